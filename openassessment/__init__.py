@@ -0,0 +1,5 @@
+"""
+Open Response Assessment: an XBlock where students can read a question, compose their response and assess responses.
+"""
+
+default_app_config = 'openassessment.apps.OpenAssessmentConfig'  # pylint: disable=invalid-name
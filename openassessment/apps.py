@@ -0,0 +1,37 @@
+"""
+Configuration of the openassessment Django application.
+"""
+from __future__ import absolute_import
+
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class OpenAssessmentConfig(AppConfig):
+    """
+    Application configuration of the OpenAssessment XBlock.
+    """
+
+    name = 'openassessment'
+    verbose_name = 'Open Response Assessment'
+
+    def ready(self):
+        """
+        Connect the receivers of the signals of the LMS and Studio, and compile
+        the templates of the XBlock when the process starts, if enabled with the
+        ORA2_WARM_TEMPLATES setting.
+        """
+        # Import is placed here to avoid model import at project startup.
+        from openassessment.workflow import signals
+
+        course_published = signals.get_course_published_signal()
+        if course_published is not None:
+            course_published.connect(
+                signals.index_published_step_deadlines,
+                dispatch_uid='openassessment.workflow.index_published_step_deadlines'
+            )
+
+        if getattr(settings, 'ORA2_WARM_TEMPLATES', False):
+            # Import is placed here to avoid model import at project startup.
+            from openassessment.xblock import template_registry
+            template_registry.warm()
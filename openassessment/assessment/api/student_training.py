@@ -8,7 +8,11 @@ Public interface for student training:
 """
 from __future__ import absolute_import
 
+from collections import OrderedDict
+import hashlib
+import json
 import logging
+import threading
 
 import six
 
@@ -16,13 +20,19 @@ from django.db import DatabaseError
 from django.utils.translation import ugettext as _
 
 from openassessment.assessment.errors import StudentTrainingInternalError, StudentTrainingRequestError
-from openassessment.assessment.models import InvalidRubricSelection, StudentTrainingWorkflow
+from openassessment.assessment.models import InvalidRubricSelection, StudentTrainingWorkflow, TrainingExample
 from openassessment.assessment.serializers import (InvalidRubric, InvalidTrainingExample, deserialize_training_examples,
                                                    serialize_training_example, validate_training_example_format)
 from submissions import api as sub_api
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
+# Number of training example sets whose keys are kept by each process
+EXAMPLE_SET_CACHE_SIZE = 500
+
+_EXAMPLE_SET_CACHE = OrderedDict()
+_EXAMPLE_SET_CACHE_LOCK = threading.Lock()
+
 
 def submitter_is_finished(submission_uuid, training_requirements):
     """
@@ -249,6 +259,84 @@ def validate_training_examples(rubric, examples):
     return errors
 
 
+def get_example_set_version(rubric, examples):
+    """
+    Return a hash of the rubric and training examples of a block, which changes
+    whenever an author edits them.
+
+    Args:
+        rubric (dict): Serialized rubric model.
+        examples (list): List of serialized training examples.
+
+    Returns:
+        unicode
+    """
+    serialized = json.dumps([rubric, examples], sort_keys=True).encode('utf-8')
+    return hashlib.sha1(serialized).hexdigest()
+
+
+def get_example_set(rubric, examples):
+    """
+    Return the training examples of a block, validated and deserialized.
+
+    The examples of a block only change when an author edits them, so the
+    primary keys and content hashes of the deserialized examples are kept,
+    in order, in a process-level cache keyed by the version of the rubric
+    and examples (see `get_example_set_version`).  Each learner then fetches
+    the examples with a single query, however many examples the block has.
+
+    Model instances aren't cached, since the transaction which created them
+    may still be rolled back: if any cached example no longer exists, the
+    examples are deserialized again.  Invalid examples aren't cached.
+
+    Args:
+        rubric (dict): Serialized rubric model.
+        examples (list): List of serialized training examples.
+
+    Returns:
+        list of TrainingExample
+
+    Raises:
+        StudentTrainingRequestError: The examples do not match the rubric.
+        InvalidRubric, InvalidRubricSelection, InvalidTrainingExample: The examples could not be deserialized.
+    """
+    version = get_example_set_version(rubric, examples)
+    with _EXAMPLE_SET_CACHE_LOCK:
+        example_keys = _EXAMPLE_SET_CACHE.get(version)
+        if example_keys is not None:
+            _EXAMPLE_SET_CACHE.move_to_end(version)
+
+    if example_keys is not None:
+        fetched = TrainingExample.objects.select_related('rubric').in_bulk([pk for pk, __ in example_keys])
+        example_set = [fetched.get(pk) for pk, __ in example_keys]
+        if all(
+                example is not None and example.content_hash == content_hash
+                for example, (__, content_hash) in zip(example_set, example_keys)
+        ):
+            return example_set
+
+    errors = validate_training_examples(rubric, examples)
+    if errors:
+        raise StudentTrainingRequestError(
+            u"Training examples do not match the rubric: {errors}".format(errors="\n".join(errors))
+        )
+    example_set = deserialize_training_examples(examples, rubric)
+
+    with _EXAMPLE_SET_CACHE_LOCK:
+        _EXAMPLE_SET_CACHE[version] = tuple((example.pk, example.content_hash) for example in example_set)
+        while len(_EXAMPLE_SET_CACHE) > EXAMPLE_SET_CACHE_SIZE:
+            _EXAMPLE_SET_CACHE.popitem(last=False)
+    return example_set
+
+
+def clear_example_sets():
+    """
+    Discard the training example sets cached by this process.
+    """
+    with _EXAMPLE_SET_CACHE_LOCK:
+        _EXAMPLE_SET_CACHE.clear()
+
+
 def get_num_completed(submission_uuid):
     """
     Get the number of training examples the student has assessed successfully.
@@ -368,13 +456,11 @@ def get_training_example(submission_uuid, rubric, examples):
 
     """
     try:
-        # Validate the training examples
-        errors = validate_training_examples(rubric, examples)
-        if errors:
-            msg = (
-                u"Training examples do not match the rubric (submission UUID is {uuid}): {errors}"
-            ).format(uuid=submission_uuid, errors="\n".join(errors))
-            raise StudentTrainingRequestError(msg)
+        # Validate, then get or create the training examples (once for each version of the examples)
+        try:
+            examples = get_example_set(rubric, examples)
+        except StudentTrainingRequestError as ex:
+            raise StudentTrainingRequestError(u"{} (submission UUID is {})".format(ex, submission_uuid))
 
         # Get or create the workflow
         workflow = StudentTrainingWorkflow.get_workflow(submission_uuid=submission_uuid)
@@ -383,9 +469,6 @@ def get_training_example(submission_uuid, rubric, examples):
                 u"No learner training workflow found for submission {}".format(submission_uuid)
             )
 
-        # Get or create the training examples
-        examples = deserialize_training_examples(examples, rubric)
-
         # Pick a training example that the student has not yet completed
         # If the student already started a training example, then return that instead.
         next_example = workflow.next_training_example(examples)
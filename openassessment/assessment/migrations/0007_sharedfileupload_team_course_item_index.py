@@ -0,0 +1,17 @@
+# Generated by Django 2.2.28 on 2026-10-19 10:03
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessment', '0006_TeamWorkflows'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='sharedfileupload',
+            index_together={('team_id', 'course_id', 'item_id')},
+        ),
+    ]
@@ -16,15 +16,18 @@ from __future__ import absolute_import, unicode_literals
 
 from collections import defaultdict
 from copy import deepcopy
-from hashlib import sha1
+from hashlib import md5, sha1
 import json
 import logging
 import math
+from uuid import uuid4
 
 import six
 
 from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.functional import cached_property
 from django.utils.timezone import now
@@ -853,6 +856,14 @@ class SharedFileUpload(TimeStampedModel):
     size = models.BigIntegerField(default=0, blank=True)
     name = models.CharField(max_length=255, default=u"")
 
+    # Time (in seconds) the files shared with a team are cached for.  Every
+    # change invalidates the cache, so this only bounds how long an
+    # out-of-band change (e.g. through the database) can go unnoticed.
+    TEAM_MANIFEST_CACHE_TIMEOUT = 60 * 60
+
+    class Meta:
+        index_together = [("team_id", "course_id", "item_id")]
+
     def __str__(self):
         return u"SharedFileUpload {}".format(self.file_key)
 
@@ -884,3 +895,104 @@ class SharedFileUpload(TimeStampedModel):
     @classmethod
     def by_student_course_item(cls, student_id, course_id, item_id, **kwargs):  # pylint: disable=unused-argument
         return cls.objects.filter(owner_id=student_id, course_id=course_id, item_id=item_id)
+
+    @classmethod
+    def get_team_manifest(cls, team_id, course_id, item_id):
+        """
+        Return the files shared with a team for an item, ordered by file key.
+
+        The primary keys of the files are cached, and versioned so that any
+        upload or deletion by a teammate (see `invalidate_team_manifest`) is
+        picked up by the next read.  The files are then fetched with a single
+        query by primary key.
+
+        Model instances aren't cached, since the transaction which created them
+        may still be rolled back: if any cached file no longer exists, the list
+        is read again (like the training examples, see `get_example_set`).
+
+        Args:
+            team_id (unicode): The team the files are shared with.
+            course_id (unicode): The course of the item.
+            item_id (unicode): The item (usage ID) of the problem.
+
+        Returns:
+            list of SharedFileUpload
+        """
+        version_key = cls._team_manifest_version_key(team_id, course_id, item_id)
+        version = cache.get(version_key)
+        if version is None:
+            # Use `add` so that a concurrent invalidation isn't overwritten.
+            cache.add(version_key, uuid4().hex, None)
+            version = cache.get(version_key)
+
+        cache_key = "assessment.shared_file_upload.team_manifest.{}.{}".format(
+            version_key.rsplit('.', 1)[-1], version
+        )
+        manifest_pks = cache.get(cache_key)
+        if manifest_pks is not None:
+            fetched = cls.objects.in_bulk(manifest_pks)
+            manifest = [fetched.get(pk) for pk in manifest_pks]
+            if all(shared_upload is not None for shared_upload in manifest):
+                return manifest
+
+        manifest = list(cls.by_team_course_item(team_id, course_id, item_id).order_by('file_key'))
+        cache.set(cache_key, [shared_upload.pk for shared_upload in manifest], cls.TEAM_MANIFEST_CACHE_TIMEOUT)
+        return manifest
+
+    @classmethod
+    def invalidate_team_manifest(cls, team_id, course_id, item_id):
+        """
+        Discard the cached list of files shared with a team for an item.
+        """
+        cache.set(cls._team_manifest_version_key(team_id, course_id, item_id), uuid4().hex, None)
+
+    @staticmethod
+    def _team_manifest_version_key(team_id, course_id, item_id):
+        """
+        Return the cache key that stores the version of a team's file manifest.
+        """
+        team_key = json.dumps([team_id, course_id, item_id]).encode('utf-8')
+        return "assessment.shared_file_upload.team_manifest_version.{}".format(md5(team_key).hexdigest())
+
+
+@receiver(post_save, sender=SharedFileUpload)
+@receiver(post_delete, sender=SharedFileUpload)
+def invalidate_team_manifest_on_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Discard the cached file manifest of a team whenever one of its shared files
+    is saved or deleted.  Bulk operations don't send these signals, and have
+    to invalidate the manifest themselves.
+    """
+    SharedFileUpload.invalidate_team_manifest(instance.team_id, instance.course_id, instance.item_id)
+
+
+@python_2_unicode_compatible
+class FileUploadBlob(models.Model):
+    """
+    The content of one or more uploaded files, stored once under its SHA-256
+    digest when the file upload storage is content-addressed.
+
+    The number of files referring to the blob is counted, so that it can be
+    removed from the storage once no file refers to it anymore.
+
+    """
+    digest = models.CharField(max_length=64, unique=True)
+    size = models.BigIntegerField(default=0)
+    reference_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=now)
+
+    def __str__(self):
+        return u"FileUploadBlob {}".format(self.digest)
+
+
+@python_2_unicode_compatible
+class FileUploadBlobReference(models.Model):
+    """
+    Map the key of an uploaded file (including the storage prefix) to the blob storing its content.
+
+    """
+    key_name = models.CharField(max_length=255, unique=True)
+    blob = models.ForeignKey(FileUploadBlob, related_name="references", on_delete=models.PROTECT)
+
+    def __str__(self):
+        return u"FileUploadBlobReference {}".format(self.key_name)
@@ -123,23 +123,21 @@ class StudentTrainingWorkflow(models.Model):
         if incomplete_items:
             return incomplete_items[0].training_example
 
-        # Otherwise, pick an item that we have not completed
+        # Otherwise, pick the first example we have not completed
         # from the list of examples.
         completed_examples = [
             item.training_example for item in items
         ]
-        available_examples = [
-            available for available in examples
-            if available not in completed_examples
-        ]
+        next_example = next(
+            (available for available in examples if available not in completed_examples), None
+        )
 
         # If there are no more items available, return None
-        if not available_examples:
+        if next_example is None:
             return None
         # Otherwise, create a new workflow item for the example
         # and add it to the workflow
         order_num = len(items) + 1
-        next_example = available_examples[0]
 
         try:
             with transaction.atomic():
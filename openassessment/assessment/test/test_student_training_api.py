@@ -10,10 +10,12 @@ import ddt
 from mock import patch
 import six
 
+from django.core.cache import cache
 from django.db import DatabaseError
 
 from openassessment.assessment.api import student_training as training_api
 from openassessment.assessment.errors import StudentTrainingInternalError, StudentTrainingRequestError
+from openassessment.assessment.models import TrainingExample
 from openassessment.test_utils import CacheResetTest
 from submissions import api as sub_api
 
@@ -108,15 +110,15 @@ class StudentTrainingAssessmentTest(CacheResetTest):
 
         # First training example
         # This will need to create the student training workflow and the first item
-        # NOTE: we *could* cache the rubric model to reduce the number of queries here,
-        # but we're selecting it by content hash, which is indexed and should be plenty fast.
-        with self.assertNumQueries(8):
+        # The rubric and examples were deserialized when warming the cache,
+        # so they are fetched with a single query.
+        with self.assertNumQueries(6):
             training_api.get_training_example(self.submission_uuid, RUBRIC, EXAMPLES)
 
         # Without assessing the first training example, try to retrieve a training example.
         # This should return the same example as before, so we won't need to create
         # any workflows or workflow items.
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(3):
             training_api.get_training_example(self.submission_uuid, RUBRIC, EXAMPLES)
 
         # Assess the current training example
@@ -124,7 +126,7 @@ class StudentTrainingAssessmentTest(CacheResetTest):
 
         # Retrieve the next training example, which requires us to create
         # a new workflow item (but not a new workflow).
-        with self.assertNumQueries(8):
+        with self.assertNumQueries(6):
             training_api.get_training_example(self.submission_uuid, RUBRIC, EXAMPLES)
 
     def test_submitter_is_finished_num_queries(self):
@@ -154,6 +156,51 @@ class StudentTrainingAssessmentTest(CacheResetTest):
         with self.assertNumQueries(3):
             training_api.assess_training_example(self.submission_uuid, EXAMPLES[0]['options_selected'])
 
+    def test_get_example_set_cached(self):
+        with patch.object(
+            training_api, 'deserialize_training_examples', wraps=training_api.deserialize_training_examples
+        ) as mock_deserialize:
+            example_set = training_api.get_example_set(RUBRIC, EXAMPLES)
+            self.assertEqual([example.options_selected_dict for example in example_set], [
+                example['options_selected'] for example in EXAMPLES
+            ])
+
+            # The examples are deserialized once for each version of the examples
+            with self.assertNumQueries(1):
+                self.assertEqual(training_api.get_example_set(RUBRIC, copy.deepcopy(EXAMPLES)), example_set)
+            self.assertEqual(mock_deserialize.call_count, 1)
+
+            mutated_examples = copy.deepcopy(EXAMPLES)
+            mutated_examples[0]['answer'] = u"Mutated answer"
+            self.assertNotEqual(
+                training_api.get_example_set_version(RUBRIC, mutated_examples),
+                training_api.get_example_set_version(RUBRIC, EXAMPLES)
+            )
+            self.assertEqual(len(training_api.get_example_set(RUBRIC, mutated_examples)), len(EXAMPLES))
+            self.assertEqual(mock_deserialize.call_count, 2)
+
+    def test_get_example_set_rolled_back(self):
+        example_set = training_api.get_example_set(RUBRIC, EXAMPLES)
+
+        # Simulate the rollback of the transaction which created the examples
+        TrainingExample.objects.filter(pk__in=[example.pk for example in example_set]).delete()
+        cache.clear()
+
+        # The examples are created again, instead of returning examples which don't exist
+        example_set = training_api.get_example_set(RUBRIC, EXAMPLES)
+        self.assertEqual(
+            TrainingExample.objects.filter(pk__in=[example.pk for example in example_set]).count(), len(EXAMPLES)
+        )
+        self.assertEqual(training_api.get_example_set(RUBRIC, EXAMPLES), example_set)
+
+    def test_get_example_set_invalid_not_cached(self):
+        invalid_examples = copy.deepcopy(EXAMPLES)
+        criterion_name = sorted(invalid_examples[0]['options_selected'])[0]
+        invalid_examples[0]['options_selected'][criterion_name] = u"invalid option"
+        for __ in range(2):
+            with self.assertRaises(StudentTrainingRequestError):
+                training_api.get_example_set(RUBRIC, invalid_examples)
+
     @ddt.file_data('data/validate_training_examples.json')
     def test_validate_training_examples(self, data):
         errors = training_api.validate_training_examples(
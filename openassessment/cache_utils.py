@@ -0,0 +1,16 @@
+"""
+Helpers shared by the caches of the OpenAssessment apps.
+"""
+from __future__ import absolute_import
+
+import hashlib
+import json
+
+
+def get_cache_key_digest(*parts):
+    """
+    Hash the given (JSON-serializable) parts into a string that is safe to use
+    in a cache key, whatever characters the course and item IDs contain.
+    """
+    serialized = json.dumps(parts, sort_keys=True).encode('utf-8')
+    return hashlib.md5(serialized).hexdigest()
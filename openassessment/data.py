@@ -4,17 +4,27 @@ Aggregate data for openassessment.
 from __future__ import absolute_import
 
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import csv
 import json
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
 
 import six
 
 from django.conf import settings
 
 from openassessment.assessment.models import Assessment, AssessmentFeedback, AssessmentPart
+from openassessment.fileupload import api as file_upload_api
+from openassessment.fileupload.exceptions import FileUploadError
 from openassessment.workflow.models import AssessmentWorkflow, TeamAssessmentWorkflow
 from submissions import api as sub_api
 
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
 
 class CsvWriter:
     """
@@ -346,6 +356,186 @@ class CsvWriter:
         )
 
 
+class SubmissionFilesZipWriter:
+    """
+    Dump the responses (text answers and uploaded files) to an ORA item into a ZIP archive.
+
+    Entries are grouped in one folder per learner, named after the anonymized
+    student id:
+
+        <student_id>/response.txt
+        <student_id>/<index>_<file name>
+
+    Files are fetched from the file upload backend by a pool of threads, and
+    spooled to temporary files before being added to the archive, so memory
+    usage does not depend on the size of the files.
+    """
+
+    # Number of files fetched concurrently
+    MAX_WORKERS = 8
+
+    # Number of files fetched ahead of the archive, which bounds the
+    # disk space used by the temporary files.
+    FETCH_BATCH_SIZE = 32
+
+    # Size (in bytes) of the chunks files are read in
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, output_stream, max_workers=None, progress_callback=None):
+        """
+        Configure where the writer will write the archive.
+
+        Args:
+            output_stream (file-like object): The binary stream to write the
+                archive to.  It does not need to be seekable.
+
+        Keyword Arguments:
+            max_workers (int): The number of files fetched concurrently.
+            progress_callback (callable): Callable that accepts no arguments.
+                Called once per submission written to the archive.
+
+        Example usage:
+            >>> with open('responses.zip', 'wb') as output_stream:
+            >>>     writer = SubmissionFilesZipWriter(output_stream)
+            >>>     writer.write_to_zip(course_id, item_id)
+
+        """
+        self._output_stream = output_stream
+        self._max_workers = max_workers or self.MAX_WORKERS
+        self._progress_callback = progress_callback
+
+    def write_to_zip(self, course_id, item_id, item_type='openassessment'):
+        """
+        Write the latest submission of every learner to an ORA item to the archive.
+
+        Args:
+            course_id (unicode): The ID of the course.
+            item_id (unicode): The usage ID of the ORA item.
+
+        Keyword Arguments:
+            item_type (unicode): The type of the item.
+
+        Returns:
+            int: The number of files (not counting text answers) written to the archive.
+
+        """
+        num_files = 0
+        with zipfile.ZipFile(self._output_stream, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                pending_files = []
+                submissions = sub_api.get_all_submissions(course_id, item_id, item_type, read_replica=True)
+                for submission in submissions:
+                    student_id = submission['student_id']
+                    answer = submission['answer']
+
+                    text_response = self._text_response(answer)
+                    if text_response:
+                        archive.writestr(u"{}/response.txt".format(student_id), text_response.encode('utf-8'))
+
+                    pending_files.extend(self._file_entries(student_id, answer))
+                    if len(pending_files) >= self.FETCH_BATCH_SIZE:
+                        num_files += self._write_files(archive, executor, pending_files)
+                        pending_files = []
+
+                    if self._progress_callback is not None:
+                        self._progress_callback()
+
+                num_files += self._write_files(archive, executor, pending_files)
+        return num_files
+
+    def _write_files(self, archive, executor, file_entries):
+        """
+        Fetch files concurrently, then add them to the archive in order.
+
+        Args:
+            archive (ZipFile): The archive to write to.
+            executor (ThreadPoolExecutor): The pool fetching the files.
+            file_entries (list): List of `(archive name, file key)` tuples.
+
+        Returns:
+            int: The number of files written.
+
+        """
+        num_files = 0
+        temp_paths = executor.map(self._fetch_file, [file_key for _, file_key in file_entries])
+        for (archive_name, _), temp_path in zip(file_entries, temp_paths):
+            if temp_path is None:
+                continue
+            try:
+                archive.write(temp_path, archive_name)
+                num_files += 1
+            finally:
+                os.remove(temp_path)
+        return num_files
+
+    def _fetch_file(self, file_key):
+        """
+        Copy a file from the file upload backend to a temporary file.
+
+        Args:
+            file_key (unicode): The key of the file.
+
+        Returns:
+            The path of the temporary file, or None if the file could not be fetched.
+
+        """
+        try:
+            content = file_upload_api.open_file(file_key)
+        except FileUploadError:
+            logger.exception(u"Could not fetch file {} for the responses archive".format(file_key))
+            return None
+        if content is None:
+            logger.warning(u"File {} is missing from the responses archive".format(file_key))
+            return None
+
+        temp_file = tempfile.NamedTemporaryFile(delete=False)
+        try:
+            with temp_file:
+                shutil.copyfileobj(content, temp_file, self.CHUNK_SIZE)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(u"Could not fetch file {} for the responses archive".format(file_key))
+            os.remove(temp_file.name)
+            return None
+        finally:
+            content.close()
+        return temp_file.name
+
+    @staticmethod
+    def _text_response(answer):
+        """
+        Return the text answer of a submission, with its parts separated by blank lines.
+        """
+        if isinstance(answer, six.string_types):
+            return answer
+        if 'parts' in answer:
+            return u"\n\n".join(part.get('text', u'') for part in answer['parts'])
+        return answer.get('text', u'')
+
+    @staticmethod
+    def _file_entries(student_id, answer):
+        """
+        Return the `(archive name, file key)` of each file uploaded with a submission.
+        """
+        if isinstance(answer, six.string_types):
+            return []
+        if 'file_keys' in answer:
+            file_keys = answer.get('file_keys', [])
+            file_names = answer.get('files_name', answer.get('files_names', []))
+        elif answer.get('file_key'):
+            file_keys = [answer['file_key']]
+            file_names = []
+        else:
+            return []
+
+        entries = []
+        for index, file_key in enumerate(file_keys):
+            file_name = file_names[index] if index < len(file_names) and file_names[index] else u''
+            file_name = file_name or file_key.rsplit('/', 1)[-1]
+            file_name = file_name.replace('/', '_').replace('\\', '_')
+            entries.append((u"{}/{}_{}".format(student_id, index, file_name), file_key))
+        return entries
+
+
 class OraAggregateData:
     """
     Aggregate all the ORA data into a single table-like data structure.
@@ -6,23 +6,32 @@ URLs of existing files, and delete files.
 
 from __future__ import absolute_import, unicode_literals
 
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import json
 import logging
 
-from django.db import IntegrityError
+import six
+
+from django.conf import settings
+from django.core import signing
+from django.db import IntegrityError, transaction
 from django.utils.functional import cached_property
 
 from openassessment.assessment.models.base import SharedFileUpload
 from openassessment.fileupload.exceptions import FileUploadError
+from openassessment.fileupload.previews import FilePreviewQueue
+from openassessment.fileupload.removal import FileRemovalQueue
 
-from . import backends
+from . import backends, previews
 
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
 KEY_SEPARATOR = '/'
 
+# Salt of the tokens rendered in place of deferred download URLs
+DEFERRED_URL_TOKEN_SALT = 'openassessment.fileupload.deferred_download_url'
+
 
 def get_upload_url(key, content_type):
     """
@@ -31,21 +40,215 @@ def get_upload_url(key, content_type):
     return backends.get_backend().get_upload_url(key, content_type)
 
 
-def get_download_url(key):
+def get_upload_urls(uploads):
+    """
+    Returns a dict mapping each key to a url which can be used to upload the corresponding file to.
+
+    Args:
+        uploads (list of tuple): The (key, content_type) of each file to upload.
+    """
+    return backends.get_backend().get_upload_urls(uploads)
+
+
+def initiate_multipart_upload(key, content_type):
+    """
+    Starts uploading a file in several parts, and returns the identifier of the upload.
+    Raises FileUploadRequestError if the backend does not support multipart uploads.
+    """
+    return backends.get_backend().initiate_multipart_upload(key, content_type)
+
+
+def get_upload_part_url(key, upload_id, part_number):
+    """
+    Returns a url which can be used to upload a part (numbered from 1) of a multipart upload.
+    """
+    return backends.get_backend().get_upload_part_url(key, upload_id, part_number)
+
+
+def list_upload_parts(key, upload_id):
+    """
+    Returns a dict mapping the number of each part uploaded so far to its size, to resume an upload.
+    """
+    return backends.get_backend().list_upload_parts(key, upload_id)
+
+
+def complete_multipart_upload(key, upload_id):
+    """
+    Assembles the uploaded parts of a multipart upload into the file.
+    """
+    return backends.get_backend().complete_multipart_upload(key, upload_id)
+
+
+def abort_multipart_upload(key, upload_id):
+    """
+    Discards a multipart upload and its uploaded parts.
+    """
+    return backends.get_backend().abort_multipart_upload(key, upload_id)
+
+
+def get_download_url(key, use_cache=True):
     """
     Returns the url at which the file that corresponds to the key can be downloaded.
     """
-    url = backends.get_backend().get_download_url(key)
-    if not url:
-        logger.warning('FileUploadError: Could not retrieve URL for key {}'.format(key))
-    return url
+    return get_download_urls([key], use_cache=use_cache)[key]
+
+
+def get_download_urls(keys, use_cache=True):
+    """
+    Returns a dict mapping each key to the url at which the corresponding file can be downloaded.
+    URLs are signed in a single batch, and cached until shortly before they expire.
+    With `use_cache=False`, every URL is signed again, so that it is valid for the full
+    `DOWNLOAD_URL_TIMEOUT`.
+    """
+    urls = backends.get_backend().get_download_urls(keys, use_cache=use_cache)
+    for key, url in urls.items():
+        if not url:
+            logger.warning('FileUploadError: Could not retrieve URL for key {}'.format(key))
+    return urls
+
+
+class DeferredDownloadUrl(six.text_type):
+    """
+    Placeholder rendered in place of the download URL of a file.
+
+    The placeholder is a signed token identifying the file and the item it
+    was rendered for, which the client exchanges for the download URL (see
+    `resolve_deferred_download_urls`) only once the file is shown, so that
+    pages don't wait for the storage to sign URLs which may never be used.
+    Templates tell placeholders from URLs with their `deferred` attribute.
+
+    Tokens expire like download URLs.  The placeholders of a file compare
+    equal even if they were signed at different times, so that they can be
+    used as dictionary keys (e.g. to look up the preview of a file) like URLs.
+    """
+    deferred = True
+
+    def __new__(cls, token, key):
+        placeholder = super(DeferredDownloadUrl, cls).__new__(cls, token)
+        placeholder.key = key
+        return placeholder
+
+    def __eq__(self, other):
+        if isinstance(other, DeferredDownloadUrl):
+            return self.key == other.key
+        return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.key)
+
+
+def defer_download_urls():
+    """
+    Returns True if pages render placeholders instead of the download URLs of the files,
+    as enabled with the ORA2_FILEUPLOAD_DEFER_DOWNLOAD_URLS setting.
+    """
+    return getattr(settings, 'ORA2_FILEUPLOAD_DEFER_DOWNLOAD_URLS', False)
+
+
+def get_deferred_download_url(key, item_id):
+    """
+    Returns the placeholder (a DeferredDownloadUrl) of the download url of the file that corresponds to the key,
+    which can only be resolved by the item with the given (usage) id.
+    """
+    token = signing.dumps({'key': key, 'item_id': item_id}, salt=DEFERRED_URL_TOKEN_SALT)
+    return DeferredDownloadUrl(token, key)
+
+
+def _is_item_file_key(key, course_id, item_id):
+    """
+    Returns True if the key is the key of a file uploaded to the item (see `get_student_file_key`).
+    """
+    __, __, item_key = key.partition(KEY_SEPARATOR)
+    prefix = KEY_SEPARATOR.join((course_id, item_id))
+    suffix = item_key[len(prefix):]
+    return item_key.startswith(prefix) and (
+        not suffix or (suffix.startswith(KEY_SEPARATOR) and suffix[len(KEY_SEPARATOR):].isdigit())
+    )
+
+
+def resolve_deferred_download_urls(tokens, course_id, item_id):
+    """
+    Returns a dict mapping each deferred download url token to the url at which the corresponding file can be
+    downloaded, or to an empty string if the token is invalid, has expired, or doesn't identify a file of the item
+    with the given course and (usage) id. URLs are signed in a single batch.
+    """
+    max_age = backends.get_backend().DOWNLOAD_URL_TIMEOUT
+    keys = {}
+    for token in tokens:
+        try:
+            value = signing.loads(token, salt=DEFERRED_URL_TOKEN_SALT, max_age=max_age)
+        except signing.SignatureExpired:
+            logger.info('FileUploadError: Expired download URL token {}'.format(token))
+            continue
+        except signing.BadSignature:
+            logger.warning('FileUploadError: Invalid download URL token {}'.format(token))
+            continue
+        key = value.get('key') if isinstance(value, dict) else None
+        if not key or value.get('item_id') != item_id or not _is_item_file_key(key, course_id, item_id):
+            logger.warning('FileUploadError: Download URL token {} is not valid for item {}'.format(token, item_id))
+            continue
+        keys[token] = key
+    urls = get_download_urls(list(set(keys.values()))) if keys else {}
+    return {token: (urls.get(keys[token]) or '') if token in keys else '' for token in tokens}
+
+
+def open_file(key):
+    """
+    Opens the file that corresponds to the key for reading.
+    Returns a binary file-like object, or None if there is no such file.
+    """
+    return backends.get_backend().open_file(key)
 
 
 def remove_file(key):
     """
-    Remove file from the storage
+    Remove file from the storage, along with its preview
+    """
+    backend = backends.get_backend()
+    removed = backend.remove_file(key)
+    backend.invalidate_download_url(key)
+    if previews.is_enabled():
+        preview_key = previews.get_preview_key(key)
+        backend.remove_file(preview_key)
+        backend.invalidate_download_url(preview_key)
+    return removed
+
+
+def remove_files(keys):
+    """
+    Remove several files from the storage, along with their previews, with as few requests as the backend allows.
+    Returns the keys of the files which are no longer stored.
+    """
+    backend = backends.get_backend()
+    requested_keys = set(keys)
+    if previews.is_enabled():
+        keys = list(keys) + [
+            previews.get_preview_key(key) for key in keys
+            if not previews.is_preview_key(key) and previews.get_preview_key(key) not in requested_keys
+        ]
+    removed = backend.remove_files(keys)
+    backend.invalidate_download_urls(keys)
+    return [key for key in removed if key in requested_keys]
+
+
+_REMOVAL_QUEUE = FileRemovalQueue(remove_files)
+
+
+def remove_file_later(key):
+    """
+    Remove file from the storage in a background thread, without waiting for it.
+    The download URL of the file is invalidated right away.
+
+    Files are removed immediately instead unless the ORA2_FILEUPLOAD_DEFER_REMOVAL setting is True.
     """
-    return backends.get_backend().remove_file(key)
+    if not getattr(settings, 'ORA2_FILEUPLOAD_DEFER_REMOVAL', False):
+        remove_file(key)
+        return
+    backends.get_backend().invalidate_download_url(key)
+    _REMOVAL_QUEUE.put(key)
 
 
 def get_student_file_key(student_item_dict, index=0):
@@ -120,6 +323,32 @@ def _safe_load_json_list(field, log_error=False):
         return []
 
 
+def get_preview_urls(keys, use_cache=True):
+    """
+    Returns a dict mapping each key to the url at which the preview of the corresponding file can be downloaded,
+    or to an empty string if the file has no preview. Previews are only shown if the ORA2_FILEUPLOAD_PREVIEWS
+    setting is enabled, and their URLs are signed and cached like the download URLs of the files.
+    """
+    if not previews.is_enabled() or not keys:
+        return {key: '' for key in keys}
+    preview_keys = {key: previews.get_preview_key(key) for key in keys}
+    urls = backends.get_backend().get_download_urls(list(preview_keys.values()), use_cache=use_cache)
+    return {key: urls.get(preview_key) or '' for key, preview_key in preview_keys.items()}
+
+
+_PREVIEW_QUEUE = FilePreviewQueue(previews.generate_previews)
+
+
+def generate_previews_later(keys):
+    """
+    Generate the previews of newly uploaded files in a background thread, if previews are enabled.
+    """
+    if not previews.is_enabled():
+        return
+    for key in keys:
+        _PREVIEW_QUEUE.put(key)
+
+
 class FileUpload:
     """
     A layer of abstraction over the various components of file
@@ -276,15 +505,7 @@ class FileUploadManager:
         Returns a list of FileUpload objects owned by other members of the team.
         Does not include FileUploads of the current user.
         """
-        shared_uploads_from_other_users = sorted(
-            [
-                shared_upload
-                for shared_upload in self.shared_uploads_for_team_by_key.values()
-                if shared_upload.owner_id != self.student_item_dict['student_id']
-            ],
-            key=lambda upload: upload.file_key,
-        )
-
+        # The shared uploads are already ordered by file key
         return [
             FileUpload(
                 name=shared_upload.name,
@@ -294,17 +515,21 @@ class FileUploadManager:
                 course_id=shared_upload.course_id,
                 item_id=shared_upload.item_id,
                 index=shared_upload.index,
-            ) for shared_upload in shared_uploads_from_other_users
+            )
+            for shared_upload in self.shared_uploads_for_team_by_key.values()
+            if shared_upload.owner_id != self.student_item_dict['student_id']
         ]
 
-    def file_descriptor_tuples(self, include_deleted=False):
+    def file_descriptor_tuples(self, include_deleted=False, defer_urls=False):
         """
         Used in the response template context to provide a (file URL, description, name, show_delete_button boolean)
         for each uploaded file in this block to render in the client.
         If self.block is team-enabled, this will return only entries for files
         that have been shared with the block's current user's team.
+        If defer_urls is True, the file URLs are placeholders (see `DeferredDownloadUrl`).
         """
         team_id = self.block.team.team_id if self.block.has_team() else None
+        item_id = self.student_item_dict['item_id']
 
         descriptors = []
 
@@ -321,8 +546,13 @@ class FileUploadManager:
                     shared_file=shared_upload,
                 )
 
+            if defer_urls:
+                download_url = get_deferred_download_url(upload.key, item_id) if upload.exists else None
+            else:
+                download_url = upload.download_url
+
             descriptors.append(FileDescriptor(
-                download_url=upload.download_url,
+                download_url=download_url,
                 description=upload.description,
                 name=upload.name,
                 show_delete_button=show_delete_button,
@@ -330,21 +560,45 @@ class FileUploadManager:
 
         return descriptors
 
-    def team_file_descriptor_tuples(self):
+    def team_file_descriptor_tuples(self, defer_urls=False):
         """
         Returns the list of TeamFileDescriptors owned by other team members
         shown to a user when self.block is a team assignment.
-        """
+        If defer_urls is True, the file URLs are placeholders (see `DeferredDownloadUrl`).
+        """
+        team_uploads = self.get_team_uploads()
+        if defer_urls:
+            item_id = self.student_item_dict['item_id']
+            download_urls = {upload.key: get_deferred_download_url(upload.key, item_id) for upload in team_uploads}
+        else:
+            download_urls = self._get_download_urls([upload.key for upload in team_uploads])
         return [
             TeamFileDescriptor(
-                download_url=upload.download_url,
+                download_url=download_urls.get(upload.key, ''),
                 description=upload.description,
                 name=upload.name,
                 uploaded_by=self.block.get_username(upload.student_id)
             )
-            for upload in self.get_team_uploads()
+            for upload in team_uploads
         ]
 
+    @staticmethod
+    def _get_download_urls(keys):
+        """
+        Returns the download URLs of several files in a single batch, or an
+        empty string for each file if they can't be retrieved.
+        """
+        if not keys:
+            return {}
+        try:
+            return get_download_urls(keys)
+        except FileUploadError as exc:
+            logger.exception(u'FileUploadError: URL retrieval failed for keys {keys} with error {error}'.format(
+                keys=keys,
+                error=exc
+            ))
+            return {key: '' for key in keys}
+
     @cached_property
     def shared_uploads_for_student_by_key(self):
         """
@@ -358,24 +612,22 @@ class FileUploadManager:
     def shared_uploads_for_team_by_key(self):
         """
         Returns **and caches** all of the SharedFileUpload records
-        for this student/course/item.
+        for this team/course/item, ordered by file key.
         """
-        shared_uploads = SharedFileUpload.by_team_course_item(
+        shared_uploads = SharedFileUpload.get_team_manifest(
             team_id=self.team_id,
             course_id=self.student_item_dict['course_id'],
             item_id=self.student_item_dict['item_id'],
         )
-        return {shared_upload.file_key: shared_upload for shared_upload in shared_uploads}
+        return OrderedDict((shared_upload.file_key, shared_upload) for shared_upload in shared_uploads)
 
     def invalidate_cached_shared_file_dicts(self):
         """
         Invalidates SharedFileUpload records that we have cached.
         """
-        if hasattr(self, 'shared_uploads_for_student_by_key'):
-            del self.shared_uploads_for_student_by_key
-
-        if hasattr(self, 'shared_uploads_for_team_by_key'):
-            del self.shared_uploads_for_team_by_key
+        # Look the cached values up directly: hasattr() would query them first.
+        self.__dict__.pop('shared_uploads_for_student_by_key', None)
+        self.__dict__.pop('shared_uploads_for_team_by_key', None)
 
     def append_uploads(self, *new_uploads):
         """
@@ -405,13 +657,9 @@ class FileUploadManager:
         existing_file_descriptions, existing_file_names, existing_file_sizes = self._get_metadata_from_block()
 
         new_descriptions = existing_file_descriptions + descriptions_to_add
-        self._set_file_descriptions(new_descriptions)
-
         new_names = existing_file_names + names_to_add
-        self._set_file_names(new_names)
-
         new_sizes = existing_file_sizes + sizes_to_add
-        self._set_file_sizes(new_sizes)
+        self._set_metadata(new_descriptions, new_names, new_sizes)
 
         new_file_uploads = self._file_uploads_from_list_fields(new_descriptions, new_names, new_sizes)
 
@@ -425,24 +673,53 @@ class FileUploadManager:
                 )
             }
 
-            for new_file_upload in new_file_uploads:
-                if new_file_upload.key not in existing_file_upload_key_set:
-                    self.create_shared_upload(new_file_upload)
+            self.create_shared_uploads([
+                new_file_upload for new_file_upload in new_file_uploads
+                if new_file_upload.key not in existing_file_upload_key_set
+            ])
+
+        # The files are uploaded once their metadata is saved
+        generate_previews_later([
+            new_file_upload.key for new_file_upload in new_file_uploads
+            if new_file_upload.index >= len(existing_file_descriptions)
+        ])
 
         self.invalidate_cached_shared_file_dicts()
         return new_file_uploads
 
     def create_shared_upload(self, fileupload):
+        self.create_shared_uploads([fileupload])
+
+    def create_shared_uploads(self, fileuploads):
+        """
+        Share several files with the current team, creating all of their
+        ``SharedFileUpload`` records and history records in bulk.
+        """
+        if not fileuploads:
+            return
         try:
-            SharedFileUpload.objects.create(
-                team_id=self.block.team.team_id,
-                owner_id=fileupload.student_id,
-                course_id=fileupload.course_id,
-                item_id=fileupload.item_id,
-                file_key=fileupload.key,
-                description=fileupload.description,
-                size=fileupload.size,
-                name=fileupload.name,
+            with transaction.atomic():
+                SharedFileUpload.objects.bulk_create([
+                    SharedFileUpload(
+                        team_id=self.block.team.team_id,
+                        owner_id=fileupload.student_id,
+                        course_id=fileupload.course_id,
+                        item_id=fileupload.item_id,
+                        file_key=fileupload.key,
+                        description=fileupload.description,
+                        size=fileupload.size,
+                        name=fileupload.name,
+                    ) for fileupload in fileuploads
+                ])
+                # bulk_create skips the signals the history relies on, and only sets
+                # primary keys on some databases, so read the (unique) keys back.
+                shared_uploads = SharedFileUpload.objects.filter(
+                    file_key__in=[fileupload.key for fileupload in fileuploads]
+                )
+                SharedFileUpload.history.bulk_history_create(list(shared_uploads))
+            # bulk_create doesn't send the signal that invalidates the team's file manifest
+            SharedFileUpload.invalidate_team_manifest(
+                self.block.team.team_id, self.student_item_dict['course_id'], self.student_item_dict['item_id']
             )
         except IntegrityError as e:
             logger.error("Unable to create shared upload. " + str(e))
@@ -453,26 +730,22 @@ class FileUploadManager:
 
     def delete_upload(self, index):
         """
-        Given a file index to remove, null out its metadata in our stored file metadata fields.
-        This will also delete any ``SharedFileUpload`` records associated with the file's key
-        (if the file has been shared with a team).
+        Given a file index to remove, null out its metadata in our stored file metadata fields,
+        and queue the file for removal from the storage. This will also delete any ``SharedFileUpload``
+        records associated with the file's key (if the file has been shared with a team).
 
         Args:
             index (integer): file index to remove
         """
         file_key = self.get_file_key(index)
-        remove_file(file_key)
+        remove_file_later(file_key)
 
         stored_file_descriptions, stored_file_names, stored_file_sizes = self._get_metadata_from_block()
 
         stored_file_descriptions[index] = None
-        self._set_file_descriptions(stored_file_descriptions)
-
         stored_file_names[index] = None
-        self._set_file_names(stored_file_names)
-
         stored_file_sizes[index] = 0
-        self._set_file_sizes(stored_file_sizes)
+        self._set_metadata(stored_file_descriptions, stored_file_names, stored_file_sizes)
 
         if self.block.is_team_assignment():
             try:
@@ -488,6 +761,15 @@ class FileUploadManager:
         sizes = self._get_file_sizes(descriptions)
         return descriptions, names, sizes
 
+    def _set_metadata(self, descriptions, names, sizes):
+        """
+        Updates all of the file metadata fields of this manager's OA block at once,
+        so that they are saved together with the rest of the user state.
+        """
+        self._set_file_descriptions(descriptions)
+        self._set_file_names(names)
+        self._set_file_sizes(sizes)
+
     def _file_uploads_from_list_fields(self, descriptions, names, sizes, include_deleted=False):
         """
         Given file upload data as list fields, return a list of FileUploads constructed from those fields
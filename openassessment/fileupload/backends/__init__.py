@@ -1,21 +1,24 @@
 """ File Upload backends. """
 from __future__ import absolute_import
 
+from importlib import import_module
+
 from django.conf import settings
 
-from . import django_storage, filesystem, s3, swift
+# Modules of the backends, by ORA2_FILEUPLOAD_BACKEND setting value.  Backends
+# are imported when first used, so that only the storage SDK of the configured
+# backend (e.g. boto or swiftclient) is ever imported.
+BACKEND_MODULES = {
+    "s3": "openassessment.fileupload.backends.s3",
+    "filesystem": "openassessment.fileupload.backends.filesystem",
+    "swift": "openassessment.fileupload.backends.swift",
+    "django": "openassessment.fileupload.backends.django_storage",
+}
 
 
 def get_backend():
     # Use S3 backend by default (current behaviour)
     backend_setting = getattr(settings, "ORA2_FILEUPLOAD_BACKEND", "s3")
-    if backend_setting == "s3":
-        return s3.Backend()
-    elif backend_setting == "filesystem":
-        return filesystem.Backend()
-    elif backend_setting == "swift":
-        return swift.Backend()
-    elif backend_setting == "django":
-        return django_storage.Backend()
-    else:
+    if backend_setting not in BACKEND_MODULES:
         raise ValueError(u"Invalid ORA2_FILEUPLOAD_BACKEND setting value: %s" % backend_setting)
+    return import_module(BACKEND_MODULES[backend_setting]).Backend()
@@ -2,11 +2,13 @@
 from __future__ import absolute_import
 
 import abc
+import hashlib
 import mimetypes
 
 import six
 
 from django.conf import settings
+from django.core.cache import cache
 
 from ..exceptions import FileUploadInternalError, FileUploadRequestError
 
@@ -69,6 +71,17 @@ class BaseBackend(six.with_metaclass(abc.ABCMeta, object)):
     # Time (in seconds) before a download url expires
     DOWNLOAD_URL_TIMEOUT = 1000
 
+    # Time (in seconds) before a download url expires at which it is evicted
+    # from the download URL cache, so that cached URLs are never handed out
+    # too close to their expiration.
+    DOWNLOAD_URL_CACHE_MARGIN = 60
+
+    # Maximum number of parts of a multipart upload (the S3 limit)
+    MAX_UPLOAD_PARTS = 10000
+
+    # Whether the backend implements multipart uploads
+    SUPPORTS_MULTIPART_UPLOAD = False
+
     @abc.abstractmethod
     def get_upload_url(self, key, content_type):
         """Request a one-time upload URL to upload files.
@@ -94,6 +107,124 @@ class BaseBackend(six.with_metaclass(abc.ABCMeta, object)):
         """
         raise NotImplementedError
 
+    def get_upload_urls(self, uploads):
+        """Request one-time upload URLs for several files.
+
+        Backends that can issue several URLs more efficiently than one at a
+        time should override this method.
+
+        Args:
+            uploads (list of tuple): The (key, content_type) of each file to upload.
+
+        Returns:
+            A dict mapping each key to the URL (str) to use for its one-time upload.
+
+        Raises:
+            FileUploadInternalError
+            FileUploadRequestError
+
+        """
+        return {key: self.get_upload_url(key, content_type) for key, content_type in uploads}
+
+    def initiate_multipart_upload(self, key, content_type):
+        """Start uploading a file in several parts.
+
+        Large files are uploaded in parts, each with its own one-time URL (see
+        `get_upload_part_url`), so that a failed part can be retried on its own,
+        and an interrupted upload can be resumed (see `list_upload_parts`).
+        Once every part is uploaded, `complete_multipart_upload` assembles them
+        into the file; `abort_multipart_upload` discards them instead.
+
+        Args:
+            key (str): A unique identifier of the file, as for `get_upload_url`.
+            content_type (str): The content type for the file.
+
+        Returns:
+            The identifier (str) of the upload.
+
+        Raises:
+            FileUploadInternalError
+            FileUploadRequestError: Raised if the backend doesn't support multipart uploads.
+
+        """
+        raise FileUploadRequestError("Multipart uploads are not supported by this file upload backend.")
+
+    def get_upload_part_url(self, key, upload_id, part_number):
+        """Request a one-time URL to upload a part of a multipart upload.
+
+        Args:
+            key (str): A unique identifier of the file.
+            upload_id (str): The identifier of the upload, from `initiate_multipart_upload`.
+            part_number (int): The number of the part, from 1 to `MAX_UPLOAD_PARTS`.
+                Parts are assembled in the order of their numbers.
+
+        Returns:
+            A URL (str) to which the part should be PUT.
+
+        Raises:
+            FileUploadInternalError
+            FileUploadRequestError
+
+        """
+        raise FileUploadRequestError("Multipart uploads are not supported by this file upload backend.")
+
+    def list_upload_parts(self, key, upload_id):
+        """List the parts uploaded so far, for instance to resume an interrupted upload.
+
+        Args:
+            key (str): A unique identifier of the file.
+            upload_id (str): The identifier of the upload.
+
+        Returns:
+            A dict mapping the number (int) of each uploaded part to its size in bytes (int).
+
+        Raises:
+            FileUploadInternalError
+            FileUploadRequestError
+
+        """
+        raise FileUploadRequestError("Multipart uploads are not supported by this file upload backend.")
+
+    def complete_multipart_upload(self, key, upload_id):
+        """Assemble the uploaded parts into the file.
+
+        Args:
+            key (str): A unique identifier of the file.
+            upload_id (str): The identifier of the upload.
+
+        Raises:
+            FileUploadInternalError
+            FileUploadRequestError: Raised if the upload doesn't exist, or has no parts.
+
+        """
+        raise FileUploadRequestError("Multipart uploads are not supported by this file upload backend.")
+
+    def abort_multipart_upload(self, key, upload_id):
+        """Discard a multipart upload and the parts uploaded so far.
+
+        Args:
+            key (str): A unique identifier of the file.
+            upload_id (str): The identifier of the upload.
+
+        Raises:
+            FileUploadInternalError
+            FileUploadRequestError
+
+        """
+        raise FileUploadRequestError("Multipart uploads are not supported by this file upload backend.")
+
+    def _check_part_number(self, part_number):
+        """
+        Validate the number of a part of a multipart upload.
+
+        Raises:
+            FileUploadRequestError
+        """
+        if not 1 <= part_number <= self.MAX_UPLOAD_PARTS:
+            raise FileUploadRequestError(
+                u"Part numbers must be between 1 and {}.".format(self.MAX_UPLOAD_PARTS)
+            )
+
     @abc.abstractmethod
     def get_download_url(self, key):
         """Requests a URL to download the related file from.
@@ -112,6 +243,151 @@ class BaseBackend(six.with_metaclass(abc.ABCMeta, object)):
         """
         raise NotImplementedError
 
+    def generate_download_urls(self, keys):
+        """Requests URLs to download the related files from.
+
+        Backends that can sign several URLs more efficiently than one at a time
+        (for instance by sharing a connection) should override this method.
+
+        Args:
+            keys (list of str): Unique identifiers of the files requested for download.
+
+        Returns:
+            A dict mapping each key to its download URL (str). The URL of a
+            file that is not found is empty (or None, depending on the backend).
+
+        """
+        return {key: self.get_download_url(key) for key in keys}
+
+    def get_download_urls(self, keys, use_cache=True):
+        """Returns the download URLs of several files, reusing cached URLs.
+
+        Download URLs are cached until `DOWNLOAD_URL_CACHE_MARGIN` seconds
+        before they expire. URLs of files that are not found are not cached,
+        since the file may be uploaded at any moment.
+
+        Args:
+            keys (list of str): Unique identifiers of the files requested for download.
+
+        Keyword Arguments:
+            use_cache (bool): If False, sign every URL again instead of reusing cached
+                URLs, for callers that keep the URLs for as long as they are valid.
+
+        Returns:
+            A dict mapping each key to its download URL (str).
+
+        Raises:
+            FileUploadInternalError
+            FileUploadRequestError
+
+        """
+        cache_keys = {key: self._get_download_url_cache_key(key) for key in keys}
+        cached_urls = cache.get_many(list(cache_keys.values())) if use_cache else {}
+        urls = {
+            key: cached_urls[cache_key]
+            for key, cache_key in cache_keys.items()
+            if cache_key in cached_urls
+        }
+
+        missing_keys = [key for key in cache_keys if key not in urls]
+        if missing_keys:
+            generated_urls = self.generate_download_urls(missing_keys)
+            cache.set_many(
+                {cache_keys[key]: url for key, url in generated_urls.items() if url},
+                self.DOWNLOAD_URL_TIMEOUT - self.DOWNLOAD_URL_CACHE_MARGIN
+            )
+            urls.update(generated_urls)
+
+        return urls
+
+    def open_file(self, key):
+        """Opens a stored file for reading.
+
+        By default, the file is streamed from its download URL. Backends that
+        can read their files directly should override this method.
+
+        Args:
+            key (str): A unique identifier used to identify the file.
+
+        Returns:
+            A binary file-like object supporting `read(size)` and `close()`,
+            or None if no file is found.
+
+        Raises:
+            FileUploadInternalError
+            FileUploadRequestError
+
+        """
+        # Import is placed here to avoid importing requests when the XBlock is loaded.
+        import requests
+
+        url = self.get_download_url(key)
+        if not url:
+            return None
+        try:
+            response = requests.get(url, stream=True)
+        except requests.RequestException as ex:
+            raise FileUploadInternalError(ex)
+        if response.status_code != 200:
+            response.close()
+            return None
+        response.raw.decode_content = True
+        return response.raw
+
+    def invalidate_download_url(self, key):
+        """
+        Discard the cached download URL of a file, for example once the file is removed.
+
+        Args:
+            key (str): A unique identifier used to identify the file.
+        """
+        cache.delete(self._get_download_url_cache_key(key))
+
+    def invalidate_download_urls(self, keys):
+        """
+        Discard the cached download URLs of several files at once.
+
+        Args:
+            keys (list of str): The unique identifiers of the files.
+        """
+        cache.delete_many([self._get_download_url_cache_key(key) for key in keys])
+
+    def save_file(self, key, content, content_type):
+        """
+        Store a file generated by the server, such as the preview of an uploaded file.
+
+        Files uploaded by learners are sent straight to the storage, with the
+        URLs of `get_upload_url`: this is only meant for the files ORA creates.
+
+        Args:
+            key (str): A unique identifier of the file.
+            content (bytes): The content of the file.
+            content_type (str): The content type of the file.
+
+        Raises:
+            FileUploadRequestError if the backend can't store files itself.
+            FileUploadInternalError
+
+        """
+        raise FileUploadRequestError("Saving files is not supported by this file upload backend.")
+
+    def list_files(self, prefix=''):
+        """
+        List the files stored by the backend, so that they can be reconciled with the responses.
+
+        Args:
+            prefix (str): Only list the files whose key starts with this prefix.
+
+        Yields:
+            `(key, last_modified)` tuples, where `last_modified` is an aware datetime.
+
+        Raises:
+            FileUploadRequestError if the backend can't list its files.
+            FileUploadInternalError
+
+        """
+        raise FileUploadRequestError("Listing files is not supported by this file upload backend.")
+
     @abc.abstractmethod
     def remove_file(self, key):
         """
@@ -125,6 +401,28 @@ class BaseBackend(six.with_metaclass(abc.ABCMeta, object)):
         """
         raise NotImplementedError
 
+    def remove_files(self, keys):
+        """
+        Remove several files from the storage.
+
+        By default, files are removed one at a time. Backends which can remove
+        several files with a single request should override this method.
+
+        Args:
+            keys (list of str): The unique identifiers of the files to remove.
+
+        Returns:
+            The list of the keys whose files are no longer stored (including
+            the files which did not exist).
+
+        Raises:
+            FileUploadInternalError
+
+        """
+        for key in keys:
+            self.remove_file(key)
+        return list(keys)
+
     def _retrieve_parameters(self, key):
         """
         Simple utility function to validate settings and arguments before compiling
@@ -161,3 +459,26 @@ class BaseBackend(six.with_metaclass(abc.ABCMeta, object)):
             prefix=Settings.get_prefix(),
             key=key
         )
+
+    def _get_download_url_cache_key(self, key):
+        """
+        Construct the key under which the download URL of a file is cached.
+
+        The backend and the bucket are part of the key, so that changing the
+        storage settings doesn't serve URLs pointing to the previous storage.
+        The result is hashed to respect the cache key restrictions of memcached.
+
+        Args:
+            key (str): Key to identify data for both upload and download.
+
+        Returns:
+            The cache key (str).
+        """
+        cache_key = u"{backend}/{bucket}/{key_name}".format(
+            backend=type(self).__module__,
+            bucket=getattr(settings, "FILE_UPLOAD_STORAGE_BUCKET_NAME", None),
+            key_name=self._get_key_name(key)
+        )
+        return "openassessment.fileupload.download_url.{}".format(
+            hashlib.md5(cache_key.encode('utf-8')).hexdigest()
+        )
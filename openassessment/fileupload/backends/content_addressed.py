@@ -0,0 +1,202 @@
+""" Content-addressed storage of the uploaded files, shared by the backends storing files themselves. """
+from __future__ import absolute_import
+
+import abc
+import hashlib
+import logging
+import os
+import tempfile
+from uuid import uuid4
+
+import six
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+logger = logging.getLogger("openassessment.fileupload.api")  # pylint: disable=invalid-name
+
+
+def is_content_addressed():
+    """
+    Return True if new files should be stored by content.
+
+    Enabled with the ORA2_FILEUPLOAD_CONTENT_ADDRESSED setting, for the
+    filesystem and django_storage backends.  Files stored before the setting
+    was enabled are still read from their original location.
+    """
+    return getattr(settings, 'ORA2_FILEUPLOAD_CONTENT_ADDRESSED', False)
+
+
+def create_temp_file(dir_path):
+    """
+    Create a new temporary file in a directory, to be renamed once written.
+
+    Unlike the files created by `tempfile.mkstemp`, which only the owner can
+    read, the file has the permissions of the files created by open(): the
+    kernel applies the umask of the process.
+
+    Returns:
+        tuple of (file descriptor, path) of the file, opened for writing.
+    """
+    temp_path = os.path.join(dir_path, '.upload-{}'.format(uuid4().hex))
+    return os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), temp_path
+
+
+class ContentAddressedStore(six.with_metaclass(abc.ABCMeta, object)):
+    """
+    Store the content of uploaded files once per distinct content.
+
+    Contents are stored as blobs named after their SHA-256 digest, and the
+    key of each file is mapped to its blob in the database.  Uploading a file
+    whose content is already stored (a learner uploading the same file again,
+    or teammates uploading the same artifact) only adds a mapping.  Blobs are
+    reference counted, and removed once no file refers to them anymore.
+
+    Subclasses define where the blobs are stored.
+    """
+
+    def save(self, key_name, content):
+        """
+        Store the content of a file, replacing its previous content if any.
+
+        Args:
+            key_name (str): The key of the file, including the storage prefix.
+            content (iterable): The content of the file, as chunks of bytes.
+
+        Returns:
+            FileUploadBlob
+
+        """
+        sha256 = hashlib.sha256()
+        size = 0
+        temp_directory = self._get_temp_directory()
+        if temp_directory is None:
+            # The contents are copied out of the system temporary directory, which only the owner should read
+            fd, temp_path = tempfile.mkstemp(prefix='.upload-')
+        else:
+            fd, temp_path = create_temp_file(temp_directory)
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in content:
+                    sha256.update(chunk)
+                    size += len(chunk)
+                    temp_file.write(chunk)
+            return self._add_reference(key_name, sha256.hexdigest(), size, temp_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def get_digest(self, key_name):
+        """
+        Return the digest of the blob storing the content of a file, or None
+        if the file is not stored by content.
+        """
+        return self.get_digests([key_name]).get(key_name)
+
+    def get_digests(self, key_names):
+        """
+        Return a dict mapping each of the given files which is stored by
+        content to the digest of its blob, with a single query.
+        """
+        if not key_names:
+            return {}
+        # Import is placed here to avoid model import at project startup.
+        from openassessment.assessment.models import FileUploadBlobReference
+        return dict(
+            FileUploadBlobReference.objects.filter(key_name__in=key_names).values_list('key_name', 'blob__digest')
+        )
+
+    def release(self, key_name):
+        """
+        Remove the mapping of a file to its blob, and the blob if no other file refers to it.
+
+        Returns:
+            True if the file was stored by content, False otherwise.
+        """
+        # Import is placed here to avoid model import at project startup.
+        from openassessment.assessment.models import FileUploadBlobReference
+        with transaction.atomic():
+            reference = FileUploadBlobReference.objects.select_for_update().filter(key_name=key_name).first()
+            if reference is None:
+                return False
+            reference.delete()
+            self._release_blob(reference.blob_id)
+        return True
+
+    def _add_reference(self, key_name, digest, size, temp_path):
+        """
+        Map a file to the blob with the given digest, storing the blob from
+        the temporary file if it isn't stored yet.
+        """
+        # Import is placed here to avoid model import at project startup.
+        from openassessment.assessment.models import FileUploadBlob, FileUploadBlobReference
+        with transaction.atomic():
+            # The lock keeps the blob from being removed by a concurrent release
+            blob, created = FileUploadBlob.objects.select_for_update().get_or_create(
+                digest=digest, defaults={'size': size}
+            )
+            if created or not self._blob_exists(digest):
+                self._save_blob(digest, temp_path)
+
+            reference = FileUploadBlobReference.objects.select_for_update().filter(key_name=key_name).first()
+            if reference is not None and reference.blob_id == blob.id:
+                return blob
+            if reference is not None:
+                previous_blob_id = reference.blob_id
+                reference.blob = blob
+                reference.save()
+                self._release_blob(previous_blob_id)
+            else:
+                FileUploadBlobReference.objects.create(key_name=key_name, blob=blob)
+            FileUploadBlob.objects.filter(pk=blob.pk).update(reference_count=F('reference_count') + 1)
+        return blob
+
+    def _release_blob(self, blob_id):
+        """
+        Decrement the reference count of a blob, removing the blob once it reaches zero.
+        Must be called in a transaction.
+        """
+        # Import is placed here to avoid model import at project startup.
+        from openassessment.assessment.models import FileUploadBlob
+        blob = FileUploadBlob.objects.select_for_update().get(pk=blob_id)
+        if blob.reference_count > 1:
+            FileUploadBlob.objects.filter(pk=blob.pk).update(reference_count=F('reference_count') - 1)
+            return
+        blob.delete()
+        # The blob is removed while it is locked, so that a concurrent upload
+        # of the same content stores it again.
+        try:
+            self._delete_blob(blob.digest)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(u"Could not remove blob {}".format(blob.digest))
+
+    def _get_temp_directory(self):
+        """
+        Return the directory where contents are spooled while their digest is computed,
+        or None to spool them in the system temporary directory.  Contents spooled in a
+        directory are readable like the files created by open(), so that they can be
+        moved in place as blobs.
+        """
+        return None
+
+    @abc.abstractmethod
+    def _blob_exists(self, digest):
+        """
+        Return True if the blob with the given digest is stored.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _save_blob(self, digest, temp_path):
+        """
+        Store the blob with the given digest from a temporary file, which may be moved.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _delete_blob(self, digest):
+        """
+        Remove the blob with the given digest from the storage.
+        """
+        raise NotImplementedError
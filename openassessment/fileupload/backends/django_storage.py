@@ -3,16 +3,22 @@ from __future__ import absolute_import
 
 import os
 
+from django.core.files import File
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.urls import reverse
 
-from .base import BaseBackend
+from .base import BaseBackend, Settings
+from .content_addressed import ContentAddressedStore, is_content_addressed
 
 
 class Backend(BaseBackend):
     """
     Manage openassessment student files uploaded using the default django storage settings.
+
+    Set ORA2_FILEUPLOAD_CONTENT_ADDRESSED = True to store identical files
+    only once, under the SHA-256 digest of their content.  Files stored this
+    way are only looked up while the setting is enabled.
     """
     def get_upload_url(self, key, content_type):
         """
@@ -26,19 +32,63 @@ class Backend(BaseBackend):
 
         Returns None if no file exists at that location.
         """
-        path = self._get_file_path(key)
-        if default_storage.exists(path):
-            return default_storage.url(path)
-        return None
+        return self.generate_download_urls([key])[key]
+
+    def generate_download_urls(self, keys):
+        """
+        Return the django storage download URLs of several files, looking up
+        the files stored by content with a single query.
+        """
+        paths = {key: self._get_file_path(key) for key in keys}
+        digests = DjangoStorageContentStore().get_digests(list(paths.values())) if is_content_addressed() else {}
+        download_urls = {}
+        for key, path in paths.items():
+            if path in digests:
+                download_urls[key] = default_storage.url(get_blob_path(digests[path]))
+            elif default_storage.exists(path):
+                download_urls[key] = default_storage.url(path)
+            else:
+                download_urls[key] = None
+        return download_urls
 
     def upload_file(self, key, content):
         """
         Upload the given file content to the keyed location.
         """
         path = self._get_file_path(key)
+        if is_content_addressed():
+            blob = DjangoStorageContentStore().save(path, [content])
+            # The download URL points to the blob, which changes with the content
+            self.invalidate_download_url(key)
+            return get_blob_path(blob.digest)
         saved_path = default_storage.save(path, ContentFile(content))
         return saved_path
 
+    def save_file(self, key, content, content_type):
+        """
+        Store a file generated by the server, replacing the existing file if any.
+        """
+        path = self._get_file_path(key)
+        if not is_content_addressed() and default_storage.exists(path):
+            # Django storages would save the file under another name instead
+            default_storage.delete(path)
+        self.upload_file(key, content)
+        self.invalidate_download_url(key)
+
+    def open_file(self, key):
+        """
+        Open the file at the given keyed location for reading.
+
+        Returns None if no file exists at that location.
+        """
+        path = self._get_file_path(key)
+        digest = DjangoStorageContentStore().get_digest(path) if is_content_addressed() else None
+        if digest:
+            path = get_blob_path(digest)
+        if default_storage.exists(path):
+            return default_storage.open(path, 'rb')
+        return None
+
     def remove_file(self, key):
         """
         Remove the file at the given keyed location.
@@ -47,10 +97,11 @@ class Backend(BaseBackend):
         Returns False if the file does not exist, and so was not removed.
         """
         path = self._get_file_path(key)
+        released = is_content_addressed() and DjangoStorageContentStore().release(path)
         if default_storage.exists(path):
             default_storage.delete(path)
             return True
-        return False
+        return released
 
     def _get_file_name(self, key):
         """
@@ -69,3 +120,28 @@ class Backend(BaseBackend):
         """
         path = self._get_key_name(self._get_file_name(key))
         return path
+
+
+class DjangoStorageContentStore(ContentAddressedStore):
+    """
+    Store blobs with the default django storage.
+    """
+
+    def _blob_exists(self, digest):
+        return default_storage.exists(get_blob_path(digest))
+
+    def _save_blob(self, digest, temp_path):
+        with open(temp_path, 'rb') as f:
+            default_storage.save(get_blob_path(digest), File(f))
+
+    def _delete_blob(self, digest):
+        default_storage.delete(get_blob_path(digest))
+
+
+def get_blob_path(digest):
+    """
+    Returns the path to the blob storing the content with the given digest.
+    """
+    return u"{prefix}/blobs/{directory}/{digest}".format(
+        prefix=Settings.get_prefix(), directory=digest[:2], digest=digest
+    )
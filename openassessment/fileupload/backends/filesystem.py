@@ -1,6 +1,11 @@
 """ Filesystem backend for file upload. """
 from __future__ import absolute_import
 
+import os
+from uuid import uuid4
+
+from six.moves.urllib.parse import urlencode  # pylint: disable=import-error
+
 from django.conf import settings
 import django.core.cache
 from django.urls import reverse
@@ -34,19 +39,91 @@ class Backend(BaseBackend):
             },
             ...
         }
+
+    Downloads are streamed by the Django view. To let the web server send
+    the files instead, define ORA2_FILEUPLOAD_X_ACCEL_REDIRECT_PREFIX as an
+    internal nginx location aliased to ORA2_FILEUPLOAD_ROOT.
+
+    E.g:
+
+        ORA2_FILEUPLOAD_X_ACCEL_REDIRECT_PREFIX = "/ora2-storage/"
+
+    Multipart uploads are supported: parts are PUT to the same view, and
+    appended to the file in order when the upload completes.
+
+    Set ORA2_FILEUPLOAD_CONTENT_ADDRESSED = True to store identical files
+    only once: files are then hard links to a blob named after the SHA-256
+    digest of their content.
     """
 
+    SUPPORTS_MULTIPART_UPLOAD = True
+
     def get_upload_url(self, key, content_type):
         make_upload_url_available(self._get_key_name(key), self.UPLOAD_URL_TIMEOUT)
         return self._get_url(key)
 
+    def get_upload_urls(self, uploads):
+        keys = [key for key, _ in uploads]
+        make_upload_urls_available([self._get_key_name(key) for key in keys], self.UPLOAD_URL_TIMEOUT)
+        return {key: self._get_url(key) for key in keys}
+
+    def initiate_multipart_upload(self, key, content_type):
+        from openassessment.fileupload.views_filesystem import start_multipart_upload
+        upload_id = uuid4().hex
+        start_multipart_upload(self._get_key_name(key), upload_id, {"Content-Type": content_type})
+        return upload_id
+
+    def get_upload_part_url(self, key, upload_id, part_number):
+        from openassessment.fileupload.views_filesystem import list_parts
+        self._check_part_number(part_number)
+        key_name = self._get_key_name(key)
+        # Fail early if the upload doesn't exist
+        list_parts(key_name, upload_id)
+        make_upload_url_available(key_name, self.UPLOAD_URL_TIMEOUT)
+        return u"{}?{}".format(self._get_url(key), urlencode({'uploadId': upload_id, 'partNumber': part_number}))
+
+    def list_upload_parts(self, key, upload_id):
+        from openassessment.fileupload.views_filesystem import list_parts
+        return list_parts(self._get_key_name(key), upload_id)
+
+    def complete_multipart_upload(self, key, upload_id):
+        from openassessment.fileupload.views_filesystem import complete_multipart_upload
+        complete_multipart_upload(self._get_key_name(key), upload_id)
+        self.invalidate_download_url(key)
+
+    def abort_multipart_upload(self, key, upload_id):
+        from openassessment.fileupload.views_filesystem import abort_multipart_upload
+        abort_multipart_upload(self._get_key_name(key), upload_id)
+
     def get_download_url(self, key):
         make_download_url_available(self._get_key_name(key), self.DOWNLOAD_URL_TIMEOUT)
         return self._get_url(key)
 
+    def generate_download_urls(self, keys):
+        make_download_urls_available([self._get_key_name(key) for key in keys], self.DOWNLOAD_URL_TIMEOUT)
+        return {key: self._get_url(key) for key in keys}
+
+    def save_file(self, key, content, content_type):
+        from openassessment.fileupload.views_filesystem import save_to_file
+        save_to_file(self._get_key_name(key), content, {"Content-Type": content_type})
+        self.invalidate_download_url(key)
+
     def remove_file(self, key):
-        from openassessment.fileupload.views_filesystem import safe_remove, get_file_path
-        return safe_remove(get_file_path(self._get_key_name(key)))
+        from openassessment.fileupload.views_filesystem import remove_file_content
+        return remove_file_content(self._get_key_name(key))
+
+    def list_files(self, prefix=''):
+        from openassessment.fileupload.views_filesystem import list_files
+        storage_prefix = self._get_key_name('')
+        for key_name, last_modified in list_files(storage_prefix + prefix):
+            yield key_name[len(storage_prefix):], last_modified
+
+    def open_file(self, key):
+        from openassessment.fileupload.views_filesystem import get_file_path
+        file_path = get_file_path(self._get_key_name(key))
+        if not os.path.exists(file_path):
+            return None
+        return open(file_path, 'rb')
 
     def _get_url(self, key):
         key_name = self._get_key_name(key)
@@ -84,6 +161,20 @@ def make_upload_url_available(url_key_name, timeout):
     )
 
 
+def make_upload_urls_available(url_key_names, timeout):
+    """
+    Authorize several upload URLs at once.
+
+    Arguments:
+        url_key_names (list of str): keys that uniquely identify the upload urls
+        timeout (int): time in seconds before the urls expire
+    """
+    get_cache().set_many(
+        {smart_text(get_upload_cache_key(url_key_name)): 1 for url_key_name in url_key_names},
+        timeout
+    )
+
+
 def make_download_url_available(url_key_name, timeout):
     """
     Authorize a download URL.
@@ -98,6 +189,20 @@ def make_download_url_available(url_key_name, timeout):
     )
 
 
+def make_download_urls_available(url_key_names, timeout):
+    """
+    Authorize several download URLs at once.
+
+    Arguments:
+        url_key_names (list of str): keys that uniquely identify the urls
+        timeout (int): time in seconds before the urls expire
+    """
+    get_cache().set_many(
+        {smart_text(get_download_cache_key(url_key_name)): 1 for url_key_name in url_key_names},
+        timeout
+    )
+
+
 def is_upload_url_available(url_key_name):
     """
     Return True if the corresponding upload URL is available.
@@ -0,0 +1,78 @@
+""" Connection pooling for file upload backends. """
+from __future__ import absolute_import
+
+import threading
+
+
+class ConnectionPool:
+    """
+    Process-wide pool of storage connections.
+
+    Connections are created lazily, the first time a thread asks for one,
+    and then reused by that thread for every later request.  Client
+    connections (such as boto's) are not safe to share between threads,
+    so each thread gets its own connection.
+
+    Connections are keyed by the arguments used to create them (typically
+    credentials read from the settings), so changing the settings creates
+    a new connection instead of reusing a stale one.
+
+    Pooled connections are not checked before being reused: the clients
+    (boto, requests) already check the HTTP connections they hold, and reopen
+    the ones the server closed.  Callers should `discard` a connection after
+    a failure, so that the next request starts from a new connection.
+
+    Example:
+        >>> pool = ConnectionPool(boto.connect_s3)
+        >>> conn = pool.get(aws_access_key_id, aws_secret_access_key)
+    """
+
+    def __init__(self, factory):
+        """
+        Args:
+            factory (callable): Creates a new connection from the key arguments.
+        """
+        self._factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get(self, *key):
+        """
+        Return the connection of the current thread for the given key,
+        creating it if necessary.
+
+        Args:
+            *key: Arguments passed to the factory, which also identify the connection.
+
+        Returns:
+            A connection created by the factory.
+        """
+        connections = self._get_thread_connections()
+        if key not in connections:
+            connections[key] = self._factory(*key)
+        return connections[key]
+
+    def discard(self, *key):
+        """
+        Forget the connection of the current thread for the given key, so that
+        the next call to `get` creates a new one.
+        """
+        self._get_thread_connections().pop(key, None)
+
+    def reset(self):
+        """
+        Forget every pooled connection, in every thread.
+        """
+        with self._lock:
+            self._generation += 1
+
+    def _get_thread_connections(self):
+        """
+        Return the connections of the current thread, dropping them if the pool has been reset since.
+        """
+        generation = self._generation
+        if getattr(self._local, 'generation', None) != generation:
+            self._local.generation = generation
+            self._local.connections = {}
+        return self._local.connections
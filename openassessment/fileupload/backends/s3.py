@@ -1,25 +1,52 @@
 """ S3 bucket file upload backend. """
 from __future__ import absolute_import
 
+import hashlib
 import logging
+import re
 
 from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
 
 import boto
+import boto.utils
+from boto.s3.multipart import MultiPartUpload
 
-from ..exceptions import FileUploadInternalError
-from .base import BaseBackend
+from ..exceptions import FileUploadInternalError, FileUploadRequestError
+from .base import BaseBackend, Settings
+from .pool import ConnectionPool
 
 logger = logging.getLogger("openassessment.fileupload.api")  # pylint: disable=invalid-name
 
+# Time (in seconds) the existence index of a prefix is cached for.
+# The index is invalidated when files are uploaded or removed through the
+# backend, so this only bounds how long changes made elsewhere go unnoticed.
+EXISTENCE_INDEX_TIMEOUT = 300
+
+# Files of a learner are stored at "<student>/<course>/<item>" and
+# "<student>/<course>/<item>/<index>"; they all share the same index prefix.
+FILE_INDEX_SUFFIX_REGEX = re.compile(r'/\d+$')
+
 
 class Backend(BaseBackend):
-    """ S3 Bucked File Upload Backend. """
+    """
+    S3 Bucked File Upload Backend.
+
+    Large files can be uploaded with S3 multipart uploads: every part is PUT
+    to its own signed URL, and S3 assembles them when the upload completes.
+
+    Set ORA2_FILEUPLOAD_S3_EXISTENCE_INDEX = True to sign download URLs
+    locally, checking that files exist with one cached LIST request per
+    learner instead of HEAD requests on the bucket and on every file.
+    """
+
+    SUPPORTS_MULTIPART_UPLOAD = True
 
     def get_upload_url(self, key, content_type):
         bucket_name, key_name = self._retrieve_parameters(key)
         try:
-            conn = _connect_to_s3()
+            conn = connect_to_s3()
             upload_url = conn.generate_url(
                 expires_in=self.UPLOAD_URL_TIMEOUT,
                 method='PUT',
@@ -27,50 +54,425 @@ class Backend(BaseBackend):
                 key=key_name,
                 headers={'Content-Length': '5242880', 'Content-Type': content_type}
             )
+            if _use_existence_index():
+                # The file is uploaded straight to S3, so we can't tell when
+                # it appears: check for it explicitly until the URL expires.
+                cache.set(_pending_upload_cache_key(bucket_name, key_name), True, self.UPLOAD_URL_TIMEOUT)
+                _invalidate_existence_index(bucket_name, key_name)
             return upload_url
         except Exception as ex:
             logger.exception(
                 u"An internal exception occurred while generating an upload URL."
             )
+            _discard_s3_connection()
             raise FileUploadInternalError(ex)
 
-    def get_download_url(self, key):
+    def get_upload_urls(self, uploads):
+        # Sign every URL with the same connection, then update the existence
+        # index with a single round trip to the cache.
+        key_names = {}
+        bucket_name = None
+        for key, _ in uploads:
+            bucket_name, key_names[key] = self._retrieve_parameters(key)
+        if not key_names:
+            return {}
+        try:
+            conn = connect_to_s3()
+            upload_urls = {
+                key: conn.generate_url(
+                    expires_in=self.UPLOAD_URL_TIMEOUT,
+                    method='PUT',
+                    bucket=bucket_name,
+                    key=key_names[key],
+                    headers={'Content-Length': '5242880', 'Content-Type': content_type}
+                )
+                for key, content_type in uploads
+            }
+            if _use_existence_index():
+                cache.set_many(
+                    {_pending_upload_cache_key(bucket_name, key_name): True for key_name in key_names.values()},
+                    self.UPLOAD_URL_TIMEOUT
+                )
+                cache.delete_many(list({
+                    _existence_index_cache_key(bucket_name, _get_index_prefix(key_name))
+                    for key_name in key_names.values()
+                }))
+            return upload_urls
+        except Exception as ex:
+            logger.exception(
+                u"An internal exception occurred while generating an upload URL."
+            )
+            _discard_s3_connection()
+            raise FileUploadInternalError(ex)
+
+    def initiate_multipart_upload(self, key, content_type):
+        bucket_name, key_name = self._retrieve_parameters(key)
+        try:
+            conn = connect_to_s3()
+            bucket = conn.get_bucket(bucket_name, validate=False)
+            multipart_upload = bucket.initiate_multipart_upload(key_name, headers={'Content-Type': content_type})
+            if _use_existence_index():
+                cache.set(_pending_upload_cache_key(bucket_name, key_name), True, self.UPLOAD_URL_TIMEOUT)
+                _invalidate_existence_index(bucket_name, key_name)
+            return multipart_upload.id
+        except Exception as ex:
+            logger.exception(
+                u"An internal exception occurred while initiating a multipart upload."
+            )
+            _discard_s3_connection()
+            raise FileUploadInternalError(ex)
+
+    def get_upload_part_url(self, key, upload_id, part_number):
+        bucket_name, key_name = self._retrieve_parameters(key)
+        self._check_part_number(part_number)
+        try:
+            conn = connect_to_s3()
+            if _use_existence_index():
+                # Uploading the parts may take longer than the first upload URL lasts
+                cache.set(_pending_upload_cache_key(bucket_name, key_name), True, self.UPLOAD_URL_TIMEOUT)
+            # The part number and upload ID are S3 sub-resources, so they
+            # must be signed along with the URL.
+            return conn.generate_url(
+                expires_in=self.UPLOAD_URL_TIMEOUT,
+                method='PUT',
+                bucket=bucket_name,
+                key=key_name,
+                response_headers={'partNumber': str(part_number), 'uploadId': upload_id}
+            )
+        except Exception as ex:
+            logger.exception(
+                u"An internal exception occurred while generating an upload part URL."
+            )
+            _discard_s3_connection()
+            raise FileUploadInternalError(ex)
+
+    def list_upload_parts(self, key, upload_id):
+        bucket_name, key_name = self._retrieve_parameters(key)
+        try:
+            conn = connect_to_s3()
+            multipart_upload = _get_multipart_upload(conn, bucket_name, key_name, upload_id)
+            return {part.part_number: part.size for part in multipart_upload}
+        except Exception as ex:
+            logger.exception(
+                u"An internal exception occurred while listing the parts of a multipart upload."
+            )
+            _discard_s3_connection()
+            raise FileUploadInternalError(ex)
+
+    def complete_multipart_upload(self, key, upload_id):
         bucket_name, key_name = self._retrieve_parameters(key)
         try:
-            conn = _connect_to_s3()
+            conn = connect_to_s3()
+            multipart_upload = _get_multipart_upload(conn, bucket_name, key_name, upload_id)
+            # Parts are listed, with their ETags, from S3 itself
+            has_parts = any(True for _ in multipart_upload)
+        except Exception as ex:
+            logger.exception(
+                u"An internal exception occurred while listing the parts of a multipart upload."
+            )
+            _discard_s3_connection()
+            raise FileUploadInternalError(ex)
+
+        if not has_parts:
+            raise FileUploadRequestError(u"No part has been uploaded for this multipart upload.")
+        try:
+            multipart_upload.complete_upload()
+            if _use_existence_index():
+                _invalidate_existence_index(bucket_name, key_name)
+            self.invalidate_download_url(key)
+        except Exception as ex:
+            logger.exception(
+                u"An internal exception occurred while completing a multipart upload."
+            )
+            _discard_s3_connection()
+            raise FileUploadInternalError(ex)
+
+    def abort_multipart_upload(self, key, upload_id):
+        bucket_name, key_name = self._retrieve_parameters(key)
+        try:
+            conn = connect_to_s3()
+            _get_multipart_upload(conn, bucket_name, key_name, upload_id).cancel_upload()
+        except Exception as ex:
+            logger.exception(
+                u"An internal exception occurred while aborting a multipart upload."
+            )
+            _discard_s3_connection()
+            raise FileUploadInternalError(ex)
+
+    def get_download_url(self, key):
+        return self.generate_download_urls([key])[key]
+
+    def generate_download_urls(self, keys):
+        # All the files live in the same bucket, so the URLs can share a single
+        # connection and bucket lookup.
+        key_names = {}
+        bucket_name = None
+        for key in keys:
+            bucket_name, key_names[key] = self._retrieve_parameters(key)
+        if not key_names:
+            return {}
+        try:
+            conn = connect_to_s3()
+            if _use_existence_index():
+                # Check which files exist using the existence index, and sign
+                # the URLs locally, without a round trip per file.
+                existing_key_names = _get_existing_key_names(conn, bucket_name, list(key_names.values()))
+                return {
+                    key: conn.generate_url(
+                        self.DOWNLOAD_URL_TIMEOUT, 'GET', bucket=bucket_name, key=key_name
+                    ) if key_name in existing_key_names else ""
+                    for key, key_name in key_names.items()
+                }
+
             bucket = conn.get_bucket(bucket_name)
-            s3_key = bucket.get_key(key_name)
-            return s3_key.generate_url(expires_in=self.DOWNLOAD_URL_TIMEOUT) if s3_key else ""
+            download_urls = {}
+            for key, key_name in key_names.items():
+                s3_key = bucket.get_key(key_name)
+                download_urls[key] = s3_key.generate_url(expires_in=self.DOWNLOAD_URL_TIMEOUT) if s3_key else ""
+            return download_urls
         except Exception as ex:
             logger.exception(
                 u"An internal exception occurred while generating a download URL."
             )
+            _discard_s3_connection()
             raise FileUploadInternalError(ex)
 
+    def open_file(self, key):
+        bucket_name, key_name = self._retrieve_parameters(key)
+        try:
+            conn = connect_to_s3()
+            bucket = conn.get_bucket(bucket_name, validate=False)
+            # S3 keys are file-like: their content is streamed as it is read
+            return bucket.get_key(key_name)
+        except Exception as ex:
+            logger.exception(
+                u"An internal exception occurred while opening a file."
+            )
+            _discard_s3_connection()
+            raise FileUploadInternalError(ex)
+
+    def save_file(self, key, content, content_type):
+        bucket_name, key_name = self._retrieve_parameters(key)
+        try:
+            conn = connect_to_s3()
+            bucket = conn.get_bucket(bucket_name, validate=False)
+            bucket.new_key(key_name).set_contents_from_string(content, headers={'Content-Type': content_type})
+        except Exception as ex:
+            logger.exception(
+                u"An internal exception occurred while saving a file."
+            )
+            _discard_s3_connection()
+            raise FileUploadInternalError(ex)
+        if _use_existence_index():
+            _invalidate_existence_index(bucket_name, key_name)
+
     def remove_file(self, key):
         bucket_name, key_name = self._retrieve_parameters(key)
-        conn = _connect_to_s3()
-        bucket = conn.get_bucket(bucket_name)
+        conn = connect_to_s3()
+        # The bucket is not checked: a missing bucket has no file to remove either
+        bucket = conn.get_bucket(bucket_name, validate=False)
         s3_key = bucket.get_key(key_name)
         if s3_key:
             bucket.delete_key(s3_key)
+            if _use_existence_index():
+                _invalidate_existence_index(bucket_name, key_name)
             return True
         return False
 
+    def remove_files(self, keys):
+        # Remove the files with multi-object deletes, which boto sends in
+        # batches of up to 1000 keys, instead of HEAD and DELETE requests per file.
+        key_names = {}
+        bucket_name = None
+        for key in keys:
+            bucket_name, key_name = self._retrieve_parameters(key)
+            key_names[key_name] = key
+        if not key_names:
+            return []
+        try:
+            conn = connect_to_s3()
+            bucket = conn.get_bucket(bucket_name, validate=False)
+            result = bucket.delete_keys(list(key_names), quiet=True)
+        except Exception as ex:
+            logger.exception(
+                u"An internal exception occurred while removing files."
+            )
+            _discard_s3_connection()
+            raise FileUploadInternalError(ex)
 
-def _connect_to_s3():
-    """Connect to s3
+        failed_key_names = set()
+        for error in result.errors:
+            logger.error(u"Could not remove file {key_name}: {code} {message}".format(
+                key_name=error.key, code=error.code, message=error.message
+            ))
+            failed_key_names.add(error.key)
+        if _use_existence_index():
+            cache.delete_many(list({
+                _existence_index_cache_key(bucket_name, _get_index_prefix(key_name)) for key_name in key_names
+            }))
+        return [key for key_name, key in key_names.items() if key_name not in failed_key_names]
 
-    Creates a connection to s3 for file URLs.
+    def list_files(self, prefix=''):
+        bucket_name = Settings.get_bucket_name()
+        storage_prefix = self._get_key_name('')
+        try:
+            conn = connect_to_s3()
+            bucket = conn.get_bucket(bucket_name, validate=False)
+            # The listing is paginated by boto, 1000 files per request
+            for s3_key in bucket.list(prefix=storage_prefix + prefix):
+                last_modified = timezone.make_aware(boto.utils.parse_ts(s3_key.last_modified), timezone.utc)
+                yield s3_key.name[len(storage_prefix):], last_modified
+        except Exception as ex:
+            logger.exception(
+                u"An internal exception occurred while listing files."
+            )
+            _discard_s3_connection()
+            raise FileUploadInternalError(ex)
 
-    """
-    # Try to get the AWS credentials from settings if they are available
-    # If not, these will default to `None`, and boto will try to use
-    # environment vars or configuration files instead.
-    aws_access_key_id = getattr(settings, 'AWS_ACCESS_KEY_ID', None)
-    aws_secret_access_key = getattr(settings, 'AWS_SECRET_ACCESS_KEY', None)
 
+def _create_s3_connection(aws_access_key_id, aws_secret_access_key):
+    """
+    Create a new connection to s3.
+    """
     return boto.connect_s3(
         aws_access_key_id=aws_access_key_id,
         aws_secret_access_key=aws_secret_access_key
     )
+
+
+# boto reopens the HTTP connections it holds when they are closed, so pooled
+# connections are only replaced after a request fails (see `_discard_s3_connection`).
+_S3_CONNECTIONS = ConnectionPool(_create_s3_connection)
+
+
+def _get_s3_credentials():
+    """
+    Return the AWS credentials from settings if they are available.
+
+    If not, these will default to `None`, and boto will try to use
+    environment vars or configuration files instead.
+    """
+    aws_access_key_id = getattr(settings, 'AWS_ACCESS_KEY_ID', None)
+    aws_secret_access_key = getattr(settings, 'AWS_SECRET_ACCESS_KEY', None)
+    return aws_access_key_id, aws_secret_access_key
+
+
+def connect_to_s3():
+    """Connect to s3
+
+    Returns the pooled connection to s3 for file URLs, creating it if necessary.
+
+    """
+    return _S3_CONNECTIONS.get(*_get_s3_credentials())
+
+
+def _discard_s3_connection():
+    """
+    Discard the pooled connection to s3 after a failure, so that the
+    next request uses a new connection.
+    """
+    _S3_CONNECTIONS.discard(*_get_s3_credentials())
+
+
+def _use_existence_index():
+    """
+    Return True if file existence should be checked using the cached existence index.
+
+    The index replaces the two HEAD requests made for every download URL
+    (one on the bucket, one on the file) by a single LIST request per
+    learner, and signs the URLs locally.  It is enabled with the
+    ORA2_FILEUPLOAD_S3_EXISTENCE_INDEX setting.
+    """
+    return getattr(settings, 'ORA2_FILEUPLOAD_S3_EXISTENCE_INDEX', False)
+
+
+def _get_index_prefix(key_name):
+    """
+    Return the prefix whose existence index covers the given key name.
+    """
+    return FILE_INDEX_SUFFIX_REGEX.sub('', key_name)
+
+
+def _existence_index_cache_key(bucket_name, prefix):
+    """
+    Return the cache key of the existence index of a prefix.
+    """
+    index_key = u"{}/{}".format(bucket_name, prefix).encode('utf-8')
+    return "openassessment.fileupload.s3.existence_index.{}".format(hashlib.md5(index_key).hexdigest())
+
+
+def _pending_upload_cache_key(bucket_name, key_name):
+    """
+    Return the cache key flagging a file an upload URL has been issued for.
+    """
+    upload_key = u"{}/{}".format(bucket_name, key_name).encode('utf-8')
+    return "openassessment.fileupload.s3.pending_upload.{}".format(hashlib.md5(upload_key).hexdigest())
+
+
+def _invalidate_existence_index(bucket_name, key_name):
+    """
+    Discard the existence index covering the given key name.
+    """
+    cache.delete(_existence_index_cache_key(bucket_name, _get_index_prefix(key_name)))
+
+
+def _get_multipart_upload(conn, bucket_name, key_name, upload_id):
+    """
+    Return the multipart upload of a file, without a request to S3.
+    """
+    multipart_upload = MultiPartUpload(conn.get_bucket(bucket_name, validate=False))
+    multipart_upload.key_name = key_name
+    multipart_upload.id = upload_id
+    return multipart_upload
+
+
+def _list_key_names(conn, bucket_name, prefix):
+    """
+    List the names of the files stored under a prefix.
+    """
+    bucket = conn.get_bucket(bucket_name, validate=False)
+    return [s3_key.name for s3_key in bucket.list(prefix=prefix)]
+
+
+def _get_existing_key_names(conn, bucket_name, key_names):
+    """
+    Return the subset of the given key names that exist in the bucket.
+
+    Existence is looked up in the cached existence index of each key's
+    prefix, which is built with a single LIST request when missing.
+    Files an upload URL has recently been issued for may have been uploaded
+    since the index was built, so they are checked individually.
+
+    Args:
+        conn (S3Connection): The connection to s3.
+        bucket_name (unicode): The name of the bucket.
+        key_names (list): The full names of the files (including the storage prefix).
+
+    Returns:
+        set of key names
+    """
+    prefixes = set(_get_index_prefix(key_name) for key_name in key_names)
+    index_cache_keys = {prefix: _existence_index_cache_key(bucket_name, prefix) for prefix in prefixes}
+    indexes = cache.get_many(list(index_cache_keys.values()))
+
+    existing_key_names = set()
+    for prefix, index_cache_key in index_cache_keys.items():
+        index = indexes.get(index_cache_key)
+        if index is None:
+            index = _list_key_names(conn, bucket_name, prefix)
+            cache.set(index_cache_key, index, EXISTENCE_INDEX_TIMEOUT)
+        existing_key_names.update(index)
+
+    missing_key_names = [key_name for key_name in key_names if key_name not in existing_key_names]
+    pending_cache_keys = {
+        _pending_upload_cache_key(bucket_name, key_name): key_name for key_name in missing_key_names
+    }
+    for pending_cache_key in cache.get_many(list(pending_cache_keys)):
+        key_name = pending_cache_keys[pending_cache_key]
+        bucket = conn.get_bucket(bucket_name, validate=False)
+        if bucket.get_key(key_name):
+            existing_key_names.add(key_name)
+            cache.delete(pending_cache_key)
+            _invalidate_existence_index(bucket_name, key_name)
+
+    return existing_key_names
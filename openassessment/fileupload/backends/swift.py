@@ -24,12 +24,16 @@ import swiftclient
 
 from ..exceptions import FileUploadInternalError
 from .base import BaseBackend
+from .pool import ConnectionPool
 
 logger = logging.getLogger("openassessment.fileupload.api")  # pylint: disable=invalid-name
 
 # prefix paths with current version, in case we need to roll it at some point
 SWIFT_BACKEND_VERSION = 1
 
+# HTTP sessions keep connections to the swift endpoint alive between requests
+_SWIFT_SESSIONS = ConnectionPool(requests.Session)
+
 
 class Backend(BaseBackend):
     """
@@ -54,23 +58,56 @@ class Backend(BaseBackend):
             raise FileUploadInternalError(ex)
 
     def get_download_url(self, key):
+        return self.generate_download_urls([key])[key]
+
+    def generate_download_urls(self, keys):
+        key_names = {}
+        bucket_name = None
+        for file_key in keys:
+            bucket_name, key_names[file_key] = self._retrieve_parameters(file_key)
+        key, url = get_settings()
+        try:
+            download_urls = {}
+            for file_key, key_name in key_names.items():
+                temp_url = swiftclient.utils.generate_temp_url(
+                    path='/v%s%s/%s/%s' % (SWIFT_BACKEND_VERSION, url.path, bucket_name, key_name),
+                    key=key,
+                    method='GET',
+                    seconds=self.DOWNLOAD_URL_TIMEOUT
+                )
+                download_url = '%s://%s%s' % (url.scheme, url.netloc, temp_url)
+                response = _SWIFT_SESSIONS.get().get(download_url)
+                download_urls[file_key] = download_url if response.status_code == 200 else ""
+            return download_urls
+        except Exception as ex:
+            logger.exception(
+                u"An internal exception occurred while generating a download URL."
+            )
+            _SWIFT_SESSIONS.discard()
+            raise FileUploadInternalError(ex)
+
+    def save_file(self, key, content, content_type):
         bucket_name, key_name = self._retrieve_parameters(key)
         key, url = get_settings()
         try:
             temp_url = swiftclient.utils.generate_temp_url(
                 path='/v%s%s/%s/%s' % (SWIFT_BACKEND_VERSION, url.path, bucket_name, key_name),
                 key=key,
-                method='GET',
-                seconds=self.DOWNLOAD_URL_TIMEOUT
+                method='PUT',
+                seconds=self.UPLOAD_URL_TIMEOUT
             )
-            download_url = '%s://%s%s' % (url.scheme, url.netloc, temp_url)
-            response = requests.get(download_url)
-            return download_url if response.status_code == 200 else ""
+            save_url = '%s://%s%s' % (url.scheme, url.netloc, temp_url)
+            response = _SWIFT_SESSIONS.get().put(save_url, data=content, headers={'Content-Type': content_type})
         except Exception as ex:
             logger.exception(
-                u"An internal exception occurred while generating a download URL."
+                u"An internal exception occurred while saving object on swift storage."
             )
+            _SWIFT_SESSIONS.discard()
             raise FileUploadInternalError(ex)
+        if response.status_code != 201:
+            raise FileUploadInternalError(
+                u"Could not save object on swift storage: status {}".format(response.status_code)
+            )
 
     def remove_file(self, key):
         bucket_name, key_name = self._retrieve_parameters(key)
@@ -82,12 +119,13 @@ class Backend(BaseBackend):
                 method='DELETE',
                 seconds=self.DOWNLOAD_URL_TIMEOUT)
             remove_url = '%s://%s%s' % (url.scheme, url.netloc, temp_url)
-            response = requests.delete(remove_url)
+            response = _SWIFT_SESSIONS.get().delete(remove_url)
             return response.status_code == 204
         except Exception as ex:
             logger.exception(
                 u"An internal exception occurred while removing object on swift storage."
             )
+            _SWIFT_SESSIONS.discard()
             raise FileUploadInternalError(ex)
 
 
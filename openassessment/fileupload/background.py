@@ -0,0 +1,100 @@
+""" Background processing of uploaded files. """
+from __future__ import absolute_import
+
+import logging
+import threading
+
+from six.moves import queue  # pylint: disable=import-error
+
+from django.db import close_old_connections
+
+logger = logging.getLogger("openassessment.fileupload.api")  # pylint: disable=invalid-name
+
+
+class BackgroundFileQueue:
+    """
+    Process-wide queue of files processed by a background thread.
+
+    The thread processes the files queued in the meantime together, in
+    batches, so that they can be handled with as few requests to the storage
+    as possible.  Processing is best effort: errors are logged, and files
+    still queued when the process exits are not processed.
+
+    Example:
+        >>> file_queue = BackgroundFileQueue(process_files)
+        >>> file_queue.put(key)
+    """
+
+    # Maximum number of files processed at a time
+    BATCH_SIZE = 100
+
+    # Name of the background thread
+    THREAD_NAME = "ora2-file-queue"
+
+    # Message logged when a batch of files can't be processed
+    ERROR_MESSAGE = u"Could not process files {}"
+
+    def __init__(self, process_files, batch_size=None):
+        """
+        Args:
+            process_files (callable): Processes the files whose keys it is given as a list.
+
+        Keyword Arguments:
+            batch_size (int): Maximum number of files processed at a time.
+        """
+        self._process_files = process_files
+        self._batch_size = batch_size or self.BATCH_SIZE
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def put(self, key):
+        """
+        Queue a file for processing.
+
+        Args:
+            key (str): The unique identifier of the file.
+        """
+        self._queue.put(key)
+        self._ensure_worker()
+
+    def join(self):
+        """
+        Block until every queued file has been processed.
+        """
+        self._queue.join()
+
+    def _ensure_worker(self):
+        """
+        Start the background thread, if it isn't running.
+
+        The thread is started lazily, and restarted in processes forked
+        after it was started, which don't inherit it.
+        """
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=self.THREAD_NAME)
+                self._worker.daemon = True
+                self._worker.start()
+
+    def _run(self):
+        """
+        Process the queued files, in batches, forever.
+        """
+        while True:
+            keys = [self._queue.get()]
+            while len(keys) < self._batch_size:
+                try:
+                    keys.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._process_files(keys)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception(self.ERROR_MESSAGE.format(keys))
+            finally:
+                # Requests normally clean up database connections, but this
+                # thread outlives them.
+                close_old_connections()
+                for _ in keys:
+                    self._queue.task_done()
@@ -0,0 +1,184 @@
+""" Removal of the uploaded files no response refers to. """
+from __future__ import absolute_import
+
+import datetime
+import logging
+import re
+
+from django.utils import timezone
+
+from openassessment.assessment.models.base import SharedFileUpload
+
+from . import api, backends, previews
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+# Files of a learner are stored at "<student>/<course>/<item>" and
+# "<student>/<course>/<item>/<index>".
+FILE_INDEX_SUFFIX_REGEX = re.compile(r'/\d+$')
+
+
+class OrphanedFileCollector:
+    """
+    Find the uploaded files no response refers to, and remove them from the storage.
+
+    The files listed by the file upload backend are reconciled, in batches,
+    with the submissions and with the files shared with teams.  A file which
+    neither refers to is orphaned if:
+
+    * its owner submitted a response to the item without it (for example
+      because the file was deleted, or replaced, before submitting); or
+    * its owner never submitted a response to the item, and
+      `include_unsubmitted` is set.
+
+    Previews (see `openassessment.fileupload.previews`) are orphaned along
+    with the files they preview.
+
+    The files of responses in progress are only listed in the XBlock user
+    state of the learners, which can't be queried here.  Files modified during
+    the grace period are thus never removed: it should be longer than learners
+    take to submit their response, or to submit it again after a reset.
+
+    Example usage:
+        >>> collector = OrphanedFileCollector(grace_period=datetime.timedelta(days=60))
+        >>> num_files, num_orphans = collector.collect()
+    """
+
+    DEFAULT_GRACE_PERIOD = datetime.timedelta(days=30)
+
+    # Number of files reconciled (and removed) at a time, which bounds the
+    # size of the queries and of the multi-object deletes.
+    BATCH_SIZE = 500
+
+    def __init__(self, grace_period=None, include_unsubmitted=False, dry_run=False, progress_callback=None):
+        """
+        Keyword Arguments:
+            grace_period (timedelta): Files modified more recently are never removed.
+            include_unsubmitted (bool): If True, also remove the files of learners
+                who never submitted a response to the item.
+            dry_run (bool): If True, only find the orphaned files, without removing them.
+            progress_callback (callable): Called with the list of the keys
+                of the orphaned files found in each batch.
+        """
+        self._grace_period = self.DEFAULT_GRACE_PERIOD if grace_period is None else grace_period
+        self._include_unsubmitted = include_unsubmitted
+        self._dry_run = dry_run
+        self._progress_callback = progress_callback
+
+    def collect(self, prefix=''):
+        """
+        Remove the orphaned files.
+
+        Keyword Arguments:
+            prefix (unicode): Only check the files whose key starts with this
+                prefix, for example the anonymous id of a learner.
+
+        Returns:
+            tuple of the number of files checked, and the number of orphaned
+            files removed (or found, in a dry run).
+
+        Raises:
+            FileUploadRequestError if the backend can't list its files.
+            FileUploadInternalError
+
+        """
+        num_files = 0
+        num_orphans = 0
+        batch = []
+        for key, last_modified in backends.get_backend().list_files(prefix):
+            num_files += 1
+            batch.append((key, last_modified))
+            if len(batch) >= self.BATCH_SIZE:
+                num_orphans += self._collect_batch(batch)
+                batch = []
+        num_orphans += self._collect_batch(batch)
+        return num_files, num_orphans
+
+    def _collect_batch(self, files):
+        """
+        Remove the orphaned files among a batch of listed files.
+
+        Args:
+            files (list): `(key, last_modified)` tuples.
+
+        Returns:
+            int: The number of orphaned files removed (or found, in a dry run).
+
+        """
+        expired_before = timezone.now() - self._grace_period
+        keys = [key for key, last_modified in files if last_modified < expired_before]
+        if not keys:
+            return 0
+
+        # Previews are orphaned along with the files they preview
+        source_keys = [
+            (key, previews.get_source_key(key) if previews.is_preview_key(key) else key)
+            for key in keys
+        ]
+        referenced_keys, submitted_key_prefixes = self._get_references(
+            list({source_key for _, source_key in source_keys})
+        )
+        orphaned_keys = []
+        for key, source_key in source_keys:
+            if source_key in referenced_keys:
+                continue
+            # Unless asked otherwise, only remove the files of learners who submitted a response
+            submitted = source_key in submitted_key_prefixes
+            submitted = submitted or FILE_INDEX_SUFFIX_REGEX.sub('', source_key) in submitted_key_prefixes
+            if submitted or self._include_unsubmitted:
+                orphaned_keys.append(key)
+        if orphaned_keys and not self._dry_run:
+            orphaned_keys = api.remove_files(orphaned_keys)
+            logger.info(u"Removed {} orphaned files".format(len(orphaned_keys)))
+
+        if self._progress_callback is not None:
+            self._progress_callback(orphaned_keys)
+        return len(orphaned_keys)
+
+    @classmethod
+    def _get_references(cls, keys):
+        """
+        Find which of the given files the responses refer to.
+
+        Args:
+            keys (list): The keys of the files.
+
+        Returns:
+            tuple of the set of the keys the submissions and shared files refer
+            to, and the set of the keys (without file index) of the student
+            items the owners of the files submitted a response to.
+
+        """
+        # Import is placed here to avoid model import at project startup.
+        from submissions.models import Submission
+
+        referenced_keys = set(
+            SharedFileUpload.objects.filter(file_key__in=keys).values_list('file_key', flat=True)
+        )
+        submitted_key_prefixes = set()
+
+        student_ids = set(key.split(api.KEY_SEPARATOR, 1)[0] for key in keys)
+        submissions = Submission.objects.filter(student_item__student_id__in=student_ids).values_list(
+            'student_item__student_id', 'student_item__course_id', 'student_item__item_id', 'answer'
+        )
+        for student_id, course_id, item_id, answer in submissions:
+            submitted_key_prefixes.add(api.get_student_file_key({
+                'student_id': student_id,
+                'course_id': course_id,
+                'item_id': item_id,
+            }))
+            referenced_keys.update(cls._answer_file_keys(answer))
+        return referenced_keys, submitted_key_prefixes
+
+    @staticmethod
+    def _answer_file_keys(answer):
+        """
+        Return the keys of the files uploaded with a submission.
+        """
+        if not isinstance(answer, dict):
+            return []
+        if 'file_keys' in answer:
+            return answer.get('file_keys') or []
+        if answer.get('file_key'):
+            return [answer['file_key']]
+        return []
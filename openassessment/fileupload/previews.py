@@ -0,0 +1,255 @@
+"""
+Previews of the uploaded files: size-bounded thumbnails of images, and of
+the first page of PDFs, which are shown instead of the full size files.
+
+Previews are enabled with the ORA2_FILEUPLOAD_PREVIEWS setting.  They are
+generated in the background once learners upload their files, and stored
+with the file upload backend, next to the files, so that they are served
+with the same signed URLs.  Previews of the files uploaded before the
+setting was enabled are generated with the `generate_file_previews`
+management command.
+"""
+from __future__ import absolute_import
+
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+from django.conf import settings
+
+from . import backends
+from .background import BackgroundFileQueue
+
+logger = logging.getLogger("openassessment.fileupload.api")  # pylint: disable=invalid-name
+
+# The preview of a file is stored at "previews/<key of the file>"
+PREVIEW_KEY_PREFIX = "previews/"
+
+PREVIEW_CONTENT_TYPE = "image/jpeg"
+
+# Magic numbers of the file types which can be previewed
+IMAGE_SIGNATURES = (b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n', b'GIF87a', b'GIF89a')
+PDF_SIGNATURE = b'%PDF-'
+
+
+def is_enabled():
+    """
+    Return True if the previews of the uploaded files are generated and shown.
+    """
+    return getattr(settings, 'ORA2_FILEUPLOAD_PREVIEWS', False)
+
+
+def get_preview_key(key):
+    """
+    Return the key of the preview of a file.
+    """
+    return PREVIEW_KEY_PREFIX + key
+
+
+def is_preview_key(key):
+    """
+    Return True if the key is the key of a preview.
+    """
+    return key.startswith(PREVIEW_KEY_PREFIX)
+
+
+def get_source_key(preview_key):
+    """
+    Return the key of the file previewed by a preview.
+    """
+    return preview_key[len(PREVIEW_KEY_PREFIX):]
+
+
+class PreviewGenerator:
+    """
+    Generate the previews of uploaded files, and store them with the file upload backend.
+
+    Previews are JPEG images whose width and height are bounded by the
+    ORA2_FILEUPLOAD_PREVIEW_SIZE setting.  Images are rendered with Pillow,
+    and the first page of PDFs with the `pdftoppm` command of poppler: files
+    of either type are not previewed when the corresponding tool isn't
+    installed.  Files of other types are never previewed.
+
+    Example usage:
+        >>> generator = PreviewGenerator()
+        >>> generated_keys = generator.generate_many(keys)
+    """
+
+    # Default maximum width and height of the previews, in pixels
+    DEFAULT_SIZE = 320
+
+    # Files larger than this (in bytes) are not previewed
+    MAX_SOURCE_SIZE = 20 * 1024 * 1024
+
+    # Size of the chunks in which files are read, in bytes
+    CHUNK_SIZE = 1024 * 1024
+
+    # Time (in seconds) after which the rendering of a PDF is aborted
+    PDF_RENDER_TIMEOUT = 30
+
+    JPEG_QUALITY = 80
+
+    def __init__(self, size=None):
+        """
+        Keyword Arguments:
+            size (int): Maximum width and height of the previews, in pixels.
+        """
+        self._size = size or getattr(settings, 'ORA2_FILEUPLOAD_PREVIEW_SIZE', self.DEFAULT_SIZE)
+
+    def generate(self, key):
+        """
+        Generate and store the preview of a file, replacing its previous preview if any.
+
+        Args:
+            key (str): The key of the file.
+
+        Returns:
+            True if a preview was stored, False if the file can't be previewed
+            (because it doesn't exist, is too large, or is of another type).
+
+        Raises:
+            FileUploadError
+
+        """
+        backend = backends.get_backend()
+        content = self._read_file(backend, key)
+        if content is None:
+            return False
+
+        if content.startswith(PDF_SIGNATURE):
+            preview = self._render_pdf(key, content)
+        elif content.startswith(IMAGE_SIGNATURES):
+            preview = self._render_image(key, content)
+        else:
+            preview = None
+        if preview is None:
+            return False
+
+        backend.save_file(get_preview_key(key), preview, PREVIEW_CONTENT_TYPE)
+        return True
+
+    def generate_many(self, keys):
+        """
+        Generate the previews of several files, logging the errors.
+
+        Args:
+            keys (list): The keys of the files.
+
+        Returns:
+            The list of the keys of the files whose preview was stored.
+        """
+        generated_keys = []
+        for key in keys:
+            try:
+                if self.generate(key):
+                    generated_keys.append(key)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception(u"Could not generate the preview of file {}".format(key))
+        return generated_keys
+
+    def _read_file(self, backend, key):
+        """
+        Return the content of a file, or None if it doesn't exist or is too large.
+        """
+        source = backend.open_file(key)
+        if source is None:
+            return None
+        chunks = []
+        size = 0
+        try:
+            while True:
+                chunk = source.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > self.MAX_SOURCE_SIZE:
+                    logger.info(u"File {} is too large to be previewed".format(key))
+                    return None
+                chunks.append(chunk)
+        finally:
+            source.close()
+        return b''.join(chunks)
+
+    def _render_image(self, key, content):
+        """
+        Return a JPEG thumbnail of an image, or None if it can't be rendered.
+        """
+        try:
+            # Pillow is only required to preview images
+            from PIL import Image  # pylint: disable=import-error
+        except ImportError:
+            logger.warning(u"Pillow is not installed: the preview of image {} is not generated".format(key))
+            return None
+
+        try:
+            image = Image.open(io.BytesIO(content))
+            # Let the JPEG decoder downscale the image while decoding it
+            image.draft('RGB', (self._size, self._size))
+            image.thumbnail((self._size, self._size))
+            if image.mode in ('RGBA', 'LA', 'P'):
+                # JPEG has no transparency: flatten the image on a white background
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, (255, 255, 255))
+                background.paste(image, mask=image.split()[-1])
+                image = background
+            elif image.mode != 'RGB':
+                image = image.convert('RGB')
+            output = io.BytesIO()
+            image.save(output, 'JPEG', quality=self.JPEG_QUALITY, optimize=True)
+        except (IOError, ValueError, Image.DecompressionBombError) as ex:
+            logger.warning(u"Could not render the preview of image {}: {}".format(key, ex))
+            return None
+        return output.getvalue()
+
+    def _render_pdf(self, key, content):
+        """
+        Return a JPEG thumbnail of the first page of a PDF, or None if it can't be rendered.
+        """
+        pdftoppm = shutil.which('pdftoppm')
+        if pdftoppm is None:
+            logger.warning(u"pdftoppm is not installed: the preview of PDF {} is not generated".format(key))
+            return None
+
+        temp_directory = tempfile.mkdtemp()
+        try:
+            pdf_path = os.path.join(temp_directory, 'source.pdf')
+            with open(pdf_path, 'wb') as pdf_file:
+                pdf_file.write(content)
+            subprocess.run(
+                [
+                    pdftoppm, '-f', '1', '-l', '1', '-singlefile', '-jpeg', '-scale-to', str(self._size),
+                    pdf_path, os.path.join(temp_directory, 'preview'),
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=self.PDF_RENDER_TIMEOUT,
+                check=True,
+            )
+            with open(os.path.join(temp_directory, 'preview.jpg'), 'rb') as preview_file:
+                return preview_file.read()
+        except subprocess.SubprocessError as ex:
+            logger.warning(u"Could not render the preview of PDF {}: {}".format(key, ex))
+            return None
+        finally:
+            shutil.rmtree(temp_directory, ignore_errors=True)
+
+
+def generate_previews(keys):
+    """
+    Generate the previews of several files, and return the keys of the files previewed.
+    """
+    return PreviewGenerator().generate_many(keys)
+
+
+class FilePreviewQueue(BackgroundFileQueue):
+    """
+    Process-wide queue of files whose previews are generated by a background
+    thread, so that learners don't wait for them when they upload files.
+    """
+
+    BATCH_SIZE = 10
+    THREAD_NAME = "ora2-file-previews"
+    ERROR_MESSAGE = u"Could not generate the previews of files {}"
@@ -0,0 +1,27 @@
+""" Background removal of the files deleted by learners. """
+from __future__ import absolute_import
+
+from .background import BackgroundFileQueue
+
+
+class FileRemovalQueue(BackgroundFileQueue):
+    """
+    Process-wide queue of files to remove from the storage.
+
+    Files are removed by a background thread, so that learners don't wait
+    for the storage when they delete a file.  The thread removes the files
+    queued in the meantime together, in batches, so that backends supporting
+    it can remove them with a single request.
+
+    Removal is best effort: files whose removal fails, or which are still
+    queued when the process exits, are left in the storage.  Nothing refers
+    to them anymore, so they are eventually removed by the orphaned file
+    collector (see the `collect_orphaned_files` management command).
+
+    Example:
+        >>> removal_queue = FileRemovalQueue(backend.remove_files)
+        >>> removal_queue.put(key)
+    """
+
+    THREAD_NAME = "ora2-file-removal"
+    ERROR_MESSAGE = u"Could not remove files {}"
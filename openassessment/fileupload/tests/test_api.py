@@ -2,6 +2,7 @@
 
 from __future__ import absolute_import
 
+import hashlib
 import json
 import os
 import shutil
@@ -9,6 +10,7 @@ import tempfile
 
 import ddt
 from mock import Mock, patch
+import six
 import six.moves.urllib.error
 import six.moves.urllib.parse
 from six.moves.urllib.parse import urlparse
@@ -16,23 +18,34 @@ import six.moves.urllib.request
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.http import Http404, HttpRequest
+from django.core.cache import cache
 from django.urls import reverse_lazy
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 from django.test.utils import override_settings
 
 import boto
+from boto.s3.bucket import Bucket
 from boto.s3.key import Key
 from moto import mock_s3_deprecated
 from pytest import raises
 from openassessment.fileupload import api, exceptions, urls
 from openassessment.fileupload import views_filesystem as views
+from openassessment.fileupload.backends import s3
 from openassessment.fileupload.backends.base import Settings as FileUploadSettings
 from openassessment.fileupload.backends.filesystem import get_cache as get_filesystem_cache
+from openassessment.fileupload.backends.filesystem import is_upload_url_available
 
 
 @ddt.ddt
 class TestFileUploadService(TestCase):
 
+    def setUp(self):
+        super(TestFileUploadService, self).setUp()
+        # Download URLs are cached, and S3 connections are pooled
+        cache.clear()
+        s3._S3_CONNECTIONS.reset()  # pylint: disable=protected-access
+
     @mock_s3_deprecated
     @override_settings(
         AWS_ACCESS_KEY_ID='foobar',
@@ -60,6 +73,131 @@ class TestFileUploadService(TestCase):
         downloadUrl = api.get_download_url("foo")
         self.assertIn("/submissions_attachments/foo", downloadUrl)
 
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket"
+    )
+    def test_get_download_url_is_cached(self):
+        conn = boto.connect_s3()
+        bucket = conn.create_bucket('mybucket')
+        key = Key(bucket)
+        key.key = "submissions_attachments/foo"
+        key.set_contents_from_string("How d'ya do?")
+
+        with patch.object(s3, 'connect_to_s3', wraps=s3.connect_to_s3) as mock_connect:
+            first_url = api.get_download_url("foo")
+            second_url = api.get_download_url("foo")
+
+        self.assertEqual(first_url, second_url)
+        self.assertEqual(mock_connect.call_count, 1)
+
+        # URLs can be signed again, for callers that keep them until they expire
+        with patch.object(s3, 'connect_to_s3', wraps=s3.connect_to_s3) as mock_connect:
+            api.get_download_url("foo", use_cache=False)
+        self.assertEqual(mock_connect.call_count, 1)
+
+        # Removing the file discards its cached URL
+        api.remove_file("foo")
+        self.assertEqual(api.get_download_url("foo"), "")
+
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket"
+    )
+    def test_get_download_urls(self):
+        conn = boto.connect_s3()
+        bucket = conn.create_bucket('mybucket')
+        for key_name in ("foo", "bar"):
+            key = Key(bucket)
+            key.key = "submissions_attachments/{}".format(key_name)
+            key.set_contents_from_string("How d'ya do?")
+
+        # Missing files are not cached, so that they can be found once uploaded
+        self.assertEqual(api.get_download_url("baz"), "")
+
+        with patch.object(s3, 'connect_to_s3', wraps=s3.connect_to_s3) as mock_connect:
+            urls = api.get_download_urls(["foo", "bar", "baz"])
+
+        # All the URLs are signed using a single connection
+        self.assertEqual(mock_connect.call_count, 1)
+        self.assertIn("/submissions_attachments/foo", urls["foo"])
+        self.assertIn("/submissions_attachments/bar", urls["bar"])
+        self.assertEqual(urls["baz"], "")
+
+    @override_settings(FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket")
+    def test_download_urls_expire_from_cache_before_they_expire(self):
+        backend = s3.Backend()
+        with patch.object(s3.Backend, 'generate_download_urls', return_value={"foo": "http://example.com/foo"}):
+            with patch('openassessment.fileupload.backends.base.cache') as mock_cache:
+                mock_cache.get_many.return_value = {}
+                backend.get_download_urls(["foo"])
+
+        _, timeout = mock_cache.set_many.call_args[0]
+        self.assertEqual(timeout, backend.DOWNLOAD_URL_TIMEOUT - backend.DOWNLOAD_URL_CACHE_MARGIN)
+        self.assertLess(timeout, backend.DOWNLOAD_URL_TIMEOUT)
+
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket",
+        ORA2_FILEUPLOAD_S3_EXISTENCE_INDEX=True
+    )
+    def test_get_download_urls_existence_index(self):
+        conn = boto.connect_s3()
+        bucket = conn.create_bucket('mybucket')
+        file_keys = ["student/course/item", "student/course/item/1", "student/course/item/2"]
+        for file_key in file_keys[:2]:
+            key = Key(bucket)
+            key.key = "submissions_attachments/{}".format(file_key)
+            key.set_contents_from_string("How d'ya do?")
+
+        with patch.object(s3, '_list_key_names', wraps=s3._list_key_names) as mock_list:
+            with patch.object(Bucket, 'get_key') as mock_get_key:
+                urls = api.get_download_urls(file_keys)
+
+        # A single LIST request, and no HEAD request on the files
+        self.assertEqual(mock_list.call_count, 1)
+        self.assertFalse(mock_get_key.called)
+        self.assertIn("/submissions_attachments/student/course/item", urls[file_keys[0]])
+        self.assertIn("/submissions_attachments/student/course/item/1", urls[file_keys[1]])
+        self.assertEqual(urls[file_keys[2]], "")
+
+        # The signed URL is the same as the one signed after a HEAD request
+        with override_settings(ORA2_FILEUPLOAD_S3_EXISTENCE_INDEX=False):
+            cache.clear()
+            signed_url = api.get_download_url(file_keys[0])
+        self.assertEqual(urlparse(signed_url).path, urlparse(urls[file_keys[0]]).path)
+
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket",
+        ORA2_FILEUPLOAD_S3_EXISTENCE_INDEX=True
+    )
+    def test_existence_index_upload_and_remove(self):
+        conn = boto.connect_s3()
+        bucket = conn.create_bucket('mybucket')
+
+        # The index is built before the file is uploaded
+        self.assertEqual(api.get_download_url("student/course/item/1"), "")
+
+        # Files uploaded after an upload URL was issued are found
+        api.get_upload_url("student/course/item/1", "image/png")
+        key = Key(bucket)
+        key.key = "submissions_attachments/student/course/item/1"
+        key.set_contents_from_string("How d'ya do?")
+        self.assertIn("/submissions_attachments/student/course/item/1", api.get_download_url("student/course/item/1"))
+
+        # Removed files are not
+        self.assertTrue(api.remove_file("student/course/item/1"))
+        self.assertEqual(api.get_download_url("student/course/item/1"), "")
+
     @mock_s3_deprecated
     @override_settings(
         AWS_ACCESS_KEY_ID='foobar',
@@ -77,6 +215,124 @@ class TestFileUploadService(TestCase):
         result = api.remove_file("foo")
         self.assertFalse(result)
 
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket",
+        ORA2_FILEUPLOAD_S3_EXISTENCE_INDEX=True,
+    )
+    def test_remove_files(self):
+        conn = boto.connect_s3()
+        bucket = conn.create_bucket('mybucket')
+        for key_name in ("foo", "foo/1", "bar"):
+            bucket.new_key("submissions_attachments/" + key_name).set_contents_from_string("Test")
+        self.assertIn("/submissions_attachments/foo/1", api.get_download_url("foo/1"))
+
+        removed = api.remove_files(["foo", "foo/1"])
+        self.assertEqual(sorted(removed), ["foo", "foo/1"])
+        self.assertEqual([s3_key.name for s3_key in bucket.list()], ["submissions_attachments/bar"])
+        # The cached download URL and the existence index are invalidated
+        self.assertEqual(api.get_download_url("foo/1"), "")
+
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket",
+        ORA2_FILEUPLOAD_S3_EXISTENCE_INDEX=True,
+    )
+    def test_save_file(self):
+        conn = boto.connect_s3()
+        bucket = conn.create_bucket('mybucket')
+        # Cache the absence of the file in the existence index
+        self.assertEqual(api.get_download_url("previews/foo"), "")
+
+        api.backends.get_backend().save_file("previews/foo", b"preview", "image/jpeg")
+        s3_key = bucket.get_key("submissions_attachments/previews/foo")
+        self.assertEqual(s3_key.get_contents_as_string(), b"preview")
+        self.assertEqual(s3_key.content_type, "image/jpeg")
+        self.assertIn("/submissions_attachments/previews/foo", api.get_download_url("previews/foo"))
+
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket"
+    )
+    def test_list_files(self):
+        conn = boto.connect_s3()
+        bucket = conn.create_bucket('mybucket')
+        for key_name in ("student/course/item", "student/course/item/1", "other/course/item"):
+            bucket.new_key("submissions_attachments/" + key_name).set_contents_from_string("Test")
+        bucket.new_key("unrelated").set_contents_from_string("Test")
+
+        files = list(api.backends.get_backend().list_files())
+        self.assertEqual(
+            [key for key, _ in files], ["other/course/item", "student/course/item", "student/course/item/1"]
+        )
+        self.assertIsNotNone(files[0][1].tzinfo)
+        files = list(api.backends.get_backend().list_files("student/"))
+        self.assertEqual([key for key, _ in files], ["student/course/item", "student/course/item/1"])
+
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket"
+    )
+    def test_open_file(self):
+        conn = boto.connect_s3()
+        bucket = conn.create_bucket('mybucket')
+        key = Key(bucket)
+        key.key = "submissions_attachments/foo"
+        key.set_contents_from_string("Test")
+
+        content = api.open_file("foo")
+        self.assertEqual(b"Test", content.read())
+        content.close()
+        self.assertIsNone(api.open_file("bar"))
+
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket"
+    )
+    def test_multipart_upload(self):
+        conn = boto.connect_s3()
+        bucket = conn.create_bucket('mybucket')
+
+        upload_id = api.initiate_multipart_upload("foo", "video/mp4")
+        url = api.get_upload_part_url("foo", upload_id, 1)
+        self.assertIn("/submissions_attachments/foo?", url)
+        self.assertIn("partNumber=1", url)
+        self.assertIn("uploadId=" + upload_id, url)
+
+        # Upload the part directly, as a client would with the URL
+        multipart_upload = s3._get_multipart_upload(conn, 'mybucket', "submissions_attachments/foo", upload_id)
+        multipart_upload.upload_part_from_file(six.BytesIO(b"part content"), 1)
+        self.assertEqual({1: len(b"part content")}, api.list_upload_parts("foo", upload_id))
+
+        api.complete_multipart_upload("foo", upload_id)
+        self.assertEqual(b"part content", bucket.get_key("submissions_attachments/foo").get_contents_as_string())
+
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket"
+    )
+    def test_multipart_upload_without_parts(self):
+        conn = boto.connect_s3()
+        conn.create_bucket('mybucket')
+
+        upload_id = api.initiate_multipart_upload("foo", "video/mp4")
+        with raises(exceptions.FileUploadRequestError):
+            api.complete_multipart_upload("foo", upload_id)
+        api.abort_multipart_upload("foo", upload_id)
+        self.assertEqual([], list(conn.get_bucket('mybucket').get_all_multipart_uploads()))
+
     def test_get_upload_url_no_bucket(self):
         with raises(exceptions.FileUploadInternalError):
             api.get_upload_url("foo", "bar")
@@ -109,6 +365,21 @@ class TestFileUploadService(TestCase):
             mock_s3_deprecated.side_effect = Exception("Oh noes")
             api.get_download_url("foo")
 
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket"
+    )
+    def test_failed_request_discards_connection(self):
+        conn = s3.connect_to_s3()
+        self.assertIs(s3.connect_to_s3(), conn)
+
+        with patch.object(conn, 'generate_url', side_effect=Exception("Oh noes")):
+            with raises(exceptions.FileUploadInternalError):
+                api.get_upload_url("foo", "bar")
+        self.assertIsNot(s3.connect_to_s3(), conn)
+
 
 @override_settings(
     ORA2_FILEUPLOAD_BACKEND="filesystem",
@@ -168,6 +439,15 @@ class TestFileUploadServiceWithFilesystemBackend(TestCase):
         )
         self.assertNotEqual(path1, path2)
 
+    @patch('openassessment.fileupload.backends.filesystem.reverse', lambda name, kwargs: kwargs['key'])
+    def test_get_upload_urls(self):
+        urls = api.get_upload_urls([("file-1.jpg", "image/jpeg"), ("file-2.pdf", "application/pdf")])
+
+        self.assertEqual(urls["file-1.jpg"], api.get_upload_url("file-1.jpg", "image/jpeg"))
+        for key in ("file-1.jpg", "file-2.pdf"):
+            self.assertTrue(is_upload_url_available(os.path.join(FileUploadSettings.get_prefix(), key)))
+        self.assertFalse(is_upload_url_available(os.path.join(FileUploadSettings.get_prefix(), "file-3.jpg")))
+
     def test_hack_get_file_path(self):
         expected_path = os.path.join(
             settings.ORA2_FILEUPLOAD_ROOT,
@@ -196,6 +476,15 @@ class TestFileUploadServiceWithFilesystemBackend(TestCase):
             "content"
         )
 
+    def test_safe_save_permissions(self):
+        file_path = views.get_file_path("key")
+        views.safe_save(file_path, "content")
+
+        # The file has the same permissions as the files created by open()
+        other_path = os.path.join(os.path.dirname(file_path), "other")
+        open(other_path, 'w').close()
+        self.assertEqual(os.stat(file_path).st_mode & 0o777, os.stat(other_path).st_mode & 0o777)
+
     def test_delete_file_data_on_metadata_saving_error(self):
         key = "key"
         file_path = views.get_file_path(key)
@@ -206,7 +495,7 @@ class TestFileUploadServiceWithFilesystemBackend(TestCase):
             self.assertRaises(
                 exceptions.FileUploadRequestError,
                 views.save_to_file,
-                "key", "content", "metadata"
+                "key", "content", {"Content-Type": "text/plain"}
             )
 
         self.assertFalse(os.path.exists(file_path))
@@ -322,6 +611,210 @@ class TestFileUploadServiceWithFilesystemBackend(TestCase):
         )
 
 
+@override_settings(
+    ORA2_FILEUPLOAD_BACKEND="filesystem",
+    ORA2_FILEUPLOAD_ROOT='/tmp',
+    ORA2_FILEUPLOAD_CACHE_NAME='default',
+    FILE_UPLOAD_STORAGE_BUCKET_NAME="testbucket",
+)
+@patch.object(views, 'is_download_url_available', Mock(return_value=True))
+@patch.object(views, 'is_upload_url_available', Mock(return_value=True))
+@ddt.ddt
+class TestFilesystemStreaming(TestCase):
+    """
+    Test streaming uploads and downloads of the filesystem backend views.
+    """
+
+    KEY_NAME = "submissions_attachments/streaming.bin"
+
+    def setUp(self):
+        super(TestFilesystemStreaming, self).setUp()
+        self.factory = RequestFactory()
+        # Binary content spanning several chunks
+        self.content = bytes(bytearray(range(256))) * (views.CHUNK_SIZE // 64)
+        self.addCleanup(shutil.rmtree, views.get_data_path(self.KEY_NAME), True)
+
+    def _upload(self):
+        request = self.factory.put('/', data=self.content, content_type='application/octet-stream')
+        return views.filesystem_storage(request, self.KEY_NAME)
+
+    def _download(self, **headers):
+        return views.filesystem_storage(self.factory.get('/', **headers), self.KEY_NAME)
+
+    def test_upload_binary_content(self):
+        self.assertEqual(200, self._upload().status_code)
+
+        with open(views.get_file_path(self.KEY_NAME), 'rb') as f:
+            self.assertEqual(self.content, f.read())
+        with open(views.get_metadata_path(self.KEY_NAME)) as f:
+            metadata = json.load(f)
+        self.assertEqual(metadata["Content-MD5"], hashlib.md5(self.content).hexdigest())
+        self.assertEqual(metadata["Content-Length"], str(len(self.content)))
+
+    def test_list_files(self):
+        self.addCleanup(shutil.rmtree, views.get_data_path("submissions_attachments/listed"), True)
+        self.addCleanup(shutil.rmtree, views.get_data_path("submissions_attachments/listed-other"), True)
+        for key_name in ("listed/course/item", "listed/course/item/1", "listed-other/course/item"):
+            views.save_to_file("submissions_attachments/" + key_name, b"content")
+        # Multipart uploads in progress are not listed
+        views.start_multipart_upload("submissions_attachments/listed/course/item/2", "0" * 32, {})
+
+        files = list(api.backends.get_backend().list_files("listed/"))
+        self.assertEqual([key for key, _ in files], ["listed/course/item", "listed/course/item/1"])
+        self.assertIsNotNone(files[0][1].tzinfo)
+        files = list(api.backends.get_backend().list_files("listed"))
+        self.assertEqual(len(files), 3)
+
+    def test_upload_is_streamed(self):
+        with patch.object(views, '_iter_chunks', wraps=views._iter_chunks) as mock_iter_chunks:
+            self._upload()
+        # The content is read from the request itself, not from its body
+        self.assertIsInstance(mock_iter_chunks.call_args_list[0][0][0], HttpRequest)
+
+    def test_download_streams_file(self):
+        self._upload()
+        response = self._download()
+
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.streaming)
+        self.assertEqual('bytes', response['Accept-Ranges'])
+        self.assertEqual(self.content, b''.join(response.streaming_content))
+
+    @ddt.data(
+        ('bytes=0-9', 0, 9),
+        ('bytes=100-', 100, None),
+        ('bytes=-10', -10, None),
+    )
+    @ddt.unpack
+    def test_download_range(self, range_header, start, end):
+        self._upload()
+        response = self._download(HTTP_RANGE=range_header)
+
+        expected = self.content[start:end + 1 if end is not None else None]
+        first = start if start >= 0 else len(self.content) + start
+        self.assertEqual(206, response.status_code)
+        self.assertEqual(expected, b''.join(response.streaming_content))
+        self.assertEqual(str(len(expected)), response['Content-Length'])
+        self.assertEqual(
+            'bytes {}-{}/{}'.format(first, first + len(expected) - 1, len(self.content)),
+            response['Content-Range']
+        )
+
+    def test_download_unsatisfiable_range(self):
+        self._upload()
+        response = self._download(HTTP_RANGE='bytes={}-'.format(len(self.content)))
+        self.assertEqual(416, response.status_code)
+        self.assertEqual('bytes */{}'.format(len(self.content)), response['Content-Range'])
+
+    def test_download_malformed_range(self):
+        self._upload()
+        response = self._download(HTTP_RANGE='bytes=10-5')
+        self.assertEqual(200, response.status_code)
+
+    def test_open_file(self):
+        self._upload()
+        key = self.KEY_NAME.split('/', 1)[1]
+        with api.open_file(key) as content:
+            self.assertEqual(self.content, content.read())
+        self.assertIsNone(api.open_file("missing.bin"))
+
+    @override_settings(ORA2_FILEUPLOAD_X_ACCEL_REDIRECT_PREFIX='/protected/')
+    def test_download_x_accel_redirect(self):
+        self._upload()
+        response = self._download()
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(b'', response.content)
+        self.assertEqual(
+            '/protected/testbucket/submissions_attachments/streaming.bin/content',
+            response['X-Accel-Redirect']
+        )
+        self.assertEqual('attachment; filename=streaming.bin', response['Content-Disposition'])
+
+
+@override_settings(
+    ORA2_FILEUPLOAD_BACKEND="filesystem",
+    ORA2_FILEUPLOAD_ROOT='/tmp',
+    ORA2_FILEUPLOAD_CACHE_NAME='default',
+    FILE_UPLOAD_STORAGE_BUCKET_NAME="testbucket",
+)
+@patch('openassessment.fileupload.backends.filesystem.reverse', lambda name, kwargs: '/' + kwargs['key'])
+class TestFilesystemMultipartUpload(TestCase):
+    """
+    Test multipart uploads to the filesystem backend.
+    """
+
+    KEY = "multipart.bin"
+    KEY_NAME = "submissions_attachments/multipart.bin"
+
+    def setUp(self):
+        super(TestFilesystemMultipartUpload, self).setUp()
+        self.factory = RequestFactory()
+        get_filesystem_cache().clear()
+        self.addCleanup(shutil.rmtree, views.get_data_path(self.KEY_NAME), True)
+
+    def _upload_part(self, upload_id, part_number, content):
+        url = api.get_upload_part_url(self.KEY, upload_id, part_number)
+        request = self.factory.put(url, data=content, content_type='application/octet-stream')
+        return views.filesystem_storage(request, self.KEY_NAME)
+
+    def test_multipart_upload(self):
+        upload_id = api.initiate_multipart_upload(self.KEY, "video/mp4")
+        parts = [b'a' * views.CHUNK_SIZE, b'b' * 10, b'c' * (views.CHUNK_SIZE + 1)]
+
+        # Parts can be uploaded in any order, and uploaded again
+        self.assertEqual(200, self._upload_part(upload_id, 3, parts[2]).status_code)
+        self.assertEqual(200, self._upload_part(upload_id, 1, b'interrupted').status_code)
+        self.assertEqual({1: len(b'interrupted'), 3: len(parts[2])}, api.list_upload_parts(self.KEY, upload_id))
+        self._upload_part(upload_id, 1, parts[0])
+        self._upload_part(upload_id, 2, parts[1])
+        self.assertEqual({1: len(parts[0]), 2: 10, 3: len(parts[2])}, api.list_upload_parts(self.KEY, upload_id))
+
+        api.complete_multipart_upload(self.KEY, upload_id)
+
+        content = b''.join(parts)
+        with api.open_file(self.KEY) as f:
+            self.assertEqual(content, f.read())
+        with open(views.get_metadata_path(self.KEY_NAME)) as f:
+            metadata = json.load(f)
+        self.assertEqual("video/mp4", metadata["Content-Type"])
+        self.assertEqual(hashlib.md5(content).hexdigest(), metadata["Content-MD5"])
+        self.assertEqual(str(len(content)), metadata["Content-Length"])
+
+        # The parts are discarded
+        with raises(exceptions.FileUploadRequestError):
+            api.list_upload_parts(self.KEY, upload_id)
+
+    def test_abort_multipart_upload(self):
+        upload_id = api.initiate_multipart_upload(self.KEY, "video/mp4")
+        self._upload_part(upload_id, 1, b'content')
+        api.abort_multipart_upload(self.KEY, upload_id)
+
+        self.assertFalse(os.path.exists(views.get_multipart_path(self.KEY_NAME, upload_id)))
+        self.assertIsNone(api.open_file(self.KEY))
+
+    def test_complete_without_parts(self):
+        upload_id = api.initiate_multipart_upload(self.KEY, "video/mp4")
+        with raises(exceptions.FileUploadRequestError):
+            api.complete_multipart_upload(self.KEY, upload_id)
+
+    def test_invalid_uploads(self):
+        upload_id = api.initiate_multipart_upload(self.KEY, "video/mp4")
+        with raises(exceptions.FileUploadRequestError):
+            api.get_upload_part_url(self.KEY, upload_id, 0)
+        with raises(exceptions.FileUploadRequestError):
+            api.get_upload_part_url(self.KEY, "../../etc", 1)
+        with raises(exceptions.FileUploadRequestError):
+            api.get_upload_part_url(self.KEY, "0" * 32, 1)
+
+        # Parts of unknown uploads are rejected
+        request = self.factory.put(
+            "/?uploadId={}&partNumber=1".format("0" * 32), data=b'content', content_type='application/octet-stream'
+        )
+        with raises(Http404):
+            views.filesystem_storage(request, self.KEY_NAME)
+
+
 @override_settings(
     ORA2_FILEUPLOAD_BACKEND='swift',
     ORA2_SWIFT_URL='http://www.example.com:12345',
@@ -357,7 +850,7 @@ class TestSwiftBackend(TestCase):
         url = self.backend.get_upload_url('foo', '_text')
         self._verify_url(url)
 
-    @patch('openassessment.fileupload.backends.swift.requests.get')
+    @patch('openassessment.fileupload.backends.swift.requests.Session.get')
     def test_get_download_url_success(self, requests_get_mock):
         """
         Verify the download URL when the object already exists in storage.
@@ -368,7 +861,7 @@ class TestSwiftBackend(TestCase):
         url = self.backend.get_download_url('foo')
         self._verify_url(url)
 
-    @patch('openassessment.fileupload.backends.swift.requests.get')
+    @patch('openassessment.fileupload.backends.swift.requests.Session.get')
     def test_get_download_url_no_object(self, requests_get_mock):
         """
         Verify the download URL is empty when the object
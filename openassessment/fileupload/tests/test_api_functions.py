@@ -3,9 +3,11 @@ Tests for other functions related to the management of file uploads, without tes
 anything related to backends.
 """
 import json
+import time
 
 import mock
 import pytest
+import six
 
 from openassessment.assessment.models.base import SharedFileUpload
 from openassessment.fileupload import api
@@ -241,9 +243,9 @@ def test_file_descriptor_tuples_after_sharing_with_old_team(
 
 
 @pytest.mark.django_db
-@mock.patch('openassessment.fileupload.api.get_download_url', autospec=True)
-def test_team_file_descriptor_tuples(mock_get_download_url, shared_file_upload_fixture, mock_block):
-    mock_get_download_url.return_value = "some-download-url"
+@mock.patch('openassessment.fileupload.api.get_download_urls', autospec=True)
+def test_team_file_descriptor_tuples(mock_get_download_urls, shared_file_upload_fixture, mock_block):
+    mock_get_download_urls.side_effect = lambda keys: {key: "some-download-url" for key in keys}
     block = mock_block(
         descriptions=['The first file'],
         names=['File A'],
@@ -292,20 +294,84 @@ def test_team_file_descriptor_tuples(mock_get_download_url, shared_file_upload_f
 
     expected_descriptors = [
         api.TeamFileDescriptor(
-            download_url=mock_get_download_url.return_value,
+            download_url="some-download-url",
             name='File Beta',
             description='Another file',
             uploaded_by='some_username',
         ),
         api.TeamFileDescriptor(
-            download_url=mock_get_download_url.return_value,
+            download_url="some-download-url",
             name='File Delta',
             description='Yet another file',
             uploaded_by='some_username',
         ),
     ]
     assert expected_descriptors == actual_descriptors
-    mock_get_download_url.assert_has_calls([
-        mock.call(key_beta),
-        mock.call(key_delta),
-    ])
+    # The download URLs are retrieved in a single batch
+    mock_get_download_urls.assert_called_once_with([key_beta, key_delta])
+
+
+@pytest.mark.django_db
+@mock.patch('openassessment.fileupload.api.get_download_urls', autospec=True)
+@mock.patch('openassessment.fileupload.api.get_download_url', autospec=True)
+def test_deferred_file_descriptor_tuples(mock_get_download_url, mock_get_download_urls, mock_block):
+    mock_get_download_urls.side_effect = lambda keys: {key: "url-of-" + key for key in keys}
+    block = mock_block(
+        descriptions=['The first file', 'The second file'],
+        names=['File A', 'File B'],
+        sizes=[22, 44],
+    )
+    block.is_team_assignment.return_value = False
+
+    file_manager = api.FileUploadManager(block)
+    actual_descriptors = file_manager.file_descriptor_tuples(defer_urls=True)
+
+    # No URL is signed when the page is rendered
+    assert not mock_get_download_url.called
+    assert not mock_get_download_urls.called
+    assert all(descriptor.download_url.deferred for descriptor in actual_descriptors)
+    assert ['File A', 'File B'] == [descriptor.name for descriptor in actual_descriptors]
+
+    tokens = [descriptor.download_url for descriptor in actual_descriptors]
+    student_item = block.get_student_item_dict()
+    resolved_urls = api.resolve_deferred_download_urls(
+        tokens + ['not-a-token'], student_item['course_id'], student_item['item_id']
+    )
+    assert {
+        tokens[0]: 'url-of-' + api.get_student_file_key(student_item, index=0),
+        tokens[1]: 'url-of-' + api.get_student_file_key(student_item, index=1),
+        'not-a-token': '',
+    } == resolved_urls
+    # The URLs are signed in a single batch
+    assert mock_get_download_urls.call_count == 1
+
+
+def test_deferred_download_url_tokens():
+    token = api.get_deferred_download_url('student/course/item', 'item')
+
+    # Placeholders of the same file are equal even if they were signed at different times,
+    # so that they can be used to look up previews
+    with mock.patch('django.core.signing.time.time', return_value=time.time() + 10):
+        later_token = api.get_deferred_download_url('student/course/item', 'item')
+    assert six.text_type(token) != six.text_type(later_token)
+    assert token == later_token
+    assert hash(token) == hash(later_token)
+    assert token != api.get_deferred_download_url('student/course/item/1', 'item')
+
+    with mock.patch('openassessment.fileupload.api.get_download_urls', autospec=True) as mock_get_download_urls:
+        mock_get_download_urls.return_value = {}
+        assert {token[:-1]: ''} == api.resolve_deferred_download_urls([token[:-1]], 'course', 'item')
+        assert not mock_get_download_urls.called
+
+
+@pytest.mark.parametrize('key, course_id, item_id, expected', [
+    ('student/course/item', 'course', 'item', True),
+    ('student/course/item/2', 'course', 'item', True),
+    ('student/edX/Demo/2014/item/2', 'edX/Demo/2014', 'item', True),
+    ('student/course/item-2', 'course', 'item', False),
+    ('student/course/item/../other', 'course', 'item', False),
+    ('student/course/other-item', 'course', 'item', False),
+    ('student/other-course/item', 'course', 'item', False),
+])
+def test_is_item_file_key(key, course_id, item_id, expected):
+    assert expected == api._is_item_file_key(key, course_id, item_id)  # pylint: disable=protected-access
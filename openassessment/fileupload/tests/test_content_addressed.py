@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the content-addressed storage of uploaded files.
+"""
+from __future__ import absolute_import
+
+import hashlib
+import os
+import shutil
+
+from django.core.files.storage import default_storage
+from django.test.utils import override_settings
+
+from openassessment.assessment.models import FileUploadBlob, FileUploadBlobReference
+from openassessment.fileupload import api
+from openassessment.fileupload import views_filesystem as views
+from openassessment.fileupload.backends import django_storage
+from openassessment.test_utils import CacheResetTest
+
+
+@override_settings(
+    ORA2_FILEUPLOAD_BACKEND="filesystem",
+    ORA2_FILEUPLOAD_ROOT='/tmp',
+    ORA2_FILEUPLOAD_CACHE_NAME='default',
+    ORA2_FILEUPLOAD_CONTENT_ADDRESSED=True,
+    FILE_UPLOAD_STORAGE_BUCKET_NAME="testbucket",
+)
+class TestFilesystemContentAddressed(CacheResetTest):
+    """
+    Test storing identical files once with the filesystem backend.
+    """
+
+    KEYS = ("cas/first.txt", "cas/second.txt")
+
+    def setUp(self):
+        super(TestFilesystemContentAddressed, self).setUp()
+        self.addCleanup(shutil.rmtree, views.get_data_path("submissions_attachments/cas"), True)
+        self.addCleanup(shutil.rmtree, os.path.join(views.get_bucket_path(), views.BLOB_DIRECTORY), True)
+        self.backend = api.backends.get_backend()
+
+    def _save(self, key, content):
+        views.save_to_file(self.backend._get_key_name(key), content)  # pylint: disable=protected-access
+
+    def _blob_path(self, content):
+        return views.get_blob_path(hashlib.sha256(content).hexdigest())
+
+    def test_identical_files_share_blob(self):
+        for key in self.KEYS:
+            self._save(key, b"same content")
+
+        blob = FileUploadBlob.objects.get()
+        self.assertEqual(blob.reference_count, 2)
+        self.assertEqual(blob.size, len(b"same content"))
+        inodes = set(
+            os.stat(views.get_file_path(self.backend._get_key_name(key))).st_ino  # pylint: disable=protected-access
+            for key in self.KEYS
+        )
+        self.assertEqual(inodes, {os.stat(self._blob_path(b"same content")).st_ino})
+        with api.open_file(self.KEYS[1]) as content:
+            self.assertEqual(b"same content", content.read())
+
+    def test_blob_permissions(self):
+        self._save(self.KEYS[0], b"same content")
+
+        # The blob has the same permissions as the files created by open()
+        other_path = os.path.join(os.path.dirname(self._blob_path(b"same content")), "other")
+        open(other_path, 'w').close()
+        self.assertEqual(
+            os.stat(self._blob_path(b"same content")).st_mode & 0o777, os.stat(other_path).st_mode & 0o777
+        )
+
+    @override_settings(ORA2_FILEUPLOAD_CONTENT_ADDRESSED=False)
+    def test_disabled_removal(self):
+        self._save(self.KEYS[0], b"content")
+        with self.assertNumQueries(0):
+            self.assertTrue(self.backend.remove_file(self.KEYS[0]))
+
+    def test_blob_removed_with_last_reference(self):
+        for key in self.KEYS:
+            self._save(key, b"same content")
+
+        self.assertTrue(self.backend.remove_file(self.KEYS[0]))
+        self.assertEqual(FileUploadBlob.objects.get().reference_count, 1)
+        self.assertTrue(os.path.exists(self._blob_path(b"same content")))
+
+        self.assertTrue(self.backend.remove_file(self.KEYS[1]))
+        self.assertFalse(FileUploadBlob.objects.exists())
+        self.assertFalse(os.path.exists(self._blob_path(b"same content")))
+        self.assertFalse(self.backend.remove_file(self.KEYS[1]))
+
+    def test_replace_content(self):
+        self._save(self.KEYS[0], b"old content")
+        self._save(self.KEYS[0], b"new content")
+
+        self.assertEqual(FileUploadBlobReference.objects.get().blob.digest, hashlib.sha256(b"new content").hexdigest())
+        self.assertFalse(os.path.exists(self._blob_path(b"old content")))
+        with api.open_file(self.KEYS[0]) as content:
+            self.assertEqual(b"new content", content.read())
+
+    def test_same_content_saved_again(self):
+        self._save(self.KEYS[0], b"same content")
+        self._save(self.KEYS[0], b"same content")
+        self.assertEqual(FileUploadBlob.objects.get().reference_count, 1)
+
+    def test_missing_blob_is_restored(self):
+        self._save(self.KEYS[0], b"same content")
+        os.remove(self._blob_path(b"same content"))
+
+        self._save(self.KEYS[1], b"same content")
+        self.assertTrue(os.path.exists(self._blob_path(b"same content")))
+        self.assertEqual(FileUploadBlob.objects.get().reference_count, 2)
+
+
+@override_settings(
+    ORA2_FILEUPLOAD_BACKEND="django",
+    ORA2_FILEUPLOAD_CONTENT_ADDRESSED=True,
+    DEFAULT_FILE_STORAGE="django.core.files.storage.FileSystemStorage",
+    FILE_UPLOAD_STORAGE_PREFIX="submissions",
+)
+class TestDjangoStorageContentAddressed(CacheResetTest):
+    """
+    Test storing identical files once with the django storage backend.
+    """
+
+    KEYS = ("first.txt", "second.txt")
+
+    def setUp(self):
+        super(TestDjangoStorageContentAddressed, self).setUp()
+        self.backend = api.backends.get_backend()
+        for key in self.KEYS:
+            self.addCleanup(self.backend.remove_file, key)
+
+    def test_identical_files_share_blob(self):
+        for key in self.KEYS:
+            self.backend.upload_file(key, b"same content")
+
+        blob = FileUploadBlob.objects.get()
+        self.assertEqual(blob.reference_count, 2)
+        blob_path = django_storage.get_blob_path(blob.digest)
+        self.assertTrue(default_storage.exists(blob_path))
+        self.assertEqual(
+            self.backend.generate_download_urls(self.KEYS),
+            {key: default_storage.url(blob_path) for key in self.KEYS}
+        )
+        with self.backend.open_file(self.KEYS[0]) as content:
+            self.assertEqual(b"same content", content.read())
+
+        self.assertTrue(self.backend.remove_file(self.KEYS[0]))
+        self.assertTrue(default_storage.exists(blob_path))
+        self.assertTrue(self.backend.remove_file(self.KEYS[1]))
+        self.assertFalse(default_storage.exists(blob_path))
+        self.assertIsNone(self.backend.get_download_url(self.KEYS[0]))
+
+    def test_download_urls_single_query(self):
+        for key in self.KEYS:
+            self.backend.upload_file(key, b"same content")
+        with self.assertNumQueries(1):
+            self.backend.generate_download_urls(self.KEYS)
+
+    @override_settings(ORA2_FILEUPLOAD_CONTENT_ADDRESSED=False)
+    def test_disabled(self):
+        self.backend.upload_file(self.KEYS[0], b"content")
+        self.assertFalse(FileUploadBlob.objects.exists())
+        with self.assertNumQueries(0):
+            self.assertIsNotNone(self.backend.get_download_url(self.KEYS[0]))
+            self.assertTrue(self.backend.remove_file(self.KEYS[0]))
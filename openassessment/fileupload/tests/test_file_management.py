@@ -1,13 +1,15 @@
 import json
 import mock
 
-from django.db import IntegrityError
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from django.test.utils import override_settings
 from moto import mock_s3_deprecated
 
 from openassessment.assessment.models.base import SharedFileUpload
 from openassessment.fileupload.api import get_student_file_key, FileUpload, FileUploadManager
+from openassessment.fileupload.backends import s3
 
 
 class MockBlock:
@@ -70,6 +72,10 @@ class FileUploadManagerTests(TestCase):
 
     def setUp(self):
         super(FileUploadManagerTests, self).setUp()
+        # Download URLs are cached, and whether they exist tells descriptionless uploads apart
+        cache.clear()
+        # Each test mocks S3 anew, so don't reuse connections made under an earlier mock
+        s3._S3_CONNECTIONS.reset()  # pylint: disable=protected-access
         block = MockBlock(1)
         self.manager = FileUploadManager(block)
         self.team_id = 'team_0_id'
@@ -167,6 +173,66 @@ class FileUploadManagerTests(TestCase):
         shared_upload_names = sorted([upload.name for upload in shared_uploads])
         self.assertEqual(['name1', 'name2', 'name4'], shared_upload_names)
 
+    @override_settings(ORA2_FILEUPLOAD_BACKEND='django')
+    def test_shared_uploads_are_created_in_bulk(self):
+        # One query to create the records, one to read them back and one to create
+        # their history, within a savepoint
+        with self.assertNumQueries(5):
+            self.team_manager.append_uploads(
+                upload_dict('name1', 'desc1', 100),
+                upload_dict('name2', 'desc2', 200),
+                upload_dict('name3', 'desc3', 300),
+            )
+
+        shared_uploads = self._get_shared_uploads(self.team_manager)
+        self.assertEqual(3, len(shared_uploads))
+        for shared_upload in shared_uploads:
+            self.assertEqual(1, shared_upload.history.count())
+
+    @override_settings(ORA2_FILEUPLOAD_BACKEND='django')
+    def test_team_manifest_is_cached(self):
+        self.team_manager.append_uploads(
+            upload_dict('name1', 'desc1', 100),
+            upload_dict('name2', 'desc2', 200),
+        )
+        other_users_block = MockBlock(number=2, team_id=self.team_id)
+        other_users_block.student_id = MockBlock.STUDENT_ID + '317'
+
+        # The first listing finds the shared uploads, later ones fetch them by primary key
+        self.assertEqual(2, len(FileUploadManager(other_users_block).get_team_uploads()))
+        with self.assertNumQueries(1):
+            self.assertEqual(2, len(FileUploadManager(other_users_block).get_team_uploads()))
+
+        # Uploads and deletions by a teammate are picked up
+        self.team_manager.append_uploads(upload_dict('name3', 'desc3', 300))
+        team_uploads = FileUploadManager(other_users_block).get_team_uploads()
+        self.assertEqual(['name1', 'name2', 'name3'], [upload.name for upload in team_uploads])
+
+        with mock.patch('openassessment.fileupload.api.remove_file'):
+            self.team_manager.delete_upload(0)
+        team_uploads = FileUploadManager(other_users_block).get_team_uploads()
+        self.assertEqual(['name2', 'name3'], [upload.name for upload in team_uploads])
+
+        # So are changes made outside of the upload manager
+        SharedFileUpload.objects.filter(name='name2').first().delete()
+        team_uploads = FileUploadManager(other_users_block).get_team_uploads()
+        self.assertEqual(['name3'], [upload.name for upload in team_uploads])
+
+    def test_team_manifest_rolled_back(self):
+        # The manifest is cached while the transaction which created an upload is rolled back
+        try:
+            with transaction.atomic():
+                SharedFileUpload.objects.create(
+                    team_id=self.team_id, course_id='course-1', item_id='item-1',
+                    owner_id='student-1', file_key='key-1', name='name1',
+                )
+                self.assertEqual(1, len(SharedFileUpload.get_team_manifest(self.team_id, 'course-1', 'item-1')))
+                raise IntegrityError
+        except IntegrityError:
+            pass
+
+        self.assertEqual([], SharedFileUpload.get_team_manifest(self.team_id, 'course-1', 'item-1'))
+
     @override_settings(
         ORA2_FILEUPLOAD_BACKEND='django',
         MEDIA_ROOT='/tmp',
@@ -183,6 +249,7 @@ class FileUploadManagerTests(TestCase):
 
         with mock.patch('openassessment.fileupload.backends.django_storage.default_storage') as mock_default_storage:
             mock_default_storage.exists.return_value = True
+            mock_default_storage.url.return_value = 'https://example.com/shared-file'
             other_users_file_manager = FileUploadManager(other_users_block)
 
             actual_descriptors = other_users_file_manager.team_file_descriptor_tuples()
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+""" Test the removal of orphaned files. """
+
+from __future__ import absolute_import
+
+import datetime
+
+import boto
+from moto import mock_s3_deprecated
+
+from django.test.utils import override_settings
+
+from openassessment.assessment.models.base import SharedFileUpload
+from openassessment.fileupload.orphans import OrphanedFileCollector
+from openassessment.test_utils import CacheResetTest
+from submissions import api as sub_api
+
+COURSE_ID = u"course-v1:edX+ORA+2020"
+ITEM_ID = u"block-v1:edX+ORA+2020+type@openassessment+block@item"
+
+
+@override_settings(
+    AWS_ACCESS_KEY_ID='foobar',
+    AWS_SECRET_ACCESS_KEY='bizbaz',
+    FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket"
+)
+class OrphanedFileCollectorTest(CacheResetTest):
+    """ Test reconciling the stored files with the responses. """
+
+    def setUp(self):
+        super(OrphanedFileCollectorTest, self).setUp()
+        s3_mock = mock_s3_deprecated()
+        s3_mock.start()
+        self.addCleanup(s3_mock.stop)
+        self.bucket = boto.connect_s3().create_bucket('mybucket')
+
+    def _upload(self, key):
+        self.bucket.new_key("submissions_attachments/" + key).set_contents_from_string("content")
+
+    def _stored_keys(self):
+        return sorted(s3_key.name[len("submissions_attachments/"):] for s3_key in self.bucket.list())
+
+    def _submit(self, student_id, file_keys):
+        student_item = {
+            'student_id': student_id,
+            'course_id': COURSE_ID,
+            'item_id': ITEM_ID,
+            'item_type': 'openassessment',
+        }
+        sub_api.create_submission(student_item, {'text': u"Answer", 'file_keys': file_keys})
+
+    def _key(self, student_id, index=0):
+        key = u"{}/{}/{}".format(student_id, COURSE_ID, ITEM_ID)
+        return key + u"/{}".format(index) if index else key
+
+    def test_collect(self):
+        # A submitted file, and a file deleted before submitting
+        self._submit('submitted', [self._key('submitted', 1)])
+        self._upload(self._key('submitted'))
+        self._upload(self._key('submitted', 1))
+        # A response in progress
+        self._upload(self._key('in-progress'))
+        # A file shared with a team, before the team submitted
+        SharedFileUpload.objects.create(
+            team_id='team', owner_id='team-member', course_id=COURSE_ID, item_id=ITEM_ID,
+            file_key=self._key('team-member'), description='', size=7, name='file'
+        )
+        self._submit('team-member', [])
+        self._upload(self._key('team-member'))
+
+        orphaned_keys = []
+        collector = OrphanedFileCollector(
+            grace_period=datetime.timedelta(0), progress_callback=orphaned_keys.extend
+        )
+        self.assertEqual((4, 1), collector.collect())
+        self.assertEqual([self._key('submitted')], orphaned_keys)
+        self.assertEqual(
+            sorted([self._key('submitted', 1), self._key('in-progress'), self._key('team-member')]),
+            self._stored_keys()
+        )
+
+        # The files of learners who never submitted are only removed on demand
+        collector = OrphanedFileCollector(grace_period=datetime.timedelta(0), include_unsubmitted=True)
+        self.assertEqual((3, 1), collector.collect())
+        self.assertEqual(sorted([self._key('submitted', 1), self._key('team-member')]), self._stored_keys())
+
+    def test_grace_period(self):
+        self._submit('submitted', [])
+        self._upload(self._key('submitted'))
+
+        collector = OrphanedFileCollector(grace_period=datetime.timedelta(days=1), include_unsubmitted=True)
+        self.assertEqual((1, 0), collector.collect())
+        self.assertEqual([self._key('submitted')], self._stored_keys())
+
+    def test_dry_run(self):
+        self._submit('submitted', [])
+        self._upload(self._key('submitted'))
+        self._upload(self._key('other'))
+
+        collector = OrphanedFileCollector(grace_period=datetime.timedelta(0), dry_run=True)
+        self.assertEqual((1, 1), collector.collect(prefix='submitted/'))
+        self.assertEqual(sorted([self._key('submitted'), self._key('other')]), self._stored_keys())
+
+    def test_batches(self):
+        self._submit('submitted', [self._key('submitted', 2)])
+        for index in range(5):
+            self._upload(self._key('submitted', index))
+
+        collector = OrphanedFileCollector(grace_period=datetime.timedelta(0))
+        collector.BATCH_SIZE = 2
+        self.assertEqual((5, 4), collector.collect())
+        self.assertEqual([self._key('submitted', 2)], self._stored_keys())
+
+    @override_settings(ORA2_FILEUPLOAD_PREVIEWS=True)
+    def test_previews(self):
+        self._submit('submitted', [self._key('submitted', 1)])
+        for index in range(2):
+            self._upload(self._key('submitted', index))
+            self._upload("previews/" + self._key('submitted', index))
+
+        collector = OrphanedFileCollector(grace_period=datetime.timedelta(0))
+        self.assertEqual((4, 2), collector.collect())
+        self.assertEqual(
+            sorted([self._key('submitted', 1), "previews/" + self._key('submitted', 1)]),
+            self._stored_keys()
+        )
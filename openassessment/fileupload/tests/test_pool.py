@@ -0,0 +1,64 @@
+"""
+Tests for the file upload backends connection pool.
+"""
+from __future__ import absolute_import
+
+import threading
+
+from mock import Mock
+
+from django.test import TestCase
+
+from openassessment.fileupload.backends.pool import ConnectionPool
+
+
+class TestConnectionPool(TestCase):
+    """
+    Test pooling of storage connections.
+    """
+
+    def setUp(self):
+        super(TestConnectionPool, self).setUp()
+        self.factory = Mock(side_effect=lambda *key: object())
+        self.pool = ConnectionPool(self.factory)
+
+    def test_lazy_initialization(self):
+        self.assertFalse(self.factory.called)
+        self.pool.get('key', 'secret')
+        self.factory.assert_called_once_with('key', 'secret')
+
+    def test_reuse_connection(self):
+        first = self.pool.get('key', 'secret')
+        second = self.pool.get('key', 'secret')
+        self.assertIs(first, second)
+        self.assertEqual(self.factory.call_count, 1)
+
+    def test_connections_keyed_by_arguments(self):
+        first = self.pool.get('key', 'secret')
+        second = self.pool.get('other-key', 'secret')
+        self.assertIsNot(first, second)
+
+    def test_one_connection_per_thread(self):
+        connections = []
+        threads = [
+            threading.Thread(target=lambda: connections.append(self.pool.get('key', 'secret')))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(id(connection) for connection in connections)), 3)
+
+    def test_discard(self):
+        first = self.pool.get('key', 'secret')
+        self.pool.discard('key', 'secret')
+        second = self.pool.get('key', 'secret')
+        self.assertIsNot(first, second)
+
+    def test_reset(self):
+        first = self.pool.get('key', 'secret')
+        self.pool.reset()
+        second = self.pool.get('key', 'secret')
+        self.assertIsNot(first, second)
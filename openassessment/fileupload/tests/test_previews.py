@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the previews of uploaded files.
+"""
+from __future__ import absolute_import
+
+import io
+import shutil
+import unittest
+
+from mock import Mock, patch
+
+from django.test.utils import override_settings
+
+from openassessment.fileupload import api, previews
+from openassessment.fileupload import views_filesystem as views
+from openassessment.fileupload.previews import PreviewGenerator
+from openassessment.test_utils import CacheResetTest
+
+try:
+    from PIL import Image  # pylint: disable=import-error
+except ImportError:
+    Image = None
+
+PNG_CONTENT = b'\x89PNG\r\n\x1a\n' + b'image content'
+PDF_CONTENT = b'%PDF-1.4\n' + b'pdf content'
+
+
+@override_settings(
+    ORA2_FILEUPLOAD_BACKEND="filesystem",
+    ORA2_FILEUPLOAD_ROOT='/tmp',
+    ORA2_FILEUPLOAD_CACHE_NAME='default',
+    ORA2_FILEUPLOAD_PREVIEWS=True,
+    FILE_UPLOAD_STORAGE_BUCKET_NAME="testbucket",
+)
+@patch('openassessment.fileupload.backends.filesystem.reverse', lambda name, kwargs: '/' + kwargs['key'])
+class TestPreviewGenerator(CacheResetTest):
+    """
+    Test generating and storing the previews of uploaded files.
+    """
+
+    KEY = "previewed/course/item"
+
+    def setUp(self):
+        super(TestPreviewGenerator, self).setUp()
+        self.backend = api.backends.get_backend()
+        for key in (self.KEY, previews.get_preview_key(self.KEY)):
+            key_name = self.backend._get_key_name(key)  # pylint: disable=protected-access
+            self.addCleanup(shutil.rmtree, views.get_data_path(key_name), True)
+
+    def _upload(self, content):
+        self.backend.save_file(self.KEY, content, 'application/octet-stream')
+
+    def _read_preview(self):
+        with self.backend.open_file(previews.get_preview_key(self.KEY)) as preview:
+            return preview.read()
+
+    @patch.object(PreviewGenerator, '_render_image', Mock(return_value=b'preview'))
+    def test_generate_image_preview(self):
+        self._upload(PNG_CONTENT)
+        self.assertTrue(PreviewGenerator().generate(self.KEY))
+        self.assertEqual(b'preview', self._read_preview())
+
+        preview_url = api.get_preview_urls([self.KEY])[self.KEY]
+        self.assertEqual(api.get_download_url(previews.get_preview_key(self.KEY)), preview_url)
+        with override_settings(ORA2_FILEUPLOAD_PREVIEWS=False):
+            self.assertEqual({self.KEY: ''}, api.get_preview_urls([self.KEY]))
+
+    @patch.object(PreviewGenerator, '_render_pdf', Mock(return_value=b'preview'))
+    def test_generate_pdf_preview(self):
+        self._upload(PDF_CONTENT)
+        self.assertTrue(PreviewGenerator().generate(self.KEY))
+        self.assertEqual(b'preview', self._read_preview())
+
+    def test_unsupported_file(self):
+        self._upload(b'text content')
+        self.assertFalse(PreviewGenerator().generate(self.KEY))
+        self.assertIsNone(self.backend.open_file(previews.get_preview_key(self.KEY)))
+
+    def test_missing_file(self):
+        self.assertFalse(PreviewGenerator().generate(self.KEY))
+
+    @patch.object(PreviewGenerator, '_render_image')
+    def test_file_too_large(self, mock_render_image):
+        self._upload(PNG_CONTENT)
+        generator = PreviewGenerator()
+        generator.MAX_SOURCE_SIZE = len(PNG_CONTENT) - 1
+        generator.CHUNK_SIZE = 4
+        self.assertFalse(generator.generate(self.KEY))
+        self.assertFalse(mock_render_image.called)
+
+    @patch('openassessment.fileupload.previews.shutil.which', Mock(return_value=None))
+    def test_pdf_renderer_not_installed(self):
+        self._upload(PDF_CONTENT)
+        self.assertFalse(PreviewGenerator().generate(self.KEY))
+
+    @unittest.skipUnless(Image, "Pillow is not installed")
+    def test_render_image(self):
+        image_content = io.BytesIO()
+        Image.new('RGBA', (1000, 500), (255, 0, 0, 128)).save(image_content, 'PNG')
+        self._upload(image_content.getvalue())
+
+        self.assertTrue(PreviewGenerator(size=100).generate(self.KEY))
+        preview = Image.open(io.BytesIO(self._read_preview()))
+        self.assertEqual('JPEG', preview.format)
+        self.assertEqual((100, 50), preview.size)
+
+    @patch.object(PreviewGenerator, 'generate')
+    def test_generate_many_logs_errors(self, mock_generate):
+        mock_generate.side_effect = [Exception("Storage unavailable"), True, False]
+        with patch('openassessment.fileupload.previews.logger') as mock_logger:
+            self.assertEqual(['second'], PreviewGenerator().generate_many(['first', 'second', 'third']))
+        self.assertTrue(mock_logger.exception.called)
+
+    @patch.object(PreviewGenerator, '_render_image', Mock(return_value=b'preview'))
+    def test_previews_removed_with_files(self):
+        self._upload(PNG_CONTENT)
+        PreviewGenerator().generate(self.KEY)
+
+        self.assertEqual([self.KEY], api.remove_files([self.KEY]))
+        self.assertIsNone(self.backend.open_file(previews.get_preview_key(self.KEY)))
+
+
+class TestGeneratePreviewsLater(CacheResetTest):
+    """
+    Test generating the previews of uploaded files in the background.
+    """
+
+    @override_settings(ORA2_FILEUPLOAD_PREVIEWS=True)
+    @patch.object(api, '_PREVIEW_QUEUE')
+    def test_enabled(self, mock_queue):
+        api.generate_previews_later(['first', 'second'])
+        self.assertEqual(['first', 'second'], [call[0][0] for call in mock_queue.put.call_args_list])
+
+    @override_settings(ORA2_FILEUPLOAD_PREVIEWS=False)
+    @patch.object(api, '_PREVIEW_QUEUE')
+    def test_disabled(self, mock_queue):
+        api.generate_previews_later(['first'])
+        self.assertFalse(mock_queue.put.called)
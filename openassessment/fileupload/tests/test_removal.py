@@ -0,0 +1,99 @@
+"""
+Tests for the background removal of files.
+"""
+from __future__ import absolute_import
+
+import threading
+
+from mock import Mock, patch
+
+from django.conf import settings
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from openassessment.fileupload import api
+from openassessment.fileupload.removal import FileRemovalQueue
+
+
+class TestFileRemovalQueue(TestCase):
+    """
+    Test removing files in a background thread.
+    """
+
+    def setUp(self):
+        super(TestFileRemovalQueue, self).setUp()
+        self.removed = []
+        self.remove_files = Mock(side_effect=self.removed.append)
+        self.removal_queue = FileRemovalQueue(self.remove_files, batch_size=2)
+
+    def test_remove_in_batches(self):
+        # Block the worker on the first file, while more files are queued
+        started = threading.Event()
+        release = threading.Event()
+
+        def remove_files(keys):
+            started.set()
+            release.wait(5)
+            self.removed.append(keys)
+
+        self.remove_files.side_effect = remove_files
+        self.removal_queue.put('key-0')
+        started.wait(5)
+        for index in range(1, 4):
+            self.removal_queue.put('key-{}'.format(index))
+        release.set()
+        self.removal_queue.join()
+
+        self.assertEqual(self.removed, [['key-0'], ['key-1', 'key-2'], ['key-3']])
+
+    def test_errors_are_logged(self):
+        self.remove_files.side_effect = [Exception("Storage unavailable"), None]
+        with patch('openassessment.fileupload.background.logger') as mock_logger:
+            self.removal_queue.put('key-0')
+            self.removal_queue.join()
+            self.removal_queue.put('key-1')
+            self.removal_queue.join()
+        self.assertTrue(mock_logger.exception.called)
+        self.remove_files.assert_called_with(['key-1'])
+
+    def test_restart_worker(self):
+        self.removal_queue.put('key-0')
+        self.removal_queue.join()
+        # Simulate a process forked after the worker was started
+        self.removal_queue._worker = Mock(is_alive=Mock(return_value=False))  # pylint: disable=protected-access
+        self.removal_queue.put('key-1')
+        self.removal_queue.join()
+        self.assertEqual(self.removed, [['key-0'], ['key-1']])
+
+
+class TestRemoveFileLater(TestCase):
+    """
+    Test deferring the removal of the files deleted by learners.
+    """
+
+    @override_settings(ORA2_FILEUPLOAD_DEFER_REMOVAL=True)
+    @patch.object(api, 'remove_file')
+    @patch.object(api, '_REMOVAL_QUEUE')
+    @patch.object(api.backends, 'get_backend')
+    def test_deferred_removal(self, mock_get_backend, mock_queue, mock_remove_file):
+        api.remove_file_later('key')
+        mock_queue.put.assert_called_once_with('key')
+        mock_get_backend.return_value.invalidate_download_url.assert_called_once_with('key')
+        self.assertFalse(mock_remove_file.called)
+
+    @override_settings(ORA2_FILEUPLOAD_DEFER_REMOVAL=False)
+    @patch.object(api, 'remove_file')
+    @patch.object(api, '_REMOVAL_QUEUE')
+    def test_immediate_removal(self, mock_queue, mock_remove_file):
+        api.remove_file_later('key')
+        mock_remove_file.assert_called_once_with('key')
+        self.assertFalse(mock_queue.put.called)
+
+    @patch.object(api, 'remove_file')
+    @patch.object(api, '_REMOVAL_QUEUE')
+    def test_immediate_removal_by_default(self, mock_queue, mock_remove_file):
+        with self.settings():
+            del settings.ORA2_FILEUPLOAD_DEFER_REMOVAL
+            api.remove_file_later('key')
+        mock_remove_file.assert_called_once_with('key')
+        self.assertFalse(mock_queue.put.called)
@@ -1,21 +1,45 @@
 """ Views for filesystem backend. """
 from __future__ import absolute_import
 
+import datetime
 import hashlib
 import json
 import os
+import re
+import shutil
+from uuid import uuid4
 
 import six
+from six.moves.urllib.parse import quote  # pylint: disable=import-error
 
 from django.conf import settings
+from django.http import FileResponse, StreamingHttpResponse
 from django.shortcuts import Http404, HttpResponse
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 
 from . import exceptions
 from .backends.base import Settings
+from .backends.content_addressed import ContentAddressedStore, create_temp_file, is_content_addressed
 from .backends.filesystem import is_download_url_available, is_upload_url_available
 
+# Size (in bytes) of the chunks files are read and written in, which bounds
+# the memory used by a transfer whatever the size of the file.
+CHUNK_SIZE = 64 * 1024
+
+RANGE_HEADER_REGEX = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# The parts of a multipart upload are stored in a hidden directory next to
+# the content of the file, until they are assembled.
+MULTIPART_DIRECTORY = ".multipart"
+UPLOAD_ID_REGEX = re.compile(r'^[0-9a-f]{32}$')
+PART_FILE_TEMPLATE = "part-{:05d}"
+PART_FILE_REGEX = re.compile(r'^part-(\d+)$')
+
+# With content-addressed storage, contents are stored once, in a hidden
+# directory of the bucket, under their SHA-256 digest.
+BLOB_DIRECTORY = ".blobs"
+
 
 @require_http_methods(["PUT", "GET"])
 def filesystem_storage(request, key):
@@ -25,18 +49,33 @@ def filesystem_storage(request, key):
     if request.method == "PUT":
         if not is_upload_url_available(key):
             raise Http404()
+        if 'uploadId' in request.GET:
+            try:
+                save_part(key, request.GET['uploadId'], int(request.GET.get('partNumber', '')), request)
+            except (ValueError, exceptions.FileUploadRequestError):
+                raise Http404()
+            return HttpResponse()
         content, metadata = get_content_metadata(request)
         save_to_file(key, content, metadata)
         return HttpResponse()
     elif request.method == "GET":
         if not is_download_url_available(key):
             raise Http404()
-        return download_file(key)
+        return download_file(key, request.META.get('HTTP_RANGE'))
 
 
-def download_file(key):
-    """Returns an HttpResponse to download the corresponding file"""
+def download_file(key, range_header=None):
+    """
+    Returns an HttpResponse to download the corresponding file.
 
+    The file is streamed from disk in chunks (or handed over to the web server
+    with X-Accel-Redirect, if the ORA2_FILEUPLOAD_X_ACCEL_REDIRECT_PREFIX setting
+    is defined), and single byte ranges are supported.
+
+    Arguments:
+        key (str): unique file identifier
+        range_header (str): value of the Range header of the request, if any
+    """
     file_path = get_file_path(key)
     metadata_path = get_metadata_path(key)
     if not os.path.exists(file_path):
@@ -44,8 +83,35 @@ def download_file(key):
     with open(metadata_path) as f:
         metadata = json.load(f)
         content_type = metadata.get("Content-Type", 'application/octet-stream')
-    with open(file_path, 'r') as f:
-        response = HttpResponse(f.read(), content_type=content_type)
+
+    x_accel_redirect_prefix = getattr(settings, "ORA2_FILEUPLOAD_X_ACCEL_REDIRECT_PREFIX", None)
+    if x_accel_redirect_prefix:
+        # Let the web server (e.g. nginx) serve the file, ranges included.
+        # The prefix must be an internal location aliased to ORA2_FILEUPLOAD_ROOT.
+        relative_path = os.path.relpath(file_path, os.path.abspath(get_root_directory_path()))
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = u"{}/{}".format(
+            x_accel_redirect_prefix.rstrip('/'),
+            quote(relative_path.replace(os.sep, '/').encode('utf-8'))
+        )
+    else:
+        file_size = os.path.getsize(file_path)
+        byte_range = parse_range_header(range_header, file_size)
+        if byte_range is None:
+            response = FileResponse(open(file_path, 'rb'), content_type=content_type)
+        elif byte_range == ():
+            response = HttpResponse(status=416)
+            response['Content-Range'] = 'bytes */{}'.format(file_size)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                read_file_chunks(file_path, start, end - start + 1),
+                status=206,
+                content_type=content_type
+            )
+            response['Content-Length'] = str(end - start + 1)
+            response['Content-Range'] = 'bytes {}-{}/{}'.format(start, end, file_size)
+        response['Accept-Ranges'] = 'bytes'
 
     file_name = os.path.basename(os.path.dirname(file_path))
     file_extension = Settings.guess_extension(content_type)
@@ -55,54 +121,173 @@ def download_file(key):
     return response
 
 
+def parse_range_header(range_header, file_size):
+    """
+    Parse the value of a Range header requesting a single byte range.
+
+    Arguments:
+        range_header (str): value of the Range header, or None
+        file_size (int): size of the requested file, in bytes
+
+    Returns:
+        None if the whole file should be returned (there is no range, or it
+        is malformed or not supported), an empty tuple if the range cannot be
+        satisfied, or a tuple of the first and last (inclusive) byte positions.
+    """
+    match = RANGE_HEADER_REGEX.match(range_header.strip()) if range_header else None
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the last N bytes of the file
+        start = max(file_size - int(last), 0)
+        end = file_size - 1
+    else:
+        start = int(first)
+        end = min(int(last), file_size - 1) if last else file_size - 1
+        if last and int(last) < start:
+            return None
+
+    if start >= file_size or end < start:
+        return ()
+    return start, end
+
+
+def read_file_chunks(path, start, length):
+    """
+    Generate the content of a file, in chunks, from the `start` byte position
+    up to `length` bytes.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
 def get_content_metadata(request):
     """
     Read the content and metadata associated to an HttpRequest.
 
+    The content is not read into memory: the request itself is returned
+    as a file-like object that the content can be streamed from.
+
     Returns:
-        request body (str)
+        request (file-like object)
         request metadata (dict)
     """
 
     metadata = {
         "Content-Type": request.META["CONTENT_TYPE"],
         "Date": str(timezone.now()),
-        "Content-MD5": hashlib.md5(request.body).hexdigest(),
-        "Content-Length": request.META["CONTENT_LENGTH"],
     }
-    return request.body, metadata
+    return request, metadata
 
 
 def save_to_file(key, content, metadata=None):
     """
     Save the content and metadata to a local file determined by the given key.
 
+    The Content-MD5 and Content-Length of the content are computed while it
+    is saved, and added to the metadata.
+
     Arguments:
         key (str): unique file identifier
-        content (str): uploaded file content
+        content (str, bytes or file-like object): uploaded file content
         metadata (dict): json-dumpable data
     """
     file_path = get_file_path(key)
     metadata_path = get_metadata_path(key)
-    if metadata is None:
-        metadata = {}
+    metadata = dict(metadata or {})
 
-    safe_save(file_path, content)
+    if is_content_addressed():
+        content_md5, content_length = save_content_addressed(key, content)
+    else:
+        content_md5, content_length = safe_save(file_path, content)
     try:
+        metadata["Content-MD5"] = content_md5
+        metadata["Content-Length"] = str(content_length)
         safe_save(metadata_path, json.dumps(metadata))
     except Exception:
-        safe_remove(file_path)
+        remove_file_content(key)
         safe_remove(metadata_path)
         raise
 
 
-def safe_save(path, content):
+def save_content_addressed(key, content):
     """
-    Save content to path. Creates the appropriate directories, if required.
+    Save the content of a file as a blob named after its digest, which is
+    only written if no other file has the same content.
+
+    The content file is a hard link to the blob, so it is read like any other
+    file, and uses no additional space.
+
+    Arguments:
+        key (str): unique file identifier
+        content (str, bytes or file-like object): uploaded file content
+
+    Returns:
+        The MD5 hex digest (str) and length in bytes (int) of the content.
+    """
+    file_path = get_file_path(key)
+    dir_path = _prepare_directory(file_path)
+
+    md5 = hashlib.md5()
+
+    def _hashed_chunks():
+        for chunk in _iter_chunks(content):
+            md5.update(chunk)
+            yield chunk
+
+    blob = FilesystemContentStore().save(key, _hashed_chunks())
+    link_path = os.path.join(dir_path, '.upload-{}'.format(uuid4().hex))
+    os.link(get_blob_path(blob.digest), link_path)
+    try:
+        os.rename(link_path, file_path)
+    except Exception:
+        safe_remove(link_path)
+        raise
+    return md5.hexdigest(), blob.size
+
+
+class FilesystemContentStore(ContentAddressedStore):
+    """
+    Store blobs in a hidden directory of the bucket directory.
+    """
+
+    def _get_temp_directory(self):
+        # Spool the contents next to the blobs, so that they can be moved in place
+        return _prepare_directory(os.path.join(get_bucket_path(), BLOB_DIRECTORY, ".upload"))
+
+    def _blob_exists(self, digest):
+        return os.path.exists(get_blob_path(digest))
+
+    def _save_blob(self, digest, temp_path):
+        blob_path = get_blob_path(digest)
+        _prepare_directory(blob_path)
+        os.rename(temp_path, blob_path)
+
+    def _delete_blob(self, digest):
+        safe_remove(get_blob_path(digest))
+
+
+def _prepare_directory(path):
+    """
+    Create the directory of the given path, if required.
+
+    Returns:
+        The absolute path (str) of the directory.
 
     Raises:
-        FileUploadInternalError if the root directory does not exist or if we
-        try to save in an unauthorized directory.
+        FileUploadInternalError if the root directory does not exist or if the
+        directory is not in the bucket directory.
     """
     dir_path = os.path.abspath(os.path.dirname(path))
     if not dir_path.startswith(get_bucket_path()):
@@ -112,8 +297,200 @@ def safe_save(path, content):
         raise exceptions.FileUploadInternalError(u"File upload root directory does not exist: %s" % root_directory)
     if not os.path.exists(dir_path):
         os.makedirs(dir_path)
-    with open(path, 'w') as f:
-        f.write(content.decode('utf-8') if six.PY3 and isinstance(content, bytes) else content)
+    return dir_path
+
+
+def safe_save(path, content):
+    """
+    Save content to path. Creates the appropriate directories, if required.
+
+    The content is written in binary mode, in chunks, to a temporary file
+    which then replaces the destination, so that a partially written file is
+    never visible.
+
+    Arguments:
+        path (str): destination path
+        content (str, bytes or file-like object): content to save
+
+    Returns:
+        The MD5 hex digest (str) and length in bytes (int) of the content.
+
+    Raises:
+        FileUploadInternalError if the root directory does not exist or if we
+        try to save in an unauthorized directory.
+    """
+    dir_path = _prepare_directory(path)
+
+    md5 = hashlib.md5()
+    length = 0
+    fd, temp_path = create_temp_file(dir_path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in _iter_chunks(content):
+                md5.update(chunk)
+                length += len(chunk)
+                f.write(chunk)
+        os.rename(temp_path, path)
+    except Exception:
+        safe_remove(temp_path)
+        raise
+    return md5.hexdigest(), length
+
+
+def _iter_chunks(content):
+    """
+    Generate the given content as chunks of bytes.
+
+    The content can be a string, bytes, a file-like object or an iterable of chunks.
+    """
+    if isinstance(content, six.text_type):
+        content = content.encode('utf-8')
+    if isinstance(content, bytes):
+        for start in range(0, len(content), CHUNK_SIZE):
+            yield content[start:start + CHUNK_SIZE]
+        return
+
+    if not hasattr(content, 'read'):
+        for chunk in content:
+            yield chunk
+        return
+
+    while True:
+        chunk = content.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk.encode('utf-8') if isinstance(chunk, six.text_type) else chunk
+
+
+def start_multipart_upload(key, upload_id, metadata):
+    """
+    Prepare the directory that will store the parts of a multipart upload.
+
+    Arguments:
+        key (str): unique file identifier
+        upload_id (str): unique upload identifier (32 hexadecimal digits)
+        metadata (dict): json-dumpable metadata of the file
+    """
+    safe_save(os.path.join(get_multipart_path(key, upload_id), "metadata.json"), json.dumps(metadata))
+
+
+def save_part(key, upload_id, part_number, content):
+    """
+    Save a part of a multipart upload, replacing any previous upload of the same part.
+
+    Arguments:
+        key (str): unique file identifier
+        upload_id (str): unique upload identifier
+        part_number (int): number of the part
+        content (str, bytes or file-like object): content of the part
+
+    Raises:
+        FileUploadRequestError if the upload does not exist.
+    """
+    if part_number < 1:
+        raise exceptions.FileUploadRequestError(u"Invalid part number: %s" % part_number)
+    multipart_path = _get_existing_multipart_path(key, upload_id)
+    safe_save(os.path.join(multipart_path, PART_FILE_TEMPLATE.format(part_number)), content)
+
+
+def list_parts(key, upload_id):
+    """
+    Returns a dict mapping the number of each part uploaded so far to its size.
+
+    Raises:
+        FileUploadRequestError if the upload does not exist.
+    """
+    multipart_path = _get_existing_multipart_path(key, upload_id)
+    parts = {}
+    for file_name in os.listdir(multipart_path):
+        match = PART_FILE_REGEX.match(file_name)
+        if match:
+            parts[int(match.group(1))] = os.path.getsize(os.path.join(multipart_path, file_name))
+    return parts
+
+
+def complete_multipart_upload(key, upload_id):
+    """
+    Append the parts of a multipart upload, in order, to the content file,
+    then discard the parts.
+
+    Raises:
+        FileUploadRequestError if the upload does not exist or has no part.
+    """
+    multipart_path = _get_existing_multipart_path(key, upload_id)
+    part_numbers = sorted(list_parts(key, upload_id))
+    if not part_numbers:
+        raise exceptions.FileUploadRequestError(u"No part has been uploaded for this multipart upload.")
+    with open(os.path.join(multipart_path, "metadata.json")) as f:
+        metadata = json.load(f)
+
+    save_to_file(key, _read_parts(multipart_path, part_numbers), metadata)
+    shutil.rmtree(multipart_path, ignore_errors=True)
+
+
+def abort_multipart_upload(key, upload_id):
+    """
+    Discard a multipart upload and its parts.
+    """
+    multipart_path = get_multipart_path(key, upload_id)
+    if os.path.exists(multipart_path):
+        shutil.rmtree(multipart_path)
+
+
+def _read_parts(multipart_path, part_numbers):
+    """
+    Generate the content of the given parts, in chunks.
+    """
+    for part_number in part_numbers:
+        part_path = os.path.join(multipart_path, PART_FILE_TEMPLATE.format(part_number))
+        for chunk in read_file_chunks(part_path, 0, os.path.getsize(part_path)):
+            yield chunk
+
+
+def _get_existing_multipart_path(key, upload_id):
+    """
+    Returns the path to the directory of a multipart upload, which must exist.
+    """
+    multipart_path = get_multipart_path(key, upload_id)
+    if not os.path.exists(os.path.join(multipart_path, "metadata.json")):
+        raise exceptions.FileUploadRequestError(u"Unknown multipart upload: '%s'" % upload_id)
+    return multipart_path
+
+
+def list_files(key_prefix):
+    """
+    Generate the keys of the stored files whose key starts with the given prefix, in order.
+
+    Arguments:
+        key_prefix (str): prefix of the keys, which may end in the middle of a directory name
+
+    Yields:
+        `(key, last_modified)` tuples, where `last_modified` is the aware
+        datetime at which the content was last written.
+    """
+    bucket_path = get_bucket_path()
+    # Only walk the deepest directory containing every file with the prefix
+    directory = key_prefix.rsplit("/", 1)[0] if "/" in key_prefix else ""
+    top_path = get_data_path(directory) if directory else bucket_path
+    for dir_path, dir_names, file_names in os.walk(top_path):
+        dir_names[:] = sorted(name for name in dir_names if name != MULTIPART_DIRECTORY)
+        if "content" not in file_names:
+            continue
+        key = os.path.relpath(dir_path, bucket_path).replace(os.sep, "/")
+        if key.startswith(key_prefix):
+            mtime = os.path.getmtime(os.path.join(dir_path, "content"))
+            yield key, datetime.datetime.fromtimestamp(mtime, timezone.utc)
+
+
+def remove_file_content(key):
+    """
+    Remove the content of a file, and its blob if no other file has the same content.
+
+    Returns True if the file existed.
+    """
+    removed = safe_remove(get_file_path(key))
+    released = is_content_addressed() and FilesystemContentStore().release(key)
+    return removed or released
 
 
 def safe_remove(path):
@@ -141,6 +518,25 @@ def get_metadata_path(key):
     return os.path.join(get_data_path(key), "metadata.json")
 
 
+def get_multipart_path(key, upload_id):
+    """
+    Returns the path to the directory which stores the parts of a multipart upload.
+
+    Raises:
+        FileUploadRequestError if the upload identifier is malformed.
+    """
+    if not UPLOAD_ID_REGEX.match(upload_id or ''):
+        raise exceptions.FileUploadRequestError(u"Invalid multipart upload identifier: '%s'" % upload_id)
+    return os.path.join(get_data_path(key), MULTIPART_DIRECTORY, upload_id)
+
+
+def get_blob_path(digest):
+    """
+    Returns the path to the blob storing the content with the given digest.
+    """
+    return os.path.join(get_bucket_path(), BLOB_DIRECTORY, digest[:2], digest)
+
+
 def get_data_path(key):
     """
     Returns the path to the directory which will store the content and metadata
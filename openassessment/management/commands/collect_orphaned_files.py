@@ -0,0 +1,87 @@
+"""
+Command to remove the uploaded files no response refers to from the file upload storage.
+
+Files are orphaned when learners delete or replace them before submitting,
+when their removal failed, or (with --include-unsubmitted) when learners
+never submitted their response.
+"""
+from __future__ import absolute_import
+
+import datetime
+
+import six
+
+from django.core.management.base import BaseCommand, CommandError
+
+from openassessment.fileupload.exceptions import FileUploadError
+from openassessment.fileupload.orphans import OrphanedFileCollector
+
+
+class Command(BaseCommand):
+    """
+    Remove orphaned files from the file upload storage
+    """
+
+    help = ("Usage: collect_orphaned_files [--prefix=<key_prefix>] [--grace-days=<days>] "
+            "[--include-unsubmitted] [--dry-run]")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prefix',
+            action='store',
+            dest='prefix',
+            type=six.text_type,
+            default='',
+            help="Only check the files whose key starts with this prefix (e.g. an anonymous student id)"
+        )
+        parser.add_argument(
+            '--grace-days',
+            action='store',
+            dest='grace_days',
+            type=int,
+            default=OrphanedFileCollector.DEFAULT_GRACE_PERIOD.days,
+            help="Never remove files modified during this number of days"
+        )
+        parser.add_argument(
+            '--include-unsubmitted',
+            action='store_true',
+            dest='include_unsubmitted',
+            default=False,
+            help="Also remove the files of learners who never submitted their response"
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            dest='dry_run',
+            default=False,
+            help="Only list the orphaned files, without removing them"
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the command.
+        """
+        if options['grace_days'] < 1:
+            raise CommandError("The grace period must be at least one day")
+
+        collector = OrphanedFileCollector(
+            grace_period=datetime.timedelta(days=options['grace_days']),
+            include_unsubmitted=options['include_unsubmitted'],
+            dry_run=options['dry_run'],
+            progress_callback=self._print_orphaned_keys if options['verbosity'] > 1 else None,
+        )
+        try:
+            num_files, num_orphans = collector.collect(options['prefix'])
+        except FileUploadError as ex:
+            raise CommandError(u"Could not collect orphaned files: {}".format(ex))
+
+        self.stdout.write(u"Checked {} files, {} {} orphaned files".format(
+            num_files, "found" if options['dry_run'] else "removed", num_orphans
+        ))
+
+    def _print_orphaned_keys(self, keys):
+        """
+        Print the keys of the orphaned files found in a batch.
+        """
+        for key in keys:
+            self.stdout.write(key)
@@ -0,0 +1,72 @@
+"""
+Command to download the responses (text answers and uploaded files) to an ORA item as a .zip archive.
+
+Each learner's responses are placed in a folder named after their anonymized student id.
+"""
+from __future__ import absolute_import
+
+import os
+
+import six
+
+from django.core.management.base import BaseCommand, CommandError
+
+from openassessment.data import SubmissionFilesZipWriter
+
+
+class Command(BaseCommand):
+    """
+    Write the responses to an ORA item to a .zip archive
+    """
+
+    help = ("Usage: download_submission_files <course_id> <item_id> --output=<output_file>")
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', type=six.text_type)
+        parser.add_argument('item_id', type=six.text_type)
+        parser.add_argument(
+            '-o',
+            '--output',
+            action='store',
+            dest='output',
+            default=None,
+            help="Write the archive to the given file (defaults to <course_id>-<item_id>.zip)"
+        )
+        parser.add_argument(
+            '--item-type',
+            action='store',
+            dest='item_type',
+            default='openassessment',
+            help="Type of the item"
+        )
+        parser.add_argument(
+            '-w',
+            '--workers',
+            action='store',
+            dest='workers',
+            type=int,
+            default=SubmissionFilesZipWriter.MAX_WORKERS,
+            help="Number of files to fetch concurrently"
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the command.
+        """
+        course_id = options['course_id']
+        item_id = options['item_id']
+        if not course_id or not item_id:
+            raise CommandError("Course ID and item ID must be specified to fetch responses")
+        if options['workers'] < 1:
+            raise CommandError("The number of workers must be positive")
+
+        if options['output']:
+            file_name = options['output']
+        else:
+            file_name = (u"%s-%s.zip" % (course_id, item_id)).replace("/", "-").replace(":", "-")
+
+        with open(os.path.abspath(file_name), 'wb') as zip_file:
+            writer = SubmissionFilesZipWriter(zip_file, max_workers=options['workers'])
+            num_files = writer.write_to_zip(course_id, item_id, item_type=options['item_type'])
+
+        self.stdout.write(u"Wrote {} files to {}".format(num_files, file_name))
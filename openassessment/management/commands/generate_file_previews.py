@@ -0,0 +1,72 @@
+"""
+Command to generate the previews of the files uploaded before previews were
+enabled (see the ORA2_FILEUPLOAD_PREVIEWS setting).
+
+Files which already have a preview are skipped, unless --force is given.
+"""
+from __future__ import absolute_import
+
+import six
+
+from django.core.management.base import BaseCommand, CommandError
+
+from openassessment.fileupload import backends, previews
+from openassessment.fileupload.exceptions import FileUploadError
+
+
+class Command(BaseCommand):
+    """
+    Generate the previews of the uploaded files
+    """
+
+    help = "Usage: generate_file_previews [--prefix=<key_prefix>] [--force]"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prefix',
+            action='store',
+            dest='prefix',
+            type=six.text_type,
+            default='',
+            help="Only preview the files whose key starts with this prefix (e.g. an anonymous student id)"
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            dest='force',
+            default=False,
+            help="Also generate the previews of the files which already have one"
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the command.
+        """
+        backend = backends.get_backend()
+        generator = previews.PreviewGenerator()
+        num_files = 0
+        num_previews = 0
+        try:
+            previewed_keys = set()
+            if not options['force']:
+                previewed_keys = {
+                    previews.get_source_key(preview_key)
+                    for preview_key, _ in backend.list_files(previews.get_preview_key(options['prefix']))
+                }
+            for key, _ in backend.list_files(options['prefix']):
+                if previews.is_preview_key(key) or key in previewed_keys:
+                    continue
+                num_files += 1
+                try:
+                    generated = generator.generate(key)
+                except FileUploadError as ex:
+                    self.stderr.write(u"Could not generate the preview of {}: {}".format(key, ex))
+                    continue
+                if generated:
+                    num_previews += 1
+                    if options['verbosity'] > 1:
+                        self.stdout.write(key)
+        except FileUploadError as ex:
+            raise CommandError(u"Could not list the uploaded files: {}".format(ex))
+
+        self.stdout.write(u"Checked {} files, generated {} previews".format(num_files, num_previews))
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+""" Test the collect_orphaned_files management command """
+
+from __future__ import absolute_import
+
+import datetime
+
+from mock import patch
+from six import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from openassessment.fileupload.exceptions import FileUploadInternalError
+
+
+@patch(
+    'openassessment.management.commands.collect_orphaned_files.OrphanedFileCollector',
+    DEFAULT_GRACE_PERIOD=datetime.timedelta(days=30),
+)
+class CollectOrphanedFilesTest(TestCase):
+    """ Test collect_orphaned_files options, output and error conditions """
+
+    def test_collect_orphaned_files(self, mock_collector):
+        mock_collector.return_value.collect.return_value = (10, 3)
+        output = StringIO()
+        call_command('collect_orphaned_files', prefix='student', grace_days=7, include_unsubmitted=True, stdout=output)
+
+        kwargs = mock_collector.call_args[1]
+        self.assertEqual(kwargs['grace_period'], datetime.timedelta(days=7))
+        self.assertTrue(kwargs['include_unsubmitted'])
+        self.assertFalse(kwargs['dry_run'])
+        mock_collector.return_value.collect.assert_called_once_with('student')
+        self.assertIn("Checked 10 files, removed 3 orphaned files", output.getvalue())
+
+    def test_dry_run(self, mock_collector):
+        mock_collector.return_value.collect.return_value = (10, 3)
+        output = StringIO()
+        call_command('collect_orphaned_files', dry_run=True, stdout=output)
+
+        self.assertTrue(mock_collector.call_args[1]['dry_run'])
+        self.assertIn("Checked 10 files, found 3 orphaned files", output.getvalue())
+
+    def test_invalid_grace_period(self, mock_collector):
+        with self.assertRaises(CommandError):
+            call_command('collect_orphaned_files', grace_days=0)
+        self.assertFalse(mock_collector.called)
+
+    def test_storage_error(self, mock_collector):
+        mock_collector.return_value.collect.side_effect = FileUploadInternalError("Storage unavailable")
+        with self.assertRaises(CommandError):
+            call_command('collect_orphaned_files')
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+""" Test the download_submission_files management command """
+
+from __future__ import absolute_import
+
+from io import BytesIO
+import os
+import shutil
+import tempfile
+import zipfile
+
+from mock import patch
+
+from django.core.management import CommandError, call_command
+
+from openassessment.test_utils import CacheResetTest
+from submissions import api as sub_api
+
+
+class DownloadSubmissionFilesTest(CacheResetTest):
+    """ Test download_submission_files output and error conditions """
+
+    COURSE_ID = u"TɘꙅT ↄoUᴙꙅɘ"
+    ITEM_ID = u"test_item"
+
+    def setUp(self):
+        super(DownloadSubmissionFilesTest, self).setUp()
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+
+    def test_download_submission_files(self):
+        for index in range(3):
+            student_item = {
+                'student_id': u"test_user_{}".format(index),
+                'course_id': self.COURSE_ID,
+                'item_id': self.ITEM_ID,
+                'item_type': 'openassessment',
+            }
+            sub_api.create_submission(student_item, {'text': u"Answer {}".format(index), 'file_keys': ['key']})
+
+        output = os.path.join(self.output_dir, 'responses.zip')
+        with patch('openassessment.data.file_upload_api.open_file', side_effect=lambda key: BytesIO(b'content')):
+            call_command('download_submission_files', self.COURSE_ID, self.ITEM_ID, output=output, workers=2)
+
+        with zipfile.ZipFile(output) as archive:
+            self.assertEqual(len(archive.namelist()), 6)
+            self.assertEqual(archive.read(u'test_user_1/response.txt'), b'Answer 1')
+            self.assertEqual(archive.read(u'test_user_2/0_key'), b'content')
+
+    def test_invalid_workers(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                'download_submission_files', self.COURSE_ID, self.ITEM_ID,
+                output=os.path.join(self.output_dir, 'responses.zip'), workers=0
+            )
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+""" Test the generate_file_previews management command """
+
+from __future__ import absolute_import
+
+import datetime
+
+from mock import patch
+from six import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from openassessment.fileupload.exceptions import FileUploadInternalError
+
+LAST_MODIFIED = datetime.datetime(2020, 1, 1)
+
+
+@patch('openassessment.management.commands.generate_file_previews.previews.PreviewGenerator')
+@patch('openassessment.management.commands.generate_file_previews.backends.get_backend')
+class GenerateFilePreviewsTest(TestCase):
+    """ Test generate_file_previews options, output and error conditions """
+
+    def _list_files(self, prefix=''):
+        files = ['previews/student/course/item', 'student/course/item', 'student/course/item/1', 'other/course/item']
+        return [(key, LAST_MODIFIED) for key in files if key.startswith(prefix)]
+
+    def test_generate_previews(self, mock_get_backend, mock_generator):
+        mock_get_backend.return_value.list_files.side_effect = self._list_files
+        mock_generator.return_value.generate.side_effect = [True, False]
+        output = StringIO()
+        call_command('generate_file_previews', stdout=output)
+
+        # Files which already have a preview are skipped
+        self.assertEqual(
+            [call[0][0] for call in mock_generator.return_value.generate.call_args_list],
+            ['student/course/item/1', 'other/course/item']
+        )
+        self.assertIn("Checked 2 files, generated 1 previews", output.getvalue())
+
+    def test_force(self, mock_get_backend, mock_generator):
+        mock_get_backend.return_value.list_files.side_effect = self._list_files
+        mock_generator.return_value.generate.return_value = True
+        output = StringIO()
+        call_command('generate_file_previews', prefix='student/', force=True, stdout=output)
+
+        mock_get_backend.return_value.list_files.assert_called_once_with('student/')
+        self.assertIn("Checked 2 files, generated 2 previews", output.getvalue())
+
+    def test_generation_error(self, mock_get_backend, mock_generator):
+        mock_get_backend.return_value.list_files.side_effect = self._list_files
+        mock_generator.return_value.generate.side_effect = [FileUploadInternalError("Storage unavailable"), True]
+        output = StringIO()
+        call_command('generate_file_previews', stdout=output, stderr=StringIO())
+        self.assertIn("Checked 2 files, generated 1 previews", output.getvalue())
+
+    def test_listing_error(self, mock_get_backend, mock_generator):  # pylint: disable=unused-argument
+        mock_get_backend.return_value.list_files.side_effect = FileUploadInternalError("Storage unavailable")
+        with self.assertRaises(CommandError):
+            call_command('generate_file_previews')
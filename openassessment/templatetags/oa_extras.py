@@ -8,6 +8,7 @@ from django.utils.safestring import mark_safe
 
 import bleach
 from bleach import callbacks
+from openassessment.xblock import fragment_cache
 
 register = template.Library()  # pylint: disable=invalid-name
 
@@ -25,3 +26,67 @@ def link_and_linebreak(text):
     if text:
         escaped_text = conditional_escape(text)
         return mark_safe(linebreaks(bleach.linkify(escaped_text, callbacks=[callbacks.target_blank])))
+
+
+@register.filter()
+def get_item(dictionary, key):
+    """
+    Returns the value of the given key in a dict, or None if the dict is empty or undefined.
+    Args:
+        dictionary: (dict) Dict to look the key up in
+        key: Key to look up
+    Returns: The value of the key, or None
+    """
+    if not dictionary:
+        return None
+    return dictionary.get(key)
+
+
+class FragmentCacheNode(template.Node):
+    """
+    Renders the content of a `fragment_cache` tag, from the cache if possible.
+    """
+
+    def __init__(self, nodelist, name, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        prefix = context.get(fragment_cache.FRAGMENT_CACHE_CONTEXT_KEY)
+        if not prefix:
+            return self.nodelist.render(context)
+
+        return fragment_cache.get_fragment(
+            prefix,
+            self.name.resolve(context),
+            [variable.resolve(context) for variable in self.vary_on],
+            lambda: self.nodelist.render(context)
+        )
+
+
+@register.tag('fragment_cache')
+def do_fragment_cache(parser, token):
+    """
+    Caches a fragment of a template which only depends on the configuration of
+    the block, and on the given template variables.
+
+    The fragment is cached for the block being rendered if the block enabled
+    the fragment cache (see `openassessment.xblock.fragment_cache`), and
+    rendered as usual otherwise.
+
+    Usage:
+        {% fragment_cache "rubric_criterion" rubric_type xblock_id criterion.order_num %}
+            ... configuration-only HTML ...
+        {% endfragment_cache %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(u"'{}' tag requires at least 1 argument.".format(bits[0]))
+    nodelist = parser.parse(('endfragment_cache',))
+    parser.delete_first_token()
+    return FragmentCacheNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]]
+    )
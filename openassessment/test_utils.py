@@ -9,7 +9,13 @@ from django.test import TestCase, TransactionTestCase
 
 def _clear_all_caches():
     """Clear the default cache and any custom caches."""
+    # Import is placed here to avoid model import at project startup.
+    from openassessment.assessment.api import student_training
+    from openassessment.fileupload.backends import s3
+
     cache.clear()
+    student_training.clear_example_sets()
+    s3._S3_CONNECTIONS.reset()  # pylint: disable=protected-access
 
 
 class CacheResetTest(TestCase):
@@ -6,17 +6,20 @@ Tests for openassessment data aggregation.
 from __future__ import absolute_import, print_function
 
 import csv
+from io import BytesIO
 import json
 import os.path
+import zipfile
 
 import ddt
+from mock import patch
 import six
 from six.moves import range, zip
 
 from django.core.management import call_command
 
 import openassessment.assessment.api.peer as peer_api
-from openassessment.data import CsvWriter, OraAggregateData
+from openassessment.data import CsvWriter, OraAggregateData, SubmissionFilesZipWriter
 from openassessment.test_utils import TransactionCacheResetTest
 from openassessment.tests.factories import *  # pylint: disable=wildcard-import
 from openassessment.workflow import api as workflow_api, team_api as team_workflow_api
@@ -630,3 +633,79 @@ class TestOraAggregateDataIntegration(TransactionCacheResetTest):
         self.assertEqual(data[ITEM_ID], {'total': 2, 'peer': 2, 'staff': 0})
         self.assertEqual(data[item_id2], {'total': 1, 'peer': 1, 'staff': 0})
         self.assertEqual(data[item_id3], {'total': 1, 'peer': 1, 'staff': 0})
+
+
+class SubmissionFilesZipWriterTest(TransactionCacheResetTest):
+    """
+    Test for writing the responses to an ORA item to a .zip archive.
+    """
+
+    FILE_CONTENTS = {
+        'key-1': b'first file',
+        'key-2': b'second file' * 100000,
+    }
+
+    def _open_file(self, key):
+        """ Stand-in for the file upload API, which knows nothing about `key-missing`. """
+        if key not in self.FILE_CONTENTS:
+            return None
+        return BytesIO(self.FILE_CONTENTS[key])
+
+    def _write_archive(self, **kwargs):
+        """ Write the archive for the test item, and return it along with the number of files written. """
+        output = BytesIO()
+        with patch('openassessment.data.file_upload_api.open_file', side_effect=self._open_file):
+            num_files = SubmissionFilesZipWriter(output, **kwargs).write_to_zip(COURSE_ID, ITEM_ID)
+        output.seek(0)
+        return zipfile.ZipFile(output), num_files
+
+    def test_write_to_zip(self):
+        sub_api.create_submission(STUDENT_ITEM, {
+            'parts': [{'text': u'First part'}, {'text': u'𝓢𝓮𝓬𝓸𝓷𝓭 𝓹𝓪𝓻𝓽'}],
+            'file_keys': ['key-1', 'key-2', 'key-missing'],
+            'files_name': ['notes.txt', 'sub/dir.pdf', 'gone.png'],
+        })
+        sub_api.create_submission(SCORER_ITEM, {'text': u'Legacy answer', 'file_key': 'key-1'})
+        progress_callback = []
+
+        output = BytesIO()
+        with patch('openassessment.data.file_upload_api.open_file', side_effect=self._open_file):
+            writer = SubmissionFilesZipWriter(
+                output, max_workers=2, progress_callback=lambda: progress_callback.append(1)
+            )
+            num_files = writer.write_to_zip(COURSE_ID, ITEM_ID)
+        archive = zipfile.ZipFile(output)
+
+        # The missing file is skipped
+        self.assertEqual(num_files, 3)
+        self.assertEqual(len(progress_callback), 2)
+        self.assertEqual(sorted(archive.namelist()), [
+            u'{}/0_key-1'.format(SCORER_ID),
+            u'{}/response.txt'.format(SCORER_ID),
+            u'{}/0_notes.txt'.format(STUDENT_ID),
+            u'{}/1_sub_dir.pdf'.format(STUDENT_ID),
+            u'{}/response.txt'.format(STUDENT_ID),
+        ])
+        self.assertEqual(
+            archive.read(u'{}/response.txt'.format(STUDENT_ID)).decode('utf-8'),
+            u'First part\n\n𝓢𝓮𝓬𝓸𝓷𝓭 𝓹𝓪𝓻𝓽'
+        )
+        self.assertEqual(archive.read(u'{}/response.txt'.format(SCORER_ID)), b'Legacy answer')
+        self.assertEqual(archive.read(u'{}/1_sub_dir.pdf'.format(STUDENT_ID)), self.FILE_CONTENTS['key-2'])
+        self.assertEqual(archive.read(u'{}/0_key-1'.format(SCORER_ID)), self.FILE_CONTENTS['key-1'])
+
+    def test_many_submissions(self):
+        # Write more files than a single fetch batch holds
+        for index in range(SubmissionFilesZipWriter.FETCH_BATCH_SIZE + 5):
+            student_item = dict(STUDENT_ITEM, student_id=u'student-{}'.format(index))
+            sub_api.create_submission(student_item, {'text': u'Answer', 'file_keys': ['key-1']})
+
+        archive, num_files = self._write_archive(max_workers=4)
+
+        self.assertEqual(num_files, SubmissionFilesZipWriter.FETCH_BATCH_SIZE + 5)
+        self.assertEqual(archive.read(u'student-36/0_key-1'), self.FILE_CONTENTS['key-1'])
+
+    def test_no_submissions(self):
+        archive, num_files = self._write_archive()
+        self.assertEqual(num_files, 0)
+        self.assertEqual(archive.namelist(), [])
@@ -47,3 +47,13 @@ class OAExtrasTests(unittest.TestCase):
         rendered_template = self.template.render(Context({'text': text}))
         escaped_tag = "&lt;{tag}&gt;".format(tag=tag)
         self.assertIn(escaped_tag, rendered_template)
+
+    @ddt.data(
+        ({'key': 'value'}, 'key', 'value'),
+        ({'key': 'value'}, 'other', 'None'),
+        (None, 'key', 'None'),
+    )
+    @ddt.unpack
+    def test_get_item(self, dictionary, key, expected):
+        template = Template(u"{% load oa_extras %}{{ dictionary|get_item:key }}")
+        self.assertEqual(expected, template.render(Context({'dictionary': dictionary, 'key': key})))
@@ -0,0 +1,158 @@
+"""
+Index of the resolved start and due dates of the steps of OpenAssessment blocks.
+
+Checking whether the steps of a course's blocks are open requires loading
+each block and resolving its dates (see `OpenAssessmentBlock.is_closed`).
+The resolved dates of the steps of the blocks are indexed so that course-wide
+tools (dashboards, deadline reminder jobs) can query them with a single
+database query.
+
+In the LMS and Studio, the dates are indexed when the course is published,
+so they are the published dates, inherited from the subsection when the block
+doesn't set them.  Elsewhere (e.g. in the workbench), there is no publish step:
+the dates are indexed when the block is saved, so they are the draft dates,
+and changes to the dates the block inherits are only picked up when the block
+itself is saved again.
+
+The indexed dates are the dates configured for all learners: they do not
+include the earlier start of beta testers, or the access of course staff.
+"""
+from __future__ import absolute_import
+
+import logging
+
+from django.db import DatabaseError
+
+from openassessment.workflow.errors import AssessmentWorkflowInternalError, AssessmentWorkflowRequestError
+from openassessment.workflow.models import StepDeadline
+from openassessment.workflow.signals import get_course_published_signal
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+# Fields of the indexed step dates returned by the API
+DEADLINE_FIELDS = ('course_id', 'item_id', 'step', 'start', 'due')
+
+
+def is_indexed_on_publish():
+    """
+    Check whether the dates are indexed when a course is published,
+    rather than when each block is saved.
+
+    Returns:
+        bool
+    """
+    return get_course_published_signal() is not None
+
+
+def update_step_deadlines(course_id, item_id, deadlines):
+    """
+    Replace the indexed dates of the steps of an item.
+
+    Args:
+        course_id (unicode): The course of the item.
+        item_id (unicode): The usage ID of the item.
+        deadlines (list): (step, start, due) tuples, where `step` is "problem",
+            "submission" or the name of an assessment, and `start` and `due` are
+            timezone-aware datetimes, or None if the step has no start (or due) date.
+
+    Returns:
+        None
+
+    Raises:
+        AssessmentWorkflowInternalError: The dates could not be saved.
+    """
+    try:
+        StepDeadline.replace_item_deadlines(course_id, item_id, deadlines)
+    except DatabaseError:
+        err_msg = u"Could not index the step dates of item {item_id} in course {course_id}".format(
+            item_id=item_id, course_id=course_id
+        )
+        logger.exception(err_msg)
+        raise AssessmentWorkflowInternalError(err_msg)
+
+
+def update_course_step_deadlines(course_id, item_deadlines):
+    """
+    Replace the indexed dates of the steps of every item of a course, in a single transaction.
+    The dates of the items of the course which are not given are removed from the index.
+
+    Args:
+        course_id (unicode): The course of the items.
+        item_deadlines (dict): Maps the usage ID of each item of the course to its
+            (step, start, due) tuples (see `update_step_deadlines`).
+
+    Returns:
+        None
+
+    Raises:
+        AssessmentWorkflowInternalError: The dates could not be saved.
+    """
+    try:
+        StepDeadline.replace_course_deadlines(course_id, item_deadlines)
+    except DatabaseError:
+        err_msg = u"Could not index the step dates of course {course_id}".format(course_id=course_id)
+        logger.exception(err_msg)
+        raise AssessmentWorkflowInternalError(err_msg)
+
+
+def get_step_deadlines(course_id, item_id=None):
+    """
+    Return the indexed dates of the steps of the items of a course.
+
+    Args:
+        course_id (unicode): The course of the items.
+
+    Keyword Arguments:
+        item_id (unicode): If specified, only return the dates of the steps of this item.
+
+    Returns:
+        list of dicts with keys "course_id", "item_id", "step", "start" and "due"
+    """
+    deadlines = StepDeadline.objects.filter(course_id=course_id)
+    if item_id is not None:
+        deadlines = deadlines.filter(item_id=item_id)
+    return list(deadlines.values(*DEADLINE_FIELDS))
+
+
+def get_steps_in_window(window_start, window_end, boundary='due', course_id=None):
+    """
+    Return the indexed steps which open (or close) within a time window.
+
+    Args:
+        window_start (datetime): The (inclusive) start of the window.
+        window_end (datetime): The (exclusive) end of the window.
+
+    Keyword Arguments:
+        boundary (str): "start" to find the steps which open within the window,
+            "due" to find the steps which close within the window.
+        course_id (unicode): If specified, only return the steps of the items of this course.
+
+    Returns:
+        list of dicts with keys "course_id", "item_id", "step", "start" and "due",
+        ordered by the boundary date.
+
+    Raises:
+        AssessmentWorkflowRequestError: The boundary is neither "start" nor "due".
+
+    Example:
+        >>> get_steps_in_window(now, now + timedelta(days=1), boundary='due')
+        [
+            {
+                'course_id': 'course-v1:edX+DemoX+Demo_Course',
+                'item_id': 'block-v1:edX+DemoX+Demo_Course+type@openassessment+block@essay',
+                'step': 'peer-assessment',
+                'start': datetime.datetime(2020, 3, 1, 0, 0, tzinfo=<UTC>),
+                'due': datetime.datetime(2020, 3, 27, 12, 0, tzinfo=<UTC>),
+            }
+        ]
+    """
+    if boundary not in ('start', 'due'):
+        raise AssessmentWorkflowRequestError({'boundary': u"Must be either 'start' or 'due'"})
+
+    deadlines = StepDeadline.objects.filter(**{
+        '{}__gte'.format(boundary): window_start,
+        '{}__lt'.format(boundary): window_end,
+    })
+    if course_id is not None:
+        deadlines = deadlines.filter(course_id=course_id)
+    return list(deadlines.order_by(boundary, 'id').values(*DEADLINE_FIELDS))
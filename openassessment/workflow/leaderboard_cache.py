@@ -0,0 +1,99 @@
+"""
+Materialized leaderboards of the OpenAssessment XBlock.
+
+Rendering the leaderboard means fetching the top submissions, signing a
+download URL for every attached file and building the submission dicts
+shown in the template.  The result of all of that work is cached per
+(course, item, item type, number of scores shown) so that page loads can
+reuse it.
+
+Every (course, item) pair has a version stored alongside the materialized
+leaderboards.  Changing the version (whenever a score is set or reset for
+the item) orphans every leaderboard materialized for that item, so the next
+page load rebuilds it from fresh scores.
+"""
+from __future__ import absolute_import
+
+from uuid import uuid4
+
+from django.core.cache import cache
+
+from openassessment.cache_utils import get_cache_key_digest
+from openassessment.fileupload.backends.base import BaseBackend
+
+# Signed download URLs are stored in the materialized leaderboard, so the
+# leaderboard must expire before they do: it signs them again rather than
+# reusing cached URLs, which may be close to expiring.  The margin leaves learners
+# time to actually follow a link rendered just before the cache entry expires.
+LEADERBOARD_URL_EXPIRY_MARGIN = 60
+LEADERBOARD_CACHE_TIMEOUT = BaseBackend.DOWNLOAD_URL_TIMEOUT - LEADERBOARD_URL_EXPIRY_MARGIN
+
+
+def _version_cache_key(course_id, item_id):
+    """
+    Return the cache key that stores the leaderboard version of an item.
+    """
+    return "openassessment.leaderboard.version.{}".format(get_cache_key_digest(course_id, item_id))
+
+
+def get_leaderboard_version(course_id, item_id):
+    """
+    Return the current leaderboard version for an item, creating one if necessary.
+
+    Args:
+        course_id (unicode): The course the item belongs to.
+        item_id (unicode): The item (usage ID) of the problem.
+
+    Returns:
+        unicode
+    """
+    key = _version_cache_key(course_id, item_id)
+    version = cache.get(key)
+    if version is None:
+        # Use `add` so that a concurrent invalidation isn't overwritten.
+        cache.add(key, uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_leaderboard(course_id, item_id):
+    """
+    Discard every materialized leaderboard for an item.
+
+    Args:
+        course_id (unicode): The course the item belongs to.
+        item_id (unicode): The item (usage ID) of the problem.
+
+    Returns:
+        None
+    """
+    cache.set(_version_cache_key(course_id, item_id), uuid4().hex, None)
+
+
+def leaderboard_cache_key(student_item_dict, number_of_scores, prompts):
+    """
+    Return the cache key of the materialized leaderboard for an item.
+
+    The prompts are part of the key because the rendered submission dicts
+    pair each answer with its prompt, so editing them in Studio must not
+    serve stale payloads.
+
+    Args:
+        student_item_dict (dict): The student item; only the course ID,
+            item ID and item type are used.
+        number_of_scores (int): The number of top scores displayed.
+        prompts (list): The prompts of the problem.
+
+    Returns:
+        str
+    """
+    course_id = student_item_dict['course_id']
+    item_id = student_item_dict['item_id']
+    return "openassessment.leaderboard.{}".format(get_cache_key_digest(
+        course_id,
+        item_id,
+        student_item_dict['item_type'],
+        number_of_scores,
+        prompts,
+        get_leaderboard_version(course_id, item_id),
+    ))
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workflow', '0003_TeamWorkflows'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StepDeadline',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', models.CharField(db_index=True, max_length=255)),
+                ('item_id', models.CharField(db_index=True, max_length=255)),
+                ('step', models.CharField(max_length=32)),
+                ('start', models.DateTimeField(db_index=True, default=None, null=True)),
+                ('due', models.DateTimeField(db_index=True, default=None, null=True)),
+            ],
+            options={
+                'ordering': ['course_id', 'item_id', 'id'],
+                'unique_together': {('item_id', 'step')},
+            },
+        ),
+    ]
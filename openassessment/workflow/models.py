@@ -27,8 +27,10 @@ from model_utils.models import StatusModel, TimeStampedModel
 from openassessment.assessment.errors.base import AssessmentError
 from openassessment.assessment.signals import assessment_complete_signal
 from submissions import api as sub_api, team_api as sub_team_api
+from submissions.models import score_reset, score_set
 
 from .errors import AssessmentApiLoadError, AssessmentWorkflowError, AssessmentWorkflowInternalError
+from .leaderboard_cache import invalidate_leaderboard
 
 logger = logging.getLogger('openassessment.workflow.models')  # pylint: disable=invalid-name
 
@@ -980,3 +982,109 @@ class AssessmentWorkflowCancellation(models.Model):
         """
         workflow_cancellations = cls.objects.filter(workflow__submission_uuid=submission_uuid).order_by("-created_at")
         return workflow_cancellations[0] if workflow_cancellations.exists() else None
+
+
+@python_2_unicode_compatible
+class StepDeadline(models.Model):
+    """The resolved start and due dates of a step of an OpenAssessment block.
+
+    The dates of a step are resolved by the XBlock from the dates of the
+    problem and of the other steps (see `resolve_dates`), which requires
+    loading the block.  This table indexes the resolved dates of every step
+    of every block, so that course-wide tools (dashboards, deadline reminders)
+    can find the steps which open or close within a time window without
+    loading blocks.
+
+    Rows are replaced for the whole course whenever it is published (see
+    `openassessment.workflow.signals`), or for a block whenever it is saved
+    where courses aren't published (e.g. in the workbench).
+
+    The `step` is "problem" for the problem as a whole, "submission" for the
+    submission step, or the name of an assessment (e.g. "peer-assessment").
+    Steps which have no start (or due) date have a null `start` (or `due`).
+    """
+    course_id = models.CharField(max_length=255, blank=False, db_index=True)
+    item_id = models.CharField(max_length=255, blank=False, db_index=True)
+    step = models.CharField(max_length=32)
+    start = models.DateTimeField(default=None, null=True, db_index=True)
+    due = models.DateTimeField(default=None, null=True, db_index=True)
+
+    class Meta:
+        ordering = ["course_id", "item_id", "id"]
+        unique_together = ("item_id", "step")
+        app_label = "workflow"
+
+    def __repr__(self):
+        return (
+            "StepDeadline(course_id={0.course_id}, item_id={0.item_id}, "
+            "step={0.step}, start={0.start}, due={0.due})"
+        ).format(self)
+
+    def __str__(self):
+        return repr(self)
+
+    @classmethod
+    def replace_item_deadlines(cls, course_id, item_id, deadlines):
+        """
+        Replace the indexed dates of the steps of an item.
+
+        Args:
+            course_id (unicode): The course of the item.
+            item_id (unicode): The usage ID of the item.
+            deadlines (list): (step, start, due) tuples, with timezone-aware datetimes (or None).
+
+        Returns:
+            list of StepDeadline
+        """
+        with transaction.atomic():
+            cls.objects.filter(item_id=item_id).delete()
+            return cls.objects.bulk_create([
+                cls(course_id=course_id, item_id=item_id, step=step, start=start, due=due)
+                for step, start, due in deadlines
+            ])
+
+    @classmethod
+    def replace_course_deadlines(cls, course_id, item_deadlines):
+        """
+        Replace the indexed dates of the steps of every item of a course.
+
+        The rows of the items of the course which are not given (e.g. because
+        they were deleted from the course) are removed.
+
+        Args:
+            course_id (unicode): The course of the items.
+            item_deadlines (dict): Maps the usage ID of each item of the course to its
+                (step, start, due) tuples, with timezone-aware datetimes (or None).
+
+        Returns:
+            list of StepDeadline
+        """
+        with transaction.atomic():
+            cls.objects.filter(course_id=course_id).delete()
+            cls.objects.filter(item_id__in=list(item_deadlines)).delete()
+            return cls.objects.bulk_create([
+                cls(course_id=course_id, item_id=item_id, step=step, start=start, due=due)
+                for item_id, deadlines in item_deadlines.items()
+                for step, start, due in deadlines
+            ])
+
+
+@receiver(score_set)
+@receiver(score_reset)
+def invalidate_leaderboard_on_score_change(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Discard the materialized leaderboards of an item whenever one of its scores
+    is set or reset, so that the next leaderboard render picks up the change.
+
+    Args:
+        sender (object): Not used
+
+    Keyword Arguments:
+        course_id (unicode): The course of the item whose score changed.
+        item_id (unicode): The item whose score changed.
+
+    Returns:
+        None
+
+    """
+    invalidate_leaderboard(kwargs['course_id'], kwargs['item_id'])
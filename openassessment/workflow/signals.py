@@ -0,0 +1,72 @@
+"""
+Receivers of the signals sent by the LMS and Studio (edx-platform).
+
+The receivers are connected when the application is ready (see
+`openassessment.apps.OpenAssessmentConfig`), and only if the signals are
+available: outside of the LMS and Studio, the modulestore isn't installed.
+"""
+from __future__ import absolute_import
+
+import logging
+
+import six
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+def get_course_published_signal():
+    """
+    Return the signal the modulestore sends when a course is published,
+    or None if the modulestore isn't installed.
+    """
+    try:
+        from xmodule.modulestore.django import SignalHandler  # pylint: disable=import-error
+    except ImportError:
+        return None
+    return SignalHandler.course_published
+
+
+def index_published_step_deadlines(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Index the dates of the steps of the published OpenAssessment blocks of a course
+    (see `openassessment.workflow.deadlines_api`), if the ORA2_DEADLINE_INDEX setting is enabled.
+
+    The published blocks inherit the dates of their subsection, so the index
+    also follows changes made to the dates of the subsection.  The dates of
+    every block are replaced in a single transaction, which also removes the
+    blocks deleted from the course.  Blocks with invalid dates are left out.
+
+    Args:
+        sender (object): Not used
+        course_key (CourseKey): The course which was published.
+
+    Returns:
+        None
+
+    """
+    if not getattr(settings, 'ORA2_DEADLINE_INDEX', False):
+        return
+
+    # Import is placed here to avoid model import at project startup.
+    from openassessment.workflow import deadlines_api
+    from openassessment.workflow.errors import AssessmentWorkflowInternalError
+    from openassessment.xblock.resolve_dates import DateValidationError, InvalidDateFormat
+    from xmodule.modulestore import ModuleStoreEnum  # pylint: disable=import-error
+    from xmodule.modulestore.django import modulestore  # pylint: disable=import-error
+
+    item_deadlines = {}
+    store = modulestore()
+    with store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+        for block in store.get_items(course_key, qualifiers={'category': 'openassessment'}):
+            try:
+                item_deadlines[six.text_type(block.location)] = block.get_step_deadlines()
+            except (DateValidationError, InvalidDateFormat):
+                logger.exception(u'Could not index the step dates of {}'.format(block.location))
+
+    try:
+        deadlines_api.update_course_step_deadlines(six.text_type(course_key), item_deadlines)
+    except AssessmentWorkflowInternalError:
+        # The error is logged by the API: publishing the course must not fail because of the index
+        pass
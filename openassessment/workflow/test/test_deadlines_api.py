@@ -0,0 +1,102 @@
+""" Test Cases for the Step Deadlines API """
+from __future__ import absolute_import
+
+import datetime as dt
+
+from mock import patch
+import pytz
+
+from django.db import DatabaseError
+
+from openassessment.test_utils import CacheResetTest
+from openassessment.workflow import deadlines_api
+from openassessment.workflow.errors import AssessmentWorkflowInternalError, AssessmentWorkflowRequestError
+from openassessment.workflow.models import StepDeadline
+
+COURSE_ID = 'edX/Enchantment_101/April_1'
+OTHER_COURSE_ID = 'edX/Enchantment_102/April_1'
+
+MARCH_1 = dt.datetime(2020, 3, 1, tzinfo=pytz.utc)
+MARCH_10 = dt.datetime(2020, 3, 10, tzinfo=pytz.utc)
+MARCH_20 = dt.datetime(2020, 3, 20, tzinfo=pytz.utc)
+
+
+class TestStepDeadlinesApi(CacheResetTest):
+    """ Test the index of the step dates of items """
+
+    def setUp(self):
+        super(TestStepDeadlinesApi, self).setUp()
+        deadlines_api.update_step_deadlines(COURSE_ID, 'item-1', [
+            ('problem', None, None),
+            ('submission', MARCH_1, MARCH_10),
+            ('peer-assessment', MARCH_10, MARCH_20),
+        ])
+        deadlines_api.update_step_deadlines(OTHER_COURSE_ID, 'item-2', [
+            ('submission', MARCH_1, MARCH_20),
+        ])
+
+    def test_get_step_deadlines(self):
+        deadlines = deadlines_api.get_step_deadlines(COURSE_ID)
+        self.assertEqual(len(deadlines), 3)
+        self.assertEqual(deadlines[1], {
+            'course_id': COURSE_ID,
+            'item_id': 'item-1',
+            'step': 'submission',
+            'start': MARCH_1,
+            'due': MARCH_10,
+        })
+        self.assertEqual(deadlines_api.get_step_deadlines(COURSE_ID, 'item-2'), [])
+
+    def test_update_replaces_deadlines(self):
+        deadlines_api.update_step_deadlines(COURSE_ID, 'item-1', [('submission', MARCH_10, MARCH_20)])
+        deadlines = deadlines_api.get_step_deadlines(COURSE_ID, 'item-1')
+        self.assertEqual([(d['step'], d['start'], d['due']) for d in deadlines], [('submission', MARCH_10, MARCH_20)])
+
+    def test_update_course_replaces_deadlines(self):
+        deadlines_api.update_course_step_deadlines(COURSE_ID, {
+            'item-3': [('submission', MARCH_10, MARCH_20)],
+        })
+
+        # The items no longer in the course are removed, and other courses are left unchanged
+        deadlines = deadlines_api.get_step_deadlines(COURSE_ID)
+        self.assertEqual(
+            [(d['item_id'], d['step'], d['start'], d['due']) for d in deadlines],
+            [('item-3', 'submission', MARCH_10, MARCH_20)]
+        )
+        self.assertEqual(len(deadlines_api.get_step_deadlines(OTHER_COURSE_ID)), 1)
+
+    @patch.object(StepDeadline.objects, 'bulk_create')
+    def test_update_course_database_error(self, mock_create):
+        mock_create.side_effect = DatabaseError("Kaboom!")
+        with self.assertRaises(AssessmentWorkflowInternalError):
+            deadlines_api.update_course_step_deadlines(COURSE_ID, {'item-3': [('submission', MARCH_10, MARCH_20)]})
+
+        # The deadlines of the course are left unchanged
+        self.assertEqual(len(deadlines_api.get_step_deadlines(COURSE_ID, 'item-1')), 3)
+
+    def test_get_steps_in_window(self):
+        closing = deadlines_api.get_steps_in_window(MARCH_10, MARCH_20 + dt.timedelta(days=1))
+        self.assertEqual(
+            [(d['item_id'], d['step']) for d in closing],
+            [('item-1', 'submission'), ('item-1', 'peer-assessment'), ('item-2', 'submission')]
+        )
+
+        # Steps without dates never open or close, and the end of the window is excluded
+        opening = deadlines_api.get_steps_in_window(MARCH_1, MARCH_10, boundary='start', course_id=COURSE_ID)
+        self.assertEqual([(d['item_id'], d['step']) for d in opening], [('item-1', 'submission')])
+
+    def test_indexed_on_save_without_modulestore(self):
+        self.assertFalse(deadlines_api.is_indexed_on_publish())
+
+    def test_get_steps_in_window_invalid_boundary(self):
+        with self.assertRaises(AssessmentWorkflowRequestError):
+            deadlines_api.get_steps_in_window(MARCH_1, MARCH_10, boundary='end')
+
+    @patch.object(StepDeadline.objects, 'bulk_create')
+    def test_update_database_error(self, mock_create):
+        mock_create.side_effect = DatabaseError("Kaboom!")
+        with self.assertRaises(AssessmentWorkflowInternalError):
+            deadlines_api.update_step_deadlines(COURSE_ID, 'item-1', [('submission', MARCH_10, MARCH_20)])
+
+        # The deadlines of the item are left unchanged
+        self.assertEqual(len(deadlines_api.get_step_deadlines(COURSE_ID, 'item-1')), 3)
@@ -0,0 +1,87 @@
+"""
+Read-only view of the assessment configuration of an OpenAssessment XBlock.
+
+Rendering a single step reads the configured assessments, the list of steps
+and their date ranges dozens of times, and each read used to copy, reformat
+and (for dates) parse the XBlock fields again.  The `BlockConfiguration`
+computes them once, for as long as the fields don't change.
+"""
+from __future__ import absolute_import
+
+from lazy import lazy
+
+from openassessment.xblock.resolve_dates import resolve_dates
+
+
+class BlockConfiguration:
+    """
+    The assessments and date ranges configured for a block.
+
+    The assessments are shared by every caller: they must be copied before
+    being modified (see `OpenAssessmentBlock.valid_assessments`).
+
+    Example:
+        >>> configuration = BlockConfiguration(assessments, start, due, submission_start, submission_due, _)
+        >>> configuration.assessment_steps
+        ('peer-assessment', 'self-assessment')
+        >>> configuration.get_open_range('peer-assessment')
+        (datetime.datetime(2014, 3, 27, 22, 7, 38, tzinfo=<UTC>), datetime.datetime(9999, 1, 1, 0, 0, tzinfo=<UTC>))
+    """
+
+    def __init__(self, assessments, start, due, submission_start, submission_due, _):
+        """
+        Args:
+            assessments (list): The valid assessments, in the current format (see `update_assessments_format`).
+            start (str or datetime): The start date of the problem.
+            due (str or datetime): The due date of the problem.
+            submission_start (str): The start date of the submission step.
+            submission_due (str): The due date of the submission step.
+            _ (function): The i18n service function used to translate date errors.
+        """
+        self.assessments = tuple(assessments)
+        self.assessment_steps = tuple(assessment['name'] for assessment in self.assessments)
+        self.step_index = {step: index for index, step in enumerate(self.assessment_steps)}
+        self._dates = (start, due, submission_start, submission_due)
+        self._ = _
+
+    def get_assessment(self, step):
+        """
+        Return the configuration of an assessment step, or None if the step isn't configured.
+        """
+        index = self.step_index.get(step)
+        return self.assessments[index] if index is not None else None
+
+    @lazy
+    def date_ranges(self):
+        """
+        The resolved (start, due) datetimes of the problem, of the submission step
+        and of each assessment step.
+
+        Dates are resolved on first access, so that invalid dates only raise
+        (InvalidDateFormat or DateValidationError) when dates are used.
+
+        Returns:
+            tuple of (problem_range, submission_range, list of assessment_ranges)
+        """
+        start, due, submission_start, submission_due = self._dates
+        problem_start, problem_due, date_ranges = resolve_dates(
+            start,
+            due,
+            [(submission_start, submission_due)] + [
+                (assessment.get('start'), assessment.get('due')) for assessment in self.assessments
+            ],
+            self._
+        )
+        return (problem_start, problem_due), date_ranges[0], date_ranges[1:]
+
+    def get_open_range(self, step=None):
+        """
+        Return the (start, due) datetimes of a step, or of the problem if the step
+        is None or isn't configured.
+        """
+        problem_range, submission_range, assessment_ranges = self.date_ranges
+        if step == 'submission':
+            return submission_range
+        if step in self.step_index:
+            return assessment_ranges[self.step_index[step]]
+        return problem_range
@@ -0,0 +1,112 @@
+"""
+Cache of the HTML fragments which only depend on the configuration of a block.
+
+Large parts of the sections rendered for learners (the prompts, the rubric
+criteria with their options and explanations) are the same for every learner
+of a block, yet they are rendered again on every request.  With the
+ORA2_FRAGMENT_CACHE setting enabled, the `{% fragment_cache %}` template tag
+(see `openassessment.templatetags.oa_extras`) keeps these fragments in the
+Django cache, so that rendering a section only renders the learner state.
+
+Cached fragments are keyed by:
+    * the usage ID of the block,
+    * the content version of the block: a hash of the configuration the
+      fragments are rendered from, which changes whenever an author edits it,
+    * the language of the request (the fragments contain translated text),
+    * the release of ORA2 (the markup of the fragments changes with the templates),
+    * the name of the fragment and the template variables it varies on.
+"""
+from __future__ import absolute_import
+
+from functools import lru_cache
+
+import pkg_resources
+import six
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
+
+from openassessment.cache_utils import get_cache_key_digest
+
+# Name of the template variable holding the cache key prefix of the rendered block
+FRAGMENT_CACHE_CONTEXT_KEY = 'oa_fragment_cache_prefix'
+
+# Fragments are keyed by the content of the block, so they never become stale:
+# the timeout only lets the cache evict fragments of blocks which are no longer used.
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Fields of the block from which the cached fragments are rendered
+CONTENT_FIELDS = (
+    'allow_latex',
+    'prompts',
+    'prompts_type',
+    'rubric_criteria',
+    'rubric_feedback_prompt',
+    'rubric_feedback_default_text',
+)
+
+
+def fragment_cache_enabled():
+    """
+    Return True if the configuration-only fragments are cached.
+    """
+    return getattr(settings, 'ORA2_FRAGMENT_CACHE', False)
+
+
+@lru_cache(maxsize=None)
+def _get_release():
+    """
+    Return the installed release of ORA2, or an empty string in a source checkout.
+    """
+    try:
+        return pkg_resources.get_distribution('ora2').version
+    except pkg_resources.DistributionNotFound:
+        return ''
+
+
+def get_content_version(block):
+    """
+    Return a hash of the configuration of the block which the cached fragments are rendered from.
+    """
+    return get_cache_key_digest(*[getattr(block, field) for field in CONTENT_FIELDS])
+
+
+def get_cache_prefix(block):
+    """
+    Return the prefix of the cache keys of the fragments of a block, for the current language.
+
+    Args:
+        block (OpenAssessmentBlock): The block being rendered.
+
+    Returns:
+        unicode
+    """
+    return u"openassessment.fragment.{}".format(get_cache_key_digest(
+        block.get_xblock_id(),
+        get_content_version(block),
+        translation.get_language(),
+        _get_release(),
+    ))
+
+
+def get_fragment(prefix, name, vary_on, render):
+    """
+    Return a cached fragment, rendering and caching it if it isn't in the cache.
+
+    Args:
+        prefix (unicode): The cache key prefix of the block (see `get_cache_prefix`).
+        name (unicode): The name of the fragment, unique within the templates of the block.
+        vary_on (list): The values of the template variables the fragment depends on,
+            besides the configuration of the block.
+        render (callable): Renders the fragment.
+
+    Returns:
+        unicode
+    """
+    key = u"{}.{}.{}".format(prefix, name, get_cache_key_digest(*[six.text_type(value) for value in vary_on]))
+    fragment = cache.get(key)
+    if fragment is None:
+        fragment = render()
+        cache.set(key, fragment, FRAGMENT_CACHE_TIMEOUT)
+    return fragment
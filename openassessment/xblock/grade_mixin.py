@@ -12,6 +12,13 @@ from openassessment.assessment.errors import PeerAssessmentError, SelfAssessment
 from xblock.core import XBlock
 
 from .data_conversion import create_submission_dict
+from .lazy_module import LazyModule
+
+file_upload_api = LazyModule('openassessment.fileupload.api')  # pylint: disable=invalid-name
+peer_api = LazyModule('openassessment.assessment.api.peer')  # pylint: disable=invalid-name
+self_api = LazyModule('openassessment.assessment.api.self')  # pylint: disable=invalid-name
+staff_api = LazyModule('openassessment.assessment.api.staff')  # pylint: disable=invalid-name
+sub_api = LazyModule('submissions.api')  # pylint: disable=invalid-name
 
 
 class GradeMixin:
@@ -39,9 +46,6 @@ class GradeMixin:
         Returns:
             unicode: HTML content of the grade step.
         """
-        # Import is placed here to avoid model import at project startup.
-        from submissions import api as sub_api
-
         # Retrieve the status of the workflow.  If no workflows have been
         # started this will be an empty dict, so status will be None.
         workflow = self.get_workflow_info()
@@ -85,12 +89,6 @@ class GradeMixin:
         Returns:
             tuple of context (dict), template_path (string)
         """
-        # Import is placed here to avoid model import at project startup.
-        from openassessment.assessment.api import peer as peer_api
-        from openassessment.assessment.api import self as self_api
-        from openassessment.assessment.api import staff as staff_api
-        from submissions import api as sub_api
-
         # Peer specific stuff...
         assessment_steps = self.assessment_steps
         submission_uuid = workflow['submission_uuid']
@@ -145,7 +143,9 @@ class GradeMixin:
             'file_upload_type': self.file_upload_type,
             'allow_latex': self.allow_latex,
             'prompts_type': self.prompts_type,
-            'file_urls': self.get_download_urls_from_submission(student_submission),
+            'file_urls': self.get_download_urls_from_submission(
+                student_submission, defer_urls=file_upload_api.defer_download_urls()
+            ),
             'xblock_id': self.get_xblock_id()
         }
 
@@ -191,9 +191,6 @@ class GradeMixin:
             Dict with keys 'success' (bool) and 'msg' (unicode)
 
         """
-        # Import is placed here to avoid model import at project startup.
-        from openassessment.assessment.api import peer as peer_api
-
         feedback_text = data.get('feedback_text', u'')
         feedback_options = data.get('feedback_options', list())
 
@@ -255,11 +252,6 @@ class GradeMixin:
             }
 
         """
-        # Import is placed here to avoid model import at project startup.
-        from openassessment.assessment.api import peer as peer_api
-        from openassessment.assessment.api import self as self_api
-        from openassessment.assessment.api import staff as staff_api
-
         criteria = copy.deepcopy(self.rubric_criteria_with_labels)
 
         def has_feedback(assessments):
@@ -281,41 +273,44 @@ class GradeMixin:
                 for assessment in assessments
             )
 
-        max_scores = peer_api.get_rubric_max_scores(submission_uuid)
-        median_scores = None
-        assessment_steps = self.assessment_steps
-        if staff_assessment:
-            median_scores = staff_api.get_assessment_scores_by_criteria(submission_uuid)
-        elif "peer-assessment" in assessment_steps:
-            median_scores = peer_api.get_assessment_median_scores(submission_uuid)
-        elif "self-assessment" in assessment_steps:
-            median_scores = self_api.get_assessment_scores_by_criteria(submission_uuid)
-
-        for criterion in criteria:
-            criterion_name = criterion['name']
-
-            # Record assessment info for the current criterion
-            criterion['assessments'] = self._graded_assessments(
-                submission_uuid, criterion,
-                assessment_steps,
-                staff_assessment,
-                peer_assessments,
-                self_assessment,
-                is_staff=is_staff,
-            )
+        # Share API results (notably the peer median scores, which are looked up
+        # again for every criterion) across the whole computation.
+        with self.request_cache.scope() as request_cache:
+            max_scores = request_cache.call(peer_api.get_rubric_max_scores, submission_uuid)
+            median_scores = None
+            assessment_steps = self.assessment_steps
+            if staff_assessment:
+                median_scores = request_cache.call(staff_api.get_assessment_scores_by_criteria, submission_uuid)
+            elif "peer-assessment" in assessment_steps:
+                median_scores = request_cache.call(peer_api.get_assessment_median_scores, submission_uuid)
+            elif "self-assessment" in assessment_steps:
+                median_scores = request_cache.call(self_api.get_assessment_scores_by_criteria, submission_uuid)
+
+            for criterion in criteria:
+                criterion_name = criterion['name']
+
+                # Record assessment info for the current criterion
+                criterion['assessments'] = self._graded_assessments(
+                    submission_uuid, criterion,
+                    assessment_steps,
+                    staff_assessment,
+                    peer_assessments,
+                    self_assessment,
+                    is_staff=is_staff,
+                )
 
-            # Record whether there is any feedback provided in the assessments
-            criterion['has_feedback'] = has_feedback(criterion['assessments'])
+                # Record whether there is any feedback provided in the assessments
+                criterion['has_feedback'] = has_feedback(criterion['assessments'])
 
-            # Although we prevent course authors from modifying criteria post-release,
-            # it's still possible for assessments created by course staff to
-            # have criteria that differ from the current problem definition.
-            # It's also possible to circumvent the post-release restriction
-            # if course authors directly import a course into Studio.
-            # If this happens, we simply leave the score blank so that the grade
-            # section can render without error.
-            criterion['median_score'] = median_scores.get(criterion_name, '')
-            criterion['total_value'] = max_scores.get(criterion_name, '')
+                # Although we prevent course authors from modifying criteria post-release,
+                # it's still possible for assessments created by course staff to
+                # have criteria that differ from the current problem definition.
+                # It's also possible to circumvent the post-release restriction
+                # if course authors directly import a course into Studio.
+                # If this happens, we simply leave the score blank so that the grade
+                # section can render without error.
+                criterion['median_score'] = median_scores.get(criterion_name, '')
+                criterion['total_value'] = max_scores.get(criterion_name, '')
 
         return {
             'criteria': criteria,
@@ -407,10 +402,7 @@ class GradeMixin:
             The option for the median peer grade.
 
         """
-        # Import is placed here to avoid model import at project startup.
-        from openassessment.assessment.api import peer as peer_api
-
-        median_scores = peer_api.get_assessment_median_scores(submission_uuid)
+        median_scores = self.request_cache.call(peer_api.get_assessment_median_scores, submission_uuid)
         median_score = median_scores.get(criterion['name'], None)
         median_score = -1 if not median_score else median_score
 
@@ -0,0 +1,56 @@
+"""
+Lazy references to the modules of the APIs used by the OpenAssessment XBlock.
+
+The XBlock module is imported when the runtime loads its entry points, often
+before Django apps are ready, and the APIs of the assessments, workflows,
+submissions and file uploads all import Django models (and, for file
+uploads, a storage SDK).  Mixins used to import these APIs inside each method
+("Import is placed here to avoid model import at project startup"); a
+`LazyModule` gives them a module-level reference instead, which imports the
+module on first use.
+"""
+from __future__ import absolute_import
+
+from importlib import import_module
+import sys
+
+
+class LazyModule:
+    """
+    Proxy to a module, which is imported when one of its attributes is first used.
+
+    Attributes set (or deleted) on the proxy are set on the module, so that
+    tests can patch the module through the proxy.
+
+    Example:
+        >>> workflow_api = LazyModule('openassessment.workflow.api')  # Nothing is imported
+        >>> workflow_api.get_workflow_for_submission(submission_uuid, requirements)
+    """
+
+    def __init__(self, name):
+        object.__setattr__(self, '_name', name)
+
+    def _load(self):
+        """
+        Return the module, importing it if necessary (modules are then cached in `sys.modules`).
+
+        Like `from package import module`, the module is looked up as an
+        attribute of its package, so that patching the package patches the proxy.
+        """
+        module = import_module(self._name)
+        package_name, __, module_name = self._name.rpartition('.')
+        if not package_name:
+            return module
+        return getattr(sys.modules[package_name], module_name, module)
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._load(), attribute, value)
+
+    def __delattr__(self, attribute):
+        delattr(self._load(), attribute)
+
+    def __repr__(self):
+        return u"<LazyModule '{}'>".format(self._name)
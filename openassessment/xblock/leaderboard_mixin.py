@@ -6,15 +6,18 @@ from __future__ import absolute_import
 import logging
 import six
 
+from django.core.cache import cache
 from django.utils.translation import ugettext as _
 
 from openassessment.assessment.errors import PeerAssessmentError, SelfAssessmentError
-from openassessment.fileupload import api as file_upload_api
 from openassessment.fileupload.exceptions import FileUploadError
+from openassessment.workflow.leaderboard_cache import LEADERBOARD_CACHE_TIMEOUT, leaderboard_cache_key
 from openassessment.xblock.data_conversion import create_submission_dict
+from openassessment.xblock.lazy_module import LazyModule
 from xblock.core import XBlock
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+file_upload_api = LazyModule('openassessment.fileupload.api')  # pylint: disable=invalid-name
 
 
 class LeaderboardMixin:
@@ -70,18 +73,60 @@ class LeaderboardMixin:
         Returns:
             template_path (string), tuple of context (dict)
         """
+        prompts = self.prompts
+        cache_key = leaderboard_cache_key(student_item_dict, self.leaderboard_show, prompts)
+        scores = cache.get(cache_key)
+        if scores is None:
+            scores = self._materialize_leaderboard(student_item_dict, prompts)
+            cache.set(cache_key, scores, LEADERBOARD_CACHE_TIMEOUT)
+
+        context = {'topscores': scores,
+                   'allow_latex': self.allow_latex,
+                   'prompts_type': self.prompts_type,
+                   'file_upload_type': self.file_upload_type,
+                   'xblock_id': self.get_xblock_id()}
+
+        return 'openassessmentblock/leaderboard/oa_leaderboard_show.html', context
+
+    def _materialize_leaderboard(self, student_item_dict, prompts):
+        """
+        Build the top scores displayed by the leaderboard, including the signed
+        download URLs of the files and the submission dicts shown in the template.
+
+        Args:
+            student_item_dict (dict): The student item
+            prompts (list): The prompts of the problem
+
+        Returns:
+            list of dicts with keys 'score', 'files' and (usually) 'submission'
+        """
         # Import is placed here to avoid model import at project startup.
         from submissions import api as sub_api
 
-        # Retrieve top scores from the submissions API
-        # Since this uses the read-replica and caches the results,
-        # there will be some delay in the request latency.
+        # Retrieve top scores from the submissions API.  The materialized
+        # leaderboard replaces the submissions API cache, and is invalidated
+        # whenever a score changes, so there's no need to go through both.
+        # This still uses the read-replica, so there will be some delay in
+        # the request latency.
         scores = sub_api.get_top_submissions(
             student_item_dict['course_id'],
             student_item_dict['item_id'],
             student_item_dict['item_type'],
-            self.leaderboard_show
+            self.leaderboard_show,
+            use_cache=False
         )
+        # Sign the download URLs of every file on the leaderboard in a single batch.
+        # The materialized leaderboard is cached for almost as long as the URLs are
+        # valid (see `LEADERBOARD_CACHE_TIMEOUT`), so cached URLs can't be reused.
+        file_keys = []
+        for score in scores:
+            if 'file_keys' in score['content']:
+                file_keys.extend(score['content'].get('file_keys', []))
+            elif 'file_key' in score['content']:
+                file_keys.append(score['content']['file_key'])
+        file_download_urls = self._get_file_download_urls(file_keys)
+        file_preview_urls = self._get_file_preview_urls(file_keys)
+
         for score in scores:
             score['files'] = []
             if 'file_keys' in score['content']:
@@ -89,19 +134,25 @@ class LeaderboardMixin:
                 descriptions = score['content'].get('files_descriptions', [])
                 file_names = score['content'].get('files_name', [])
                 for idx, key in enumerate(file_keys):
-                    file_download_url = self._get_file_download_url(key)
+                    file_download_url = file_download_urls.get(key)
                     if file_download_url:
                         file_description = descriptions[idx] if idx < len(descriptions) else ''
                         file_name = file_names[idx] if idx < len(file_names) else ''
                         score['files'].append((file_download_url, file_description, file_name, False))
 
             elif 'file_key' in score['content']:
-                file_download_url = self._get_file_download_url(score['content']['file_key'])
+                file_download_url = file_download_urls.get(score['content']['file_key'])
                 if file_download_url:
                     score['files'].append((file_download_url, '', '', False))
+            if file_preview_urls and isinstance(score['content'], dict):
+                score_file_keys = score['content'].get('file_keys') or [score['content'].get('file_key')]
+                score['file_previews'] = {
+                    file_download_urls[key]: file_preview_urls[key]
+                    for key in score_file_keys if file_download_urls.get(key) and file_preview_urls.get(key)
+                }
             if 'text' in score['content'] or 'parts' in score['content']:
                 submission = {'answer': score.pop('content')}
-                score['submission'] = create_submission_dict(submission, self.prompts)
+                score['submission'] = create_submission_dict(submission, prompts)
             elif isinstance(score['content'], six.string_types):
                 pass
             # Currently, we do not handle non-text submissions.
@@ -110,13 +161,7 @@ class LeaderboardMixin:
 
             score.pop('content', None)
 
-        context = {'topscores': scores,
-                   'allow_latex': self.allow_latex,
-                   'prompts_type': self.prompts_type,
-                   'file_upload_type': self.file_upload_type,
-                   'xblock_id': self.get_xblock_id()}
-
-        return 'openassessmentblock/leaderboard/oa_leaderboard_show.html', context
+        return scores
 
     def render_leaderboard_incomplete(self):
         """
@@ -138,7 +183,7 @@ class LeaderboardMixin:
             file_download_url (string) or empty string in case of error.
         """
         try:
-            file_download_url = file_upload_api.get_download_url(file_key)
+            file_download_url = file_upload_api.get_download_url(file_key, use_cache=False)
         except FileUploadError as exc:
             logger.exception(u'FileUploadError: URL retrieval failed for key {file_key} with error {error}'.format(
                 file_key=file_key,
@@ -146,3 +191,49 @@ class LeaderboardMixin:
             ))
             file_download_url = ''
         return file_download_url
+
+    def _get_file_download_urls(self, file_keys):
+        """
+        Internal function for retrieving the download urls of several files in a single batch.
+
+        Arguments:
+            file_keys (list): The file keys.
+        Returns:
+            dict mapping each file key to its download url (string), or to an
+            empty string in case of error.
+        """
+        file_keys = [key for key in file_keys if key]
+        if not file_keys:
+            return {}
+        try:
+            return file_upload_api.get_download_urls(file_keys, use_cache=False)
+        except FileUploadError as exc:
+            logger.exception(u'FileUploadError: URL retrieval failed for keys {file_keys} with error {error}'.format(
+                file_keys=file_keys,
+                error=exc
+            ))
+            # Retrieve the URLs one at a time, so that a single failing file
+            # doesn't hide every other file on the leaderboard.
+            return {key: self._get_file_download_url(key) for key in file_keys}
+
+    def _get_file_preview_urls(self, file_keys):
+        """
+        Internal function for retrieving the preview urls of several files in a single batch.
+
+        Arguments:
+            file_keys (list): The file keys.
+        Returns:
+            dict mapping each file key with a preview to the preview url (string).
+        """
+        file_keys = [key for key in file_keys if key]
+        try:
+            preview_urls = file_upload_api.get_preview_urls(file_keys, use_cache=False)
+        except FileUploadError as exc:
+            logger.exception(
+                u'FileUploadError: Preview URL retrieval failed for keys {file_keys} with error {error}'.format(
+                    file_keys=file_keys,
+                    error=exc
+                )
+            )
+            return {}
+        return {key: url for key, url in preview_urls.items() if url}
@@ -13,22 +13,25 @@ import pytz
 from six import text_type
 
 from django.conf import settings
-from django.template.loader import get_template
 
 from lazy import lazy
 from openassessment.workflow.errors import AssessmentWorkflowError
+from openassessment.xblock.block_configuration import BlockConfiguration
 from openassessment.xblock.course_items_listing_mixin import CourseItemsListingMixin
 from openassessment.xblock.data_conversion import create_prompts_list, create_rubric_dict, update_assessments_format
+from openassessment.xblock import fragment_cache
 from openassessment.xblock.defaults import *  # pylint: disable=wildcard-import, unused-wildcard-import
 from openassessment.xblock.grade_mixin import GradeMixin
 from openassessment.xblock.leaderboard_mixin import LeaderboardMixin
 from openassessment.xblock.lms_mixin import LmsCompatibilityMixin
 from openassessment.xblock.message_mixin import MessageMixin
 from openassessment.xblock.peer_assessment_mixin import PeerAssessmentMixin
-from openassessment.xblock.resolve_dates import DISTANT_FUTURE, DISTANT_PAST, parse_date_value, resolve_dates
+from openassessment.xblock.request_cache import RequestCache
+from openassessment.xblock.resolve_dates import DISTANT_FUTURE, DISTANT_PAST, parse_date_value
 from openassessment.xblock.self_assessment_mixin import SelfAssessmentMixin
 from openassessment.xblock.staff_area_mixin import StaffAreaMixin
 from openassessment.xblock.staff_assessment_mixin import StaffAssessmentMixin
+from openassessment.xblock import static_assets
 from openassessment.xblock.student_training_mixin import StudentTrainingMixin
 from openassessment.xblock.studio_mixin import StudioMixin
 from openassessment.xblock.submission_mixin import SubmissionMixin
@@ -37,6 +40,7 @@ from openassessment.xblock.validation import validator
 from openassessment.xblock.config_mixin import ConfigMixin
 from openassessment.xblock.workflow_mixin import WorkflowMixin
 from openassessment.xblock.team_workflow_mixin import TeamWorkflowMixin
+from openassessment.xblock.template_registry import get_template
 from openassessment.xblock.xml import parse_from_xml, serialize_content_to_xml
 from webob import Response
 from xblock.core import XBlock
@@ -88,8 +92,7 @@ UI_MODELS = {
 
 def load(path):
     """Handy helper for getting resources from our kit."""
-    data = pkg_resources.resource_string(__name__, path)
-    return data.decode("utf8")
+    return static_assets.load_resource(path)
 
 
 @XBlock.needs("i18n")
@@ -127,6 +130,23 @@ class OpenAssessmentBlock(MessageMixin,
         'staff-assessment',
     ]
 
+    # Fields the `configuration` is computed from: assigning any of them recomputes it
+    CONFIGURATION_FIELDS = frozenset([
+        'teams_enabled', 'start', 'due', 'submission_start', 'submission_due', 'rubric_assessments',
+    ])
+
+    # Sections which can be rendered together by `render_sections`, in rendering order
+    RENDERED_SECTIONS = [
+        'submission',
+        'student_training',
+        'peer_assessment',
+        'self_assessment',
+        'staff_assessment',
+        'grade',
+        'leaderboard',
+        'message',
+    ]
+
     public_dir = 'static'
 
     submission_start = String(
@@ -353,6 +373,24 @@ class OpenAssessmentBlock(MessageMixin,
         self.white_listed_file_types = [file_type.strip().strip('.').lower()
                                         for file_type in value.split(',')] if value else None
 
+    @lazy
+    def request_cache(self):
+        """
+        Memoizes read-only API calls for the duration of a single handler invocation.
+
+        Returns:
+            RequestCache
+        """
+        return RequestCache()
+
+    def handle(self, handler_name, request, suffix=''):
+        """
+        Handle `request` with this block's runtime, sharing the results of
+        identical API calls for the lifetime of the handler invocation.
+        """
+        with self.request_cache.scope():
+            return super(OpenAssessmentBlock, self).handle(handler_name, request, suffix=suffix)
+
     def get_anonymous_user_id(self, username, course_id):
         """
         Get the anonymous user id from Xblock user service.
@@ -619,20 +657,20 @@ class OpenAssessmentBlock(MessageMixin,
             self.add_javascript_files(fragment, "static/js/src/oa_server.js")
             self.add_javascript_files(fragment, "static/js/src/lms")
         else:
-            # TODO: load CSS and JavaScript as URLs once they can be served by the CDN
             for css in additional_css:
-                fragment.add_css(load(css))
-            fragment.add_css(load(css_url))
+                static_assets.add_css(self, fragment, css)
+            static_assets.add_css(self, fragment, css_url)
 
             # minified additional_js should be already included in 'make javascript'
-            fragment.add_javascript(load("static/js/openassessment-lms.min.js"))
+            static_assets.add_javascript(self, fragment, "static/js/openassessment-lms.min.js")
         js_context_dict = {
             "ALLOWED_IMAGE_MIME_TYPES": self.ALLOWED_IMAGE_MIME_TYPES,
             "ALLOWED_FILE_MIME_TYPES": self.ALLOWED_FILE_MIME_TYPES,
             "FILE_EXT_BLACK_LIST": self.FILE_EXT_BLACK_LIST,
             "FILE_TYPE_WHITE_LIST": self.white_listed_file_types,
             "MAXIMUM_FILE_UPLOAD_COUNT": self.MAX_FILES_COUNT,
-            "TEAM_ASSIGNMENT": self.is_team_assignment()
+            "TEAM_ASSIGNMENT": self.is_team_assignment(),
+            "RENDER_SECTIONS_TOGETHER": getattr(settings, 'ORA2_RENDER_SECTIONS_TOGETHER', False),
         }
         fragment.initialize_js(initialize_js_func, js_context_dict)
         return fragment
@@ -698,7 +736,7 @@ class OpenAssessmentBlock(MessageMixin,
         """
         ui_models = [UI_MODELS["submission"]]
         staff_assessment_required = False
-        for assessment in self.valid_assessments:
+        for assessment in self.configuration.assessments:
             if assessment["name"] == "staff-assessment":
                 if not assessment["required"]:
                     continue
@@ -855,16 +893,21 @@ class OpenAssessmentBlock(MessageMixin,
         else:
             self.prompt = json.dumps(value)
 
-    @property
-    def valid_assessments(self):
+    def __setattr__(self, name, value):
+        super(OpenAssessmentBlock, self).__setattr__(name, value)
+        if name in self.CONFIGURATION_FIELDS:
+            lazy.invalidate(self, 'configuration')
+
+    @lazy
+    def configuration(self):
         """
-        Return a list of assessment dictionaries that we recognize.
-        This allows us to gracefully handle situations in which unrecognized
-        assessment types are stored in the XBlock field (e.g. because
-        we roll back code after releasing a feature).
+        Return the read-only view of the assessments and dates configured for this block.
+
+        The view is computed once, and again after one of the `CONFIGURATION_FIELDS`
+        is assigned (in Studio, or in tests).
 
         Returns:
-            list
+            BlockConfiguration
 
         """
         assessment_types = self.VALID_ASSESSMENT_TYPES
@@ -875,11 +918,31 @@ class OpenAssessmentBlock(MessageMixin,
             asmnt for asmnt in self.rubric_assessments
             if asmnt.get('name') in assessment_types
         ]
-        return update_assessments_format(copy.deepcopy(_valid_assessments))
+        return BlockConfiguration(
+            update_assessments_format(copy.deepcopy(_valid_assessments)),
+            self.start, self.due, self.submission_start, self.submission_due, self._
+        )
+
+    @property
+    def valid_assessments(self):
+        """
+        Return a list of assessment dictionaries that we recognize.
+        This allows us to gracefully handle situations in which unrecognized
+        assessment types are stored in the XBlock field (e.g. because
+        we roll back code after releasing a feature).
+
+        Callers get their own copy, which they may modify: code which only
+        reads the assessments should use `configuration.assessments` instead.
+
+        Returns:
+            list
+
+        """
+        return copy.deepcopy(list(self.configuration.assessments))
 
     @property
     def assessment_steps(self):
-        return [asmnt['name'] for asmnt in self.valid_assessments]
+        return list(self.configuration.assessment_steps)
 
     @lazy
     def rubric_criteria_with_labels(self):
@@ -928,9 +991,50 @@ class OpenAssessmentBlock(MessageMixin,
         if not context_dict:
             context_dict = {}
 
+        if fragment_cache.fragment_cache_enabled():
+            context_dict[fragment_cache.FRAGMENT_CACHE_CONTEXT_KEY] = fragment_cache.get_cache_prefix(self)
+
         template = get_template(path)
         return Response(template.render(context_dict), content_type='application/html', charset='UTF-8')
 
+    @XBlock.handler
+    def render_sections(self, request, suffix=''):  # pylint: disable=unused-argument
+        """
+        Render several sections of the XBlock in a single request.
+
+        The sections are rendered by their own handlers (e.g. `render_grade`
+        for the "grade" section) from the workflow snapshot of this request,
+        instead of retrieving and updating the workflow once per section.
+
+        Args:
+            request (Request): JSON body with a 'sections' list of section
+                names, e.g. ["submission", "grade"].
+
+        Returns:
+            (Response): JSON object mapping the name of each rendered section
+                to its HTML.  Sections which fail to render are left out, so
+                that the client can fall back to their own handler.
+        """
+        try:
+            sections = set(json.loads(request.body.decode('utf-8')).get('sections', []))
+        except (AttributeError, TypeError, ValueError):
+            return Response(status=400)
+
+        rendered_sections = {}
+        with self.request_cache.scope():
+            # Sections are rendered in a fixed order: the message depends on the peer section
+            for section in self.RENDERED_SECTIONS:
+                if section not in sections:
+                    continue
+                try:
+                    response = getattr(self, 'render_' + section)(request)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception(u"An error occurred while rendering the {} section".format(section))
+                    continue
+                if response.status_int == 200:
+                    rendered_sections[section] = response.text
+        return Response(json.dumps(rendered_sections), content_type='application/json', charset='UTF-8')
+
     def add_xml_to_node(self, node):
         """
         Serialize the XBlock to XML for exporting.
@@ -991,24 +1095,8 @@ class OpenAssessmentBlock(MessageMixin,
             datetime.datetime(2015, 3, 27, 22, 7, 38, 788861)
 
         """
-        submission_range = (self.submission_start, self.submission_due)
-        assessment_ranges = [
-            (asmnt.get('start'), asmnt.get('due'))
-            for asmnt in self.valid_assessments
-        ]
-
-        # Resolve unspecified dates and date strings to datetimes
-        start, due, date_ranges = resolve_dates(
-            self.start, self.due, [submission_range] + assessment_ranges, self._
-        )
-
-        open_range = (start, due)
-        assessment_steps = self.assessment_steps
-        if step == 'submission':
-            open_range = date_ranges[0]
-        elif step in assessment_steps:
-            step_index = assessment_steps.index(step)
-            open_range = date_ranges[1 + step_index]
+        # Unspecified dates and date strings are resolved to datetimes once
+        open_range = self.configuration.get_open_range(step)
 
         # Course staff always have access to the problem
         if course_staff is None:
@@ -1089,6 +1177,34 @@ class OpenAssessmentBlock(MessageMixin,
             is_released = is_released and dt.datetime.now(pytz.UTC) > parse_date_value(self.start, self._)
         return is_released
 
+    def get_step_deadlines(self):
+        """
+        Return the resolved start and due dates of the problem and of each of its steps.
+
+        These are the dates which apply to all learners: unlike `is_closed`,
+        they are not adjusted for beta testers or course staff.
+
+        Returns:
+            list of (step, start, due) tuples, where `step` is "problem", "submission"
+            or the name of an assessment, and `start` (or `due`) is None if the step
+            has no start (or due) date.
+
+        Raises:
+            InvalidDateFormat, DateValidationError: The dates are invalid.
+        """
+        steps = [('problem', None), ('submission', 'submission')] + [
+            (step, step) for step in self.configuration.assessment_steps
+        ]
+        deadlines = []
+        for name, step in steps:
+            start, due = self.configuration.get_open_range(step)
+            deadlines.append((
+                name,
+                start if start != DISTANT_PAST else None,
+                due if due != DISTANT_FUTURE else None,
+            ))
+        return deadlines
+
     def get_assessment_module(self, mixin_name):
         """
         Get a configured assessment module by name.
@@ -1109,9 +1225,8 @@ class OpenAssessmentBlock(MessageMixin,
                 "must_be_graded_by": 3,
             }
         """
-        for assessment in self.valid_assessments:
-            if assessment["name"] == mixin_name:
-                return assessment
+        assessment = self.configuration.get_assessment(mixin_name)
+        return copy.deepcopy(assessment) if assessment is not None else None
 
     def publish_assessment_event(self, event_name, assessment, **kwargs):
         """
@@ -16,10 +16,13 @@ from xblock.core import XBlock
 
 from .data_conversion import (clean_criterion_feedback, create_rubric_dict, create_submission_dict,
                               verify_assessment_parameters)
+from .lazy_module import LazyModule
 from .resolve_dates import DISTANT_FUTURE
 from .user_data import get_user_preferences
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+file_upload_api = LazyModule('openassessment.fileupload.api')  # pylint: disable=invalid-name
+peer_api = LazyModule('openassessment.assessment.api.peer')  # pylint: disable=invalid-name
 
 
 class PeerAssessmentMixin:
@@ -56,8 +59,6 @@ class PeerAssessmentMixin:
             and "msg" (unicode) containing additional information if an error occurs.
 
         """
-        # Import is placed here to avoid model import at project startup.
-        from openassessment.assessment.api import peer as peer_api
         if self.submission_uuid is None:
             return {
                 'success': False, 'msg': self._('You must submit a response before you can perform a peer assessment.')
@@ -164,8 +165,6 @@ class PeerAssessmentMixin:
             tuple of (template_path, context_dict)
 
         """
-        # Import is placed here to avoid model import at project startup.
-        from openassessment.assessment.api import peer as peer_api
         path = 'openassessmentblock/peer/oa_peer_unavailable.html'
         finished = False
         problem_closed, reason, start_date, due_date = self.is_closed(step="peer-assessment")
@@ -240,7 +239,11 @@ class PeerAssessmentMixin:
 
                 # Determine if file upload is supported for this XBlock.
                 context_dict["file_upload_type"] = self.file_upload_type
-                context_dict["peer_file_urls"] = self.get_download_urls_from_submission(peer_sub)
+                defer_urls = file_upload_api.defer_download_urls()
+                context_dict["peer_file_urls"] = self.get_download_urls_from_submission(peer_sub, defer_urls=defer_urls)
+                peer_file_previews = self.get_file_previews_from_submission(peer_sub, defer_urls=defer_urls)
+                if peer_file_previews:
+                    context_dict["peer_file_previews"] = peer_file_previews
             else:
                 path = 'openassessmentblock/peer/oa_peer_turbo_mode_waiting.html'
         elif reason == 'due' and problem_closed:
@@ -255,7 +258,11 @@ class PeerAssessmentMixin:
                 context_dict["peer_submission"] = create_submission_dict(peer_sub, self.prompts)
                 # Determine if file upload is supported for this XBlock.
                 context_dict["file_upload_type"] = self.file_upload_type
-                context_dict["peer_file_urls"] = self.get_download_urls_from_submission(peer_sub)
+                defer_urls = file_upload_api.defer_download_urls()
+                context_dict["peer_file_urls"] = self.get_download_urls_from_submission(peer_sub, defer_urls=defer_urls)
+                peer_file_previews = self.get_file_previews_from_submission(peer_sub, defer_urls=defer_urls)
+                if peer_file_previews:
+                    context_dict["peer_file_previews"] = peer_file_previews
                 # Sets the XBlock boolean to signal to Message that it WAS NOT able to grab a submission
                 self.no_peers = False
             else:
@@ -277,8 +284,6 @@ class PeerAssessmentMixin:
             dict: The serialized submission model.
 
         """
-        # Import is placed here to avoid model import at project startup.
-        from openassessment.assessment.api import peer as peer_api
         peer_submission = False
         try:
             peer_submission = peer_api.get_submission_to_assess(
@@ -0,0 +1,93 @@
+"""
+Per-request memoization of read-only API calls made by the OpenAssessment XBlock.
+
+Rendering a single section (for example the grade or the staff area) can
+call the same assessment API function many times with identical arguments.
+The `RequestCache` lets those calls share one result for as long as a scope
+is open, which is normally the lifetime of a single handler invocation.
+"""
+from __future__ import absolute_import
+
+from contextlib import contextmanager
+
+
+class RequestCache:
+    """
+    Memoizes function calls while at least one scope is open.
+
+    Outside of a scope, calls pass straight through to the wrapped function,
+    so nothing is cached between requests (or between consecutive handler
+    calls on the same block instance).
+
+    Cached results are shared between callers, so only read-only API calls
+    (or callers that copy the result before mutating it) should go through
+    the cache.
+
+    Example:
+        >>> cache = RequestCache()
+        >>> with cache.scope():
+        ...     cache.call(peer_api.get_assessment_median_scores, submission_uuid)
+        ...     cache.call(peer_api.get_assessment_median_scores, submission_uuid)  # cached
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._results = {}
+
+    @contextmanager
+    def scope(self):
+        """
+        Open a caching scope.  Scopes can be nested; cached results are
+        discarded when the outermost scope exits.
+        """
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self._results = {}
+
+    @property
+    def active(self):
+        """
+        Return True if a caching scope is currently open.
+        """
+        return self._depth > 0
+
+    def call(self, func, *args, **kwargs):
+        """
+        Call `func` with the given arguments, returning a memoized result
+        if an identical call has already been made in the current scope.
+
+        Args:
+            func (callable): The function to call.
+            *args: Positional arguments passed to `func`.
+            **kwargs: Keyword arguments passed to `func`.
+
+        Returns:
+            The (possibly cached) return value of `func`.
+        """
+        if not self.active:
+            return func(*args, **kwargs)
+
+        key = (func, args, tuple(sorted(kwargs.items())))
+        try:
+            return self._results[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable arguments can't be used as a cache key.
+            return func(*args, **kwargs)
+
+        result = func(*args, **kwargs)
+        self._results[key] = result
+        return result
+
+    def invalidate(self):
+        """
+        Discard all cached results without closing the current scope.
+        Callers should invalidate after any operation that changes the data
+        a cached call would return.
+        """
+        self._results = {}
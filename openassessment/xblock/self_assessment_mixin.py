@@ -3,17 +3,18 @@ from __future__ import absolute_import
 
 import logging
 
-from openassessment.assessment.api import self as self_api
-from openassessment.workflow import api as workflow_api
 from webob import Response
 from xblock.core import XBlock
 
 from .data_conversion import (clean_criterion_feedback, create_rubric_dict, create_submission_dict,
                               verify_assessment_parameters)
+from .lazy_module import LazyModule
 from .resolve_dates import DISTANT_FUTURE
 from .user_data import get_user_preferences
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+self_api = LazyModule('openassessment.assessment.api.self')  # pylint: disable=invalid-name
+workflow_api = LazyModule('openassessment.workflow.api')  # pylint: disable=invalid-name
 
 
 class SelfAssessmentMixin:
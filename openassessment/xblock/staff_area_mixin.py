@@ -8,6 +8,10 @@ import copy
 from django.core.exceptions import ObjectDoesNotExist
 from functools import wraps
 import logging
+import tempfile
+
+from webob import Response
+from webob.static import FileIter
 
 from openassessment.assessment.errors import PeerAssessmentInternalError
 from openassessment.workflow.errors import AssessmentWorkflowError, AssessmentWorkflowInternalError
@@ -67,6 +71,7 @@ def require_course_staff(error_key, with_json_handler=False):
                 "STAFF_AREA": xblock._(u"You do not have permission to access the ORA staff area"),
                 "STUDENT_INFO": xblock._(u"You do not have permission to access ORA learner information."),
                 "STUDENT_GRADE": xblock._(u"You do not have permission to access ORA staff grading."),
+                "SUBMISSION_FILES": xblock._(u"You do not have permission to download ORA learner responses."),
             }
 
             if not xblock.is_course_staff and with_json_handler:
@@ -305,6 +310,10 @@ class StaffAreaMixin:
                         ))
                     context['staff_file_urls'] = self.get_all_upload_urls_for_user(student_username)
 
+            staff_file_previews = self.get_file_previews_from_submission(submission)
+            if staff_file_previews:
+                context["staff_file_previews"] = staff_file_previews
+
         if self.rubric_feedback_prompt is not None:
             context["rubric_feedback_prompt"] = self.rubric_feedback_prompt
 
@@ -367,70 +376,72 @@ class StaffAreaMixin:
         from openassessment.assessment.api import self as self_api
         from openassessment.assessment.api import staff as staff_api
 
-        assessment_steps = self.assessment_steps
+        # Grade details and the rubric max scores below share the same API results.
+        with self.request_cache.scope() as request_cache:
+            assessment_steps = self.assessment_steps
 
-        self_assessment = None
-        self_assessment_grade_context = None
+            self_assessment = None
+            self_assessment_grade_context = None
 
-        peer_assessments = None
-        peer_assessments_grade_context = []
+            peer_assessments = None
+            peer_assessments_grade_context = []
 
-        staff_assessment = staff_api.get_latest_staff_assessment(submission_uuid)
-        staff_assessment_grade_context = None
+            staff_assessment = staff_api.get_latest_staff_assessment(submission_uuid)
+            staff_assessment_grade_context = None
 
-        submitted_assessments = None
+            submitted_assessments = None
 
-        grade_details = None
+            grade_details = None
 
-        workflow = self.get_workflow_info(submission_uuid=submission_uuid)
-        grade_exists = workflow.get('status') == "done"
-        grade_utils = self.runtime._services.get('grade_utils')  # pylint: disable=protected-access
+            workflow = self.get_workflow_info(submission_uuid=submission_uuid)
+            grade_exists = workflow.get('status') == "done"
+            grade_utils = self.runtime._services.get('grade_utils')  # pylint: disable=protected-access
+
+            if "peer-assessment" in assessment_steps:
+                peer_assessments = peer_api.get_assessments(submission_uuid)
+                submitted_assessments = peer_api.get_submitted_assessments(submission_uuid)
+                if grade_exists:
+                    peer_api.get_score(submission_uuid, self.workflow_requirements()["peer"])
+                    peer_assessments_grade_context = [
+                        self._assessment_grade_context(peer_assessment)
+                        for peer_assessment in peer_assessments
+                    ]
+
+            if "self-assessment" in assessment_steps:
+                self_assessment = self_api.get_assessment(submission_uuid)
+                if grade_exists:
+                    self_assessment_grade_context = self._assessment_grade_context(self_assessment)
 
-        if "peer-assessment" in assessment_steps:
-            peer_assessments = peer_api.get_assessments(submission_uuid)
-            submitted_assessments = peer_api.get_submitted_assessments(submission_uuid)
-            if grade_exists:
-                peer_api.get_score(submission_uuid, self.workflow_requirements()["peer"])
-                peer_assessments_grade_context = [
-                    self._assessment_grade_context(peer_assessment)
-                    for peer_assessment in peer_assessments
-                ]
-
-        if "self-assessment" in assessment_steps:
-            self_assessment = self_api.get_assessment(submission_uuid)
             if grade_exists:
-                self_assessment_grade_context = self._assessment_grade_context(self_assessment)
-
-        if grade_exists:
-            if staff_assessment:
-                staff_assessment_grade_context = self._assessment_grade_context(staff_assessment)
-
-            grade_details = self.grade_details(
-                submission_uuid,
-                peer_assessments_grade_context,
-                self_assessment_grade_context,
-                staff_assessment_grade_context,
-                is_staff=True,
-            )
+                if staff_assessment:
+                    staff_assessment_grade_context = self._assessment_grade_context(staff_assessment)
+
+                grade_details = self.grade_details(
+                    submission_uuid,
+                    peer_assessments_grade_context,
+                    self_assessment_grade_context,
+                    staff_assessment_grade_context,
+                    is_staff=True,
+                )
+
+            workflow_cancellation = self.get_workflow_cancellation_info(submission_uuid)
+
+            context.update({
+                'self_assessment': [self_assessment] if self_assessment else None,
+                'peer_assessments': peer_assessments,
+                'staff_assessment': [staff_assessment] if staff_assessment else None,
+                'submitted_assessments': submitted_assessments,
+                'grade_details': grade_details,
+                'score': workflow.get('score'),
+                'workflow_status': workflow.get('status'),
+                'workflow_cancellation': workflow_cancellation,
+                'are_grades_frozen': grade_utils.are_grades_frozen() if grade_utils else None
+            })
 
-        workflow_cancellation = self.get_workflow_cancellation_info(submission_uuid)
-
-        context.update({
-            'self_assessment': [self_assessment] if self_assessment else None,
-            'peer_assessments': peer_assessments,
-            'staff_assessment': [staff_assessment] if staff_assessment else None,
-            'submitted_assessments': submitted_assessments,
-            'grade_details': grade_details,
-            'score': workflow.get('score'),
-            'workflow_status': workflow.get('status'),
-            'workflow_cancellation': workflow_cancellation,
-            'are_grades_frozen': grade_utils.are_grades_frozen() if grade_utils else None
-        })
-
-        if peer_assessments or self_assessment or staff_assessment:
-            max_scores = peer_api.get_rubric_max_scores(submission_uuid)
-            for criterion in context["rubric_criteria"]:
-                criterion["total_value"] = max_scores[criterion["name"]]
+            if peer_assessments or self_assessment or staff_assessment:
+                max_scores = request_cache.call(peer_api.get_rubric_max_scores, submission_uuid)
+                for criterion in context["rubric_criteria"]:
+                    criterion["total_value"] = max_scores[criterion["name"]]
 
     def clear_student_state(self, user_id, course_id, item_id, requesting_user_id):
         """
@@ -489,6 +500,36 @@ class StaffAreaMixin:
 
         return self._cancel_workflow(submission_uuid, comments)
 
+    @XBlock.handler
+    @require_course_staff("SUBMISSION_FILES")
+    def download_submission_files(self, data, suffix=''):  # pylint: disable=W0613
+        """
+        Download the responses of every learner to this problem, files included, as a .zip archive.
+
+        The archive is spooled to a temporary file rather than built in
+        memory, then streamed back in chunks.
+
+        Returns:
+            Response: The .zip archive, as an attachment.
+        """
+        # Import is placed here to avoid model import at project startup.
+        from openassessment.data import SubmissionFilesZipWriter
+
+        student_item = self.get_student_item_dict()
+        archive = tempfile.TemporaryFile()
+        try:
+            SubmissionFilesZipWriter(archive).write_to_zip(
+                student_item['course_id'], student_item['item_id'], student_item['item_type']
+            )
+            archive.seek(0)
+        except Exception:
+            archive.close()
+            raise
+
+        response = Response(app_iter=FileIter(archive), content_type='application/zip')
+        response.content_disposition = 'attachment; filename="ora-responses.zip"'
+        return response
+
     def _cancel_workflow(self, submission_uuid, comments, requesting_user_id=None):
         """
         Internal helper method to cancel a workflow using the workflow API.
@@ -508,6 +549,7 @@ class StaffAreaMixin:
                 cancelled_by_id=requesting_user_id,
                 assessment_requirements=assessment_requirements
             )
+            self.workflow_snapshot.invalidate()
             return {
                 "success": True,
                 'msg': self._(
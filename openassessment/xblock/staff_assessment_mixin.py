@@ -5,15 +5,16 @@ from __future__ import absolute_import
 
 import logging
 
-from openassessment.assessment.api import staff as staff_api
 from openassessment.assessment.errors import StaffAssessmentInternalError, StaffAssessmentRequestError
-from openassessment.workflow import api as workflow_api
 from xblock.core import XBlock
 
 from .data_conversion import clean_criterion_feedback, create_rubric_dict, verify_assessment_parameters
+from .lazy_module import LazyModule
 from .staff_area_mixin import require_course_staff
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+staff_api = LazyModule('openassessment.assessment.api.staff')  # pylint: disable=invalid-name
+workflow_api = LazyModule('openassessment.workflow.api')  # pylint: disable=invalid-name
 
 
 class StaffAssessmentMixin:
@@ -56,6 +57,7 @@ class StaffAssessmentMixin:
                 None,
                 override_submitter_requirements=(assess_type == 'regrade')
             )
+            self.workflow_snapshot.invalidate()
 
         except StaffAssessmentRequestError:
             logger.warning(
@@ -1 +1 @@
-if(typeof OpenAssessment=="undefined"||!OpenAssessment){OpenAssessment={}}if(typeof window.gettext==="undefined"){window.gettext=function(text){return text}}if(typeof window.ngetgext==="undefined"){window.ngettext=function(singularText,pluralText,n){if(n>1){return pluralText}else{return singularText}}}if(typeof window.Logger==="undefined"){window.Logger={log:function(){}}}if(typeof window.MathJax==="undefined"){window.MathJax={Hub:{Typeset:function(){},Queue:function(){}}}}if(typeof OpenAssessment.Server==="undefined"||!OpenAssessment.Server){OpenAssessment.Server=function(runtime,element){this.runtime=runtime;this.element=element};var jsonContentType="application/json; charset=utf-8";OpenAssessment.Server.prototype={url:function(handler){return this.runtime.handlerUrl(this.element,handler)},render:function(component){var view=this;var url=this.url("render_"+component);return $.Deferred(function(defer){$.ajax({url:url,type:"POST",dataType:"html"}).done(function(data){defer.resolveWith(view,[data])}).fail(function(){defer.rejectWith(view,[gettext("This section could not be loaded.")])})}).promise()},renderLatex:function(element){element.filter(".allow--latex").each(function(){MathJax.Hub.Queue(["Typeset",MathJax.Hub,this])})},renderContinuedPeer:function(){var view=this;var url=this.url("render_peer_assessment");return $.Deferred(function(defer){$.ajax({url:url,type:"POST",dataType:"html",data:{continue_grading:true}}).done(function(data){defer.resolveWith(view,[data])}).fail(function(){defer.rejectWith(view,[gettext("This section could not be loaded.")])})}).promise()},studentInfo:function(studentUsername,options){var url=this.url("render_student_info");return $.Deferred(function(defer){$.ajax({url:url,type:"POST",dataType:"html",data:_.extend({student_username:studentUsername},options)}).done(function(data){defer.resolveWith(this,[data])}).fail(function(){defer.rejectWith(this,[gettext("This section could not be loaded.")])})}).promise()},staffGradeForm:function(){var url=this.url("render_staff_grade_form");return $.Deferred(function(defer){$.ajax({url:url,type:"POST",dataType:"html"}).done(function(data){defer.resolveWith(this,[data])}).fail(function(){defer.rejectWith(this,[gettext("The staff assessment form could not be loaded.")])})}).promise()},staffGradeCounts:function(){var url=this.url("render_staff_grade_counts");return $.Deferred(function(defer){$.ajax({url:url,type:"POST",dataType:"html"}).done(function(data){defer.resolveWith(this,[data])}).fail(function(){defer.rejectWith(this,[gettext("The display of ungraded and checked out responses could not be loaded.")])})}).promise()},submit:function(submission){var url=this.url("submit");return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({submission:submission}),contentType:jsonContentType}).done(function(data){var success=data[0];if(success){var studentId=data[1];var attemptNum=data[2];defer.resolveWith(this,[studentId,attemptNum])}else{var errorNum=data[1];var errorMsg=data[2];defer.rejectWith(this,[errorNum,errorMsg])}}).fail(function(){defer.rejectWith(this,["AJAX",gettext("This response could not be submitted.")])})}).promise()},save:function(submission){var url=this.url("save_submission");return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({submission:submission}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve()}else{defer.rejectWith(this,[data.msg])}}).fail(function(){defer.rejectWith(this,[gettext("This response could not be saved.")])})}).promise()},submitFeedbackOnAssessment:function(text,options){var url=this.url("submit_feedback");var payload=JSON.stringify({feedback_text:text,feedback_options:options});return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:payload,contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve()}else{defer.rejectWith(this,[data.msg])}}).fail(function(){defer.rejectWith(this,[gettext("This feedback could not be submitted.")])})}).promise()},submitAssessment:function(assessmentType,payload){var url=this.url(assessmentType);return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify(payload),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve()}else{defer.rejectWith(this,[data.msg])}}).fail(function(){defer.rejectWith(this,[gettext("This assessment could not be submitted.")])})}).promise()},peerAssess:function(optionsSelected,criterionFeedback,overallFeedback,submissionID){return this.submitAssessment("peer_assess",{options_selected:optionsSelected,criterion_feedback:criterionFeedback,overall_feedback:overallFeedback,submission_uuid:submissionID})},selfAssess:function(optionsSelected,criterionFeedback,overallFeedback){return this.submitAssessment("self_assess",{options_selected:optionsSelected,criterion_feedback:criterionFeedback,overall_feedback:overallFeedback})},staffAssess:function(optionsSelected,criterionFeedback,overallFeedback,submissionID,assessType){return this.submitAssessment("staff_assess",{options_selected:optionsSelected,criterion_feedback:criterionFeedback,overall_feedback:overallFeedback,submission_uuid:submissionID,assess_type:assessType})},trainingAssess:function(optionsSelected){var url=this.url("training_assess");var payload=JSON.stringify({options_selected:optionsSelected});return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:payload,contentType:jsonContentType}).done(function(data){if(data.success){defer.resolveWith(this,[data.corrections])}else{defer.rejectWith(this,[data.msg])}}).fail(function(){defer.rejectWith(this,[gettext("This assessment could not be submitted.")])})})},scheduleTraining:function(){var url=this.url("schedule_training");return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:'""',contentType:jsonContentType}).done(function(data){if(data.success){defer.resolveWith(this,[data.msg])}else{defer.rejectWith(this,[data.msg])}}).fail(function(){defer.rejectWith(this,[gettext("This assessment could not be submitted.")])})})},rescheduleUnfinishedTasks:function(){var url=this.url("reschedule_unfinished_tasks");return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:'""',contentType:jsonContentType}).done(function(data){if(data.success){defer.resolveWith(this,[data.msg])}else{defer.rejectWith(this,[data.msg])}}).fail(function(){defer.rejectWith(this,[gettext("One or more rescheduling tasks failed.")])})})},updateEditorContext:function(options){var url=this.url("update_editor_context");var payload=JSON.stringify({prompts:options.prompts,prompts_type:options.prompts_type,feedback_prompt:options.feedbackPrompt,feedback_default_text:options.feedback_default_text,title:options.title,submission_start:options.submissionStart,submission_due:options.submissionDue,criteria:options.criteria,assessments:options.assessments,editor_assessments_order:options.editorAssessmentsOrder,text_response:options.textResponse,file_upload_response:options.fileUploadResponse,file_upload_type:options.fileUploadType,white_listed_file_types:options.fileTypeWhiteList,allow_latex:options.latexEnabled,leaderboard_show:options.leaderboardNum,teams_enabled:options.teamsEnabled,selected_teamset_id:options.selectedTeamsetId});return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:payload,contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve()}else{defer.rejectWith(this,[data.msg])}}).fail(function(){defer.rejectWith(this,[gettext("This problem could not be saved.")])})}).promise()},checkReleased:function(){var url=this.url("check_released");var payload='""';return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:payload,contentType:jsonContentType}).done(function(data){if(data.success){defer.resolveWith(this,[data.is_released])}else{defer.rejectWith(this,[data.msg])}}).fail(function(){defer.rejectWith(this,[gettext("The server could not be contacted.")])})}).promise()},getUploadUrl:function(contentType,filename,filenum){var url=this.url("upload_url");return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({contentType:contentType,filename:filename,filenum:filenum}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve(data.url)}else{defer.rejectWith(this,[data.msg])}}).fail(function(){defer.rejectWith(this,[gettext("Could not retrieve upload url.")])})}).promise()},removeUploadedFile:function(filenum){var url=this.url("remove_uploaded_file");return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({filenum:filenum}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve()}else{defer.rejectWith(this,[data.msg])}}).fail(function(){defer.rejectWith(this,[gettext("Server error.")])})}).promise()},saveFilesDescriptions:function(fileMetadata){var url=this.url("save_files_descriptions");return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({fileMetadata:fileMetadata}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve()}else{defer.rejectWith(this,[data.msg])}}).fail(function(){defer.rejectWith(this,[gettext("Server error.")])})}).promise()},getDownloadUrl:function(filenum){var url=this.url("download_url");return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({filenum:filenum}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve(data.url)}else{defer.rejectWith(this,[data.msg])}}).fail(function(){defer.rejectWith(this,[gettext("Could not retrieve download url.")])})}).promise()},cancelSubmission:function(submissionID,comments){var url=this.url("cancel_submission");var payload=JSON.stringify({submission_uuid:submissionID,comments:comments});return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:payload,contentType:jsonContentType}).done(function(data){if(data.success){defer.resolveWith(this,[data.msg])}}).fail(function(){defer.rejectWith(this,[gettext("The submission could not be removed from the grading pool.")])})}).promise()},publishEvent:function(eventName,eventData){eventData.event_name=eventName;var url=this.url("publish_event");var payload=JSON.stringify(eventData);$.ajax({type:"POST",url:url,data:payload,contentType:jsonContentType})},getTeamDetail:function(teamId){var teamsUrl=window.location.origin+"/api/team/v0/teams/"+teamId;return $.ajax({type:"GET",url:teamsUrl,contentType:jsonContentType})},listTeams:function(username,courseId){var teamsUrl=window.location.origin+"/api/team/v0/teams/";return $.Deferred(function(defer){$.ajax({type:"GET",url:teamsUrl,data:{course_id:courseId,username:username},contentType:jsonContentType}).done(function(data){if(data.count>1){defer.rejectWith(this,[gettext("Multiple teams returned for course")])}else if(data.count===0){defer.resolveWith(this,[null])}else{defer.resolveWith(this,[data.results[0]])}}).fail(function(){defer.rejectWith(this,[gettext("Could not load teams information.")])})}).promise()},getUsername:function(){var url=this.url("get_student_username");return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({}),contentType:jsonContentType}).done(function(data){if(data.username===null){defer.rejectWith(this,[gettext("User lookup failed")])}else{defer.resolveWith(this,[data.username])}}).fail(function(){defer.rejectWith(this,[gettext("Error when looking up username")])})})}}}OpenAssessment.Container=function(ContainerItem,kwargs){this.containerElement=kwargs.containerElement;this.templateElement=kwargs.templateElement;this.addButtonElement=kwargs.addButtonElement;this.removeButtonClass=kwargs.removeButtonClass;this.containerItemClass=kwargs.containerItemClass;this.notifier=kwargs.notifier;this.addRemoveEnabled=typeof kwargs.addRemoveEnabled==="undefined"||kwargs.addRemoveEnabled;var container=this;this.createContainerItem=function(element){return new ContainerItem(element,container.notifier)}};OpenAssessment.Container.prototype={addEventListeners:function(){var container=this;if(this.addRemoveEnabled){$(this.addButtonElement).click($.proxy(this.add,this));$("."+this.removeButtonClass,this.containerElement).click(function(eventData){var item=container.createContainerItem(eventData.target);container.remove(item)})}else{$(this.addButtonElement).addClass("is--disabled");$("."+this.removeButtonClass,this.containerElement).addClass("is--disabled")}$("."+this.containerItemClass,this.containerElement).each(function(index,element){var item=container.createContainerItem(element);item.addEventListeners()})},add:function(){$(this.templateElement).children().first().clone().removeAttr("id").toggleClass("is--hidden",false).toggleClass(this.containerItemClass,true).appendTo($(this.containerElement));var container=this;var containerItem=$("."+this.containerItemClass,this.containerElement).last();if(this.addRemoveEnabled){containerItem.find("."+this.removeButtonClass).click(function(eventData){var containerItem=container.createContainerItem(eventData.target);container.remove(containerItem)})}else{containerItem.find("."+this.removeButtonClass).addClass("is--disabled")}var handlerItem=container.createContainerItem(containerItem);handlerItem.addEventListeners();handlerItem.addHandler()},remove:function(item){var itemElement=$(item.element).closest("."+this.containerItemClass);var containerItem=this.createContainerItem(itemElement);containerItem.removeHandler();itemElement.remove()},getItemValues:function(){var values=[];var container=this;$("."+this.containerItemClass,this.containerElement).each(function(index,element){var containerItem=container.createContainerItem(element);var fieldValues=containerItem.getFieldValues();values.push(fieldValues)});return values},getItem:function(index){var element=$("."+this.containerItemClass,this.containerElement).get(index);return element!==undefined?this.createContainerItem(element):null},getAllItems:function(){var container=this;return $("."+this.containerItemClass,this.containerElement).map(function(){return container.createContainerItem(this)})}};OpenAssessment.ItemUtilities={createUniqueName:function(selector,nameAttribute){var index=0;while(index<=selector.length){if(selector.parent().find("*["+nameAttribute+"='"+index+"']").length===0){return index.toString()}index++}return index.toString()},refreshOptionString:function(element){var points=$(element).attr("data-points");var label=$(element).attr("data-label");var name=$(element).val();if(label===""){label=gettext("Unnamed Option")}var singularString=label+" - "+points+" point";var multipleString=label+" - "+points+" points";var finalLabel="";if(name===""){finalLabel=gettext("Not Selected")}else if(isNaN(points)){finalLabel=label}else{finalLabel=ngettext(singularString,multipleString,points)}$(element).text(finalLabel)}};OpenAssessment.Prompt=function(element,notifier){if(this.tinyMCEEnabled){element=this.attachWysiwygToPrompt(element)}this.element=element;this.notifier=notifier};OpenAssessment.Prompt.prototype={tinyMCEEnabled:window.tinyMCE!==undefined,attachWysiwygToPrompt:function(el){var elId=$(el).find("textarea").attr("id");if(!elId){var textarea=$(el).find("textarea");var text=$(textarea).val();var type=$(textarea).data("type");if(text&&type==="text"){text=_.escape(text).replace(/(?:\r\n|\r|\n)/g,"<br />");$(textarea).val(text)}var newElId=Date.now()+"-textarea-"+Math.random()*100;$(textarea).attr("id",newElId).tinymce(oaTinyMCE({base_asset_url:$("#openassessment_prompt_template").data("baseAssetUrl")}))}return $(el)},getFieldValues:function(){var fields={description:this.description()};return fields},description:function(text){var sel=$(".openassessment_prompt_description",this.element);if(!this.tinyMCEEnabled){return OpenAssessment.Fields.stringField(sel,text)}var tinyEl=window.tinyMCE.get(sel.attr("id"));if(text){tinyEl.setContent(text)}else{return tinyEl.getContent()}},addEventListeners:function(){},addHandler:function(){this.notifier.notificationFired("promptAdd",{index:this.element.index()})},removeHandler:function(){this.notifier.notificationFired("promptRemove",{index:this.element.index()})},updateHandler:function(){},validate:function(){return true},validationErrors:function(){return[]},clearValidationErrors:function(){}};OpenAssessment.RubricOption=function(element,notifier){this.element=element;this.notifier=notifier;this.pointsField=new OpenAssessment.IntField($(".openassessment_criterion_option_points",this.element),{min:0,max:999})};OpenAssessment.RubricOption.prototype={addEventListeners:function(){$(this.element).focusout($.proxy(this.updateHandler,this))},getFieldValues:function(){var fields={label:this.label(),points:this.points(),explanation:this.explanation()};var nameString=OpenAssessment.Fields.stringField($(".openassessment_criterion_option_name",this.element));if(nameString!==""){fields.name=nameString}return fields},label:function(label){var sel=$(".openassessment_criterion_option_label",this.element);return OpenAssessment.Fields.stringField(sel,label)},points:function(points){if(points!==undefined){this.pointsField.set(points)}return this.pointsField.get()},explanation:function(explanation){var sel=$(".openassessment_criterion_option_explanation",this.element);return OpenAssessment.Fields.stringField(sel,explanation)},addHandler:function(){var criterionElement=$(this.element).closest(".openassessment_criterion");var criterionName=$(criterionElement).data("criterion");var criterionLabel=$(".openassessment_criterion_label",criterionElement).val();var options=$(".openassessment_criterion_option",this.element.parent());var name=OpenAssessment.ItemUtilities.createUniqueName(options,"data-option");$(this.element).attr("data-criterion",criterionName).attr("data-option",name);$(".openassessment_criterion_option_name",this.element).attr("value",name);var fields=this.getFieldValues();this.notifier.notificationFired("optionAdd",{criterionName:criterionName,criterionLabel:criterionLabel,name:name,label:fields.label,points:fields.points})},removeHandler:function(){var criterionName=$(this.element).data("criterion");var optionName=$(this.element).data("option");this.notifier.notificationFired("optionRemove",{criterionName:criterionName,name:optionName})},updateHandler:function(){var fields=this.getFieldValues();var criterionName=$(this.element).data("criterion");var optionName=$(this.element).data("option");var optionLabel=fields.label;var optionPoints=fields.points;this.notifier.notificationFired("optionUpdated",{criterionName:criterionName,name:optionName,label:optionLabel,points:optionPoints})},validate:function(){return this.pointsField.validate()},validationErrors:function(){var hasError=this.pointsField.validationErrors().length>0;return hasError?["Option points are invalid"]:[]},clearValidationErrors:function(){this.pointsField.clearValidationErrors()}};OpenAssessment.RubricCriterion=function(element,notifier){this.element=element;this.notifier=notifier;this.labelSel=$(".openassessment_criterion_label",this.element);this.promptSel=$(".openassessment_criterion_prompt",this.element);this.optionContainer=new OpenAssessment.Container(OpenAssessment.RubricOption,{containerElement:$(".openassessment_criterion_option_list",this.element).get(0),templateElement:$("#openassessment_option_template").get(0),addButtonElement:$(".openassessment_criterion_add_option",this.element).get(0),removeButtonClass:"openassessment_criterion_option_remove_button",containerItemClass:"openassessment_criterion_option",notifier:this.notifier})};OpenAssessment.RubricCriterion.prototype={addEventListeners:function(){this.optionContainer.addEventListeners();$(this.element).focusout($.proxy(this.updateHandler,this))},getFieldValues:function(){var fields={label:this.label(),prompt:this.prompt(),feedback:this.feedback(),options:this.optionContainer.getItemValues()};var nameString=OpenAssessment.Fields.stringField($(".openassessment_criterion_name",this.element));if(nameString!==""){fields.name=nameString}return fields},label:function(label){return OpenAssessment.Fields.stringField(this.labelSel,label)},prompt:function(prompt){return OpenAssessment.Fields.stringField(this.promptSel,prompt)},feedback:function(){return $(".openassessment_criterion_feedback",this.element).val()},addOption:function(){this.optionContainer.add()},addHandler:function(){var criteria=$(".openassessment_criterion",this.element.parent());var name=OpenAssessment.ItemUtilities.createUniqueName(criteria,"data-criterion");$(this.element).attr("data-criterion",name);$(".openassessment_criterion_name",this.element).attr("value",name)},removeHandler:function(){var criterionName=$(this.element).data("criterion");this.notifier.notificationFired("criterionRemove",{criterionName:criterionName})},updateHandler:function(){var fields=this.getFieldValues();var criterionName=fields.name;var criterionLabel=fields.label;this.notifier.notificationFired("criterionUpdated",{criterionName:criterionName,criterionLabel:criterionLabel})},validate:function(){var isValid=this.prompt()!=="";if(!isValid){this.promptSel.addClass("openassessment_highlighted_field")}$.each(this.optionContainer.getAllItems(),function(){isValid=this.validate()&&isValid});return isValid},validationErrors:function(){var errors=[];if(this.promptSel.hasClass("openassessment_highlighted_field")){errors.push("Criterion prompt is invalid.")}$.each(this.optionContainer.getAllItems(),function(){errors=errors.concat(this.validationErrors())});return errors},clearValidationErrors:function(){this.promptSel.removeClass("openassessment_highlighted_field");$.each(this.optionContainer.getAllItems(),function(){this.clearValidationErrors()})}};OpenAssessment.TrainingExample=function(element){this.element=element;this.criteria=$(".openassessment_training_example_criterion_option",this.element);this.answer=$(".openassessment_training_example_essay_part textarea",this.element)};OpenAssessment.TrainingExample.prototype={getFieldValues:function(){var optionsSelected=this.criteria.map(function(){return{criterion:$(this).data("criterion"),option:$(this).prop("value")}}).get();return{answer:this.answer.map(function(){return $(this).prop("value")}).get(),options_selected:optionsSelected}},addHandler:function(){$(".openassessment_training_example_criterion_option",this.element).each(function(){$("option",this).each(function(){OpenAssessment.ItemUtilities.refreshOptionString($(this))})})},addEventListeners:function(){},removeHandler:function(){},updateHandler:function(){},validate:function(){var isValid=true;this.criteria.each(function(){var isOptionValid=$(this).prop("value")!=="";isValid=isOptionValid&&isValid;if(!isOptionValid){$(this).addClass("openassessment_highlighted_field")}});return isValid},validationErrors:function(){var errors=[];this.criteria.each(function(){var hasError=$(this).hasClass("openassessment_highlighted_field");if(hasError){errors.push("Student training example is invalid.")}});return errors},clearValidationErrors:function(){this.criteria.each(function(){$(this).removeClass("openassessment_highlighted_field")})}};OpenAssessment.StudioView=function(runtime,element,server,data){this.element=element;this.runtime=runtime;this.server=server;this.data=data;this.fixModalHeight();this.initializeTabs();this.alert=(new OpenAssessment.ValidationAlert).install();var studentTrainingListener=new OpenAssessment.StudentTrainingListener;this.promptsView=new OpenAssessment.EditPromptsView($("#oa_prompts_editor_wrapper",this.element).get(0),new OpenAssessment.Notifier([studentTrainingListener]));var staffAssessmentView=new OpenAssessment.EditStaffAssessmentView($("#oa_staff_assessment_editor",this.element).get(0));var studentTrainingView=new OpenAssessment.EditStudentTrainingView($("#oa_student_training_editor",this.element).get(0));var peerAssessmentView=new OpenAssessment.EditPeerAssessmentView($("#oa_peer_assessment_editor",this.element).get(0));var selfAssessmentView=new OpenAssessment.EditSelfAssessmentView($("#oa_self_assessment_editor",this.element).get(0));var assessmentLookupDictionary={};assessmentLookupDictionary[staffAssessmentView.getID()]=staffAssessmentView;assessmentLookupDictionary[studentTrainingView.getID()]=studentTrainingView;assessmentLookupDictionary[peerAssessmentView.getID()]=peerAssessmentView;assessmentLookupDictionary[selfAssessmentView.getID()]=selfAssessmentView;this.settingsView=new OpenAssessment.EditSettingsView($("#oa_basic_settings_editor",this.element).get(0),assessmentLookupDictionary,data);this.rubricView=new OpenAssessment.EditRubricView($("#oa_rubric_editor_wrapper",this.element).get(0),new OpenAssessment.Notifier([studentTrainingListener]));$(".openassessment_save_button",this.element).click($.proxy(this.save,this));$(".openassessment_cancel_button",this.element).click($.proxy(this.cancel,this))};OpenAssessment.StudioView.prototype={fixModalHeight:function(){$(this.element).addClass("openassessment_full_height").parentsUntil(".modal-window").addClass("openassessment_full_height");$(this.element).closest(".modal-window").addClass("openassessment_modal_window")},initializeTabs:function(){if(typeof OpenAssessment.lastOpenEditingTab==="undefined"){OpenAssessment.lastOpenEditingTab=2}$(".openassessment_editor_content_and_tabs",this.element).tabs({active:OpenAssessment.lastOpenEditingTab})},saveTabState:function(){var tabElement=$(".openassessment_editor_content_and_tabs",this.element);OpenAssessment.lastOpenEditingTab=tabElement.tabs("option","active")},save:function(){var view=this;this.saveTabState();this.clearValidationErrors();if(!this.validate()){this.alert.setMessage(gettext("Couldn't Save This Assignment"),gettext("Please correct the outlined fields.")).show()}else{this.alert.hide();this.server.checkReleased().done(function(isReleased){if(isReleased){view.confirmPostReleaseUpdate($.proxy(view.updateEditorContext,view))}else{view.updateEditorContext()}}).fail(function(errMsg){view.showError(errMsg)})}},confirmPostReleaseUpdate:function(onConfirm){var msg=gettext("This problem has already been released. Any changes will apply only to future assessments.");if(confirm(msg)){onConfirm()}},updateEditorContext:function(){this.runtime.notify("save",{state:"start"});var view=this;var fileUploadType=view.settingsView.fileUploadType();this.server.updateEditorContext({prompts:view.promptsView.promptsDefinition(),prompts_type:view.promptsView.promptsType(),feedbackPrompt:view.rubricView.feedbackPrompt(),feedback_default_text:view.rubricView.feedback_default_text(),criteria:view.rubricView.criteriaDefinition(),title:view.settingsView.displayName(),submissionStart:view.settingsView.submissionStart(),submissionDue:view.settingsView.submissionDue(),assessments:view.settingsView.assessmentsDescription(),textResponse:view.settingsView.textResponseNecessity(),fileUploadResponse:view.settingsView.fileUploadResponseNecessity(),fileUploadType:fileUploadType!==""?fileUploadType:null,fileTypeWhiteList:view.settingsView.fileTypeWhiteList(),latexEnabled:view.settingsView.latexEnabled(),leaderboardNum:view.settingsView.leaderboardNum(),editorAssessmentsOrder:view.settingsView.editorAssessmentsOrder(),teamsEnabled:view.settingsView.teamsEnabled(),selectedTeamsetId:view.settingsView.teamset()}).done(function(){view.runtime.notify("save",{state:"end"})}).fail(function(msg){view.showError(msg)})},cancel:function(){this.saveTabState();this.runtime.notify("cancel",{})},showError:function(errorMsg){this.runtime.notify("error",{msg:errorMsg})},validate:function(){var settingsValid=this.settingsView.validate();var rubricValid=this.rubricView.validate();var promptsValid=this.promptsView.validate();return settingsValid&&rubricValid&&promptsValid},validationErrors:function(){return this.settingsView.validationErrors().concat(this.rubricView.validationErrors().concat(this.promptsView.validationErrors()))},clearValidationErrors:function(){this.settingsView.clearValidationErrors();this.rubricView.clearValidationErrors();this.promptsView.clearValidationErrors()}};function oaTinyMCE(options){var CUSTOM_FONTS,STANDARD_FONTS,_getFonts,_this=this;CUSTOM_FONTS="Default='Open Sans', Verdana, Arial, Helvetica, sans-serif;";STANDARD_FONTS="Andale Mono=andale mono,times;"+"Arial=arial,helvetica,sans-serif;"+"Arial Black=arial black,avant garde;"+"Book Antiqua=book antiqua,palatino;"+"Comic Sans MS=comic sans ms,sans-serif;"+"Courier New=courier new,courier;"+"Georgia=georgia,palatino;"+"Helvetica=helvetica;"+"Impact=impact,chicago;"+"Symbol=symbol;"+"Tahoma=tahoma,arial,helvetica,sans-serif;"+"Terminal=terminal,monaco;"+"Times New Roman=times new roman,times;"+"Trebuchet MS=trebuchet ms,geneva;"+"Verdana=verdana,geneva;"+"Webdings=webdings;"+"Wingdings=wingdings,zapf dingbats";_getFonts=function(){return CUSTOM_FONTS+STANDARD_FONTS};this.initInstanceCallback=function(ed){return oaTinyMCE.prototype.initInstanceCallback.apply(_this,arguments)};this.saveLink=function(data){return oaTinyMCE.prototype.saveLink.apply(_this,arguments)};this.editLink=function(data){return oaTinyMCE.prototype.editLink.apply(_this,arguments)};this.saveImage=function(data){return oaTinyMCE.prototype.saveImage.apply(_this,arguments)};this.editImage=function(data){return oaTinyMCE.prototype.editImage.apply(_this,arguments)};this.setupTinyMCE=function(ed){return oaTinyMCE.prototype.setupTinyMCE.apply(_this,arguments)};oaTinyMCE.prototype.setupTinyMCE=function(ed){ed.on("SaveImage",this.saveImage);ed.on("EditImage",this.editImage);ed.on("SaveLink",this.saveLink);ed.on("EditLink",this.editLink)};oaTinyMCE.prototype.editImage=function(data){if(data.src){data.src=rewriteStaticLinks(data.src,this.base_asset_url,"/static/")}};oaTinyMCE.prototype.saveImage=function(data){if(data.src){data.src=rewriteStaticLinks(data.src,"/static/",this.base_asset_url)}};oaTinyMCE.prototype.editLink=function(data){if(data.href){data.href=rewriteStaticLinks(data.href,this.base_asset_url,"/static/")}};oaTinyMCE.prototype.saveLink=function(data){if(data.href){data.href=rewriteStaticLinks(data.href,"/static/",this.base_asset_url)}};oaTinyMCE.prototype.initInstanceCallback=function(ed){ed.setContent(rewriteStaticLinks(ed.getContent({no_events:1}),"/static/",this.base_asset_url));return ed.focus()};this.base_asset_url=options.base_asset_url;return{height:"300",font_formats:_getFonts(),theme:"modern",skin:"studio-tmce4",schema:"html5",convert_urls:false,directionality:$(".wrapper-view, .window-wrap").prop("dir"),formats:{code:{inline:"code"}},visual:false,plugins:"textcolor, link, image, media",image_advtab:true,toolbar:"formatselect | fontselect | bold italic underline forecolor | "+"bullist numlist outdent indent blockquote | link unlink image media",block_formats:gettext("Paragraph")+"=p;"+gettext("Preformatted")+"=pre;"+gettext("Heading 3")+"=h3;"+gettext("Heading 4")+"=h4;"+gettext("Heading 5")+"=h5;"+gettext("Heading 6")+"=h6",menubar:false,statusbar:false,valid_children:"+body[style]",valid_elements:"*[*]",extended_valid_elements:"*[*]",invalid_elements:"",setup:this.setupTinyMCE,init_instance_callback:this.initInstanceCallback,browser_spellcheck:true}}function OpenAssessmentEditor(runtime,element,data){var server=new OpenAssessment.Server(runtime,element);new OpenAssessment.StudioView(runtime,element,server,data)}OpenAssessment.EditPeerAssessmentView=function(element){this.element=element;this.name="peer-assessment";this.mustGradeField=new OpenAssessment.IntField($("#peer_assessment_must_grade",this.element),{min:0,max:99});this.mustBeGradedByField=new OpenAssessment.IntField($("#peer_assessment_graded_by",this.element),{min:0,max:99});new OpenAssessment.ToggleControl($("#include_peer_assessment",this.element),$("#peer_assessment_settings_editor",this.element),$("#peer_assessment_description_closed",this.element),new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener])).install();this.startDatetimeControl=new OpenAssessment.DatetimeControl(this.element,"#peer_assessment_start_date","#peer_assessment_start_time").install();this.dueDatetimeControl=new OpenAssessment.DatetimeControl(this.element,"#peer_assessment_due_date","#peer_assessment_due_time").install()};OpenAssessment.EditPeerAssessmentView.prototype={description:function(){return{must_grade:this.mustGradeNum(),must_be_graded_by:this.mustBeGradedByNum(),start:this.startDatetime(),due:this.dueDatetime()}},isEnabled:function(isEnabled){var sel=$("#include_peer_assessment",this.element);return OpenAssessment.Fields.booleanField(sel,isEnabled)},toggleEnabled:function(){$("#include_peer_assessment",this.element).click()},mustGradeNum:function(num){if(num!==undefined){this.mustGradeField.set(num)}return this.mustGradeField.get()},mustBeGradedByNum:function(num){if(num!==undefined){this.mustBeGradedByField.set(num)}return this.mustBeGradedByField.get()},startDatetime:function(dateString,timeString){return this.startDatetimeControl.datetime(dateString,timeString)},dueDatetime:function(dateString,timeString){return this.dueDatetimeControl.datetime(dateString,timeString)},getID:function(){return $(this.element).attr("id")},validate:function(){var startValid=this.startDatetimeControl.validate();var dueValid=this.dueDatetimeControl.validate();var mustGradeValid=this.mustGradeField.validate();var mustBeGradedByValid=this.mustBeGradedByField.validate();return startValid&&dueValid&&mustGradeValid&&mustBeGradedByValid},validationErrors:function(){var errors=[];if(this.startDatetimeControl.validationErrors().length>0){errors.push("Peer assessment start is invalid")}if(this.dueDatetimeControl.validationErrors().length>0){errors.push("Peer assessment due is invalid")}if(this.mustGradeField.validationErrors().length>0){errors.push("Peer assessment must grade is invalid")}if(this.mustBeGradedByField.validationErrors().length>0){errors.push("Peer assessment must be graded by is invalid")}return errors},clearValidationErrors:function(){this.startDatetimeControl.clearValidationErrors();this.dueDatetimeControl.clearValidationErrors();this.mustGradeField.clearValidationErrors();this.mustBeGradedByField.clearValidationErrors()}};OpenAssessment.EditSelfAssessmentView=function(element){this.element=element;this.name="self-assessment";new OpenAssessment.ToggleControl($("#include_self_assessment",this.element),$("#self_assessment_settings_editor",this.element),$("#self_assessment_description_closed",this.element),new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener])).install();this.startDatetimeControl=new OpenAssessment.DatetimeControl(this.element,"#self_assessment_start_date","#self_assessment_start_time").install();this.dueDatetimeControl=new OpenAssessment.DatetimeControl(this.element,"#self_assessment_due_date","#self_assessment_due_time").install()};OpenAssessment.EditSelfAssessmentView.prototype={description:function(){return{start:this.startDatetime(),due:this.dueDatetime()}},isEnabled:function(isEnabled){var sel=$("#include_self_assessment",this.element);return OpenAssessment.Fields.booleanField(sel,isEnabled)},toggleEnabled:function(){$("#include_self_assessment",this.element).click()},startDatetime:function(dateString,timeString){return this.startDatetimeControl.datetime(dateString,timeString)},dueDatetime:function(dateString,timeString){return this.dueDatetimeControl.datetime(dateString,timeString)},getID:function(){return $(this.element).attr("id")},validate:function(){var startValid=this.startDatetimeControl.validate();var dueValid=this.dueDatetimeControl.validate();return startValid&&dueValid},validationErrors:function(){var errors=[];if(this.startDatetimeControl.validationErrors().length>0){errors.push("Self assessment start is invalid")}if(this.dueDatetimeControl.validationErrors().length>0){errors.push("Self assessment due is invalid")}return errors},clearValidationErrors:function(){this.startDatetimeControl.clearValidationErrors();this.dueDatetimeControl.clearValidationErrors()}};OpenAssessment.EditStudentTrainingView=function(element){this.element=element;this.name="student-training";new OpenAssessment.ToggleControl($("#include_student_training",this.element),$("#student_training_settings_editor",this.element),$("#student_training_description_closed",this.element),new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener])).install();this.exampleContainer=new OpenAssessment.Container(OpenAssessment.TrainingExample,{containerElement:$("#openassessment_training_example_list",this.element).get(0),templateElement:$("#openassessment_training_example_template",this.element).get(0),addButtonElement:$(".openassessment_add_training_example",this.element).get(0),removeButtonClass:"openassessment_training_example_remove",containerItemClass:"openassessment_training_example"});this.exampleContainer.addEventListeners()};OpenAssessment.EditStudentTrainingView.prototype={description:function(){return{examples:this.exampleContainer.getItemValues()}},isEnabled:function(isEnabled){var sel=$("#include_student_training",this.element);return OpenAssessment.Fields.booleanField(sel,isEnabled)},toggleEnabled:function(){$("#include_student_training",this.element).click()},getID:function(){return $(this.element).attr("id")},validate:function(){var isValid=true;$.each(this.exampleContainer.getAllItems(),function(){isValid=this.validate()&&isValid});return isValid},validationErrors:function(){var errors=[];$.each(this.exampleContainer.getAllItems(),function(){errors=errors.concat(this.validationErrors())});return errors},clearValidationErrors:function(){$.each(this.exampleContainer.getAllItems(),function(){this.clearValidationErrors()})},addTrainingExample:function(){this.exampleContainer.add()}};OpenAssessment.EditStaffAssessmentView=function(element){this.element=element;this.name="staff-assessment";new OpenAssessment.ToggleControl($("#include_staff_assessment",this.element),$("#staff_assessment_description",this.element),$("#staff_assessment_description",this.element),new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener])).install()};OpenAssessment.EditStaffAssessmentView.prototype={description:function(){return{required:this.isEnabled()}},isEnabled:function(isEnabled){var sel=$("#include_staff_assessment",this.element);return OpenAssessment.Fields.booleanField(sel,isEnabled)},toggleEnabled:function(){$("#include_staff_assessment",this.element).click()},getID:function(){return $(this.element).attr("id")},validate:function(){return true},validationErrors:function(){return[]},clearValidationErrors:function(){}};OpenAssessment.Fields={stringField:function(sel,value){if(value!==undefined){sel.val(value)}return sel.val()},booleanField:function(sel,value){if(value!==undefined){sel.prop("checked",value)}return sel.prop("checked")}};OpenAssessment.IntField=function(inputSel,restrictions){this.max=restrictions.max;this.min=restrictions.min;this.input=$(inputSel)};OpenAssessment.IntField.prototype={get:function(){return parseInt(this.input.val().trim(),10)},set:function(val){this.input.val(val)},validate:function(){var value=this.get();var isValid=!isNaN(value)&&value>=this.min&&value<=this.max;if(this.input.val().indexOf(".")!==-1){isValid=false}if(!isValid){this.input.addClass("openassessment_highlighted_field")}return isValid},clearValidationErrors:function(){this.input.removeClass("openassessment_highlighted_field")},validationErrors:function(){var hasError=this.input.hasClass("openassessment_highlighted_field");return hasError?["Int field is invalid"]:[]}};OpenAssessment.ToggleControl=function(checkboxSel,shownSel,hiddenSel,notifier){this.checkbox=checkboxSel;this.shownSection=shownSel;this.hiddenSection=hiddenSel;this.notifier=notifier};OpenAssessment.ToggleControl.prototype={install:function(){this.checkbox.change(this,function(event){var control=event.data;if(this.checked){control.notifier.notificationFired("toggleOn",{});control.show()}else{control.notifier.notificationFired("toggleOff",{});control.hide()}});return this},show:function(){this.hiddenSection.addClass("is--hidden");this.shownSection.removeClass("is--hidden")},hide:function(){this.shownSection.addClass("is--hidden");this.hiddenSection.removeClass("is--hidden")}};OpenAssessment.DatetimeControl=function(element,datePicker,timePicker){this.element=element;this.datePicker=datePicker;this.timePicker=timePicker};OpenAssessment.DatetimeControl.prototype={install:function(){var dateString=$(this.datePicker,this.element).val();$(this.datePicker,this.element).datepicker({showButtonPanel:true}).datepicker("option","dateFormat","yy-mm-dd").datepicker("setDate",dateString);$(this.timePicker,this.element).timepicker({timeFormat:"H:i",step:60});return this},datetime:function(dateString,timeString){var datePickerSel=$(this.datePicker,this.element);var timePickerSel=$(this.timePicker,this.element);if(typeof dateString!=="undefined"){datePickerSel.val(dateString)}if(typeof timeString!=="undefined"){timePickerSel.val(timeString)}return datePickerSel.val()+"T"+timePickerSel.val()},validate:function(){var dateString=$(this.datePicker,this.element).val();var timeString=$(this.timePicker,this.element).val();var isDateValid=false;try{var parsedDate=$.datepicker.parseDate($.datepicker.ISO_8601,dateString);isDateValid=parsedDate instanceof Date}catch(err){}if(!isDateValid){$(this.datePicker,this.element).addClass("openassessment_highlighted_field")}var matches=timeString.match(/^\d{2}:\d{2}$/g);var isTimeValid=matches!==null;if(!isTimeValid){$(this.timePicker,this.element).addClass("openassessment_highlighted_field")}return isDateValid&&isTimeValid},clearValidationErrors:function(){$(this.datePicker,this.element).removeClass("openassessment_highlighted_field");$(this.timePicker,this.element).removeClass("openassessment_highlighted_field")},validationErrors:function(){var errors=[];var dateHasError=$(this.datePicker,this.element).hasClass("openassessment_highlighted_field");var timeHasError=$(this.timePicker,this.element).hasClass("openassessment_highlighted_field");if(dateHasError){errors.push("Date is invalid")}if(timeHasError){errors.push("Time is invalid")}return errors}};OpenAssessment.SelectControl=function(selectSel,mapping,notifier){this.select=selectSel;this.mapping=mapping;this.notifier=notifier};OpenAssessment.SelectControl.prototype={install:function(){this.select.change(this,function(event){var control=event.data;control.notifier.notificationFired("selectionChanged",{selected:this.value});control.change(this.value)});return this},change:function(selected){if($.isFunction(this.mapping)){this.mapping(selected)}else{$.each(this.mapping,function(option,sel){if(option===selected){sel.removeClass("is--hidden")}else{sel.addClass("is--hidden")}})}}};OpenAssessment.InputControl=function(inputSel,validator){this.input=$(inputSel);this.validator=validator;this.errors=[]};OpenAssessment.InputControl.prototype={get:function(){return this.input.val()},set:function(val){this.input.val(val)},validate:function(){this.errors=this.validator(this.get());if(this.errors.length){this.input.addClass("openassessment_highlighted_field");this.input.parent().nextAll(".message-status").text(this.errors.join(";"));this.input.parent().nextAll(".message-status").addClass("is-shown")}return this.errors.length===0},clearValidationErrors:function(){this.input.removeClass("openassessment_highlighted_field");this.input.parent().nextAll(".message-status").removeClass("is-shown")},validationErrors:function(){return this.errors}};OpenAssessment.StudentTrainingListener=function(){this.element=$("#oa_student_training_editor");this.alert=new OpenAssessment.ValidationAlert};OpenAssessment.StudentTrainingListener.prototype={promptAdd:function(){var view=this.element;$("#openassessment_training_example_part_template").children().first().clone().removeAttr("id").toggleClass("is--hidden",false).appendTo(".openassessment_training_example_essay",view)},promptRemove:function(data){var view=this.element;$(".openassessment_training_example_essay li:nth-child("+(data.index+1)+")",view).remove()},optionUpdated:function(data){this._optionSel(data.criterionName).each(function(){var criterion=this;var option=$('option[value="'+data.name+'"]',criterion).attr("data-points",data.points).attr("data-label",data.label);OpenAssessment.ItemUtilities.refreshOptionString(option)})},optionAdd:function(data){var criterionAdded=false;if(this._optionSel(data.criterionName).length===0){this.criterionAdd(data);criterionAdded=true}this._optionSel(data.criterionName).each(function(){var criterion=this;var option=$("<option></option>").attr("value",data.name).attr("data-points",data.points).attr("data-label",data.label);OpenAssessment.ItemUtilities.refreshOptionString(option);$(criterion).append(option)});if(criterionAdded){this.displayAlertMsg(gettext("Criterion Added"),gettext("You have added a criterion. You will need to select an option for the criterion in the Learner Training step. To do this, click the Settings tab."))}},optionRemove:function(data){var handler=this;var invalidated=false;this._optionSel(data.criterionName).each(function(){var criterionOption=this;if($(criterionOption).val()===data.name.toString()){$(criterionOption).val("").addClass("openassessment_highlighted_field").click(function(){$(criterionOption).removeClass("openassessment_highlighted_field")});invalidated=true}$('option[value="'+data.name+'"]',criterionOption).remove();if($("option",criterionOption).length===1){handler.removeAllOptions(data);invalidated=false}});if(invalidated){this.displayAlertMsg(gettext("Option Deleted"),gettext("You have deleted an option. That option has been removed from its criterion in the sample responses in the Learner Training step. You might have to select a new option for the criterion."))}},_optionSel:function(criterionName){return $('.openassessment_training_example_criterion_option[data-criterion="'+criterionName+'"]',this.element)},removeAllOptions:function(data){var changed=false;$(".openassessment_training_example_criterion",this.element).each(function(){var criterion=this;if($(criterion).data("criterion")===data.criterionName){$(criterion).remove();changed=true}});if(changed){this.displayAlertMsg(gettext("Option Deleted"),gettext("You have deleted all the options for this criterion. The criterion has been removed from the sample responses in the Learner Training step."))}},criterionRemove:function(data){var changed=false;var sel='.openassessment_training_example_criterion[data-criterion="'+data.criterionName+'"]';$(sel,this.element).each(function(){$(this).remove();changed=true});if(changed){this.displayAlertMsg(gettext("Criterion Deleted"),gettext("You have deleted a criterion. The criterion has been removed from the example responses in the Learner Training step."))}},displayAlertMsg:function(title,msg){if($("#include_student_training",this.element).is(":checked")&&$(".openassessment_training_example",this.element).length>1){this.alert.setMessage(title,msg).show()}},criterionUpdated:function(data){var sel='.openassessment_training_example_criterion[data-criterion="'+data.criterionName+'"]';$(sel,this.element).each(function(){$(".openassessment_training_example_criterion_name_wrapper",this).text(data.criterionLabel)})},criterionAdd:function(data){var view=this.element;var criterion=$("#openassessment_training_example_criterion_template").children().first().clone().removeAttr("id").attr("data-criterion",data.criterionName).toggleClass("is--hidden",false).appendTo(".openassessment_training_example_criteria_selections",view);criterion.find(".openassessment_training_example_criterion_option").attr("data-criterion",data.criterionName);criterion.find(".openassessment_training_example_criterion_name_wrapper").text(data.label)},examplesCriteriaLabels:function(){var examples=[];$(".openassessment_training_example_criteria_selections",this.element).each(function(){var exampleDescription={};$(".openassessment_training_example_criterion",this).each(function(){var criterionName=$(this).data("criterion");var criterionLabel=$(".openassessment_training_example_criterion_name_wrapper",this).text().trim();exampleDescription[criterionName]=criterionLabel});examples.push(exampleDescription)});return examples},examplesOptionsLabels:function(){var examples=[];$(".openassessment_training_example_criteria_selections",this.element).each(function(){var exampleDescription={};$(".openassessment_training_example_criterion_option",this).each(function(){var criterionName=$(this).data("criterion");exampleDescription[criterionName]={};$("option",this).each(function(){var optionName=$(this).val();var optionLabel=$(this).text().trim();exampleDescription[criterionName][optionName]=optionLabel})});examples.push(exampleDescription)});return examples}};OpenAssessment.AssessmentToggleListener=function(){this.alert=new OpenAssessment.ValidationAlert};OpenAssessment.AssessmentToggleListener.prototype={toggleOff:function(){this.alert.setMessage(gettext("Warning"),gettext("Changes to steps that are not selected as part of the assignment will not be saved.")).show()},toggleOn:function(){this.alert.hide()}};OpenAssessment.Notifier=function(listeners){this.listeners=listeners};OpenAssessment.Notifier.prototype={notificationFired:function(name,data){for(var i=0;i<this.listeners.length;i++){if(typeof this.listeners[i][name]==="function"){this.listeners[i][name](data)}}}};OpenAssessment.EditPromptsView=function(element,notifier){this.element=element;this.editorElement=$(this.element).closest("#openassessment-editor");this.addRemoveEnabled=this.editorElement.attr("data-is-released")!=="true";this.promptsContainer=new OpenAssessment.Container(OpenAssessment.Prompt,{containerElement:$("#openassessment_prompts_list",this.element).get(0),templateElement:$("#openassessment_prompt_template",this.element).get(0),addButtonElement:$("#openassessment_prompts_add_prompt",this.element).get(0),removeButtonClass:"openassessment_prompt_remove_button",containerItemClass:"openassessment_prompt",notifier:notifier,addRemoveEnabled:this.addRemoveEnabled});this.promptsContainer.addEventListeners()};OpenAssessment.EditPromptsView.prototype={promptsDefinition:function(){var prompts=this.promptsContainer.getItemValues();return prompts},promptsType:function(){var firstPrompt=this.promptsContainer.getItem(0);return firstPrompt&&firstPrompt.tinyMCEEnabled?"html":"text"},addPrompt:function(){if(this.addRemoveEnabled){this.promptsContainer.add()}},removePrompt:function(item){if(this.addRemoveEnabled){this.promptsContainer.remove(item)}},getAllPrompts:function(){return this.promptsContainer.getAllItems()},getPromptItem:function(index){return this.promptsContainer.getItem(index)},validate:function(){return true},validationErrors:function(){var errors=[];return errors},clearValidationErrors:function(){}};OpenAssessment.EditRubricView=function(element,notifier){this.element=element;this.criterionAddButton=$("#openassessment_rubric_add_criterion",this.element);this.criteriaContainer=new OpenAssessment.Container(OpenAssessment.RubricCriterion,{containerElement:$("#openassessment_criterion_list",this.element).get(0),templateElement:$("#openassessment_criterion_template",this.element).get(0),addButtonElement:$("#openassessment_rubric_add_criterion",this.element).get(0),removeButtonClass:"openassessment_criterion_remove_button",containerItemClass:"openassessment_criterion",notifier:notifier});this.criteriaContainer.addEventListeners()};OpenAssessment.EditRubricView.prototype={criteriaDefinition:function(){var criteria=this.criteriaContainer.getItemValues();for(var criterionIndex=0;criterionIndex<criteria.length;criterionIndex++){var criterion=criteria[criterionIndex];criterion.order_num=criterionIndex;for(var optionIndex=0;optionIndex<criterion.options.length;optionIndex++){var option=criterion.options[optionIndex];option.order_num=optionIndex}}return criteria},feedbackPrompt:function(text){var sel=$("#openassessment_rubric_feedback",this.element);return OpenAssessment.Fields.stringField(sel,text)},feedback_default_text:function(text){var sel=$("#openassessment_rubric_feedback_default_text",this.element);return OpenAssessment.Fields.stringField(sel,text)},addCriterion:function(){this.criteriaContainer.add()},removeCriterion:function(item){this.criteriaContainer.remove(item)},getAllCriteria:function(){return this.criteriaContainer.getAllItems()},getCriterionItem:function(index){return this.criteriaContainer.getItem(index)},addOption:function(criterionIndex){var criterionItem=this.getCriterionItem(criterionIndex);criterionItem.optionContainer.add()},removeOption:function(criterionIndex,item){var criterionItem=this.getCriterionItem(criterionIndex);criterionItem.optionContainer.remove(item)},getAllOptions:function(criterionIndex){var criterionItem=this.getCriterionItem(criterionIndex);return criterionItem.optionContainer.getAllItems()},getOptionItem:function(criterionIndex,optionIndex){var criterionItem=this.getCriterionItem(criterionIndex);return criterionItem.optionContainer.getItem(optionIndex)},validate:function(){var criteria=this.getAllCriteria();var isValid=criteria.length>0;if(!isValid){this.criterionAddButton.addClass("openassessment_highlighted_field").click(function(){$(this).removeClass("openassessment_highlighted_field")})}$.each(criteria,function(){isValid=this.validate()&&isValid});return isValid},validationErrors:function(){var errors=[];if(this.criterionAddButton.hasClass("openassessment_highlighted_field")){errors.push("The rubric must contain at least one criterion")}$.each(this.getAllCriteria(),function(){errors=errors.concat(this.validationErrors())});return errors},clearValidationErrors:function(){this.criterionAddButton.removeClass("openassessment_highlighted_field");$.each(this.getAllCriteria(),function(){this.clearValidationErrors()})}};OpenAssessment.EditSettingsView=function(element,assessmentViews,data){var self=this;this.settingsElement=element;this.assessmentsElement=$(element).siblings("#openassessment_assessment_module_settings_editors").get(0);this.assessmentViews=assessmentViews;this.startDatetimeControl=new OpenAssessment.DatetimeControl(this.element,"#openassessment_submission_start_date","#openassessment_submission_start_time").install();this.dueDatetimeControl=new OpenAssessment.DatetimeControl(this.element,"#openassessment_submission_due_date","#openassessment_submission_due_time").install();new OpenAssessment.SelectControl($("#openassessment_submission_file_upload_response",this.element),function(selectedValue){var el=$("#openassessment_submission_file_upload_type_wrapper",self.element);if(!selectedValue){el.addClass("is--hidden")}else{el.removeClass("is--hidden")}},new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener])).install();new OpenAssessment.SelectControl($("#openassessment_submission_upload_selector",this.element),{custom:$("#openassessment_submission_white_listed_file_types_wrapper",this.element)},new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener])).install();function onTeamsEnabledChange(selectedValue){var teamsetElement=$("#openassessment_teamset_selection_wrapper",self.element);var selfAssessment=self.assessmentViews.oa_self_assessment_editor;var peerAssessment=self.assessmentViews.oa_peer_assessment_editor;var trainingAssessment=self.assessmentViews.oa_student_training_editor;var staffAssessment=self.assessmentViews.oa_staff_assessment_editor;if(!selectedValue||selectedValue==="0"){self.setHidden(teamsetElement,true);self.setHidden($(selfAssessment.element),false);self.setHidden($(peerAssessment.element),false);self.setHidden($(trainingAssessment.element),false)}else{self.setHidden(teamsetElement,false);self.setHidden($(selfAssessment.element),true);self.setHidden($(peerAssessment.element),true);self.setHidden($(trainingAssessment.element),true);staffAssessment.isEnabled(true)}}this.teamsEnabledSelectControl=new OpenAssessment.SelectControl($("#openassessment_team_enabled_selector",this.element),onTeamsEnabledChange,new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener])).install();this.leaderboardIntField=new OpenAssessment.IntField($("#openassessment_leaderboard_editor",this.element),{min:0,max:100});this.fileTypeWhiteListInputField=new OpenAssessment.InputControl($("#openassessment_submission_white_listed_file_types",this.element),function(value){var badExts=[];var errors=[];if(!value){errors.push(gettext("File types can not be empty."));return errors}var whiteList=$.map(value.replace(/\./g,"").toLowerCase().split(","),$.trim);$.each(whiteList,function(index,ext){if(data.FILE_EXT_BLACK_LIST.indexOf(ext)!==-1){badExts.push(ext)}});if(badExts.length){errors.push(gettext("The following file types are not allowed: ")+badExts.join(","))}return errors});this.initializeSortableAssessments();onTeamsEnabledChange($("#openassessment_team_enabled_selector").val())};OpenAssessment.EditSettingsView.prototype={initializeSortableAssessments:function(){var view=this;$("#openassessment_assessment_module_settings_editors",view.element).sortable({start:function(event,ui){$(".openassessment_assessment_module_editor",view.element).hide();var targetHeight="auto";ui.placeholder.height(targetHeight);ui.helper.height(targetHeight);$("#openassessment_assessment_module_settings_editors",view.element).sortable("refresh").sortable("refreshPositions")},stop:function(){$(".openassessment_assessment_module_editor",view.element).show()},snap:true,axis:"y",handle:".drag-handle",cursorAt:{top:20}});$("#openassessment_assessment_module_settings_editors .drag-handle",view.element).disableSelection()},displayName:function(name){var sel=$("#openassessment_title_editor",this.settingsElement);return OpenAssessment.Fields.stringField(sel,name)},submissionStart:function(dateString,timeString){return this.startDatetimeControl.datetime(dateString,timeString)},submissionDue:function(dateString,timeString){return this.dueDatetimeControl.datetime(dateString,timeString)},textResponseNecessity:function(value){var sel=$("#openassessment_submission_text_response",this.settingsElement);if(value!==undefined){sel.val(value)}return sel.val()},fileUploadResponseNecessity:function(value,triggerChange){var sel=$("#openassessment_submission_file_upload_response",this.settingsElement);if(value!==undefined){triggerChange=triggerChange||false;sel.val(value);if(triggerChange){$(sel).trigger("change")}}return sel.val()},fileUploadType:function(uploadType){var fileUploadTypeWrapper=$("#openassessment_submission_file_upload_type_wrapper",this.settingsElement);var fileUploadAllowed=!$(fileUploadTypeWrapper).hasClass("is--hidden");if(fileUploadAllowed){var sel=$("#openassessment_submission_upload_selector",this.settingsElement);if(uploadType!==undefined){sel.val(uploadType)}return sel.val()}return""},fileTypeWhiteList:function(exts){if(exts!==undefined){this.fileTypeWhiteListInputField.set(exts)}return this.fileTypeWhiteListInputField.get()},settingSelectorEnabled:function(settingId,isEnabled){var sel=$(settingId,this.settingsElement);if(isEnabled!==undefined){if(isEnabled){sel.val(1)}else{sel.val(0)}}return sel.val()==="1"},latexEnabled:function(isEnabled){return this.settingSelectorEnabled("#openassessment_submission_latex_editor",isEnabled)},teamsEnabled:function(isEnabled){if(isEnabled!==undefined){this.teamsEnabledSelectControl.change(isEnabled?"1":"0")}return this.settingSelectorEnabled("#openassessment_team_enabled_selector",isEnabled)},setHidden:function(selector,hidden){selector.toggleClass("is--hidden",hidden);selector.attr("aria-hidden",hidden?"true":"false")},isHidden:function(selector){return selector.hasClass("is--hidden")&&selector.attr("aria-hidden")==="true"},teamset:function(teamsetIdentifier){if(this.teamsEnabled()){var sel=$("#openassessment_teamset_selector",this.settingsElement);if(teamsetIdentifier!==undefined){sel.val(teamsetIdentifier)}return sel.val()}return""},leaderboardNum:function(num){if(num!==undefined){this.leaderboardIntField.set(num)}return this.leaderboardIntField.get(num)},assessmentsDescription:function(){var assessmentDescList=[];var view=this;$(".openassessment_assessment_module_settings_editor",this.assessmentsElement).each(function(){var asmntView=view.assessmentViews[$(this).attr("id")];var isVisible=!view.isHidden($(asmntView.element));if(asmntView.isEnabled()&&isVisible){var description=asmntView.description();description.name=asmntView.name;assessmentDescList.push(description)}});return assessmentDescList},editorAssessmentsOrder:function(){var editorAssessments=[];var view=this;$(".openassessment_assessment_module_settings_editor",this.assessmentsElement).each(function(){var asmntView=view.assessmentViews[$(this).attr("id")];editorAssessments.push(asmntView.name)});return editorAssessments},validate:function(){var isValid=true;isValid=this.startDatetimeControl.validate()&&isValid;isValid=this.dueDatetimeControl.validate()&&isValid;isValid=this.leaderboardIntField.validate()&&isValid;if(this.fileUploadType()==="custom"){isValid=this.fileTypeWhiteListInputField.validate()&&isValid}else{if(this.fileTypeWhiteListInputField.get()&&!this.fileTypeWhiteListInputField.validate()){this.fileTypeWhiteListInputField.set("")}}$.each(this.assessmentViews,function(){if(this.isEnabled()){isValid=this.validate()&&isValid}});return isValid},validationErrors:function(){var errors=[];if(this.startDatetimeControl.validationErrors().length>0){errors.push("Submission start is invalid")}if(this.dueDatetimeControl.validationErrors().length>0){errors.push("Submission due is invalid")}if(this.leaderboardIntField.validationErrors().length>0){errors.push("Leaderboard number is invalid")}if(this.fileTypeWhiteListInputField.validationErrors().length>0){errors=errors.concat(this.fileTypeWhiteListInputField.validationErrors())}$.each(this.assessmentViews,function(){errors=errors.concat(this.validationErrors())});return errors},clearValidationErrors:function(){this.startDatetimeControl.clearValidationErrors();this.dueDatetimeControl.clearValidationErrors();this.leaderboardIntField.clearValidationErrors();this.fileTypeWhiteListInputField.clearValidationErrors();$.each(this.assessmentViews,function(){this.clearValidationErrors()})}};OpenAssessment.ValidationAlert=function(){this.element=$("#openassessment_validation_alert");this.editorElement=$(this.element).parent();this.title=$(".openassessment_alert_title",this.element);this.message=$(".openassessment_alert_message",this.element);this.closeButton=$(".openassessment_alert_close",this.element);this.ALERT_YELLOW="rgb(192, 172, 0)";this.DARK_GREY="#323232"};OpenAssessment.ValidationAlert.prototype={install:function(){var alert=this;this.closeButton.click(function(eventObject){eventObject.preventDefault();alert.hide()});return this},hide:function(){var headerHeight=$("#openassessment_editor_header",this.editorElement).outerHeight();this.element.addClass("covered");var styles={height:"Calc(100% - "+headerHeight+"px)","border-top-right-radius":"3px","border-top-left-radius":"3px"};$(".oa_editor_content_wrapper",this.editorElement).each(function(){$(this).css(styles)});return this},show:function(){var view=this;if(this.isVisible()){$(this.element).animate({"background-color":view.ALERT_YELLOW},300,"swing",function(){$(this).animate({"background-color":view.DARK_GREY},700,"swing")})}else{this.element.removeClass("covered");var alertHeight=this.element.outerHeight();var headerHeight=$("#openassessment_editor_header",this.editorElement).outerHeight();var heightString="Calc(100% - "+(alertHeight+headerHeight)+"px)";var styles={height:heightString,"border-top-right-radius":"0px","border-top-left-radius":"0px"};$(".oa_editor_content_wrapper",this.editorElement).each(function(){$(this).css(styles);$(this).scrollTop($(this).scrollTop()+alertHeight)})}return this},setMessage:function(newTitle,newMessage){this.title.text(newTitle);this.message.text(newMessage);return this},isVisible:function(){return!this.element.hasClass("covered")},getTitle:function(){return this.title.text()},getMessage:function(){return this.message.text()}};!function(a,b){"function"==typeof define&&define.amd?define(["underscore","backbone"],function(c,d){return a.Backgrid=b(c,d)}):"object"==typeof exports?module.exports=b(require("underscore"),require("backbone")):a.Backgrid=b(a._,a.Backbone)}(this,function(a,b){"use strict";function c(a,b,c){var d=b-(a+"").length;d=d<0?0:d;for(var e="",f=0;f<d;f++)e+=c;return e+a}var d="\t\n\v\f\r   ᠎             　\u2028\u2029\ufeff";if(!String.prototype.trim||d.trim()){d="["+d+"]";var e=new RegExp("^"+d+d+"*"),f=new RegExp(d+d+"*$");String.prototype.trim=function(){if(void 0===this||null===this)throw new TypeError("can't convert "+this+" to object");return String(this).replace(e,"").replace(f,"")}}var g=b.$,h={Extension:{},resolveNameToClass:function(b,c){if(a.isString(b)){var d=a.map(b.split("-"),function(a){return a.slice(0,1).toUpperCase()+a.slice(1)}).join("")+c,e=h[d]||h.Extension[d];if(a.isUndefined(e))throw new ReferenceError("Class '"+d+"' not found");return e}return b},callByNeed:function(){var b=arguments[0];if(!a.isFunction(b))return b;var c=arguments[1],d=[].slice.call(arguments,2);return b.apply(c,d+""?d:[])}};a.extend(h,b.Events);var i=h.Command=function(b){a.extend(this,{altKey:!!b.altKey,char:b.char,charCode:b.charCode,ctrlKey:!!b.ctrlKey,key:b.key,keyCode:b.keyCode,locale:b.locale,location:b.location,metaKey:!!b.metaKey,repeat:!!b.repeat,shiftKey:!!b.shiftKey,which:b.which})};a.extend(i.prototype,{moveUp:function(){return 38==this.keyCode},moveDown:function(){return 40===this.keyCode},moveLeft:function(){return this.shiftKey&&9===this.keyCode},moveRight:function(){return!this.shiftKey&&9===this.keyCode},save:function(){return 13===this.keyCode},cancel:function(){return 27===this.keyCode},passThru:function(){return!(this.moveUp()||this.moveDown()||this.moveLeft()||this.moveRight()||this.save()||this.cancel())}});var j=h.CellFormatter=function(){};a.extend(j.prototype,{fromRaw:function(a,b){return a},toRaw:function(a,b){return a}});var k=h.NumberFormatter=function(b){if(a.extend(this,this.defaults,b||{}),this.decimals<0||this.decimals>20)throw new RangeError("decimals must be between 0 and 20")};k.prototype=new j,a.extend(k.prototype,{defaults:{decimals:2,decimalSeparator:".",orderSeparator:","},HUMANIZED_NUM_RE:/(\d)(?=(?:\d{3})+$)/g,fromRaw:function(b,c){if(a.isNull(b)||a.isUndefined(b))return"";b=parseFloat(b).toFixed(~~this.decimals);var d=b.split("."),e=d[0],f=d[1]?(this.decimalSeparator||".")+d[1]:"";return e.replace(this.HUMANIZED_NUM_RE,"$1"+this.orderSeparator)+f},toRaw:function(b,c){if(b=b.trim(),""===b)return null;for(var d="",e=b.split(this.orderSeparator),f=0;f<e.length;f++)d+=e[f];var g=d.split(this.decimalSeparator);d="";for(var f=0;f<g.length;f++)d=d+g[f]+".";"."===d[d.length-1]&&(d=d.slice(0,d.length-1));var h=1*(1*d).toFixed(~~this.decimals);return a.isNumber(h)&&!a.isNaN(h)?h:void 0}});var l=h.PercentFormatter=function(){h.NumberFormatter.apply(this,arguments)};l.prototype=new h.NumberFormatter,a.extend(l.prototype,{defaults:a.extend({},k.prototype.defaults,{multiplier:1,symbol:"%"}),fromRaw:function(a,b){var c=[].slice.call(arguments,1);return c.unshift(a*this.multiplier),(k.prototype.fromRaw.apply(this,c)||"0")+this.symbol},toRaw:function(b,c){var d=b.split(this.symbol);if(d&&d[0]&&""===d[1]||null==d[1]){var e=k.prototype.toRaw.call(this,d[0]);return a.isUndefined(e)?e:e/this.multiplier}}});var m=h.DatetimeFormatter=function(b){if(a.extend(this,this.defaults,b||{}),!this.includeDate&&!this.includeTime)throw new Error("Either includeDate or includeTime must be true")};m.prototype=new j,a.extend(m.prototype,{defaults:{includeDate:!0,includeTime:!0,includeMilli:!1},DATE_RE:/^([+\-]?\d{4})-(\d{2})-(\d{2})$/,TIME_RE:/^(\d{2}):(\d{2}):(\d{2})(\.(\d{3}))?$/,ISO_SPLITTER_RE:/T|Z| +/,_convert:function(b,d){if(""===(b+"").trim())return null;var e,f=null;if(a.isNumber(b)){var g=new Date(b);e=c(g.getUTCFullYear(),4,0)+"-"+c(g.getUTCMonth()+1,2,0)+"-"+c(g.getUTCDate(),2,0),f=c(g.getUTCHours(),2,0)+":"+c(g.getUTCMinutes(),2,0)+":"+c(g.getUTCSeconds(),2,0)}else{b=b.trim();var h=b.split(this.ISO_SPLITTER_RE)||[];e=this.DATE_RE.test(h[0])?h[0]:"",f=e&&h[1]?h[1]:this.TIME_RE.test(h[0])?h[0]:""}var i=this.DATE_RE.exec(e)||[],j=this.TIME_RE.exec(f)||[];if(d){if(this.includeDate&&a.isUndefined(i[0]))return;if(this.includeTime&&a.isUndefined(j[0]))return;if(!this.includeDate&&e)return;if(!this.includeTime&&f)return}var g=new Date(Date.UTC(1*i[1]||0,1*i[2]-1||0,1*i[3]||0,1*j[1]||null,1*j[2]||null,1*j[3]||null,1*j[5]||null)),k="";return this.includeDate&&(k=c(g.getUTCFullYear(),4,0)+"-"+c(g.getUTCMonth()+1,2,0)+"-"+c(g.getUTCDate(),2,0)),this.includeTime&&(k=k+(this.includeDate?"T":"")+c(g.getUTCHours(),2,0)+":"+c(g.getUTCMinutes(),2,0)+":"+c(g.getUTCSeconds(),2,0),this.includeMilli&&(k=k+"."+c(g.getUTCMilliseconds(),3,0))),this.includeDate&&this.includeTime&&(k+="Z"),k},fromRaw:function(b,c){return a.isNull(b)||a.isUndefined(b)?"":this._convert(b)},toRaw:function(a,b){return this._convert(a,!0)}});var n=h.StringFormatter=function(){};n.prototype=new j,a.extend(n.prototype,{fromRaw:function(b,c){return a.isUndefined(b)||a.isNull(b)?"":b+""}});var o=h.EmailFormatter=function(){};o.prototype=new j,a.extend(o.prototype,{toRaw:function(b,c){var d=b.trim().split("@");if(2===d.length&&a.all(d))return b}});var p=h.SelectFormatter=function(){};p.prototype=new j,a.extend(p.prototype,{fromRaw:function(b,c){return a.isArray(b)?b:null!=b?[b]:[]}});var q=h.CellEditor=b.View.extend({initialize:function(a){this.formatter=a.formatter,this.column=a.column,this.column instanceof B||(this.column=new B(this.column)),this.listenTo(this.model,"backgrid:editing",this.postRender)},postRender:function(a,b){return null!=b&&b.get("name")!=this.column.get("name")||this.$el.focus(),this}}),r=h.InputCellEditor=q.extend({tagName:"input",attributes:{type:"text"},events:{blur:"saveOrCancel",keydown:"saveOrCancel"},initialize:function(a){r.__super__.initialize.apply(this,arguments),a.placeholder&&this.$el.attr("placeholder",a.placeholder)},render:function(){var a=this.model;return this.$el.val(this.formatter.fromRaw(a.get(this.column.get("name")),a)),this},saveOrCancel:function(b){var c=this.formatter,d=this.model,e=this.column,f=new i(b),g="blur"===b.type;if(f.moveUp()||f.moveDown()||f.moveLeft()||f.moveRight()||f.save()||g){b.preventDefault(),b.stopPropagation();var h=this.$el.val(),j=c.toRaw(h,d);a.isUndefined(j)?d.trigger("backgrid:error",d,e,h):(d.set(e.get("name"),j),d.trigger("backgrid:edited",d,e,f))}else f.cancel()&&(b.stopPropagation(),d.trigger("backgrid:edited",d,e,f))},postRender:function(a,b){if(null==b||b.get("name")==this.column.get("name"))if("right"===this.$el.css("text-align")){var c=this.$el.val();this.$el.focus().val(null).val(c)}else this.$el.focus();return this}}),s=h.Cell=b.View.extend({tagName:"td",formatter:j,editor:r,events:{click:"enterEditMode"},initialize:function(b){this.column=b.column,this.column instanceof B||(this.column=new B(this.column));var c=this.column,d=this.model,e=this.$el,f=h.resolveNameToClass(c.get("formatter")||this.formatter,"Formatter");a.isFunction(f.fromRaw)||a.isFunction(f.toRaw)||(f=new f),this.formatter=f,this.editor=h.resolveNameToClass(this.editor,"CellEditor"),this.listenTo(d,"change:"+c.get("name"),function(){e.hasClass("editor")||this.render()}),this.listenTo(d,"backgrid:error",this.renderError),this.listenTo(c,"change:editable change:sortable change:renderable",function(a){var b=a.changedAttributes();for(var c in b)b.hasOwnProperty(c)&&e.toggleClass(c,b[c])}),this.updateStateClassesMaybe()},updateStateClassesMaybe:function(){var a=this.model,b=this.column,c=this.$el;c.toggleClass("editable",h.callByNeed(b.editable(),b,a)),c.toggleClass("sortable",h.callByNeed(b.sortable(),b,a)),c.toggleClass("renderable",h.callByNeed(b.renderable(),b,a))},render:function(){var a=this.$el;a.empty();var b=this.model,c=this.column.get("name");return a.text(this.formatter.fromRaw(b.get(c),b)),a.addClass(c),this.updateStateClassesMaybe(),this.delegateEvents(),this},enterEditMode:function(){var a=this.model,b=this.column,c=h.callByNeed(b.editable(),b,a);c&&(this.currentEditor=new this.editor({column:this.column,model:this.model,formatter:this.formatter}),a.trigger("backgrid:edit",a,b,this,this.currentEditor),this.undelegateEvents(),this.$el.empty(),this.$el.append(this.currentEditor.$el),this.currentEditor.render(),this.$el.addClass("editor"),a.trigger("backgrid:editing",a,b,this,this.currentEditor))},renderError:function(a,b){null!=b&&b.get("name")!=this.column.get("name")||this.$el.addClass("error")},exitEditMode:function(){this.$el.removeClass("error"),this.currentEditor.remove(),this.stopListening(this.currentEditor),delete this.currentEditor,this.$el.removeClass("editor"),this.render()},remove:function(){return this.currentEditor&&(this.currentEditor.remove.apply(this.currentEditor,arguments),delete this.currentEditor),s.__super__.remove.apply(this,arguments)}}),t=h.StringCell=s.extend({className:"string-cell",formatter:n}),u=h.UriCell=s.extend({className:"uri-cell",title:null,target:"_blank",initialize:function(a){u.__super__.initialize.apply(this,arguments),this.title=a.title||this.title,this.target=a.target||this.target},render:function(){this.$el.empty();var a=this.model.get(this.column.get("name")),b=this.formatter.fromRaw(a,this.model);return this.$el.append(g("<a>",{tabIndex:-1,href:a,title:this.title||b,target:this.target}).text(b)),this.delegateEvents(),this}}),v=(h.EmailCell=t.extend({className:"email-cell",formatter:o,render:function(){this.$el.empty();var a=this.model,b=this.formatter.fromRaw(a.get(this.column.get("name")),a);return this.$el.append(g("<a>",{tabIndex:-1,href:"mailto:"+b,title:b}).text(b)),this.delegateEvents(),this}}),h.NumberCell=s.extend({className:"number-cell",decimals:k.prototype.defaults.decimals,decimalSeparator:k.prototype.defaults.decimalSeparator,orderSeparator:k.prototype.defaults.orderSeparator,formatter:k,initialize:function(a){v.__super__.initialize.apply(this,arguments);var b=this.formatter;b.decimals=this.decimals,b.decimalSeparator=this.decimalSeparator,b.orderSeparator=this.orderSeparator}})),w=(h.IntegerCell=v.extend({className:"integer-cell",decimals:0}),h.PercentCell=v.extend({className:"percent-cell",multiplier:l.prototype.defaults.multiplier,symbol:l.prototype.defaults.symbol,formatter:l,initialize:function(){w.__super__.initialize.apply(this,arguments);var a=this.formatter;a.multiplier=this.multiplier,a.symbol=this.symbol}})),x=h.DatetimeCell=s.extend({className:"datetime-cell",includeDate:m.prototype.defaults.includeDate,includeTime:m.prototype.defaults.includeTime,includeMilli:m.prototype.defaults.includeMilli,formatter:m,initialize:function(b){x.__super__.initialize.apply(this,arguments);var c=this.formatter;c.includeDate=this.includeDate,c.includeTime=this.includeTime,c.includeMilli=this.includeMilli;var d=this.includeDate?"YYYY-MM-DD":"";d+=this.includeDate&&this.includeTime?"T":"",d+=this.includeTime?"HH:mm:ss":"",d+=this.includeTime&&this.includeMilli?".SSS":"",this.editor=this.editor.extend({attributes:a.extend({},this.editor.prototype.attributes,this.editor.attributes,{placeholder:d})})}}),y=(h.DateCell=x.extend({className:"date-cell",includeTime:!1}),h.TimeCell=x.extend({className:"time-cell",includeDate:!1}),h.BooleanCellEditor=q.extend({tagName:"input",attributes:{tabIndex:-1,type:"checkbox"},events:{mousedown:function(){this.mouseDown=!0},blur:"enterOrExitEditMode",mouseup:function(){this.mouseDown=!1},change:"saveOrCancel",keydown:"saveOrCancel"},render:function(){var a=this.model,b=this.formatter.fromRaw(a.get(this.column.get("name")),a);return this.$el.prop("checked",b),this},enterOrExitEditMode:function(a){if(!this.mouseDown){var b=this.model;b.trigger("backgrid:edited",b,this.column,new i(a))}},saveOrCancel:function(a){var b=this.model,c=this.column,d=this.formatter,e=new i(a);if(e.passThru()&&"change"!=a.type)return!0;e.cancel()&&(a.stopPropagation(),b.trigger("backgrid:edited",b,c,e));var f=this.$el;if(e.save()||e.moveLeft()||e.moveRight()||e.moveUp()||e.moveDown()){a.preventDefault(),a.stopPropagation();var g=d.toRaw(f.prop("checked"),b);b.set(c.get("name"),g),b.trigger("backgrid:edited",b,c,e)}else if("change"==a.type){var g=d.toRaw(f.prop("checked"),b);b.set(c.get("name"),g),f.focus()}}})),z=(h.BooleanCell=s.extend({className:"boolean-cell",editor:y,events:{click:"enterEditMode"},render:function(){this.$el.empty();var a=this.model,b=this.column,c=h.callByNeed(b.editable(),b,a);return this.$el.append(g("<input>",{tabIndex:-1,type:"checkbox",checked:this.formatter.fromRaw(a.get(b.get("name")),a),disabled:!c})),this.delegateEvents(),this}}),h.SelectCellEditor=q.extend({tagName:"select",events:{change:"save",blur:"close",keydown:"close"},template:a.template('<option value="<%- value %>" <%= selected ? \'selected="selected"\' : "" %>><%- text %></option>',null,{variable:null,evaluate:/<%([\s\S]+?)%>/g,interpolate:/<%=([\s\S]+?)%>/g,escape:/<%-([\s\S]+?)%>/g}),setOptionValues:function(b){this.optionValues=b,this.optionValues=a.result(this,"optionValues")},setMultiple:function(a){this.multiple=a,this.$el.prop("multiple",a)},_renderOptions:function(b,c){for(var d="",e=0;e<b.length;e++)d+=this.template({text:b[e][0],value:b[e][1],selected:a.indexOf(c,b[e][1])>-1});return d},render:function(){this.$el.empty();var b=a.result(this,"optionValues"),c=this.model,d=this.formatter.fromRaw(c.get(this.column.get("name")),c);if(!a.isArray(b))throw new TypeError("optionValues must be an array");for(var e=null,f=null,e=null,h=null,i=null,j=0;j<b.length;j++){var e=b[j];if(a.isArray(e))f=e[0],e=e[1],this.$el.append(this.template({text:f,value:e,selected:a.indexOf(d,e)>-1}));else{if(!a.isObject(e))throw new TypeError("optionValues elements must be a name-value pair or an object hash of { name: 'optgroup label', value: [option name-value pairs] }");h=e.name,i=g("<optgroup></optgroup>",{label:h}),i.append(this._renderOptions.call(this,e.values,d)),this.$el.append(i)}}return this.delegateEvents(),this},save:function(a){var b=this.model,c=this.column;b.set(c.get("name"),this.formatter.toRaw(this.$el.val(),b))},close:function(a){var b=this.model,c=this.column,d=new i(a);d.cancel()?(a.stopPropagation(),b.trigger("backgrid:edited",b,c,new i(a))):(d.save()||d.moveLeft()||d.moveRight()||d.moveUp()||d.moveDown()||"blur"==a.type)&&(a.preventDefault(),a.stopPropagation(),this.save(a),b.trigger("backgrid:edited",b,c,new i(a)))}})),A=h.SelectCell=s.extend({className:"select-cell",editor:z,multiple:!1,formatter:p,optionValues:void 0,delimiter:", ",initialize:function(a){A.__super__.initialize.apply(this,arguments),this.listenTo(this.model,"backgrid:edit",function(a,b,c,d){b.get("name")==this.column.get("name")&&(d.setOptionValues(this.optionValues),d.setMultiple(this.multiple))})},render:function(){this.$el.empty();var b=a.result(this,"optionValues"),c=this.model,d=this.formatter.fromRaw(c.get(this.column.get("name")),c),e=[];try{if(!a.isArray(b)||a.isEmpty(b))throw new TypeError;for(var f=0;f<d.length;f++)for(var g=d[f],h=0;h<b.length;h++){var i=b[h];if(a.isArray(i)){var j=i[0],i=i[1];i==g&&e.push(j)}else{if(!a.isObject(i))throw new TypeError;for(var k=i.values,l=0;l<k.length;l++){var m=k[l];m[1]==g&&e.push(m[0])}}}this.$el.append(e.join(this.delimiter))}catch(a){if(a instanceof TypeError)throw new TypeError("'optionValues' must be of type {Array.<Array>|Array.<{name: string, values: Array.<Array>}>}");throw a}return this.delegateEvents(),this}}),B=h.Column=b.Model.extend({defaults:{name:void 0,label:void 0,sortable:!0,editable:!0,renderable:!0,formatter:void 0,sortType:"cycle",sortValue:void 0,direction:null,cell:void 0,headerCell:void 0},initialize:function(){this.has("label")||this.set({label:this.get("name")},{silent:!0});var a=h.resolveNameToClass(this.get("headerCell"),"HeaderCell"),b=h.resolveNameToClass(this.get("cell"),"Cell");this.set({cell:b,headerCell:a},{silent:!0})},sortValue:function(){var b=this.get("sortValue");return a.isString(b)?this[b]:a.isFunction(b)?b:function(a,b){return a.get(b)}}});a.each(["sortable","renderable","editable"],function(b){B.prototype[b]=function(){var c=this.get(b);return a.isString(c)?this[c]:a.isFunction(c)?c:!!c}});var C=h.Columns=b.Collection.extend({model:B}),D=h.Row=b.View.extend({tagName:"tr",initialize:function(a){var c=this.columns=a.columns;c instanceof b.Collection||(c=this.columns=new C(c));for(var d=this.cells=[],e=0;e<c.length;e++)d.push(this.makeCell(c.at(e),a));this.listenTo(c,"add",function(b,c){var e=c.indexOf(b),f=this.makeCell(b,a);d.splice(e,0,f);var g=this.$el;0===e?g.prepend(f.render().$el):e===c.length-1?g.append(f.render().$el):g.children().eq(e).before(f.render().$el)}),this.listenTo(c,"remove",function(a,b,c){d[c.index].remove(),d.splice(c.index,1)})},makeCell:function(a){return new(a.get("cell"))({column:a,model:this.model})},render:function(){this.$el.empty();for(var a=document.createDocumentFragment(),b=0;b<this.cells.length;b++)a.appendChild(this.cells[b].render().el);return this.el.appendChild(a),this.delegateEvents(),this},remove:function(){for(var a=0;a<this.cells.length;a++){var c=this.cells[a];c.remove.apply(c,arguments)}return b.View.prototype.remove.apply(this,arguments)}}),E=h.EmptyRow=b.View.extend({tagName:"tr",emptyText:null,initialize:function(a){this.emptyText=a.emptyText,this.columns=a.columns},render:function(){this.$el.empty();var b=document.createElement("td");b.setAttribute("colspan",this.columns.length);var c=document.createElement("span");return c.innerHTML=a.result(this,"emptyText"),b.appendChild(c),this.el.className="empty",this.el.appendChild(b),this}}),F=h.HeaderCell=b.View.extend({tagName:"th",events:{"click button":"onClick"},initialize:function(a){this.column=a.column,this.column instanceof B||(this.column=new B(this.column));var b=this.column,c=this.collection,d=this.$el;this.listenTo(b,"change:editable change:sortable change:renderable",function(a){var b=a.changedAttributes();for(var c in b)b.hasOwnProperty(c)&&d.toggleClass(c,b[c])}),this.listenTo(b,"change:direction",this.setCellDirection),this.listenTo(b,"change:name change:label",this.render),h.callByNeed(b.editable(),b,c)&&d.addClass("editable"),h.callByNeed(b.sortable(),b,c)&&d.addClass("sortable"),h.callByNeed(b.renderable(),b,c)&&d.addClass("renderable"),this.listenTo(c.fullCollection||c,"backgrid:sorted",this.removeCellDirection)},removeCellDirection:function(){this.$el.removeClass("ascending").removeClass("descending"),this.column.set("direction",null)},setCellDirection:function(a,b){this.$el.removeClass("ascending").removeClass("descending"),a.cid==this.column.cid&&this.$el.addClass(b)},onClick:function(a){function b(a,b){"ascending"===d.get("direction")?e.trigger(f,b,"descending"):"descending"===d.get("direction")?e.trigger(f,b,null):e.trigger(f,b,"ascending")}function c(a,b){"ascending"===d.get("direction")?e.trigger(f,b,"descending"):e.trigger(f,b,"ascending")}a.preventDefault();var d=this.column,e=this.collection,f="backgrid:sort",g=h.callByNeed(d.sortable(),d,this.collection);if(g){var i=d.get("sortType");"toggle"===i?c(this,d):b(this,d)}},render:function(){this.$el.empty();var a,b=this.column,c=h.callByNeed(b.sortable(),b,this.collection);return a=c?g("<button>").text(b.get("label")).append("<span class='sort-caret' aria-hidden='true'></span>"):document.createTextNode(b.get("label")),this.$el.append(a),this.$el.addClass(b.get("name")),this.$el.addClass(b.get("direction")),this.delegateEvents(),this}}),G=(h.HeaderRow=h.Row.extend({initialize:function(){h.Row.prototype.initialize.apply(this,arguments)},makeCell:function(a,b){var c=a.get("headerCell")||b.headerCell||F;return c=new c({column:a,collection:this.collection})}}),h.Header=b.View.extend({tagName:"thead",initialize:function(a){this.columns=a.columns,this.columns instanceof b.Collection||(this.columns=new C(this.columns)),this.row=new h.HeaderRow({columns:this.columns,collection:this.collection})},render:function(){return this.$el.append(this.row.render().$el),this.delegateEvents(),this},remove:function(){return this.row.remove.apply(this.row,arguments),b.View.prototype.remove.apply(this,arguments)}})),H=h.Body=b.View.extend({tagName:"tbody",initialize:function(a){this.columns=a.columns,this.columns instanceof b.Collection||(this.columns=new C(this.columns)),this.row=a.row||this.row||D,this.rows=this.collection.map(function(a){var b=new this.row({columns:this.columns,model:a});return b},this),this.emptyText=a.emptyText,this._unshiftEmptyRowMayBe();var c=this.collection;this.listenTo(c,"add",this.insertRow),this.listenTo(c,"remove",this.removeRow),this.listenTo(c,"sort",this.refresh),this.listenTo(c,"reset",this.refresh),this.listenTo(c,"backgrid:sort",this.sort),this.listenTo(c,"backgrid:edited",this.moveToNextCell),this.listenTo(this.columns,"add remove",this.updateEmptyRow)},_unshiftEmptyRowMayBe:function(){if(0===this.rows.length&&null!=this.emptyText)return this.emptyRow=new E({emptyText:this.emptyText,columns:this.columns}),this.rows.unshift(this.emptyRow),!0},insertRow:function(a,c,d){if(this.rows[0]instanceof E&&this.rows.pop().remove(),!(c instanceof b.Collection||d))return void this.collection.add(a,d=c);var e=new this.row({columns:this.columns,model:a}),f=c.indexOf(a);this.rows.splice(f,0,e);var g=this.$el,h=g.children(),i=e.render().$el;return f>=h.length?g.append(i):h.eq(f).before(i),this},removeRow:function(b,c,d){return d?((a.isUndefined(d.render)||d.render)&&this.rows[d.index].remove(),this.rows.splice(d.index,1),this._unshiftEmptyRowMayBe()&&this.render(),this):(this.collection.remove(b,d=c),void(this._unshiftEmptyRowMayBe()&&this.render()))},updateEmptyRow:function(){null!=this.emptyRow&&this.emptyRow.render()},refresh:function(){for(var a=0;a<this.rows.length;a++)this.rows[a].remove();return this.rows=this.collection.map(function(a){var b=new this.row({columns:this.columns,model:a});return b},this),this._unshiftEmptyRowMayBe(),this.render(),this.collection.trigger("backgrid:refresh",this),this},render:function(){this.$el.empty();for(var a=document.createDocumentFragment(),b=0;b<this.rows.length;b++){var c=this.rows[b];a.appendChild(c.render().el)}return this.el.appendChild(a),this.delegateEvents(),this},remove:function(){for(var a=0;a<this.rows.length;a++){var c=this.rows[a];c.remove.apply(c,arguments)}return b.View.prototype.remove.apply(this,arguments)},sort:function(c,d){if(!a.contains(["ascending","descending",null],d))throw new RangeError('direction must be one of "ascending", "descending" or `null`');a.isString(c)&&(c=this.columns.findWhere({name:c}));var e,f=this.collection;e="ascending"===d?-1:"descending"===d?1:null;var g=this.makeComparator(c.get("name"),e,e?c.sortValue():function(a){return 1*a.cid.replace("c","")});return b.PageableCollection&&f instanceof b.PageableCollection?(f.setSorting(e&&c.get("name"),e,{sortValue:c.sortValue()}),f.fullCollection?(null==f.fullCollection.comparator&&(f.fullCollection.comparator=g),f.fullCollection.sort(),f.trigger("backgrid:sorted",c,d,f),c.set("direction",d)):f.fetch({reset:!0,success:function(){f.trigger("backgrid:sorted",c,d,f),c.set("direction",d)}})):(f.comparator=g,f.sort(),f.trigger("backgrid:sorted",c,d,f),c.set("direction",d)),this},makeComparator:function(a,b,c){return function(d,e){var f,g=c(d,a),h=c(e,a);return 1===b&&(f=g,g=h,h=f),g===h?0:g<h?-1:1}},moveToNextCell:function(a,b,c){var d,e,f,g,i,j=this.collection.indexOf(a),k=this.columns.indexOf(b);if(k===-1)return this;if(this.rows[j].cells[k].exitEditMode(),c.moveUp()||c.moveDown()||c.moveLeft()||c.moveRight()||c.save()){var l=this.columns.length,m=l*this.collection.length;if(c.moveUp()||c.moveDown()){g=j+(c.moveUp()?-1:1);var n=this.rows[g];n?(d=n.cells[k],h.callByNeed(d.column.editable(),d.column,a)&&(d.enterEditMode(),a.trigger("backgrid:next",g,k,!1))):a.trigger("backgrid:next",g,k,!0)}else if(c.moveLeft()||c.moveRight()){for(var o=c.moveRight(),p=j*l+k+(o?1:-1);p>=0&&p<m;o?p++:p--)if(g=~~(p/l),i=p-g*l,d=this.rows[g].cells[i],e=h.callByNeed(d.column.renderable(),d.column,d.model),f=h.callByNeed(d.column.editable(),d.column,a),e&&f){d.enterEditMode(),a.trigger("backgrid:next",g,i,!1);break}p==m&&a.trigger("backgrid:next",~~(p/l),p-g*l,!0)}}return this}});h.Footer=b.View.extend({tagName:"tfoot",initialize:function(a){this.columns=a.columns,this.columns instanceof b.Collection||(this.columns=new h.Columns(this.columns))}}),h.Grid=b.View.extend({tagName:"table",className:"backgrid",header:G,body:H,footer:null,initialize:function(c){c.columns instanceof b.Collection||(c.columns=new C(c.columns||this.columns)),this.columns=c.columns,this.caption=c.caption;var d=a.omit(c,["el","id","attributes","className","tagName","events"]);this.body=c.body||this.body,this.body=new this.body(d),this.header=c.header||this.header,this.header&&(this.header=new this.header(d)),this.footer=c.footer||this.footer,this.footer&&(this.footer=new this.footer(d)),this.listenTo(this.columns,"reset",function(){this.header&&(this.header=new(this.header.remove().constructor)(d)),this.body=new(this.body.remove().constructor)(d),this.footer&&(this.footer=new(this.footer.remove().constructor)(d)),this.render()})},insertRow:function(){return this.body.insertRow.apply(this.body,arguments),this},removeRow:function(){return this.body.removeRow.apply(this.body,arguments),this},insertColumn:function(){return this.columns.add.apply(this.columns,arguments),this},removeColumn:function(){return this.columns.remove.apply(this.columns,arguments),this},sort:function(){return this.body.sort.apply(this.body,arguments),this},render:function(){return this.$el.empty(),this.caption&&this.$el.append(g("<caption>").text(this.caption)),this.header&&this.$el.append(this.header.render().$el),this.footer&&this.$el.append(this.footer.render().$el),this.$el.append(this.body.render().$el),this.delegateEvents(),this.trigger("backgrid:rendered",this),this},remove:function(){return this.header&&this.header.remove.apply(this.header,arguments),this.body.remove.apply(this.body,arguments),this.footer&&this.footer.remove.apply(this.footer,arguments),b.View.prototype.remove.apply(this,arguments)}});return h});
+if(typeof OpenAssessment=="undefined"||!OpenAssessment){OpenAssessment={};}if(typeof window.gettext==='undefined'){window.gettext=function(text){return text;};}if(typeof window.ngetgext==='undefined'){window.ngettext=function(singularText,pluralText,n){if(n>1){return pluralText;}else{return singularText;}};}if(typeof window.Logger==='undefined'){window.Logger={log:function(){}};}if(typeof window.MathJax==='undefined'){window.MathJax={Hub:{Typeset:function(){},Queue:function(){}}};}if(typeof OpenAssessment.Server==="undefined"||!OpenAssessment.Server){OpenAssessment.Server=function(runtime,element){this.runtime=runtime;this.element=element;this.renderedSections={};};var jsonContentType="application/json; charset=utf-8";OpenAssessment.Server.prototype={url:function(handler){return this.runtime.handlerUrl(this.element,handler);},render:function(component){var view=this;var url=this.url('render_'+component);if(this.renderedSections.hasOwnProperty(component)){var html=this.renderedSections[component];delete this.renderedSections[component];return $.Deferred().resolveWith(view,[html]).promise();}return $.Deferred(function(defer){$.ajax({url:url,type:"POST",dataType:"html"}).done(function(data){defer.resolveWith(view,[data]);}).fail(function(){defer.rejectWith(view,[gettext('This section could not be loaded.')]);});}).promise();},renderSections:function(components){var server=this;var url=this.url('render_sections');return $.Deferred(function(defer){$.ajax({url:url,type:"POST",data:JSON.stringify({sections:components}),contentType:jsonContentType,dataType:"json"}).done(function(data){server.renderedSections=data;}).always(function(){defer.resolve();});}).promise();},renderLatex:function(element){element.filter(".allow--latex").each(function(){MathJax.Hub.Queue(['Typeset',MathJax.Hub,this]);});},renderContinuedPeer:function(){var view=this;var url=this.url('render_peer_assessment');return $.Deferred(function(defer){$.ajax({url:url,type:"POST",dataType:"html",data:{continue_grading:true}}).done(function(data){defer.resolveWith(view,[data]);}).fail(function(){defer.rejectWith(view,[gettext('This section could not be loaded.')]);});}).promise();},studentInfo:function(studentUsername,options){var url=this.url('render_student_info');return $.Deferred(function(defer){$.ajax({url:url,type:"POST",dataType:"html",data:_.extend({student_username:studentUsername},options)}).done(function(data){defer.resolveWith(this,[data]);}).fail(function(){defer.rejectWith(this,[gettext('This section could not be loaded.')]);});}).promise();},staffGradeForm:function(){var url=this.url('render_staff_grade_form');return $.Deferred(function(defer){$.ajax({url:url,type:"POST",dataType:"html"}).done(function(data){defer.resolveWith(this,[data]);}).fail(function(){defer.rejectWith(this,[gettext('The staff assessment form could not be loaded.')]);});}).promise();},staffGradeCounts:function(){var url=this.url('render_staff_grade_counts');return $.Deferred(function(defer){$.ajax({url:url,type:"POST",dataType:"html"}).done(function(data){defer.resolveWith(this,[data]);}).fail(function(){defer.rejectWith(this,[gettext('The display of ungraded and checked out responses could not be loaded.')]);});}).promise();},submit:function(submission){var url=this.url('submit');return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({submission:submission}),contentType:jsonContentType}).done(function(data){var success=data[0];if(success){var studentId=data[1];var attemptNum=data[2];defer.resolveWith(this,[studentId,attemptNum]);}else{var errorNum=data[1];var errorMsg=data[2];defer.rejectWith(this,[errorNum,errorMsg]);}}).fail(function(){defer.rejectWith(this,["AJAX",gettext("This response could not be submitted.")]);});}).promise();},save:function(submission){var url=this.url('save_submission');return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({submission:submission}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve();}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext("This response could not be saved.")]);});}).promise();},submitFeedbackOnAssessment:function(text,options){var url=this.url('submit_feedback');var payload=JSON.stringify({'feedback_text':text,'feedback_options':options});return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:payload,contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve();}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('This feedback could not be submitted.')]);});}).promise();},submitAssessment:function(assessmentType,payload){var url=this.url(assessmentType);return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify(payload),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve();}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('This assessment could not be submitted.')]);});}).promise();},peerAssess:function(optionsSelected,criterionFeedback,overallFeedback,submissionID){return this.submitAssessment("peer_assess",{options_selected:optionsSelected,criterion_feedback:criterionFeedback,overall_feedback:overallFeedback,submission_uuid:submissionID});},selfAssess:function(optionsSelected,criterionFeedback,overallFeedback){return this.submitAssessment("self_assess",{options_selected:optionsSelected,criterion_feedback:criterionFeedback,overall_feedback:overallFeedback});},staffAssess:function(optionsSelected,criterionFeedback,overallFeedback,submissionID,assessType){return this.submitAssessment("staff_assess",{options_selected:optionsSelected,criterion_feedback:criterionFeedback,overall_feedback:overallFeedback,submission_uuid:submissionID,assess_type:assessType});},trainingAssess:function(optionsSelected){var url=this.url('training_assess');var payload=JSON.stringify({options_selected:optionsSelected});return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:payload,contentType:jsonContentType}).done(function(data){if(data.success){defer.resolveWith(this,[data.corrections]);}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('This assessment could not be submitted.')]);});});},scheduleTraining:function(){var url=this.url('schedule_training');return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:"\"\"",contentType:jsonContentType}).done(function(data){if(data.success){defer.resolveWith(this,[data.msg]);}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('This assessment could not be submitted.')]);});});},rescheduleUnfinishedTasks:function(){var url=this.url('reschedule_unfinished_tasks');return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:"\"\"",contentType:jsonContentType}).done(function(data){if(data.success){defer.resolveWith(this,[data.msg]);}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('One or more rescheduling tasks failed.')]);});});},updateEditorContext:function(options){var url=this.url('update_editor_context');var payload=JSON.stringify({prompts:options.prompts,prompts_type:options.prompts_type,feedback_prompt:options.feedbackPrompt,feedback_default_text:options.feedback_default_text,title:options.title,submission_start:options.submissionStart,submission_due:options.submissionDue,criteria:options.criteria,assessments:options.assessments,editor_assessments_order:options.editorAssessmentsOrder,text_response:options.textResponse,file_upload_response:options.fileUploadResponse,file_upload_type:options.fileUploadType,white_listed_file_types:options.fileTypeWhiteList,allow_latex:options.latexEnabled,leaderboard_show:options.leaderboardNum,teams_enabled:options.teamsEnabled,selected_teamset_id:options.selectedTeamsetId});return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:payload,contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve();}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('This problem could not be saved.')]);});}).promise();},checkReleased:function(){var url=this.url('check_released');var payload="\"\"";return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:payload,contentType:jsonContentType}).done(function(data){if(data.success){defer.resolveWith(this,[data.is_released]);}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext("The server could not be contacted.")]);});}).promise();},getUploadUrl:function(contentType,filename,filenum){var url=this.url('upload_url');return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({contentType:contentType,filename:filename,filenum:filenum}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve(data.url);}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('Could not retrieve upload url.')]);});}).promise();},getUploadUrls:function(files){var url=this.url('upload_urls');return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({files:files}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve(data.urls);}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('Could not retrieve upload url.')]);});}).promise();},initiateMultipartUpload:function(contentType,filename,filenum){var url=this.url('initiate_multipart_upload');return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({contentType:contentType,filename:filename,filenum:filenum}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve(data.uploadId);}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('Could not retrieve upload url.')]);});}).promise();},getUploadPartUrls:function(filenum,uploadId,partNumbers){var url=this.url('upload_part_urls');return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({filenum:filenum,uploadId:uploadId,partNumbers:partNumbers}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve(data.urls);}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('Could not retrieve upload url.')]);});}).promise();},listUploadParts:function(filenum,uploadId){return this.multipartUploadRequest('list_upload_parts',filenum,uploadId).pipe(function(data){return data.parts;});},completeMultipartUpload:function(filenum,uploadId){return this.multipartUploadRequest('complete_multipart_upload',filenum,uploadId);},abortMultipartUpload:function(filenum,uploadId){return this.multipartUploadRequest('abort_multipart_upload',filenum,uploadId);},multipartUploadRequest:function(handler,filenum,uploadId){var url=this.url(handler);return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({filenum:filenum,uploadId:uploadId}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve(data);}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('There was an error uploading your file.')]);});}).promise();},removeUploadedFile:function(filenum){var url=this.url('remove_uploaded_file');return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({'filenum':filenum}),contentType:jsonContentType,}).done(function(data){if(data.success){defer.resolve();}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('Server error.')]);});}).promise();},saveFilesDescriptions:function(fileMetadata){var url=this.url('save_files_descriptions');return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({fileMetadata:fileMetadata}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve();}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('Server error.')]);});}).promise();},getDownloadUrl:function(filenum){var url=this.url('download_url');return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({filenum:filenum}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve(data.url);}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('Could not retrieve download url.')]);});}).promise();},resolveFileUrls:function(tokens){var url=this.url('resolve_file_urls');return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({tokens:tokens}),contentType:jsonContentType}).done(function(data){if(data.success){defer.resolve(data.urls);}else{defer.rejectWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('Could not retrieve download url.')]);});}).promise();},cancelSubmission:function(submissionID,comments){var url=this.url('cancel_submission');var payload=JSON.stringify({submission_uuid:submissionID,comments:comments});return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:payload,contentType:jsonContentType}).done(function(data){if(data.success){defer.resolveWith(this,[data.msg]);}}).fail(function(){defer.rejectWith(this,[gettext('The submission could not be removed from the grading pool.')]);});}).promise();},publishEvent:function(eventName,eventData){eventData.event_name=eventName;var url=this.url('publish_event');var payload=JSON.stringify(eventData);$.ajax({type:"POST",url:url,data:payload,contentType:jsonContentType});},getTeamDetail:function(teamId){var teamsUrl=window.location.origin+'/api/team/v0/teams/'+teamId;return $.ajax({type:"GET",url:teamsUrl,contentType:jsonContentType});},listTeams:function(username,courseId){var teamsUrl=window.location.origin+'/api/team/v0/teams/';return $.Deferred(function(defer){$.ajax({type:"GET",url:teamsUrl,data:{course_id:courseId,username:username,},contentType:jsonContentType}).done(function(data){if(data.count>1){defer.rejectWith(this,[gettext('Multiple teams returned for course')]);}else if(data.count===0){defer.resolveWith(this,[null]);}else{defer.resolveWith(this,[data.results[0]]);}}).fail(function(){defer.rejectWith(this,[gettext('Could not load teams information.')]);});}).promise();},getUsername:function(){var url=this.url('get_student_username');return $.Deferred(function(defer){$.ajax({type:"POST",url:url,data:JSON.stringify({}),contentType:jsonContentType}).done(function(data){if(data.username===null){defer.rejectWith(this,[gettext('User lookup failed')]);}else{defer.resolveWith(this,[data.username]);}}).fail(function(){defer.rejectWith(this,[gettext('Error when looking up username')]);});});}};}OpenAssessment.Container=function(ContainerItem,kwargs){this.containerElement=kwargs.containerElement;this.templateElement=kwargs.templateElement;this.addButtonElement=kwargs.addButtonElement;this.removeButtonClass=kwargs.removeButtonClass;this.containerItemClass=kwargs.containerItemClass;this.notifier=kwargs.notifier;this.addRemoveEnabled=(typeof kwargs.addRemoveEnabled==='undefined')||kwargs.addRemoveEnabled;var container=this;this.createContainerItem=function(element){return new ContainerItem(element,container.notifier);};};OpenAssessment.Container.prototype={addEventListeners:function(){var container=this;if(this.addRemoveEnabled){$(this.addButtonElement).click($.proxy(this.add,this));$('.'+this.removeButtonClass,this.containerElement).click(function(eventData){var item=container.createContainerItem(eventData.target);container.remove(item);});}else{$(this.addButtonElement).addClass('is--disabled');$('.'+this.removeButtonClass,this.containerElement).addClass('is--disabled');}$('.'+this.containerItemClass,this.containerElement).each(function(index,element){var item=container.createContainerItem(element);item.addEventListeners();});},add:function(){$(this.templateElement).children().first().clone().removeAttr('id').toggleClass('is--hidden',false).toggleClass(this.containerItemClass,true).appendTo($(this.containerElement));var container=this;var containerItem=$('.'+this.containerItemClass,this.containerElement).last();if(this.addRemoveEnabled){containerItem.find('.'+this.removeButtonClass).click(function(eventData){var containerItem=container.createContainerItem(eventData.target);container.remove(containerItem);});}else{containerItem.find('.'+this.removeButtonClass).addClass('is--disabled');}var handlerItem=container.createContainerItem(containerItem);handlerItem.addEventListeners();handlerItem.addHandler();},remove:function(item){var itemElement=$(item.element).closest('.'+this.containerItemClass);var containerItem=this.createContainerItem(itemElement);containerItem.removeHandler();itemElement.remove();},getItemValues:function(){var values=[];var container=this;$('.'+this.containerItemClass,this.containerElement).each(function(index,element){var containerItem=container.createContainerItem(element);var fieldValues=containerItem.getFieldValues();values.push(fieldValues);});return values;},getItem:function(index){var element=$('.'+this.containerItemClass,this.containerElement).get(index);return(element!==undefined)?this.createContainerItem(element):null;},getAllItems:function(){var container=this;return $('.'+this.containerItemClass,this.containerElement).map(function(){return container.createContainerItem(this);});},};OpenAssessment.ItemUtilities={createUniqueName:function(selector,nameAttribute){var index=0;while(index<=selector.length){if(selector.parent().find('*['+nameAttribute+'=\''+index+'\']').length===0){return index.toString();}index++;}return index.toString();},refreshOptionString:function(element){var points=$(element).attr('data-points');var label=$(element).attr('data-label');var name=$(element).val();if(label===''){label=gettext('Unnamed Option');}var singularString=label+' - '+points+' point';var multipleString=label+' - '+points+' points';var finalLabel='';if(name===''){finalLabel=gettext('Not Selected');}else if(isNaN(points)){finalLabel=label;}else{finalLabel=ngettext(singularString,multipleString,points);}$(element).text(finalLabel);},};OpenAssessment.Prompt=function(element,notifier){if(this.tinyMCEEnabled){element=this.attachWysiwygToPrompt(element);}this.element=element;this.notifier=notifier;};OpenAssessment.Prompt.prototype={tinyMCEEnabled:window.tinyMCE!==undefined,attachWysiwygToPrompt:function(el){var elId=$(el).find('textarea').attr('id');if(!elId){var textarea=$(el).find('textarea');var text=$(textarea).val();var type=$(textarea).data('type');if(text&&(type==='text')){text=_.escape(text).replace(/(?:\r\n|\r|\n)/g,'<br />');$(textarea).val(text);}var newElId=Date.now()+'-textarea-'+(Math.random()*100);$(textarea).attr('id',newElId).tinymce(oaTinyMCE({base_asset_url:$('#openassessment_prompt_template').data('baseAssetUrl'),}));}return $(el);},getFieldValues:function(){var fields={description:this.description(),};return fields;},description:function(text){var sel=$('.openassessment_prompt_description',this.element);if(!this.tinyMCEEnabled){return OpenAssessment.Fields.stringField(sel,text);}var tinyEl=window.tinyMCE.get(sel.attr('id'));if(text){tinyEl.setContent(text);}else{return tinyEl.getContent();}},addEventListeners:function(){},addHandler:function(){this.notifier.notificationFired('promptAdd',{'index':this.element.index(),});},removeHandler:function(){this.notifier.notificationFired('promptRemove',{'index':this.element.index(),});},updateHandler:function(){},validate:function(){return true;},validationErrors:function(){return[];},clearValidationErrors:function(){},};OpenAssessment.RubricOption=function(element,notifier){this.element=element;this.notifier=notifier;this.pointsField=new OpenAssessment.IntField($('.openassessment_criterion_option_points',this.element),{min:0,max:999});};OpenAssessment.RubricOption.prototype={addEventListeners:function(){$(this.element).focusout($.proxy(this.updateHandler,this));},getFieldValues:function(){var fields={label:this.label(),points:this.points(),explanation:this.explanation(),};var nameString=OpenAssessment.Fields.stringField($('.openassessment_criterion_option_name',this.element));if(nameString!==''){fields.name=nameString;}return fields;},label:function(label){var sel=$('.openassessment_criterion_option_label',this.element);return OpenAssessment.Fields.stringField(sel,label);},points:function(points){if(points!==undefined){this.pointsField.set(points);}return this.pointsField.get();},explanation:function(explanation){var sel=$('.openassessment_criterion_option_explanation',this.element);return OpenAssessment.Fields.stringField(sel,explanation);},addHandler:function(){var criterionElement=$(this.element).closest('.openassessment_criterion');var criterionName=$(criterionElement).data('criterion');var criterionLabel=$('.openassessment_criterion_label',criterionElement).val();var options=$('.openassessment_criterion_option',this.element.parent());var name=OpenAssessment.ItemUtilities.createUniqueName(options,'data-option');$(this.element).attr('data-criterion',criterionName).attr('data-option',name);$('.openassessment_criterion_option_name',this.element).attr('value',name);var fields=this.getFieldValues();this.notifier.notificationFired('optionAdd',{'criterionName':criterionName,'criterionLabel':criterionLabel,'name':name,'label':fields.label,'points':fields.points,});},removeHandler:function(){var criterionName=$(this.element).data('criterion');var optionName=$(this.element).data('option');this.notifier.notificationFired('optionRemove',{'criterionName':criterionName,'name':optionName,});},updateHandler:function(){var fields=this.getFieldValues();var criterionName=$(this.element).data('criterion');var optionName=$(this.element).data('option');var optionLabel=fields.label;var optionPoints=fields.points;this.notifier.notificationFired('optionUpdated',{'criterionName':criterionName,'name':optionName,'label':optionLabel,'points':optionPoints,});},validate:function(){return this.pointsField.validate();},validationErrors:function(){var hasError=(this.pointsField.validationErrors().length>0);return hasError?['Option points are invalid']:[];},clearValidationErrors:function(){this.pointsField.clearValidationErrors();},};OpenAssessment.RubricCriterion=function(element,notifier){this.element=element;this.notifier=notifier;this.labelSel=$('.openassessment_criterion_label',this.element);this.promptSel=$('.openassessment_criterion_prompt',this.element);this.optionContainer=new OpenAssessment.Container(OpenAssessment.RubricOption,{containerElement:$('.openassessment_criterion_option_list',this.element).get(0),templateElement:$('#openassessment_option_template').get(0),addButtonElement:$('.openassessment_criterion_add_option',this.element).get(0),removeButtonClass:'openassessment_criterion_option_remove_button',containerItemClass:'openassessment_criterion_option',notifier:this.notifier,});};OpenAssessment.RubricCriterion.prototype={addEventListeners:function(){this.optionContainer.addEventListeners();$(this.element).focusout($.proxy(this.updateHandler,this));},getFieldValues:function(){var fields={label:this.label(),prompt:this.prompt(),feedback:this.feedback(),options:this.optionContainer.getItemValues(),};var nameString=OpenAssessment.Fields.stringField($('.openassessment_criterion_name',this.element));if(nameString!==''){fields.name=nameString;}return fields;},label:function(label){return OpenAssessment.Fields.stringField(this.labelSel,label);},prompt:function(prompt){return OpenAssessment.Fields.stringField(this.promptSel,prompt);},feedback:function(){return $('.openassessment_criterion_feedback',this.element).val();},addOption:function(){this.optionContainer.add();},addHandler:function(){var criteria=$('.openassessment_criterion',this.element.parent());var name=OpenAssessment.ItemUtilities.createUniqueName(criteria,'data-criterion');$(this.element).attr('data-criterion',name);$('.openassessment_criterion_name',this.element).attr('value',name);},removeHandler:function(){var criterionName=$(this.element).data('criterion');this.notifier.notificationFired('criterionRemove',{'criterionName':criterionName});},updateHandler:function(){var fields=this.getFieldValues();var criterionName=fields.name;var criterionLabel=fields.label;this.notifier.notificationFired('criterionUpdated',{'criterionName':criterionName,'criterionLabel':criterionLabel});},validate:function(){var isValid=(this.prompt()!=='');if(!isValid){this.promptSel.addClass('openassessment_highlighted_field');}$.each(this.optionContainer.getAllItems(),function(){isValid=(this.validate()&&isValid);});return isValid;},validationErrors:function(){var errors=[];if(this.promptSel.hasClass('openassessment_highlighted_field')){errors.push('Criterion prompt is invalid.');}$.each(this.optionContainer.getAllItems(),function(){errors=errors.concat(this.validationErrors());});return errors;},clearValidationErrors:function(){this.promptSel.removeClass('openassessment_highlighted_field');$.each(this.optionContainer.getAllItems(),function(){this.clearValidationErrors();});},};OpenAssessment.TrainingExample=function(element){this.element=element;this.criteria=$('.openassessment_training_example_criterion_option',this.element);this.answer=$('.openassessment_training_example_essay_part textarea',this.element);};OpenAssessment.TrainingExample.prototype={getFieldValues:function(){var optionsSelected=this.criteria.map(function(){return{criterion:$(this).data('criterion'),option:$(this).prop('value'),};}).get();return{answer:this.answer.map(function(){return $(this).prop('value');}).get(),options_selected:optionsSelected,};},addHandler:function(){$('.openassessment_training_example_criterion_option',this.element).each(function(){$('option',this).each(function(){OpenAssessment.ItemUtilities.refreshOptionString($(this));});});},addEventListeners:function(){},removeHandler:function(){},updateHandler:function(){},validate:function(){var isValid=true;this.criteria.each(function(){var isOptionValid=($(this).prop('value')!=='');isValid=isOptionValid&&isValid;if(!isOptionValid){$(this).addClass('openassessment_highlighted_field');}});return isValid;},validationErrors:function(){var errors=[];this.criteria.each(function(){var hasError=$(this).hasClass('openassessment_highlighted_field');if(hasError){errors.push('Student training example is invalid.');}});return errors;},clearValidationErrors:function(){this.criteria.each(function(){$(this).removeClass('openassessment_highlighted_field');});},};OpenAssessment.StudioView=function(runtime,element,server,data){this.element=element;this.runtime=runtime;this.server=server;this.data=data;this.fixModalHeight();this.initializeTabs();this.alert=new OpenAssessment.ValidationAlert().install();var studentTrainingListener=new OpenAssessment.StudentTrainingListener();this.promptsView=new OpenAssessment.EditPromptsView($('#oa_prompts_editor_wrapper',this.element).get(0),new OpenAssessment.Notifier([studentTrainingListener,]));var staffAssessmentView=new OpenAssessment.EditStaffAssessmentView($('#oa_staff_assessment_editor',this.element).get(0));var studentTrainingView=new OpenAssessment.EditStudentTrainingView($('#oa_student_training_editor',this.element).get(0));var peerAssessmentView=new OpenAssessment.EditPeerAssessmentView($('#oa_peer_assessment_editor',this.element).get(0));var selfAssessmentView=new OpenAssessment.EditSelfAssessmentView($('#oa_self_assessment_editor',this.element).get(0));var assessmentLookupDictionary={};assessmentLookupDictionary[staffAssessmentView.getID()]=staffAssessmentView;assessmentLookupDictionary[studentTrainingView.getID()]=studentTrainingView;assessmentLookupDictionary[peerAssessmentView.getID()]=peerAssessmentView;assessmentLookupDictionary[selfAssessmentView.getID()]=selfAssessmentView;this.settingsView=new OpenAssessment.EditSettingsView($('#oa_basic_settings_editor',this.element).get(0),assessmentLookupDictionary,data);this.rubricView=new OpenAssessment.EditRubricView($('#oa_rubric_editor_wrapper',this.element).get(0),new OpenAssessment.Notifier([studentTrainingListener,]));$('.openassessment_save_button',this.element).click($.proxy(this.save,this));$('.openassessment_cancel_button',this.element).click($.proxy(this.cancel,this));};OpenAssessment.StudioView.prototype={fixModalHeight:function(){$(this.element).addClass('openassessment_full_height').parentsUntil('.modal-window').addClass('openassessment_full_height');$(this.element).closest('.modal-window').addClass('openassessment_modal_window');},initializeTabs:function(){if(typeof(OpenAssessment.lastOpenEditingTab)==='undefined'){OpenAssessment.lastOpenEditingTab=2;}$('.openassessment_editor_content_and_tabs',this.element).tabs({active:OpenAssessment.lastOpenEditingTab,});},saveTabState:function(){var tabElement=$('.openassessment_editor_content_and_tabs',this.element);OpenAssessment.lastOpenEditingTab=tabElement.tabs('option','active');},save:function(){var view=this;this.saveTabState();this.clearValidationErrors();if(!this.validate()){this.alert.setMessage(gettext('Couldn\'t Save This Assignment'),gettext('Please correct the outlined fields.')).show();}else{this.alert.hide();this.server.checkReleased().done(function(isReleased){if(isReleased){view.confirmPostReleaseUpdate($.proxy(view.updateEditorContext,view));}else{view.updateEditorContext();}}).fail(function(errMsg){view.showError(errMsg);});}},confirmPostReleaseUpdate:function(onConfirm){var msg=gettext('This problem has already been released. Any changes will apply only to future assessments.');if(confirm(msg)){onConfirm();}},updateEditorContext:function(){this.runtime.notify('save',{state:'start'});var view=this;var fileUploadType=view.settingsView.fileUploadType();this.server.updateEditorContext({prompts:view.promptsView.promptsDefinition(),prompts_type:view.promptsView.promptsType(),feedbackPrompt:view.rubricView.feedbackPrompt(),feedback_default_text:view.rubricView.feedback_default_text(),criteria:view.rubricView.criteriaDefinition(),title:view.settingsView.displayName(),submissionStart:view.settingsView.submissionStart(),submissionDue:view.settingsView.submissionDue(),assessments:view.settingsView.assessmentsDescription(),textResponse:view.settingsView.textResponseNecessity(),fileUploadResponse:view.settingsView.fileUploadResponseNecessity(),fileUploadType:fileUploadType!==''?fileUploadType:null,fileTypeWhiteList:view.settingsView.fileTypeWhiteList(),latexEnabled:view.settingsView.latexEnabled(),leaderboardNum:view.settingsView.leaderboardNum(),editorAssessmentsOrder:view.settingsView.editorAssessmentsOrder(),teamsEnabled:view.settingsView.teamsEnabled(),selectedTeamsetId:view.settingsView.teamset(),}).done(function(){view.runtime.notify('save',{state:'end'});}).fail(function(msg){view.showError(msg);});},cancel:function(){this.saveTabState();this.runtime.notify('cancel',{});},showError:function(errorMsg){this.runtime.notify('error',{msg:errorMsg});},validate:function(){var settingsValid=this.settingsView.validate();var rubricValid=this.rubricView.validate();var promptsValid=this.promptsView.validate();return settingsValid&&rubricValid&&promptsValid;},validationErrors:function(){return this.settingsView.validationErrors().concat(this.rubricView.validationErrors().concat(this.promptsView.validationErrors()));},clearValidationErrors:function(){this.settingsView.clearValidationErrors();this.rubricView.clearValidationErrors();this.promptsView.clearValidationErrors();},};function oaTinyMCE(options){var CUSTOM_FONTS,STANDARD_FONTS,_getFonts,_this=this;CUSTOM_FONTS='Default=\'Open Sans\', Verdana, Arial, Helvetica, sans-serif;';STANDARD_FONTS='Andale Mono=andale mono,times;'+'Arial=arial,helvetica,sans-serif;'+'Arial Black=arial black,avant garde;'+'Book Antiqua=book antiqua,palatino;'+'Comic Sans MS=comic sans ms,sans-serif;'+'Courier New=courier new,courier;'+'Georgia=georgia,palatino;'+'Helvetica=helvetica;'+'Impact=impact,chicago;'+'Symbol=symbol;'+'Tahoma=tahoma,arial,helvetica,sans-serif;'+'Terminal=terminal,monaco;'+'Times New Roman=times new roman,times;'+'Trebuchet MS=trebuchet ms,geneva;'+'Verdana=verdana,geneva;'+'Webdings=webdings;'+'Wingdings=wingdings,zapf dingbats';_getFonts=function(){return CUSTOM_FONTS+STANDARD_FONTS;};this.initInstanceCallback=function(ed){return oaTinyMCE.prototype.initInstanceCallback.apply(_this,arguments);};this.saveLink=function(data){return oaTinyMCE.prototype.saveLink.apply(_this,arguments);};this.editLink=function(data){return oaTinyMCE.prototype.editLink.apply(_this,arguments);};this.saveImage=function(data){return oaTinyMCE.prototype.saveImage.apply(_this,arguments);};this.editImage=function(data){return oaTinyMCE.prototype.editImage.apply(_this,arguments);};this.setupTinyMCE=function(ed){return oaTinyMCE.prototype.setupTinyMCE.apply(_this,arguments);};oaTinyMCE.prototype.setupTinyMCE=function(ed){ed.on('SaveImage',this.saveImage);ed.on('EditImage',this.editImage);ed.on('SaveLink',this.saveLink);ed.on('EditLink',this.editLink);};oaTinyMCE.prototype.editImage=function(data){if(data.src){data.src=rewriteStaticLinks(data.src,this.base_asset_url,'/static/');}};oaTinyMCE.prototype.saveImage=function(data){if(data.src){data.src=rewriteStaticLinks(data.src,'/static/',this.base_asset_url);}};oaTinyMCE.prototype.editLink=function(data){if(data.href){data.href=rewriteStaticLinks(data.href,this.base_asset_url,'/static/');}};oaTinyMCE.prototype.saveLink=function(data){if(data.href){data.href=rewriteStaticLinks(data.href,'/static/',this.base_asset_url);}};oaTinyMCE.prototype.initInstanceCallback=function(ed){ed.setContent(rewriteStaticLinks(ed.getContent({no_events:1,}),'/static/',this.base_asset_url));return ed.focus();};this.base_asset_url=options.base_asset_url;return{height:'300',font_formats:_getFonts(),theme:'modern',skin:'studio-tmce4',schema:'html5',convert_urls:false,directionality:$('.wrapper-view, .window-wrap').prop('dir'),formats:{code:{inline:'code'},},visual:false,plugins:'textcolor, link, image, media',image_advtab:true,toolbar:'formatselect | fontselect | bold italic underline forecolor | '+'bullist numlist outdent indent blockquote | link unlink image media',block_formats:gettext('Paragraph')+'=p;'+gettext('Preformatted')+'=pre;'+gettext('Heading 3')+'=h3;'+gettext('Heading 4')+'=h4;'+gettext('Heading 5')+'=h5;'+gettext('Heading 6')+'=h6',menubar:false,statusbar:false,valid_children:'+body[style]',valid_elements:'*[*]',extended_valid_elements:'*[*]',invalid_elements:'',setup:this.setupTinyMCE,init_instance_callback:this.initInstanceCallback,browser_spellcheck:true,};}function OpenAssessmentEditor(runtime,element,data){var server=new OpenAssessment.Server(runtime,element);new OpenAssessment.StudioView(runtime,element,server,data);}OpenAssessment.EditPeerAssessmentView=function(element){this.element=element;this.name='peer-assessment';this.mustGradeField=new OpenAssessment.IntField($('#peer_assessment_must_grade',this.element),{min:0,max:99});this.mustBeGradedByField=new OpenAssessment.IntField($('#peer_assessment_graded_by',this.element),{min:0,max:99});new OpenAssessment.ToggleControl($('#include_peer_assessment',this.element),$('#peer_assessment_settings_editor',this.element),$('#peer_assessment_description_closed',this.element),new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener(),])).install();this.startDatetimeControl=new OpenAssessment.DatetimeControl(this.element,'#peer_assessment_start_date','#peer_assessment_start_time').install();this.dueDatetimeControl=new OpenAssessment.DatetimeControl(this.element,'#peer_assessment_due_date','#peer_assessment_due_time').install();};OpenAssessment.EditPeerAssessmentView.prototype={description:function(){return{must_grade:this.mustGradeNum(),must_be_graded_by:this.mustBeGradedByNum(),start:this.startDatetime(),due:this.dueDatetime(),};},isEnabled:function(isEnabled){var sel=$('#include_peer_assessment',this.element);return OpenAssessment.Fields.booleanField(sel,isEnabled);},toggleEnabled:function(){$('#include_peer_assessment',this.element).click();},mustGradeNum:function(num){if(num!==undefined){this.mustGradeField.set(num);}return this.mustGradeField.get();},mustBeGradedByNum:function(num){if(num!==undefined){this.mustBeGradedByField.set(num);}return this.mustBeGradedByField.get();},startDatetime:function(dateString,timeString){return this.startDatetimeControl.datetime(dateString,timeString);},dueDatetime:function(dateString,timeString){return this.dueDatetimeControl.datetime(dateString,timeString);},getID:function(){return $(this.element).attr('id');},validate:function(){var startValid=this.startDatetimeControl.validate();var dueValid=this.dueDatetimeControl.validate();var mustGradeValid=this.mustGradeField.validate();var mustBeGradedByValid=this.mustBeGradedByField.validate();return startValid&&dueValid&&mustGradeValid&&mustBeGradedByValid;},validationErrors:function(){var errors=[];if(this.startDatetimeControl.validationErrors().length>0){errors.push('Peer assessment start is invalid');}if(this.dueDatetimeControl.validationErrors().length>0){errors.push('Peer assessment due is invalid');}if(this.mustGradeField.validationErrors().length>0){errors.push('Peer assessment must grade is invalid');}if(this.mustBeGradedByField.validationErrors().length>0){errors.push('Peer assessment must be graded by is invalid');}return errors;},clearValidationErrors:function(){this.startDatetimeControl.clearValidationErrors();this.dueDatetimeControl.clearValidationErrors();this.mustGradeField.clearValidationErrors();this.mustBeGradedByField.clearValidationErrors();},};OpenAssessment.EditSelfAssessmentView=function(element){this.element=element;this.name='self-assessment';new OpenAssessment.ToggleControl($('#include_self_assessment',this.element),$('#self_assessment_settings_editor',this.element),$('#self_assessment_description_closed',this.element),new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener(),])).install();this.startDatetimeControl=new OpenAssessment.DatetimeControl(this.element,'#self_assessment_start_date','#self_assessment_start_time').install();this.dueDatetimeControl=new OpenAssessment.DatetimeControl(this.element,'#self_assessment_due_date','#self_assessment_due_time').install();};OpenAssessment.EditSelfAssessmentView.prototype={description:function(){return{start:this.startDatetime(),due:this.dueDatetime(),};},isEnabled:function(isEnabled){var sel=$('#include_self_assessment',this.element);return OpenAssessment.Fields.booleanField(sel,isEnabled);},toggleEnabled:function(){$('#include_self_assessment',this.element).click();},startDatetime:function(dateString,timeString){return this.startDatetimeControl.datetime(dateString,timeString);},dueDatetime:function(dateString,timeString){return this.dueDatetimeControl.datetime(dateString,timeString);},getID:function(){return $(this.element).attr('id');},validate:function(){var startValid=this.startDatetimeControl.validate();var dueValid=this.dueDatetimeControl.validate();return startValid&&dueValid;},validationErrors:function(){var errors=[];if(this.startDatetimeControl.validationErrors().length>0){errors.push('Self assessment start is invalid');}if(this.dueDatetimeControl.validationErrors().length>0){errors.push('Self assessment due is invalid');}return errors;},clearValidationErrors:function(){this.startDatetimeControl.clearValidationErrors();this.dueDatetimeControl.clearValidationErrors();},};OpenAssessment.EditStudentTrainingView=function(element){this.element=element;this.name='student-training';new OpenAssessment.ToggleControl($('#include_student_training',this.element),$('#student_training_settings_editor',this.element),$('#student_training_description_closed',this.element),new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener(),])).install();this.exampleContainer=new OpenAssessment.Container(OpenAssessment.TrainingExample,{containerElement:$('#openassessment_training_example_list',this.element).get(0),templateElement:$('#openassessment_training_example_template',this.element).get(0),addButtonElement:$('.openassessment_add_training_example',this.element).get(0),removeButtonClass:'openassessment_training_example_remove',containerItemClass:'openassessment_training_example',});this.exampleContainer.addEventListeners();};OpenAssessment.EditStudentTrainingView.prototype={description:function(){return{examples:this.exampleContainer.getItemValues(),};},isEnabled:function(isEnabled){var sel=$('#include_student_training',this.element);return OpenAssessment.Fields.booleanField(sel,isEnabled);},toggleEnabled:function(){$('#include_student_training',this.element).click();},getID:function(){return $(this.element).attr('id');},validate:function(){var isValid=true;$.each(this.exampleContainer.getAllItems(),function(){isValid=this.validate()&&isValid;});return isValid;},validationErrors:function(){var errors=[];$.each(this.exampleContainer.getAllItems(),function(){errors=errors.concat(this.validationErrors());});return errors;},clearValidationErrors:function(){$.each(this.exampleContainer.getAllItems(),function(){this.clearValidationErrors();});},addTrainingExample:function(){this.exampleContainer.add();},};OpenAssessment.EditStaffAssessmentView=function(element){this.element=element;this.name='staff-assessment';new OpenAssessment.ToggleControl($('#include_staff_assessment',this.element),$('#staff_assessment_description',this.element),$('#staff_assessment_description',this.element),new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener(),])).install();};OpenAssessment.EditStaffAssessmentView.prototype={description:function(){return{required:this.isEnabled(),};},isEnabled:function(isEnabled){var sel=$('#include_staff_assessment',this.element);return OpenAssessment.Fields.booleanField(sel,isEnabled);},toggleEnabled:function(){$('#include_staff_assessment',this.element).click();},getID:function(){return $(this.element).attr('id');},validate:function(){return true;},validationErrors:function(){return[];},clearValidationErrors:function(){},};OpenAssessment.Fields={stringField:function(sel,value){if(value!==undefined){sel.val(value);}return sel.val();},booleanField:function(sel,value){if(value!==undefined){sel.prop('checked',value);}return sel.prop('checked');},};OpenAssessment.IntField=function(inputSel,restrictions){this.max=restrictions.max;this.min=restrictions.min;this.input=$(inputSel);};OpenAssessment.IntField.prototype={get:function(){return parseInt(this.input.val().trim(),10);},set:function(val){this.input.val(val);},validate:function(){var value=this.get();var isValid=!isNaN(value)&&value>=this.min&&value<=this.max;if(this.input.val().indexOf('.')!==-1){isValid=false;}if(!isValid){this.input.addClass('openassessment_highlighted_field');}return isValid;},clearValidationErrors:function(){this.input.removeClass('openassessment_highlighted_field');},validationErrors:function(){var hasError=this.input.hasClass('openassessment_highlighted_field');return hasError?['Int field is invalid']:[];},};OpenAssessment.ToggleControl=function(checkboxSel,shownSel,hiddenSel,notifier){this.checkbox=checkboxSel;this.shownSection=shownSel;this.hiddenSection=hiddenSel;this.notifier=notifier;};OpenAssessment.ToggleControl.prototype={install:function(){this.checkbox.change(this,function(event){var control=event.data;if(this.checked){control.notifier.notificationFired('toggleOn',{});control.show();}else{control.notifier.notificationFired('toggleOff',{});control.hide();}});return this;},show:function(){this.hiddenSection.addClass('is--hidden');this.shownSection.removeClass('is--hidden');},hide:function(){this.shownSection.addClass('is--hidden');this.hiddenSection.removeClass('is--hidden');},};OpenAssessment.DatetimeControl=function(element,datePicker,timePicker){this.element=element;this.datePicker=datePicker;this.timePicker=timePicker;};OpenAssessment.DatetimeControl.prototype={install:function(){var dateString=$(this.datePicker,this.element).val();$(this.datePicker,this.element).datepicker({showButtonPanel:true}).datepicker('option','dateFormat','yy-mm-dd').datepicker('setDate',dateString);$(this.timePicker,this.element).timepicker({timeFormat:'H:i',step:60,});return this;},datetime:function(dateString,timeString){var datePickerSel=$(this.datePicker,this.element);var timePickerSel=$(this.timePicker,this.element);if(typeof(dateString)!=='undefined'){datePickerSel.val(dateString);}if(typeof(timeString)!=='undefined'){timePickerSel.val(timeString);}return datePickerSel.val()+'T'+timePickerSel.val();},validate:function(){var dateString=$(this.datePicker,this.element).val();var timeString=$(this.timePicker,this.element).val();var isDateValid=false;try{var parsedDate=$.datepicker.parseDate($.datepicker.ISO_8601,dateString);isDateValid=parsedDate instanceof Date;}catch(err){}if(!isDateValid){$(this.datePicker,this.element).addClass('openassessment_highlighted_field');}var matches=timeString.match(/^\d{2}:\d{2}$/g);var isTimeValid=(matches!==null);if(!isTimeValid){$(this.timePicker,this.element).addClass('openassessment_highlighted_field');}return(isDateValid&&isTimeValid);},clearValidationErrors:function(){$(this.datePicker,this.element).removeClass('openassessment_highlighted_field');$(this.timePicker,this.element).removeClass('openassessment_highlighted_field');},validationErrors:function(){var errors=[];var dateHasError=$(this.datePicker,this.element).hasClass('openassessment_highlighted_field');var timeHasError=$(this.timePicker,this.element).hasClass('openassessment_highlighted_field');if(dateHasError){errors.push('Date is invalid');}if(timeHasError){errors.push('Time is invalid');}return errors;},};OpenAssessment.SelectControl=function(selectSel,mapping,notifier){this.select=selectSel;this.mapping=mapping;this.notifier=notifier;};OpenAssessment.SelectControl.prototype={install:function(){this.select.change(this,function(event){var control=event.data;control.notifier.notificationFired('selectionChanged',{selected:this.value});control.change(this.value);});return this;},change:function(selected){if($.isFunction(this.mapping)){this.mapping(selected);}else{$.each(this.mapping,function(option,sel){if(option===selected){sel.removeClass('is--hidden');}else{sel.addClass('is--hidden');}});}},};OpenAssessment.InputControl=function(inputSel,validator){this.input=$(inputSel);this.validator=validator;this.errors=[];};OpenAssessment.InputControl.prototype={get:function(){return this.input.val();},set:function(val){this.input.val(val);},validate:function(){this.errors=this.validator(this.get());if(this.errors.length){this.input.addClass('openassessment_highlighted_field');this.input.parent().nextAll('.message-status').text(this.errors.join(';'));this.input.parent().nextAll('.message-status').addClass('is-shown');}return this.errors.length===0;},clearValidationErrors:function(){this.input.removeClass('openassessment_highlighted_field');this.input.parent().nextAll('.message-status').removeClass('is-shown');},validationErrors:function(){return this.errors;},};OpenAssessment.StudentTrainingListener=function(){this.element=$('#oa_student_training_editor');this.alert=new OpenAssessment.ValidationAlert();};OpenAssessment.StudentTrainingListener.prototype={promptAdd:function(){var view=this.element;$('#openassessment_training_example_part_template').children().first().clone().removeAttr('id').toggleClass('is--hidden',false).appendTo('.openassessment_training_example_essay',view);},promptRemove:function(data){var view=this.element;$('.openassessment_training_example_essay li:nth-child('+(data.index+1)+')',view).remove();},optionUpdated:function(data){this._optionSel(data.criterionName).each(function(){var criterion=this;var option=$('option[value="'+data.name+'"]',criterion).attr('data-points',data.points).attr('data-label',data.label);OpenAssessment.ItemUtilities.refreshOptionString(option);});},optionAdd:function(data){var criterionAdded=false;if(this._optionSel(data.criterionName).length===0){this.criterionAdd(data);criterionAdded=true;}this._optionSel(data.criterionName).each(function(){var criterion=this;var option=$('<option></option>').attr('value',data.name).attr('data-points',data.points).attr('data-label',data.label);OpenAssessment.ItemUtilities.refreshOptionString(option);$(criterion).append(option);});if(criterionAdded){this.displayAlertMsg(gettext('Criterion Added'),gettext('You have added a criterion. You will need to select an option for the criterion in the Learner Training step. To do this, click the Settings tab.'));}},optionRemove:function(data){var handler=this;var invalidated=false;this._optionSel(data.criterionName).each(function(){var criterionOption=this;if($(criterionOption).val()===data.name.toString()){$(criterionOption).val('').addClass('openassessment_highlighted_field').click(function(){$(criterionOption).removeClass('openassessment_highlighted_field');});invalidated=true;}$('option[value="'+data.name+'"]',criterionOption).remove();if($('option',criterionOption).length===1){handler.removeAllOptions(data);invalidated=false;}});if(invalidated){this.displayAlertMsg(gettext('Option Deleted'),gettext('You have deleted an option. That option has been removed from its criterion in the sample responses in the Learner Training step. You might have to select a new option for the criterion.'));}},_optionSel:function(criterionName){return $('.openassessment_training_example_criterion_option[data-criterion="'+criterionName+'"]',this.element);},removeAllOptions:function(data){var changed=false;$('.openassessment_training_example_criterion',this.element).each(function(){var criterion=this;if($(criterion).data('criterion')===data.criterionName){$(criterion).remove();changed=true;}});if(changed){this.displayAlertMsg(gettext('Option Deleted'),gettext('You have deleted all the options for this criterion. The criterion has been removed from the sample responses in the Learner Training step.'));}},criterionRemove:function(data){var changed=false;var sel='.openassessment_training_example_criterion[data-criterion="'+data.criterionName+'"]';$(sel,this.element).each(function(){$(this).remove();changed=true;});if(changed){this.displayAlertMsg(gettext('Criterion Deleted'),gettext('You have deleted a criterion. The criterion has been removed from the example responses in the Learner Training step.'));}},displayAlertMsg:function(title,msg){if($('#include_student_training',this.element).is(':checked')&&$('.openassessment_training_example',this.element).length>1){this.alert.setMessage(title,msg).show();}},criterionUpdated:function(data){var sel='.openassessment_training_example_criterion[data-criterion="'+data.criterionName+'"]';$(sel,this.element).each(function(){$('.openassessment_training_example_criterion_name_wrapper',this).text(data.criterionLabel);});},criterionAdd:function(data){var view=this.element;var criterion=$('#openassessment_training_example_criterion_template').children().first().clone().removeAttr('id').attr('data-criterion',data.criterionName).toggleClass('is--hidden',false).appendTo('.openassessment_training_example_criteria_selections',view);criterion.find('.openassessment_training_example_criterion_option').attr('data-criterion',data.criterionName);criterion.find('.openassessment_training_example_criterion_name_wrapper').text(data.label);},examplesCriteriaLabels:function(){var examples=[];$('.openassessment_training_example_criteria_selections',this.element).each(function(){var exampleDescription={};$('.openassessment_training_example_criterion',this).each(function(){var criterionName=$(this).data('criterion');var criterionLabel=$('.openassessment_training_example_criterion_name_wrapper',this).text().trim();exampleDescription[criterionName]=criterionLabel;});examples.push(exampleDescription);});return examples;},examplesOptionsLabels:function(){var examples=[];$('.openassessment_training_example_criteria_selections',this.element).each(function(){var exampleDescription={};$('.openassessment_training_example_criterion_option',this).each(function(){var criterionName=$(this).data('criterion');exampleDescription[criterionName]={};$('option',this).each(function(){var optionName=$(this).val();var optionLabel=$(this).text().trim();exampleDescription[criterionName][optionName]=optionLabel;});});examples.push(exampleDescription);});return examples;},};OpenAssessment.AssessmentToggleListener=function(){this.alert=new OpenAssessment.ValidationAlert();};OpenAssessment.AssessmentToggleListener.prototype={toggleOff:function(){this.alert.setMessage(gettext('Warning'),gettext('Changes to steps that are not selected as part of the assignment will not be saved.')).show();},toggleOn:function(){this.alert.hide();},};OpenAssessment.Notifier=function(listeners){this.listeners=listeners;};OpenAssessment.Notifier.prototype={notificationFired:function(name,data){for(var i=0;i<this.listeners.length;i++){if(typeof(this.listeners[i][name])==='function'){this.listeners[i][name](data);}}},};OpenAssessment.EditPromptsView=function(element,notifier){this.element=element;this.editorElement=$(this.element).closest('#openassessment-editor');this.addRemoveEnabled=this.editorElement.attr('data-is-released')!=='true';this.promptsContainer=new OpenAssessment.Container(OpenAssessment.Prompt,{containerElement:$('#openassessment_prompts_list',this.element).get(0),templateElement:$('#openassessment_prompt_template',this.element).get(0),addButtonElement:$('#openassessment_prompts_add_prompt',this.element).get(0),removeButtonClass:'openassessment_prompt_remove_button',containerItemClass:'openassessment_prompt',notifier:notifier,addRemoveEnabled:this.addRemoveEnabled,});this.promptsContainer.addEventListeners();};OpenAssessment.EditPromptsView.prototype={promptsDefinition:function(){var prompts=this.promptsContainer.getItemValues();return prompts;},promptsType:function(){var firstPrompt=this.promptsContainer.getItem(0);return(firstPrompt&&firstPrompt.tinyMCEEnabled)?'html':'text';},addPrompt:function(){if(this.addRemoveEnabled){this.promptsContainer.add();}},removePrompt:function(item){if(this.addRemoveEnabled){this.promptsContainer.remove(item);}},getAllPrompts:function(){return this.promptsContainer.getAllItems();},getPromptItem:function(index){return this.promptsContainer.getItem(index);},validate:function(){return true;},validationErrors:function(){var errors=[];return errors;},clearValidationErrors:function(){},};OpenAssessment.EditRubricView=function(element,notifier){this.element=element;this.criterionAddButton=$('#openassessment_rubric_add_criterion',this.element);this.criteriaContainer=new OpenAssessment.Container(OpenAssessment.RubricCriterion,{containerElement:$('#openassessment_criterion_list',this.element).get(0),templateElement:$('#openassessment_criterion_template',this.element).get(0),addButtonElement:$('#openassessment_rubric_add_criterion',this.element).get(0),removeButtonClass:'openassessment_criterion_remove_button',containerItemClass:'openassessment_criterion',notifier:notifier,});this.criteriaContainer.addEventListeners();};OpenAssessment.EditRubricView.prototype={criteriaDefinition:function(){var criteria=this.criteriaContainer.getItemValues();for(var criterionIndex=0;criterionIndex<criteria.length;criterionIndex++){var criterion=criteria[criterionIndex];criterion.order_num=criterionIndex;for(var optionIndex=0;optionIndex<criterion.options.length;optionIndex++){var option=criterion.options[optionIndex];option.order_num=optionIndex;}}return criteria;},feedbackPrompt:function(text){var sel=$('#openassessment_rubric_feedback',this.element);return OpenAssessment.Fields.stringField(sel,text);},feedback_default_text:function(text){var sel=$('#openassessment_rubric_feedback_default_text',this.element);return OpenAssessment.Fields.stringField(sel,text);},addCriterion:function(){this.criteriaContainer.add();},removeCriterion:function(item){this.criteriaContainer.remove(item);},getAllCriteria:function(){return this.criteriaContainer.getAllItems();},getCriterionItem:function(index){return this.criteriaContainer.getItem(index);},addOption:function(criterionIndex){var criterionItem=this.getCriterionItem(criterionIndex);criterionItem.optionContainer.add();},removeOption:function(criterionIndex,item){var criterionItem=this.getCriterionItem(criterionIndex);criterionItem.optionContainer.remove(item);},getAllOptions:function(criterionIndex){var criterionItem=this.getCriterionItem(criterionIndex);return criterionItem.optionContainer.getAllItems();},getOptionItem:function(criterionIndex,optionIndex){var criterionItem=this.getCriterionItem(criterionIndex);return criterionItem.optionContainer.getItem(optionIndex);},validate:function(){var criteria=this.getAllCriteria();var isValid=criteria.length>0;if(!isValid){this.criterionAddButton.addClass('openassessment_highlighted_field').click(function(){$(this).removeClass('openassessment_highlighted_field');});}$.each(criteria,function(){isValid=(this.validate()&&isValid);});return isValid;},validationErrors:function(){var errors=[];if(this.criterionAddButton.hasClass('openassessment_highlighted_field')){errors.push('The rubric must contain at least one criterion');}$.each(this.getAllCriteria(),function(){errors=errors.concat(this.validationErrors());});return errors;},clearValidationErrors:function(){this.criterionAddButton.removeClass('openassessment_highlighted_field');$.each(this.getAllCriteria(),function(){this.clearValidationErrors();});},};OpenAssessment.EditSettingsView=function(element,assessmentViews,data){var self=this;this.settingsElement=element;this.assessmentsElement=$(element).siblings('#openassessment_assessment_module_settings_editors').get(0);this.assessmentViews=assessmentViews;this.startDatetimeControl=new OpenAssessment.DatetimeControl(this.element,'#openassessment_submission_start_date','#openassessment_submission_start_time').install();this.dueDatetimeControl=new OpenAssessment.DatetimeControl(this.element,'#openassessment_submission_due_date','#openassessment_submission_due_time').install();new OpenAssessment.SelectControl($('#openassessment_submission_file_upload_response',this.element),function(selectedValue){var el=$('#openassessment_submission_file_upload_type_wrapper',self.element);if(!selectedValue){el.addClass('is--hidden');}else{el.removeClass('is--hidden');}},new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener(),])).install();new OpenAssessment.SelectControl($('#openassessment_submission_upload_selector',this.element),{'custom':$('#openassessment_submission_white_listed_file_types_wrapper',this.element)},new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener(),])).install();function onTeamsEnabledChange(selectedValue){var teamsetElement=$('#openassessment_teamset_selection_wrapper',self.element);var selfAssessment=self.assessmentViews.oa_self_assessment_editor;var peerAssessment=self.assessmentViews.oa_peer_assessment_editor;var trainingAssessment=self.assessmentViews.oa_student_training_editor;var staffAssessment=self.assessmentViews.oa_staff_assessment_editor;if(!selectedValue||selectedValue==='0'){self.setHidden(teamsetElement,true);self.setHidden($(selfAssessment.element),false);self.setHidden($(peerAssessment.element),false);self.setHidden($(trainingAssessment.element),false);}else{self.setHidden(teamsetElement,false);self.setHidden($(selfAssessment.element),true);self.setHidden($(peerAssessment.element),true);self.setHidden($(trainingAssessment.element),true);staffAssessment.isEnabled(true);}}this.teamsEnabledSelectControl=new OpenAssessment.SelectControl($('#openassessment_team_enabled_selector',this.element),onTeamsEnabledChange,new OpenAssessment.Notifier([new OpenAssessment.AssessmentToggleListener(),])).install();this.leaderboardIntField=new OpenAssessment.IntField($('#openassessment_leaderboard_editor',this.element),{min:0,max:100});this.fileTypeWhiteListInputField=new OpenAssessment.InputControl($('#openassessment_submission_white_listed_file_types',this.element),function(value){var badExts=[];var errors=[];if(!value){errors.push(gettext('File types can not be empty.'));return errors;}var whiteList=$.map(value.replace(/\./g,'').toLowerCase().split(','),$.trim);$.each(whiteList,function(index,ext){if(data.FILE_EXT_BLACK_LIST.indexOf(ext)!==-1){badExts.push(ext);}});if(badExts.length){errors.push(gettext('The following file types are not allowed: ')+badExts.join(','));}return errors;});this.initializeSortableAssessments();onTeamsEnabledChange($('#openassessment_team_enabled_selector').val());};OpenAssessment.EditSettingsView.prototype={initializeSortableAssessments:function(){var view=this;$('#openassessment_assessment_module_settings_editors',view.element).sortable({start:function(event,ui){$('.openassessment_assessment_module_editor',view.element).hide();var targetHeight='auto';ui.placeholder.height(targetHeight);ui.helper.height(targetHeight);$('#openassessment_assessment_module_settings_editors',view.element).sortable('refresh').sortable('refreshPositions');},stop:function(){$('.openassessment_assessment_module_editor',view.element).show();},snap:true,axis:'y',handle:'.drag-handle',cursorAt:{top:20},});$('#openassessment_assessment_module_settings_editors .drag-handle',view.element).disableSelection();},displayName:function(name){var sel=$('#openassessment_title_editor',this.settingsElement);return OpenAssessment.Fields.stringField(sel,name);},submissionStart:function(dateString,timeString){return this.startDatetimeControl.datetime(dateString,timeString);},submissionDue:function(dateString,timeString){return this.dueDatetimeControl.datetime(dateString,timeString);},textResponseNecessity:function(value){var sel=$('#openassessment_submission_text_response',this.settingsElement);if(value!==undefined){sel.val(value);}return sel.val();},fileUploadResponseNecessity:function(value,triggerChange){var sel=$('#openassessment_submission_file_upload_response',this.settingsElement);if(value!==undefined){triggerChange=triggerChange||false;sel.val(value);if(triggerChange){$(sel).trigger('change');}}return sel.val();},fileUploadType:function(uploadType){var fileUploadTypeWrapper=$('#openassessment_submission_file_upload_type_wrapper',this.settingsElement);var fileUploadAllowed=!$(fileUploadTypeWrapper).hasClass('is--hidden');if(fileUploadAllowed){var sel=$('#openassessment_submission_upload_selector',this.settingsElement);if(uploadType!==undefined){sel.val(uploadType);}return sel.val();}return'';},fileTypeWhiteList:function(exts){if(exts!==undefined){this.fileTypeWhiteListInputField.set(exts);}return this.fileTypeWhiteListInputField.get();},settingSelectorEnabled:function(settingId,isEnabled){var sel=$(settingId,this.settingsElement);if(isEnabled!==undefined){if(isEnabled){sel.val(1);}else{sel.val(0);}}return sel.val()==='1';},latexEnabled:function(isEnabled){return this.settingSelectorEnabled('#openassessment_submission_latex_editor',isEnabled);},teamsEnabled:function(isEnabled){if(isEnabled!==undefined){this.teamsEnabledSelectControl.change(isEnabled?'1':'0');}return this.settingSelectorEnabled('#openassessment_team_enabled_selector',isEnabled);},setHidden:function(selector,hidden){selector.toggleClass('is--hidden',hidden);selector.attr('aria-hidden',hidden?'true':'false');},isHidden:function(selector){return selector.hasClass('is--hidden')&&selector.attr('aria-hidden')==='true';},teamset:function(teamsetIdentifier){if(this.teamsEnabled()){var sel=$('#openassessment_teamset_selector',this.settingsElement);if(teamsetIdentifier!==undefined){sel.val(teamsetIdentifier);}return sel.val();}return'';},leaderboardNum:function(num){if(num!==undefined){this.leaderboardIntField.set(num);}return this.leaderboardIntField.get(num);},assessmentsDescription:function(){var assessmentDescList=[];var view=this;$('.openassessment_assessment_module_settings_editor',this.assessmentsElement).each(function(){var asmntView=view.assessmentViews[$(this).attr('id')];var isVisible=!view.isHidden($(asmntView.element));if(asmntView.isEnabled()&&isVisible){var description=asmntView.description();description.name=asmntView.name;assessmentDescList.push(description);}});return assessmentDescList;},editorAssessmentsOrder:function(){var editorAssessments=[];var view=this;$('.openassessment_assessment_module_settings_editor',this.assessmentsElement).each(function(){var asmntView=view.assessmentViews[$(this).attr('id')];editorAssessments.push(asmntView.name);});return editorAssessments;},validate:function(){var isValid=true;isValid=(this.startDatetimeControl.validate()&&isValid);isValid=(this.dueDatetimeControl.validate()&&isValid);isValid=(this.leaderboardIntField.validate()&&isValid);if(this.fileUploadType()==='custom'){isValid=(this.fileTypeWhiteListInputField.validate()&&isValid);}else{if(this.fileTypeWhiteListInputField.get()&&!this.fileTypeWhiteListInputField.validate()){this.fileTypeWhiteListInputField.set('');}}$.each(this.assessmentViews,function(){if(this.isEnabled()){isValid=(this.validate()&&isValid);}});return isValid;},validationErrors:function(){var errors=[];if(this.startDatetimeControl.validationErrors().length>0){errors.push('Submission start is invalid');}if(this.dueDatetimeControl.validationErrors().length>0){errors.push('Submission due is invalid');}if(this.leaderboardIntField.validationErrors().length>0){errors.push('Leaderboard number is invalid');}if(this.fileTypeWhiteListInputField.validationErrors().length>0){errors=errors.concat(this.fileTypeWhiteListInputField.validationErrors());}$.each(this.assessmentViews,function(){errors=errors.concat(this.validationErrors());});return errors;},clearValidationErrors:function(){this.startDatetimeControl.clearValidationErrors();this.dueDatetimeControl.clearValidationErrors();this.leaderboardIntField.clearValidationErrors();this.fileTypeWhiteListInputField.clearValidationErrors();$.each(this.assessmentViews,function(){this.clearValidationErrors();});},};OpenAssessment.ValidationAlert=function(){this.element=$('#openassessment_validation_alert');this.editorElement=$(this.element).parent();this.title=$('.openassessment_alert_title',this.element);this.message=$('.openassessment_alert_message',this.element);this.closeButton=$('.openassessment_alert_close',this.element);this.ALERT_YELLOW='rgb(192, 172, 0)';this.DARK_GREY='#323232';};OpenAssessment.ValidationAlert.prototype={install:function(){var alert=this;this.closeButton.click(function(eventObject){eventObject.preventDefault();alert.hide();});return this;},hide:function(){var headerHeight=$('#openassessment_editor_header',this.editorElement).outerHeight();this.element.addClass('covered');var styles={'height':'Calc(100% - '+headerHeight+'px)','border-top-right-radius':'3px','border-top-left-radius':'3px',};$('.oa_editor_content_wrapper',this.editorElement).each(function(){$(this).css(styles);});return this;},show:function(){var view=this;if(this.isVisible()){$(this.element).animate({'background-color':view.ALERT_YELLOW},300,'swing',function(){$(this).animate({'background-color':view.DARK_GREY},700,'swing');});}else{this.element.removeClass('covered');var alertHeight=this.element.outerHeight();var headerHeight=$('#openassessment_editor_header',this.editorElement).outerHeight();var heightString='Calc(100% - '+(alertHeight+headerHeight)+'px)';var styles={'height':heightString,'border-top-right-radius':'0px','border-top-left-radius':'0px',};$('.oa_editor_content_wrapper',this.editorElement).each(function(){$(this).css(styles);$(this).scrollTop($(this).scrollTop()+alertHeight);});}return this;},setMessage:function(newTitle,newMessage){this.title.text(newTitle);this.message.text(newMessage);return this;},isVisible:function(){return!this.element.hasClass('covered');},getTitle:function(){return this.title.text();},getMessage:function(){return this.message.text();},};!function(a,b){"function"==typeof define&&define.amd?define(["underscore","backbone"],function(c,d){return a.Backgrid=b(c,d)}):"object"==typeof exports?module.exports=b(require("underscore"),require("backbone")):a.Backgrid=b(a._,a.Backbone)}(this,function(a,b){"use strict";function c(a,b,c){var d=b-(a+"").length;d=d<0?0:d;for(var e="",f=0;f<d;f++)e+=c;return e+a}var d="\t\n\v\f\r   ᠎             　\u2028\u2029\ufeff";if(!String.prototype.trim||d.trim()){d="["+d+"]";var e=new RegExp("^"+d+d+"*"),f=new RegExp(d+d+"*$");String.prototype.trim=function(){if(void 0===this||null===this)throw new TypeError("can't convert "+this+" to object");return String(this).replace(e,"").replace(f,"")}}var g=b.$,h={Extension:{},resolveNameToClass:function(b,c){if(a.isString(b)){var d=a.map(b.split("-"),function(a){return a.slice(0,1).toUpperCase()+a.slice(1)}).join("")+c,e=h[d]||h.Extension[d];if(a.isUndefined(e))throw new ReferenceError("Class '"+d+"' not found");return e}return b},callByNeed:function(){var b=arguments[0];if(!a.isFunction(b))return b;var c=arguments[1],d=[].slice.call(arguments,2);return b.apply(c,d+""?d:[])}};a.extend(h,b.Events);var i=h.Command=function(b){a.extend(this,{altKey:!!b.altKey,char:b.char,charCode:b.charCode,ctrlKey:!!b.ctrlKey,key:b.key,keyCode:b.keyCode,locale:b.locale,location:b.location,metaKey:!!b.metaKey,repeat:!!b.repeat,shiftKey:!!b.shiftKey,which:b.which})};a.extend(i.prototype,{moveUp:function(){return 38==this.keyCode},moveDown:function(){return 40===this.keyCode},moveLeft:function(){return this.shiftKey&&9===this.keyCode},moveRight:function(){return!this.shiftKey&&9===this.keyCode},save:function(){return 13===this.keyCode},cancel:function(){return 27===this.keyCode},passThru:function(){return!(this.moveUp()||this.moveDown()||this.moveLeft()||this.moveRight()||this.save()||this.cancel())}});var j=h.CellFormatter=function(){};a.extend(j.prototype,{fromRaw:function(a,b){return a},toRaw:function(a,b){return a}});var k=h.NumberFormatter=function(b){if(a.extend(this,this.defaults,b||{}),this.decimals<0||this.decimals>20)throw new RangeError("decimals must be between 0 and 20")};k.prototype=new j,a.extend(k.prototype,{defaults:{decimals:2,decimalSeparator:".",orderSeparator:","},HUMANIZED_NUM_RE:/(\d)(?=(?:\d{3})+$)/g,fromRaw:function(b,c){if(a.isNull(b)||a.isUndefined(b))return"";b=parseFloat(b).toFixed(~~this.decimals);var d=b.split("."),e=d[0],f=d[1]?(this.decimalSeparator||".")+d[1]:"";return e.replace(this.HUMANIZED_NUM_RE,"$1"+this.orderSeparator)+f},toRaw:function(b,c){if(b=b.trim(),""===b)return null;for(var d="",e=b.split(this.orderSeparator),f=0;f<e.length;f++)d+=e[f];var g=d.split(this.decimalSeparator);d="";for(var f=0;f<g.length;f++)d=d+g[f]+".";"."===d[d.length-1]&&(d=d.slice(0,d.length-1));var h=1*(1*d).toFixed(~~this.decimals);return a.isNumber(h)&&!a.isNaN(h)?h:void 0}});var l=h.PercentFormatter=function(){h.NumberFormatter.apply(this,arguments)};l.prototype=new h.NumberFormatter,a.extend(l.prototype,{defaults:a.extend({},k.prototype.defaults,{multiplier:1,symbol:"%"}),fromRaw:function(a,b){var c=[].slice.call(arguments,1);return c.unshift(a*this.multiplier),(k.prototype.fromRaw.apply(this,c)||"0")+this.symbol},toRaw:function(b,c){var d=b.split(this.symbol);if(d&&d[0]&&""===d[1]||null==d[1]){var e=k.prototype.toRaw.call(this,d[0]);return a.isUndefined(e)?e:e/this.multiplier}}});var m=h.DatetimeFormatter=function(b){if(a.extend(this,this.defaults,b||{}),!this.includeDate&&!this.includeTime)throw new Error("Either includeDate or includeTime must be true")};m.prototype=new j,a.extend(m.prototype,{defaults:{includeDate:!0,includeTime:!0,includeMilli:!1},DATE_RE:/^([+\-]?\d{4})-(\d{2})-(\d{2})$/,TIME_RE:/^(\d{2}):(\d{2}):(\d{2})(\.(\d{3}))?$/,ISO_SPLITTER_RE:/T|Z| +/,_convert:function(b,d){if(""===(b+"").trim())return null;var e,f=null;if(a.isNumber(b)){var g=new Date(b);e=c(g.getUTCFullYear(),4,0)+"-"+c(g.getUTCMonth()+1,2,0)+"-"+c(g.getUTCDate(),2,0),f=c(g.getUTCHours(),2,0)+":"+c(g.getUTCMinutes(),2,0)+":"+c(g.getUTCSeconds(),2,0)}else{b=b.trim();var h=b.split(this.ISO_SPLITTER_RE)||[];e=this.DATE_RE.test(h[0])?h[0]:"",f=e&&h[1]?h[1]:this.TIME_RE.test(h[0])?h[0]:""}var i=this.DATE_RE.exec(e)||[],j=this.TIME_RE.exec(f)||[];if(d){if(this.includeDate&&a.isUndefined(i[0]))return;if(this.includeTime&&a.isUndefined(j[0]))return;if(!this.includeDate&&e)return;if(!this.includeTime&&f)return}var g=new Date(Date.UTC(1*i[1]||0,1*i[2]-1||0,1*i[3]||0,1*j[1]||null,1*j[2]||null,1*j[3]||null,1*j[5]||null)),k="";return this.includeDate&&(k=c(g.getUTCFullYear(),4,0)+"-"+c(g.getUTCMonth()+1,2,0)+"-"+c(g.getUTCDate(),2,0)),this.includeTime&&(k=k+(this.includeDate?"T":"")+c(g.getUTCHours(),2,0)+":"+c(g.getUTCMinutes(),2,0)+":"+c(g.getUTCSeconds(),2,0),this.includeMilli&&(k=k+"."+c(g.getUTCMilliseconds(),3,0))),this.includeDate&&this.includeTime&&(k+="Z"),k},fromRaw:function(b,c){return a.isNull(b)||a.isUndefined(b)?"":this._convert(b)},toRaw:function(a,b){return this._convert(a,!0)}});var n=h.StringFormatter=function(){};n.prototype=new j,a.extend(n.prototype,{fromRaw:function(b,c){return a.isUndefined(b)||a.isNull(b)?"":b+""}});var o=h.EmailFormatter=function(){};o.prototype=new j,a.extend(o.prototype,{toRaw:function(b,c){var d=b.trim().split("@");if(2===d.length&&a.all(d))return b}});var p=h.SelectFormatter=function(){};p.prototype=new j,a.extend(p.prototype,{fromRaw:function(b,c){return a.isArray(b)?b:null!=b?[b]:[]}});var q=h.CellEditor=b.View.extend({initialize:function(a){this.formatter=a.formatter,this.column=a.column,this.column instanceof B||(this.column=new B(this.column)),this.listenTo(this.model,"backgrid:editing",this.postRender)},postRender:function(a,b){return null!=b&&b.get("name")!=this.column.get("name")||this.$el.focus(),this}}),r=h.InputCellEditor=q.extend({tagName:"input",attributes:{type:"text"},events:{blur:"saveOrCancel",keydown:"saveOrCancel"},initialize:function(a){r.__super__.initialize.apply(this,arguments),a.placeholder&&this.$el.attr("placeholder",a.placeholder)},render:function(){var a=this.model;return this.$el.val(this.formatter.fromRaw(a.get(this.column.get("name")),a)),this},saveOrCancel:function(b){var c=this.formatter,d=this.model,e=this.column,f=new i(b),g="blur"===b.type;if(f.moveUp()||f.moveDown()||f.moveLeft()||f.moveRight()||f.save()||g){b.preventDefault(),b.stopPropagation();var h=this.$el.val(),j=c.toRaw(h,d);a.isUndefined(j)?d.trigger("backgrid:error",d,e,h):(d.set(e.get("name"),j),d.trigger("backgrid:edited",d,e,f))}else f.cancel()&&(b.stopPropagation(),d.trigger("backgrid:edited",d,e,f))},postRender:function(a,b){if(null==b||b.get("name")==this.column.get("name"))if("right"===this.$el.css("text-align")){var c=this.$el.val();this.$el.focus().val(null).val(c)}else this.$el.focus();return this}}),s=h.Cell=b.View.extend({tagName:"td",formatter:j,editor:r,events:{click:"enterEditMode"},initialize:function(b){this.column=b.column,this.column instanceof B||(this.column=new B(this.column));var c=this.column,d=this.model,e=this.$el,f=h.resolveNameToClass(c.get("formatter")||this.formatter,"Formatter");a.isFunction(f.fromRaw)||a.isFunction(f.toRaw)||(f=new f),this.formatter=f,this.editor=h.resolveNameToClass(this.editor,"CellEditor"),this.listenTo(d,"change:"+c.get("name"),function(){e.hasClass("editor")||this.render()}),this.listenTo(d,"backgrid:error",this.renderError),this.listenTo(c,"change:editable change:sortable change:renderable",function(a){var b=a.changedAttributes();for(var c in b)b.hasOwnProperty(c)&&e.toggleClass(c,b[c])}),this.updateStateClassesMaybe()},updateStateClassesMaybe:function(){var a=this.model,b=this.column,c=this.$el;c.toggleClass("editable",h.callByNeed(b.editable(),b,a)),c.toggleClass("sortable",h.callByNeed(b.sortable(),b,a)),c.toggleClass("renderable",h.callByNeed(b.renderable(),b,a))},render:function(){var a=this.$el;a.empty();var b=this.model,c=this.column.get("name");return a.text(this.formatter.fromRaw(b.get(c),b)),a.addClass(c),this.updateStateClassesMaybe(),this.delegateEvents(),this},enterEditMode:function(){var a=this.model,b=this.column,c=h.callByNeed(b.editable(),b,a);c&&(this.currentEditor=new this.editor({column:this.column,model:this.model,formatter:this.formatter}),a.trigger("backgrid:edit",a,b,this,this.currentEditor),this.undelegateEvents(),this.$el.empty(),this.$el.append(this.currentEditor.$el),this.currentEditor.render(),this.$el.addClass("editor"),a.trigger("backgrid:editing",a,b,this,this.currentEditor))},renderError:function(a,b){null!=b&&b.get("name")!=this.column.get("name")||this.$el.addClass("error")},exitEditMode:function(){this.$el.removeClass("error"),this.currentEditor.remove(),this.stopListening(this.currentEditor),delete this.currentEditor,this.$el.removeClass("editor"),this.render()},remove:function(){return this.currentEditor&&(this.currentEditor.remove.apply(this.currentEditor,arguments),delete this.currentEditor),s.__super__.remove.apply(this,arguments)}}),t=h.StringCell=s.extend({className:"string-cell",formatter:n}),u=h.UriCell=s.extend({className:"uri-cell",title:null,target:"_blank",initialize:function(a){u.__super__.initialize.apply(this,arguments),this.title=a.title||this.title,this.target=a.target||this.target},render:function(){this.$el.empty();var a=this.model.get(this.column.get("name")),b=this.formatter.fromRaw(a,this.model);return this.$el.append(g("<a>",{tabIndex:-1,href:a,title:this.title||b,target:this.target}).text(b)),this.delegateEvents(),this}}),v=(h.EmailCell=t.extend({className:"email-cell",formatter:o,render:function(){this.$el.empty();var a=this.model,b=this.formatter.fromRaw(a.get(this.column.get("name")),a);return this.$el.append(g("<a>",{tabIndex:-1,href:"mailto:"+b,title:b}).text(b)),this.delegateEvents(),this}}),h.NumberCell=s.extend({className:"number-cell",decimals:k.prototype.defaults.decimals,decimalSeparator:k.prototype.defaults.decimalSeparator,orderSeparator:k.prototype.defaults.orderSeparator,formatter:k,initialize:function(a){v.__super__.initialize.apply(this,arguments);var b=this.formatter;b.decimals=this.decimals,b.decimalSeparator=this.decimalSeparator,b.orderSeparator=this.orderSeparator}})),w=(h.IntegerCell=v.extend({className:"integer-cell",decimals:0}),h.PercentCell=v.extend({className:"percent-cell",multiplier:l.prototype.defaults.multiplier,symbol:l.prototype.defaults.symbol,formatter:l,initialize:function(){w.__super__.initialize.apply(this,arguments);var a=this.formatter;a.multiplier=this.multiplier,a.symbol=this.symbol}})),x=h.DatetimeCell=s.extend({className:"datetime-cell",includeDate:m.prototype.defaults.includeDate,includeTime:m.prototype.defaults.includeTime,includeMilli:m.prototype.defaults.includeMilli,formatter:m,initialize:function(b){x.__super__.initialize.apply(this,arguments);var c=this.formatter;c.includeDate=this.includeDate,c.includeTime=this.includeTime,c.includeMilli=this.includeMilli;var d=this.includeDate?"YYYY-MM-DD":"";d+=this.includeDate&&this.includeTime?"T":"",d+=this.includeTime?"HH:mm:ss":"",d+=this.includeTime&&this.includeMilli?".SSS":"",this.editor=this.editor.extend({attributes:a.extend({},this.editor.prototype.attributes,this.editor.attributes,{placeholder:d})})}}),y=(h.DateCell=x.extend({className:"date-cell",includeTime:!1}),h.TimeCell=x.extend({className:"time-cell",includeDate:!1}),h.BooleanCellEditor=q.extend({tagName:"input",attributes:{tabIndex:-1,type:"checkbox"},events:{mousedown:function(){this.mouseDown=!0},blur:"enterOrExitEditMode",mouseup:function(){this.mouseDown=!1},change:"saveOrCancel",keydown:"saveOrCancel"},render:function(){var a=this.model,b=this.formatter.fromRaw(a.get(this.column.get("name")),a);return this.$el.prop("checked",b),this},enterOrExitEditMode:function(a){if(!this.mouseDown){var b=this.model;b.trigger("backgrid:edited",b,this.column,new i(a))}},saveOrCancel:function(a){var b=this.model,c=this.column,d=this.formatter,e=new i(a);if(e.passThru()&&"change"!=a.type)return!0;e.cancel()&&(a.stopPropagation(),b.trigger("backgrid:edited",b,c,e));var f=this.$el;if(e.save()||e.moveLeft()||e.moveRight()||e.moveUp()||e.moveDown()){a.preventDefault(),a.stopPropagation();var g=d.toRaw(f.prop("checked"),b);b.set(c.get("name"),g),b.trigger("backgrid:edited",b,c,e)}else if("change"==a.type){var g=d.toRaw(f.prop("checked"),b);b.set(c.get("name"),g),f.focus()}}})),z=(h.BooleanCell=s.extend({className:"boolean-cell",editor:y,events:{click:"enterEditMode"},render:function(){this.$el.empty();var a=this.model,b=this.column,c=h.callByNeed(b.editable(),b,a);return this.$el.append(g("<input>",{tabIndex:-1,type:"checkbox",checked:this.formatter.fromRaw(a.get(b.get("name")),a),disabled:!c})),this.delegateEvents(),this}}),h.SelectCellEditor=q.extend({tagName:"select",events:{change:"save",blur:"close",keydown:"close"},template:a.template('<option value="<%- value %>" <%= selected ? \'selected="selected"\' : "" %>><%- text %></option>',null,{variable:null,evaluate:/<%([\s\S]+?)%>/g,interpolate:/<%=([\s\S]+?)%>/g,escape:/<%-([\s\S]+?)%>/g}),setOptionValues:function(b){this.optionValues=b,this.optionValues=a.result(this,"optionValues")},setMultiple:function(a){this.multiple=a,this.$el.prop("multiple",a)},_renderOptions:function(b,c){for(var d="",e=0;e<b.length;e++)d+=this.template({text:b[e][0],value:b[e][1],selected:a.indexOf(c,b[e][1])>-1});return d},render:function(){this.$el.empty();var b=a.result(this,"optionValues"),c=this.model,d=this.formatter.fromRaw(c.get(this.column.get("name")),c);if(!a.isArray(b))throw new TypeError("optionValues must be an array");for(var e=null,f=null,e=null,h=null,i=null,j=0;j<b.length;j++){var e=b[j];if(a.isArray(e))f=e[0],e=e[1],this.$el.append(this.template({text:f,value:e,selected:a.indexOf(d,e)>-1}));else{if(!a.isObject(e))throw new TypeError("optionValues elements must be a name-value pair or an object hash of { name: 'optgroup label', value: [option name-value pairs] }");h=e.name,i=g("<optgroup></optgroup>",{label:h}),i.append(this._renderOptions.call(this,e.values,d)),this.$el.append(i)}}return this.delegateEvents(),this},save:function(a){var b=this.model,c=this.column;b.set(c.get("name"),this.formatter.toRaw(this.$el.val(),b))},close:function(a){var b=this.model,c=this.column,d=new i(a);d.cancel()?(a.stopPropagation(),b.trigger("backgrid:edited",b,c,new i(a))):(d.save()||d.moveLeft()||d.moveRight()||d.moveUp()||d.moveDown()||"blur"==a.type)&&(a.preventDefault(),a.stopPropagation(),this.save(a),b.trigger("backgrid:edited",b,c,new i(a)))}})),A=h.SelectCell=s.extend({className:"select-cell",editor:z,multiple:!1,formatter:p,optionValues:void 0,delimiter:", ",initialize:function(a){A.__super__.initialize.apply(this,arguments),this.listenTo(this.model,"backgrid:edit",function(a,b,c,d){b.get("name")==this.column.get("name")&&(d.setOptionValues(this.optionValues),d.setMultiple(this.multiple))})},render:function(){this.$el.empty();var b=a.result(this,"optionValues"),c=this.model,d=this.formatter.fromRaw(c.get(this.column.get("name")),c),e=[];try{if(!a.isArray(b)||a.isEmpty(b))throw new TypeError;for(var f=0;f<d.length;f++)for(var g=d[f],h=0;h<b.length;h++){var i=b[h];if(a.isArray(i)){var j=i[0],i=i[1];i==g&&e.push(j)}else{if(!a.isObject(i))throw new TypeError;for(var k=i.values,l=0;l<k.length;l++){var m=k[l];m[1]==g&&e.push(m[0])}}}this.$el.append(e.join(this.delimiter))}catch(a){if(a instanceof TypeError)throw new TypeError("'optionValues' must be of type {Array.<Array>|Array.<{name: string, values: Array.<Array>}>}");throw a}return this.delegateEvents(),this}}),B=h.Column=b.Model.extend({defaults:{name:void 0,label:void 0,sortable:!0,editable:!0,renderable:!0,formatter:void 0,sortType:"cycle",sortValue:void 0,direction:null,cell:void 0,headerCell:void 0},initialize:function(){this.has("label")||this.set({label:this.get("name")},{silent:!0});var a=h.resolveNameToClass(this.get("headerCell"),"HeaderCell"),b=h.resolveNameToClass(this.get("cell"),"Cell");this.set({cell:b,headerCell:a},{silent:!0})},sortValue:function(){var b=this.get("sortValue");return a.isString(b)?this[b]:a.isFunction(b)?b:function(a,b){return a.get(b)}}});a.each(["sortable","renderable","editable"],function(b){B.prototype[b]=function(){var c=this.get(b);return a.isString(c)?this[c]:a.isFunction(c)?c:!!c}});var C=h.Columns=b.Collection.extend({model:B}),D=h.Row=b.View.extend({tagName:"tr",initialize:function(a){var c=this.columns=a.columns;c instanceof b.Collection||(c=this.columns=new C(c));for(var d=this.cells=[],e=0;e<c.length;e++)d.push(this.makeCell(c.at(e),a));this.listenTo(c,"add",function(b,c){var e=c.indexOf(b),f=this.makeCell(b,a);d.splice(e,0,f);var g=this.$el;0===e?g.prepend(f.render().$el):e===c.length-1?g.append(f.render().$el):g.children().eq(e).before(f.render().$el)}),this.listenTo(c,"remove",function(a,b,c){d[c.index].remove(),d.splice(c.index,1)})},makeCell:function(a){return new(a.get("cell"))({column:a,model:this.model})},render:function(){this.$el.empty();for(var a=document.createDocumentFragment(),b=0;b<this.cells.length;b++)a.appendChild(this.cells[b].render().el);return this.el.appendChild(a),this.delegateEvents(),this},remove:function(){for(var a=0;a<this.cells.length;a++){var c=this.cells[a];c.remove.apply(c,arguments)}return b.View.prototype.remove.apply(this,arguments)}}),E=h.EmptyRow=b.View.extend({tagName:"tr",emptyText:null,initialize:function(a){this.emptyText=a.emptyText,this.columns=a.columns},render:function(){this.$el.empty();var b=document.createElement("td");b.setAttribute("colspan",this.columns.length);var c=document.createElement("span");return c.innerHTML=a.result(this,"emptyText"),b.appendChild(c),this.el.className="empty",this.el.appendChild(b),this}}),F=h.HeaderCell=b.View.extend({tagName:"th",events:{"click button":"onClick"},initialize:function(a){this.column=a.column,this.column instanceof B||(this.column=new B(this.column));var b=this.column,c=this.collection,d=this.$el;this.listenTo(b,"change:editable change:sortable change:renderable",function(a){var b=a.changedAttributes();for(var c in b)b.hasOwnProperty(c)&&d.toggleClass(c,b[c])}),this.listenTo(b,"change:direction",this.setCellDirection),this.listenTo(b,"change:name change:label",this.render),h.callByNeed(b.editable(),b,c)&&d.addClass("editable"),h.callByNeed(b.sortable(),b,c)&&d.addClass("sortable"),h.callByNeed(b.renderable(),b,c)&&d.addClass("renderable"),this.listenTo(c.fullCollection||c,"backgrid:sorted",this.removeCellDirection)},removeCellDirection:function(){this.$el.removeClass("ascending").removeClass("descending"),this.column.set("direction",null)},setCellDirection:function(a,b){this.$el.removeClass("ascending").removeClass("descending"),a.cid==this.column.cid&&this.$el.addClass(b)},onClick:function(a){function b(a,b){"ascending"===d.get("direction")?e.trigger(f,b,"descending"):"descending"===d.get("direction")?e.trigger(f,b,null):e.trigger(f,b,"ascending")}function c(a,b){"ascending"===d.get("direction")?e.trigger(f,b,"descending"):e.trigger(f,b,"ascending")}a.preventDefault();var d=this.column,e=this.collection,f="backgrid:sort",g=h.callByNeed(d.sortable(),d,this.collection);if(g){var i=d.get("sortType");"toggle"===i?c(this,d):b(this,d)}},render:function(){this.$el.empty();var a,b=this.column,c=h.callByNeed(b.sortable(),b,this.collection);return a=c?g("<button>").text(b.get("label")).append("<span class='sort-caret' aria-hidden='true'></span>"):document.createTextNode(b.get("label")),this.$el.append(a),this.$el.addClass(b.get("name")),this.$el.addClass(b.get("direction")),this.delegateEvents(),this}}),G=(h.HeaderRow=h.Row.extend({initialize:function(){h.Row.prototype.initialize.apply(this,arguments)},makeCell:function(a,b){var c=a.get("headerCell")||b.headerCell||F;return c=new c({column:a,collection:this.collection})}}),h.Header=b.View.extend({tagName:"thead",initialize:function(a){this.columns=a.columns,this.columns instanceof b.Collection||(this.columns=new C(this.columns)),this.row=new h.HeaderRow({columns:this.columns,collection:this.collection})},render:function(){return this.$el.append(this.row.render().$el),this.delegateEvents(),this},remove:function(){return this.row.remove.apply(this.row,arguments),b.View.prototype.remove.apply(this,arguments)}})),H=h.Body=b.View.extend({tagName:"tbody",initialize:function(a){this.columns=a.columns,this.columns instanceof b.Collection||(this.columns=new C(this.columns)),this.row=a.row||this.row||D,this.rows=this.collection.map(function(a){var b=new this.row({columns:this.columns,model:a});return b},this),this.emptyText=a.emptyText,this._unshiftEmptyRowMayBe();var c=this.collection;this.listenTo(c,"add",this.insertRow),this.listenTo(c,"remove",this.removeRow),this.listenTo(c,"sort",this.refresh),this.listenTo(c,"reset",this.refresh),this.listenTo(c,"backgrid:sort",this.sort),this.listenTo(c,"backgrid:edited",this.moveToNextCell),this.listenTo(this.columns,"add remove",this.updateEmptyRow)},_unshiftEmptyRowMayBe:function(){if(0===this.rows.length&&null!=this.emptyText)return this.emptyRow=new E({emptyText:this.emptyText,columns:this.columns}),this.rows.unshift(this.emptyRow),!0},insertRow:function(a,c,d){if(this.rows[0]instanceof E&&this.rows.pop().remove(),!(c instanceof b.Collection||d))return void this.collection.add(a,d=c);var e=new this.row({columns:this.columns,model:a}),f=c.indexOf(a);this.rows.splice(f,0,e);var g=this.$el,h=g.children(),i=e.render().$el;return f>=h.length?g.append(i):h.eq(f).before(i),this},removeRow:function(b,c,d){return d?((a.isUndefined(d.render)||d.render)&&this.rows[d.index].remove(),this.rows.splice(d.index,1),this._unshiftEmptyRowMayBe()&&this.render(),this):(this.collection.remove(b,d=c),void(this._unshiftEmptyRowMayBe()&&this.render()))},updateEmptyRow:function(){null!=this.emptyRow&&this.emptyRow.render()},refresh:function(){for(var a=0;a<this.rows.length;a++)this.rows[a].remove();return this.rows=this.collection.map(function(a){var b=new this.row({columns:this.columns,model:a});return b},this),this._unshiftEmptyRowMayBe(),this.render(),this.collection.trigger("backgrid:refresh",this),this},render:function(){this.$el.empty();for(var a=document.createDocumentFragment(),b=0;b<this.rows.length;b++){var c=this.rows[b];a.appendChild(c.render().el)}return this.el.appendChild(a),this.delegateEvents(),this},remove:function(){for(var a=0;a<this.rows.length;a++){var c=this.rows[a];c.remove.apply(c,arguments)}return b.View.prototype.remove.apply(this,arguments)},sort:function(c,d){if(!a.contains(["ascending","descending",null],d))throw new RangeError('direction must be one of "ascending", "descending" or `null`');a.isString(c)&&(c=this.columns.findWhere({name:c}));var e,f=this.collection;e="ascending"===d?-1:"descending"===d?1:null;var g=this.makeComparator(c.get("name"),e,e?c.sortValue():function(a){return 1*a.cid.replace("c","")});return b.PageableCollection&&f instanceof b.PageableCollection?(f.setSorting(e&&c.get("name"),e,{sortValue:c.sortValue()}),f.fullCollection?(null==f.fullCollection.comparator&&(f.fullCollection.comparator=g),f.fullCollection.sort(),f.trigger("backgrid:sorted",c,d,f),c.set("direction",d)):f.fetch({reset:!0,success:function(){f.trigger("backgrid:sorted",c,d,f),c.set("direction",d)}})):(f.comparator=g,f.sort(),f.trigger("backgrid:sorted",c,d,f),c.set("direction",d)),this},makeComparator:function(a,b,c){return function(d,e){var f,g=c(d,a),h=c(e,a);return 1===b&&(f=g,g=h,h=f),g===h?0:g<h?-1:1}},moveToNextCell:function(a,b,c){var d,e,f,g,i,j=this.collection.indexOf(a),k=this.columns.indexOf(b);if(k===-1)return this;if(this.rows[j].cells[k].exitEditMode(),c.moveUp()||c.moveDown()||c.moveLeft()||c.moveRight()||c.save()){var l=this.columns.length,m=l*this.collection.length;if(c.moveUp()||c.moveDown()){g=j+(c.moveUp()?-1:1);var n=this.rows[g];n?(d=n.cells[k],h.callByNeed(d.column.editable(),d.column,a)&&(d.enterEditMode(),a.trigger("backgrid:next",g,k,!1))):a.trigger("backgrid:next",g,k,!0)}else if(c.moveLeft()||c.moveRight()){for(var o=c.moveRight(),p=j*l+k+(o?1:-1);p>=0&&p<m;o?p++:p--)if(g=~~(p/l),i=p-g*l,d=this.rows[g].cells[i],e=h.callByNeed(d.column.renderable(),d.column,d.model),f=h.callByNeed(d.column.editable(),d.column,a),e&&f){d.enterEditMode(),a.trigger("backgrid:next",g,i,!1);break}p==m&&a.trigger("backgrid:next",~~(p/l),p-g*l,!0)}}return this}});h.Footer=b.View.extend({tagName:"tfoot",initialize:function(a){this.columns=a.columns,this.columns instanceof b.Collection||(this.columns=new h.Columns(this.columns))}}),h.Grid=b.View.extend({tagName:"table",className:"backgrid",header:G,body:H,footer:null,initialize:function(c){c.columns instanceof b.Collection||(c.columns=new C(c.columns||this.columns)),this.columns=c.columns,this.caption=c.caption;var d=a.omit(c,["el","id","attributes","className","tagName","events"]);this.body=c.body||this.body,this.body=new this.body(d),this.header=c.header||this.header,this.header&&(this.header=new this.header(d)),this.footer=c.footer||this.footer,this.footer&&(this.footer=new this.footer(d)),this.listenTo(this.columns,"reset",function(){this.header&&(this.header=new(this.header.remove().constructor)(d)),this.body=new(this.body.remove().constructor)(d),this.footer&&(this.footer=new(this.footer.remove().constructor)(d)),this.render()})},insertRow:function(){return this.body.insertRow.apply(this.body,arguments),this},removeRow:function(){return this.body.removeRow.apply(this.body,arguments),this},insertColumn:function(){return this.columns.add.apply(this.columns,arguments),this},removeColumn:function(){return this.columns.remove.apply(this.columns,arguments),this},sort:function(){return this.body.sort.apply(this.body,arguments),this},render:function(){return this.$el.empty(),this.caption&&this.$el.append(g("<caption>").text(this.caption)),this.header&&this.$el.append(this.header.render().$el),this.footer&&this.$el.append(this.footer.render().$el),this.$el.append(this.body.render().$el),this.delegateEvents(),this.trigger("backgrid:rendered",this),this},remove:function(){return this.header&&this.header.remove.apply(this.header,arguments),this.body.remove.apply(this.body,arguments),this.footer&&this.footer.remove.apply(this.footer,arguments),b.View.prototype.remove.apply(this,arguments)}});return h});
@@ -42,6 +42,18 @@ describe("OpenAssessment.BaseView", function() {
                 function(defer) { defer.resolveWith(this, [null]); }
             ).promise();
         }
+
+        this.renderSections = function(components) {
+            return successPromise;
+        };
+
+        this.resolveFileUrls = function(tokens) {
+            return $.Deferred(function(defer) {
+                var urls = {};
+                $.each(tokens, function(index, token) { urls[token] = '/download/' + token; });
+                defer.resolveWith(this, [urls]);
+            }).promise();
+        };
     };
 
     // Stub runtime
@@ -103,4 +115,78 @@ describe("OpenAssessment.BaseView", function() {
             };
         });
     });
+
+    it("Resolves the placeholders of file urls with a single request", function() {
+        spyOn(server, 'resolveFileUrls').and.callThrough();
+        var $container = $(
+            '<div>' +
+            '<a href="#" data-file-token="token1"><img data-file-token="token1"/></a>' +
+            '<a href="#" data-file-token="token2"></a>' +
+            '<a href="/download/resolved">Resolved file</a>' +
+            '</div>'
+        );
+
+        view.resolveFileUrls($container);
+
+        expect(server.resolveFileUrls.calls.count()).toEqual(1);
+        expect(server.resolveFileUrls).toHaveBeenCalledWith(['token1', 'token2']);
+        expect($('a', $container).eq(0)).toHaveAttr('href', '/download/token1');
+        expect($('img', $container)).toHaveAttr('src', '/download/token1');
+        expect($('a', $container).eq(1)).toHaveAttr('href', '/download/token2');
+        expect($('[data-file-token]', $container).length).toEqual(0);
+    });
+
+    it("Resolves the placeholders of file urls in batches", function() {
+        spyOn(server, 'resolveFileUrls').and.callThrough();
+        var $container = $('<div></div>');
+        for (var index = 0; index <= view.MAX_RESOLVED_FILE_URLS; index++) {
+            $container.append('<a href="#" data-file-token="token' + index + '"></a>');
+        }
+
+        var resolved = false;
+        view.resolveFileUrls($container).done(function() { resolved = true; });
+
+        expect(resolved).toBe(true);
+        expect(server.resolveFileUrls.calls.count()).toEqual(2);
+        expect(server.resolveFileUrls.calls.argsFor(0)[0].length).toEqual(view.MAX_RESOLVED_FILE_URLS);
+        expect(server.resolveFileUrls.calls.argsFor(1)[0]).toEqual(['token' + view.MAX_RESOLVED_FILE_URLS]);
+        expect($('a', $container).eq(0)).toHaveAttr('href', '/download/token0');
+        expect($('a', $container).last()).toHaveAttr('href', '/download/token' + view.MAX_RESOLVED_FILE_URLS);
+        expect($('[data-file-token]', $container).length).toEqual(0);
+    });
+
+    it("Does not send a request when there are no file urls to resolve", function() {
+        spyOn(server, 'resolveFileUrls').and.callThrough();
+        var $container = $('<div><a href="/download/resolved">Resolved file</a></div>');
+
+        var resolved = false;
+        view.resolveFileUrls($container).done(function() { resolved = true; });
+
+        expect(resolved).toBe(true);
+        expect(server.resolveFileUrls).not.toHaveBeenCalled();
+    });
+
+    it("Renders the sections one by one by default", function() {
+        spyOn(server, 'renderSections').and.callThrough();
+        view.load();
+        view.loadAssessmentModules();
+        expect(server.renderSections).not.toHaveBeenCalled();
+    });
+
+    it("Renders the sections together when enabled", function() {
+        spyOn(server, 'renderSections').and.callThrough();
+        var el = $(".openassessment").get(0);
+        view = new OpenAssessment.BaseView(runtime, el, server, {RENDER_SECTIONS_TOGETHER: true});
+
+        view.load();
+        expect(server.renderSections.calls.count()).toEqual(1);
+        expect(server.renderSections).toHaveBeenCalledWith(['submission'].concat(view.ASSESSMENT_MODULE_SECTIONS));
+        expect(server.fragmentsLoaded).toContain("submission");
+        expect(server.fragmentsLoaded).toContain("grade");
+
+        // Refreshing the assessment modules renders them together again
+        view.loadAssessmentModules();
+        expect(server.renderSections.calls.count()).toEqual(2);
+        expect(server.renderSections.calls.mostRecent().args[0]).toEqual(view.ASSESSMENT_MODULE_SECTIONS);
+    });
 });
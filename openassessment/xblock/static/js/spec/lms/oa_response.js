@@ -60,10 +60,39 @@ describe("OpenAssessment.ResponseView", function() {
             return this.uploadUrlError ? errorPromise : successPromiseWithUrl;
         };
 
+        this.getUploadUrls = function(files) {
+            var urls = $.map(files, function() { return FAKE_URL; });
+            return this.uploadUrlError ? errorPromise : successPromiseWithResult(urls);
+        };
+
         this.getDownloadUrl = function() {
             return successPromiseWithUrl;
         };
 
+        this.multipartUploadError = false;
+        this.uploadedParts = {};
+        this.initiateMultipartUpload = function() {
+            return this.multipartUploadError ? errorPromise : successPromiseWithResult('upload-id');
+        };
+
+        this.getUploadPartUrls = function(filenum, uploadId, partNumbers) {
+            var urls = {};
+            $.each(partNumbers, function(index, partNumber) { urls[partNumber] = FAKE_URL + '/' + partNumber; });
+            return successPromiseWithResult(urls);
+        };
+
+        this.listUploadParts = function() {
+            return successPromiseWithResult(this.uploadedParts);
+        };
+
+        this.completeMultipartUpload = function() {
+            return successPromise;
+        };
+
+        this.abortMultipartUpload = function() {
+            return successPromise;
+        };
+
         this.removeFileError = false
         this.removeUploadedFile = function() {
             return this.removeFileError ? errorPromise : successPromise;;
@@ -119,6 +148,23 @@ describe("OpenAssessment.ResponseView", function() {
             // Return a promise indicating success or error
             return this.uploadError ? errorPromise : successPromise;
         };
+
+        this.uploadPartErrors = 0;
+        this.uploadPartArgs = [];
+
+        this.uploadPart = function(url, data) {
+            this.uploadPartArgs.push({
+                url: url,
+                data: data
+            });
+
+            // Fail the given number of uploads, then succeed
+            if (this.uploadPartErrors > 0) {
+                this.uploadPartErrors--;
+                return errorPromise;
+            }
+            return successPromise;
+        };
     };
 
     // Stubs
@@ -696,6 +742,93 @@ describe("OpenAssessment.ResponseView", function() {
         expect(view.filesDescriptions).toEqual(['i3']);
     });
 
+    it("retrieves the upload URLs of all the files with a single request", function() {
+        spyOn(server, 'getUploadUrls').and.callThrough();
+        spyOn(view, 'getSavedFileCount').and.returnValue(2);
+        var files = [{type: 'image/jpeg', size: 1024, name: 'picture1.jpg', data: ''},
+                     {type: 'image/png', size: 1024, name: 'picture2.png', data: ''}];
+        view.prepareUpload(files, 'image', ['text1', 'text2']);
+        view.uploadFiles();
+        expect(server.getUploadUrls.calls.count()).toEqual(1);
+        expect(server.getUploadUrls).toHaveBeenCalledWith([
+            {contentType: 'image/jpeg', filename: 'picture1.jpg', filenum: 2},
+            {contentType: 'image/png', filename: 'picture2.png', filenum: 3}
+        ]);
+        expect(fileUploader.uploadArgs.length).toEqual(2);
+    });
+
+    describe("uploading a large file", function() {
+        var largeFile = null;
+
+        beforeEach(function() {
+            largeFile = {
+                type: 'image/jpeg',
+                size: view.MULTIPART_UPLOAD_THRESHOLD + 1,
+                name: 'large-picture.jpg',
+                slice: function(start, end) { return {start: start, end: end}; }
+            };
+            spyOn(view, 'getSavedFileCount').and.returnValue(0);
+            view.prepareUpload([largeFile], 'image', ['text']);
+        });
+
+        it("uploads the file in parts", function() {
+            spyOn(server, 'completeMultipartUpload').and.callThrough();
+            view.uploadFiles();
+
+            var partSize = view.MULTIPART_UPLOAD_PART_SIZE;
+            var partCount = Math.ceil(largeFile.size / partSize);
+            expect(fileUploader.uploadArgs.length).toEqual(0);
+            expect(fileUploader.uploadPartArgs.length).toEqual(partCount);
+            expect(fileUploader.uploadPartArgs[0].url).toEqual(FAKE_URL + '/1');
+            expect(fileUploader.uploadPartArgs[partCount - 1].data).toEqual(
+                {start: (partCount - 1) * partSize, end: partCount * partSize}
+            );
+            expect(server.completeMultipartUpload).toHaveBeenCalledWith(0, 'upload-id');
+            expect(view.multipartUploads).toEqual({});
+        });
+
+        it("retries the parts which could not be uploaded", function() {
+            spyOn(view.baseView, 'toggleActionError').and.callThrough();
+            fileUploader.uploadPartErrors = view.MULTIPART_UPLOAD_ATTEMPTS - 1;
+            view.uploadFiles();
+
+            expect(fileUploader.uploadPartArgs[0].url).toEqual(FAKE_URL + '/1');
+            expect(fileUploader.uploadPartArgs[view.MULTIPART_UPLOAD_ATTEMPTS - 1].url).toEqual(FAKE_URL + '/1');
+            expect(fileUploader.uploadPartArgs[view.MULTIPART_UPLOAD_ATTEMPTS].url).toEqual(FAKE_URL + '/2');
+            expect(view.baseView.toggleActionError).not.toHaveBeenCalledWith('upload', 'ERROR');
+        });
+
+        it("resumes an upload which failed", function() {
+            spyOn(view.baseView, 'toggleActionError').and.callThrough();
+            spyOn(server, 'initiateMultipartUpload').and.callThrough();
+            spyOn(server, 'getUploadPartUrls').and.callThrough();
+            spyOn(server, 'completeMultipartUpload').and.callThrough();
+
+            // Every attempt at uploading the first part fails
+            fileUploader.uploadPartErrors = view.MULTIPART_UPLOAD_ATTEMPTS;
+            view.uploadFiles();
+            expect(view.baseView.toggleActionError).toHaveBeenCalledWith('upload', 'ERROR');
+            expect(server.completeMultipartUpload).not.toHaveBeenCalled();
+
+            // Uploading the file again only sends the parts which weren't uploaded
+            server.uploadedParts = {1: view.MULTIPART_UPLOAD_PART_SIZE};
+            fileUploader.uploadPartArgs = [];
+            view.uploadFiles();
+            expect(server.initiateMultipartUpload.calls.count()).toEqual(1);
+            expect(server.getUploadPartUrls.calls.mostRecent().args[2][0]).toEqual(2);
+            expect(fileUploader.uploadPartArgs[0].url).toEqual(FAKE_URL + '/2');
+            expect(server.completeMultipartUpload).toHaveBeenCalledWith(0, 'upload-id');
+        });
+
+        it("uploads the file at once if the backend doesn't support multipart uploads", function() {
+            server.multipartUploadError = true;
+            view.uploadFiles();
+            expect(fileUploader.uploadPartArgs.length).toEqual(0);
+            expect(fileUploader.uploadArgs[0].url).toEqual(FAKE_URL);
+            expect(fileUploader.uploadArgs[0].data).toEqual(largeFile);
+        });
+    });
+
     it("uploads a PDF using a one-time URL", function() {
         var files = [{type: 'application/pdf', size: 1024, name: 'application.pdf', data: ''}];
         view.prepareUpload(files, 'pdf-and-image', ['text']);
@@ -45,4 +45,24 @@ describe("OpenAssessment.FileUploader", function() {
             }
         );
     });
-});
\ No newline at end of file
+
+    it("uploads a part of a file", function() {
+        var successPromise = $.Deferred(
+            function(defer) { defer.resolve(); }
+        ).promise();
+        spyOn($, 'ajax').and.returnValue(successPromise);
+
+        var blob = {data: "abcdefghijklm"};
+        var uploaded = false;
+        fileUploader.uploadPart(TEST_URL, blob).done(function() { uploaded = true; });
+
+        expect(uploaded).toBe(true);
+        expect($.ajax).toHaveBeenCalledWith({
+            url: TEST_URL,
+            type: 'PUT',
+            data: blob,
+            processData: false,
+            contentType: false
+        });
+    });
+});
@@ -109,6 +109,47 @@ describe("OpenAssessment.Server", function() {
         });
     });
 
+    it("renders several sections of the XBlock in a single request", function() {
+        stubAjax(true, {submission: "<div>Submission</div>", grade: "<div>Grade</div>"});
+
+        var rendered = false;
+        server.renderSections(['submission', 'grade']).done(function() { rendered = true; });
+        expect(rendered).toBe(true);
+        expect($.ajax).toHaveBeenCalledWith({
+            url: '/render_sections',
+            type: "POST",
+            data: JSON.stringify({sections: ['submission', 'grade']}),
+            contentType: jsonContentType,
+            dataType: "json"
+        });
+
+        // The sections rendered together are not requested again
+        var loadedHtml = "";
+        server.render('grade').done(function(html) { loadedHtml = html; });
+        expect(loadedHtml).toEqual("<div>Grade</div>");
+        expect($.ajax.calls.count()).toEqual(1);
+
+        // ... but only once
+        server.render('grade');
+        expect($.ajax.calls.count()).toEqual(2);
+        expect($.ajax).toHaveBeenCalledWith({
+            url: '/render_grade', type: "POST", dataType: "html"
+        });
+    });
+
+    it("renders the sections one by one if they can't be rendered together", function() {
+        stubAjax(false, null);
+
+        var rendered = false;
+        server.renderSections(['submission', 'grade']).done(function() { rendered = true; });
+        expect(rendered).toBe(true);
+
+        server.render('submission');
+        expect($.ajax).toHaveBeenCalledWith({
+            url: '/render_submission', type: "POST", dataType: "html"
+        });
+    });
+
     it("sends a submission to the XBlock", function() {
         // Status, student ID, attempt number
         stubAjax(true, [true, 1, 2]);
@@ -181,6 +222,107 @@ describe("OpenAssessment.Server", function() {
         });
     });
 
+    it("gets the upload urls of several files", function() {
+        stubAjax(true, {success: true, urls: ['/upload/1', '/upload/2']});
+
+        var urls = null;
+        var files = [
+            {contentType: 'image/jpeg', filename: 'picture1.jpg', filenum: 0},
+            {contentType: 'image/jpeg', filename: 'picture2.jpg', filenum: 1}
+        ];
+        server.getUploadUrls(files).done(function(data) { urls = data; });
+
+        expect(urls).toEqual(['/upload/1', '/upload/2']);
+        expect($.ajax).toHaveBeenCalledWith({
+            url: "/upload_urls",
+            type: "POST",
+            data: JSON.stringify({files: files}),
+            contentType : jsonContentType
+        });
+    });
+
+    it("initiates a multipart upload", function() {
+        stubAjax(true, {success: true, uploadId: 'upload-id'});
+
+        var uploadId = null;
+        server.initiateMultipartUpload('image/jpeg', 'picture.jpg', 1).done(function(data) { uploadId = data; });
+
+        expect(uploadId).toEqual('upload-id');
+        expect($.ajax).toHaveBeenCalledWith({
+            url: "/initiate_multipart_upload",
+            type: "POST",
+            data: JSON.stringify({contentType: 'image/jpeg', filename: 'picture.jpg', filenum: 1}),
+            contentType : jsonContentType
+        });
+    });
+
+    it("gets the upload urls of the parts of a multipart upload", function() {
+        stubAjax(true, {success: true, urls: {1: '/upload/1', 2: '/upload/2'}});
+
+        var urls = null;
+        server.getUploadPartUrls(1, 'upload-id', [1, 2]).done(function(data) { urls = data; });
+
+        expect(urls).toEqual({1: '/upload/1', 2: '/upload/2'});
+        expect($.ajax).toHaveBeenCalledWith({
+            url: "/upload_part_urls",
+            type: "POST",
+            data: JSON.stringify({filenum: 1, uploadId: 'upload-id', partNumbers: [1, 2]}),
+            contentType : jsonContentType
+        });
+    });
+
+    it("lists the uploaded parts of a multipart upload", function() {
+        stubAjax(true, {success: true, parts: {1: 1024}});
+
+        var parts = null;
+        server.listUploadParts(1, 'upload-id').done(function(data) { parts = data; });
+
+        expect(parts).toEqual({1: 1024});
+        expect($.ajax).toHaveBeenCalledWith({
+            url: "/list_upload_parts",
+            type: "POST",
+            data: JSON.stringify({filenum: 1, uploadId: 'upload-id'}),
+            contentType : jsonContentType
+        });
+    });
+
+    it("completes and aborts multipart uploads", function() {
+        stubAjax(true, {success: true});
+
+        var completed = false;
+        server.completeMultipartUpload(1, 'upload-id').done(function() { completed = true; });
+        server.abortMultipartUpload(1, 'upload-id');
+
+        expect(completed).toBe(true);
+        expect($.ajax).toHaveBeenCalledWith({
+            url: "/complete_multipart_upload",
+            type: "POST",
+            data: JSON.stringify({filenum: 1, uploadId: 'upload-id'}),
+            contentType : jsonContentType
+        });
+        expect($.ajax).toHaveBeenCalledWith({
+            url: "/abort_multipart_upload",
+            type: "POST",
+            data: JSON.stringify({filenum: 1, uploadId: 'upload-id'}),
+            contentType : jsonContentType
+        });
+    });
+
+    it("resolves the download urls of file tokens", function() {
+        stubAjax(true, {success: true, urls: {token1: '/download/file1', token2: '/download/file2'}});
+
+        var urls = null;
+        server.resolveFileUrls(['token1', 'token2']).done(function(data) { urls = data; });
+
+        expect(urls).toEqual({token1: '/download/file1', token2: '/download/file2'});
+        expect($.ajax).toHaveBeenCalledWith({
+            url: "/resolve_file_urls",
+            type: "POST",
+            data: JSON.stringify({tokens: ['token1', 'token2']}),
+            contentType : jsonContentType
+        });
+    });
+
 
 
     it("sends a peer-assessment to the XBlock", function() {
@@ -495,6 +637,62 @@ describe("OpenAssessment.Server", function() {
         expect(receivedMsg).toEqual("Test error");
     });
 
+    it("informs the caller of an AJAX error when getting upload urls", function() {
+        stubAjax(false, null);
+
+        var receivedMsg = null;
+        server.getUploadUrls([]).fail(function(errMsg) { receivedMsg = errMsg; });
+
+        expect(receivedMsg).toContain("Could not retrieve upload url");
+    });
+
+    it("informs the caller of a server error when getting upload urls", function() {
+        stubAjax(true, { success: false, msg: "Test error" });
+
+        var receivedMsg = null;
+        server.getUploadUrls([]).fail(function(errMsg) { receivedMsg = errMsg; });
+
+        expect(receivedMsg).toEqual("Test error");
+    });
+
+    it("informs the caller of a server error when initiating a multipart upload", function() {
+        stubAjax(true, { success: false, msg: "Test error" });
+
+        var receivedMsg = null;
+        server.initiateMultipartUpload('image/jpeg', 'picture.jpg', 1).fail(function(errMsg) {
+            receivedMsg = errMsg;
+        });
+
+        expect(receivedMsg).toEqual("Test error");
+    });
+
+    it("informs the caller of an AJAX error when completing a multipart upload", function() {
+        stubAjax(false, null);
+
+        var receivedMsg = null;
+        server.completeMultipartUpload(1, 'upload-id').fail(function(errMsg) { receivedMsg = errMsg; });
+
+        expect(receivedMsg).toContain("There was an error uploading your file");
+    });
+
+    it("informs the caller of an AJAX error when resolving file urls", function() {
+        stubAjax(false, null);
+
+        var receivedMsg = null;
+        server.resolveFileUrls(['token1']).fail(function(errMsg) { receivedMsg = errMsg; });
+
+        expect(receivedMsg).toContain("Could not retrieve download url");
+    });
+
+    it("informs the caller of a server error when resolving file urls", function() {
+        stubAjax(true, { success: false, msg: "Test error" });
+
+        var receivedMsg = null;
+        server.resolveFileUrls(['token1']).fail(function(errMsg) { receivedMsg = errMsg; });
+
+        expect(receivedMsg).toEqual("Test error");
+    });
+
     it("informs the caller of an AJAX error when sending feedback on submission", function() {
         stubAjax(false, null);
 
@@ -28,6 +28,7 @@ OpenAssessment.BaseView = function(runtime, element, server, data) {
     this.staffAreaView = new OpenAssessment.StaffAreaView(this.element, this.server, this);
     this.usageID = '';
     this.srStatusUpdates = [];
+    this.renderSectionsTogether = Boolean(data && data.RENDER_SECTIONS_TOGETHER);
 };
 
 if (typeof OpenAssessment.unsavedChanges === 'undefined' || !OpenAssessment.unsavedChanges) {
@@ -49,6 +50,15 @@ OpenAssessment.BaseView.prototype = {
     SLIDABLE_CONTAINER_CLASS: 'ui-slidable__container',
     READER_FEEDBACK_CLASS: '.sr.reader-feedback',
 
+    // Maximum number of file URLs resolved by a request (MAX_RESOLVED_FILE_URLS on the server)
+    MAX_RESOLVED_FILE_URLS: 100,
+
+    // Sections loaded by loadAssessmentModules, the message being loaded by the peer view
+    ASSESSMENT_MODULE_SECTIONS: [
+        'student_training', 'peer_assessment', 'self_assessment', 'staff_assessment', 'grade', 'leaderboard',
+        'message',
+    ],
+
     /**
      * Checks to see if the scrollTo function is available, then scrolls to the
      * top of the list of steps (or the specified selector) for this display.
@@ -185,11 +195,76 @@ OpenAssessment.BaseView.prototype = {
                     $panel.slideDown();
                     $toggleButton.attr('aria-expanded', 'true');
                     $container.addClass('is--showing');
+                    view.resolveFileUrls($panel);
                 }
 
                 $container.removeClass('is--initially--collapsed ');
             });
         });
+
+        // Resolve the file URLs of the sections which are already expanded
+        $('.' + view.SLIDABLE_CONTAINER_CLASS + '.is--showing', parentElement).each(function() {
+            view.resolveFileUrls($(this));
+        });
+
+        // Links to files whose URL isn't resolved yet open it once it is
+        $('a[data-file-token]', parentElement).on('click', function(event) {
+            var $link = $(this);
+            if (!$link.attr('data-file-token')) {
+                return;
+            }
+            event.preventDefault();
+            // The window is opened now, while handling the click, so that it isn't blocked as a popup
+            var fileWindow = window.open('', '_blank');
+            view.resolveFileUrls($link).done(function() {
+                if ($link.attr('href') !== '#') {
+                    fileWindow.location = $link.attr('href');
+                } else {
+                    fileWindow.close();
+                }
+            }).fail(function() {
+                fileWindow.close();
+            });
+        });
+    },
+
+    /**
+     * Replace the placeholders rendered in place of file download URLs
+     * (as data-file-token attributes) by the URLs, with a single request
+     * per MAX_RESOLVED_FILE_URLS placeholders.
+     *
+     * @param {element} parentElement JQuery selector for the container element.
+     * @returns {promise} A JQuery promise, resolved once the URLs are set.
+     */
+    resolveFileUrls: function(parentElement) {
+        var $elements = $('[data-file-token]', parentElement).addBack('[data-file-token]');
+        var tokens = [];
+        $elements.each(function() {
+            var token = $(this).attr('data-file-token');
+            if (tokens.indexOf(token) === -1) {
+                tokens.push(token);
+            }
+        });
+        if (tokens.length === 0) {
+            return $.Deferred().resolve().promise();
+        }
+
+        var requests = [];
+        for (var start = 0; start < tokens.length; start += this.MAX_RESOLVED_FILE_URLS) {
+            requests.push(this.server.resolveFileUrls(tokens.slice(start, start + this.MAX_RESOLVED_FILE_URLS)));
+        }
+        return $.when.apply($, requests).done(function() {
+            var urls = {};
+            $.each(arguments, function(index, batchUrls) { $.extend(urls, batchUrls); });
+            $elements.each(function() {
+                var $element = $(this);
+                var url = urls[$element.attr('data-file-token')];
+                if (url) {
+                    $element.attr($element.is('img') ? 'src' : 'href', url);
+                }
+                $element.removeAttr('data-file-token');
+            });
+        });
     },
 
     /**
@@ -231,16 +306,43 @@ OpenAssessment.BaseView.prototype = {
      * Asynchronously load each sub-view into the DOM.
      */
     load: function() {
-        this.responseView.load();
-        this.loadAssessmentModules();
+        var view = this;
+        this.renderSections(['submission'].concat(this.ASSESSMENT_MODULE_SECTIONS)).done(function() {
+            view.responseView.load();
+            view.loadAssessmentModules(undefined, true);
+        });
         this.staffAreaView.load();
     },
 
+    /**
+     * If enabled, render the given sections in a single request, so that the views
+     * then load them without requesting them one by one.
+     *
+     * @param {Array} sections The sections to render.
+     * @returns {promise} A JQuery promise, which resolves once the sections are rendered.
+     */
+    renderSections: function(sections) {
+        if (!this.renderSectionsTogether) {
+            return $.Deferred().resolve().promise();
+        }
+        return this.server.renderSections(sections);
+    },
+
     /**
      * Refresh the Assessment Modules. This should be called any time an action is
      * performed by the user.
+     *
+     * @param {String} usageID The usage id of the XBlock.
+     * @param {boolean} rendered Whether the sections were already rendered with renderSections.
      */
-    loadAssessmentModules: function(usageID) {
+    loadAssessmentModules: function(usageID, rendered) {
+        var view = this;
+        if (this.renderSectionsTogether && !rendered) {
+            this.renderSections(this.ASSESSMENT_MODULE_SECTIONS).done(function() {
+                view.loadAssessmentModules(usageID, true);
+            });
+            return;
+        }
         this.trainingView.load(usageID);
         this.peerView.load(usageID);
         this.staffView.load(usageID);
@@ -49,4 +49,28 @@ OpenAssessment.FileUploader = function() {
             }
         ).promise();
     };
+
+    /*
+    Upload a part (a Blob) of a file using a one-time URL, as part of a multipart upload.
+    */
+    this.uploadPart = function(url, blob) {
+        // eslint-disable-next-line new-cap
+        return $.Deferred(
+            function(defer) {
+                $.ajax({
+                    url: url,
+                    type: 'PUT',
+                    data: blob,
+                    processData: false,
+                    contentType: false,
+                }).done(
+                    function() { defer.resolve(); }
+                ).fail(
+                    function(data, textStatus) {
+                        defer.rejectWith(this, [textStatus]);
+                    }
+                );
+            }
+        ).promise();
+    };
 };
@@ -31,6 +31,7 @@ OpenAssessment.ResponseView = function(element, server, fileUploader, baseView,
     this.announceStatus = false;
     this.isRendering = false;
     this.fileCountBeforeUpload = 0;
+    this.multipartUploads = {};
     this.dateFactory = new OpenAssessment.DateTimeFactory(this.element);
 };
 
@@ -49,6 +50,16 @@ OpenAssessment.ResponseView.prototype = {
     // For user-facing upload limit text.
     MAX_FILES_MB: 500,
 
+    // Files larger than this (50 * 2^20 bytes) are uploaded in parts, which
+    // are retried on their own, if the file upload backend supports it.
+    MULTIPART_UPLOAD_THRESHOLD: 50 * Math.pow(1024, 2),
+
+    // Size of the parts of multipart uploads (S3 requires at least 5MB).
+    MULTIPART_UPLOAD_PART_SIZE: 10 * Math.pow(1024, 2),
+
+    // Number of attempts at uploading each part before giving up.
+    MULTIPART_UPLOAD_ATTEMPTS: 3,
+
     UNSAVED_WARNING_KEY: 'learner-response',
 
     /**
@@ -850,6 +861,8 @@ OpenAssessment.ResponseView.prototype = {
 
     /**
      Manages file uploads for submission attachments.
+     The upload URLs of all the files are retrieved with a single request,
+     then the files are uploaded one after the other.
 
      **/
     uploadFiles: function() {
@@ -857,16 +870,28 @@ OpenAssessment.ResponseView.prototype = {
         var promise = null;
         var fileCount = view.files.length;
         var sel = $('.step--response', this.element);
+        var uploads = null;
+        var urls = [];
 
         sel.find('.file__upload').prop('disabled', true);
 
         promise = view.saveFilesDescriptions();
 
         view.fileCountBeforeUpload = view.getSavedFileCount(true);
+        uploads = $.map(view.files, function(file, index) {
+            return {contentType: file.type, filename: file.name, filenum: view.fileCountBeforeUpload + index};
+        });
+        promise = promise.pipe(function() {
+            return view.server.getUploadUrls(uploads).done(function(uploadUrls) {
+                urls = uploadUrls;
+            }).fail(function(errMsg) {
+                view.baseView.toggleActionError('upload', errMsg);
+                sel.find('.file__upload').prop('disabled', false);
+            });
+        });
         $.each(view.files, function(index, file) {
-            promise = promise.then(function() {
-                return view.fileUpload(view, file.type, file.name, view.fileCountBeforeUpload + index, file,
-                    fileCount === (index + 1));
+            promise = promise.pipe(function() {
+                return view.fileUpload(view, urls[index], uploads[index].filenum, file, fileCount === (index + 1));
             });
         });
 
@@ -874,36 +899,133 @@ OpenAssessment.ResponseView.prototype = {
     },
 
     /**
-     Retrieves a one-time upload URL from the server, and uses it to upload images
-     to a designated location.
+     Uploads a file to its one-time upload URL, or in parts if it is large.
 
      **/
-    fileUpload: function(view, filetype, filename, filenum, file, finalUpload) {
+    fileUpload: function(view, url, filenum, file, finalUpload) {
         var sel = $('.step--response', this.element);
         var handleError = function(errMsg) {
             view.baseView.toggleActionError('upload', errMsg);
             sel.find('.file__upload').prop('disabled', false);
         };
+        var upload = null;
 
-        // Call getUploadUrl to get the one-time upload URL for this file. Once
-        // completed, execute a sequential AJAX call to upload to the returned
-        // URL. This request requires appropriate CORS configuration for AJAX
+        // This request requires appropriate CORS configuration for AJAX
         // PUT requests on the server.
-        return view.server.getUploadUrl(filetype, filename, filenum).done(
-            function(url) {
-                view.fileUploader.upload(url, file)
-                    .done(function() {
-                        view.fileUrl(filenum);
-                        view.baseView.toggleActionError('upload', null);
-                        if (finalUpload) {
-                            sel.find('input[type=file]').val('');
-                            view.filesUploaded = true;
-                            view.checkSubmissionAbility(true);
-                        }
-                    })
-                    .fail(handleError);
+        if (file.size > view.MULTIPART_UPLOAD_THRESHOLD) {
+            upload = view.multipartUpload(url, filenum, file);
+        } else {
+            upload = view.fileUploader.upload(url, file);
+        }
+        return upload
+            .done(function() {
+                view.fileUrl(filenum);
+                view.baseView.toggleActionError('upload', null);
+                if (finalUpload) {
+                    sel.find('input[type=file]').val('');
+                    view.filesUploaded = true;
+                    view.checkSubmissionAbility(true);
+                }
+            })
+            .fail(handleError);
+    },
+
+    /**
+     Uploads a large file in parts, each of which is retried on its own.
+     If an upload fails, uploading the same file again resumes it, without
+     sending again the parts which were already uploaded.
+     Falls back to the one-time upload URL of the file if the file upload
+     backend doesn't support multipart uploads.
+
+     **/
+    multipartUpload: function(url, filenum, file) {
+        var view = this;
+        var server = this.server;
+        var partSize = this.MULTIPART_UPLOAD_PART_SIZE;
+        var partCount = Math.ceil(file.size / partSize);
+        var pending = this.multipartUploads[filenum];
+        var uploadId = null;
+
+        var initiate = function() {
+            return server.initiateMultipartUpload(file.type, file.name, filenum).pipe(function(newUploadId) {
+                view.multipartUploads[filenum] = {uploadId: newUploadId, name: file.name, size: file.size};
+                uploadId = newUploadId;
+                return {};
+            });
+        };
+        var resume = function() {
+            return server.listUploadParts(filenum, pending.uploadId).pipe(
+                function(parts) {
+                    uploadId = pending.uploadId;
+                    return parts;
+                },
+                function() {
+                    // The upload expired, or was completed or discarded meanwhile
+                    delete view.multipartUploads[filenum];
+                    return initiate();
+                }
+            );
+        };
+        var uploadPart = function(partUrl, partNumber, attempt) {
+            var start = (partNumber - 1) * partSize;
+            return view.fileUploader.uploadPart(partUrl, file.slice(start, start + partSize)).pipe(
+                null,
+                function(errMsg) {
+                    if (attempt < view.MULTIPART_UPLOAD_ATTEMPTS) {
+                        return uploadPart(partUrl, partNumber, attempt + 1);
+                    }
+                    return $.Deferred().rejectWith(this, [errMsg]).promise();
+                }
+            );
+        };
+        var started = null;
+
+        if (pending && pending.name === file.name && pending.size === file.size) {
+            started = resume();
+        } else {
+            if (pending) {
+                // Another file replaces the one whose upload failed
+                server.abortMultipartUpload(filenum, pending.uploadId);
+                delete this.multipartUploads[filenum];
             }
-        ).fail(handleError);
+            started = initiate();
+        }
+
+        return started.pipe(
+            function(uploadedParts) {
+                var partNumbers = [];
+                for (var partNumber = 1; partNumber <= partCount; partNumber++) {
+                    if (uploadedParts[partNumber] !== Math.min(partSize, file.size - (partNumber - 1) * partSize)) {
+                        partNumbers.push(partNumber);
+                    }
+                }
+                var uploaded = $.Deferred().resolve().promise();
+                if (partNumbers.length > 0) {
+                    uploaded = server.getUploadPartUrls(filenum, uploadId, partNumbers).pipe(function(urls) {
+                        var partsUploaded = $.Deferred().resolve().promise();
+                        $.each(partNumbers, function(index, partNumber) {
+                            partsUploaded = partsUploaded.pipe(function() {
+                                return uploadPart(urls[partNumber], partNumber, 1);
+                            });
+                        });
+                        return partsUploaded;
+                    });
+                }
+                return uploaded.pipe(function() {
+                    return server.completeMultipartUpload(filenum, uploadId);
+                }).done(function() {
+                    delete view.multipartUploads[filenum];
+                    Logger.log('openassessment.upload_file', {
+                        fileName: file.name,
+                        fileSize: file.size,
+                        fileType: file.type,
+                    });
+                });
+            },
+            function() {
+                return view.fileUploader.upload(url, file);
+            }
+        );
     },
 
     /**
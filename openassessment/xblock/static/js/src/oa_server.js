@@ -16,6 +16,7 @@ if (typeof OpenAssessment.Server === "undefined" || !OpenAssessment.Server) {
     OpenAssessment.Server = function(runtime, element) {
         this.runtime = runtime;
         this.element = element;
+        this.renderedSections = {};
     };
 
     var jsonContentType = "application/json; charset=utf-8";
@@ -42,6 +43,12 @@ if (typeof OpenAssessment.Server === "undefined" || !OpenAssessment.Server) {
         render: function(component) {
             var view = this;
             var url = this.url('render_' + component);
+            if (this.renderedSections.hasOwnProperty(component)) {
+                // The component was rendered in advance by renderSections
+                var html = this.renderedSections[component];
+                delete this.renderedSections[component];
+                return $.Deferred().resolveWith(view, [html]).promise();
+            }
             return $.Deferred(function(defer) {
                 $.ajax({
                     url: url,
@@ -55,6 +62,33 @@ if (typeof OpenAssessment.Server === "undefined" || !OpenAssessment.Server) {
             }).promise();
         },
 
+        /**
+         * Render several components in a single request.  The HTML of each component
+         * is then returned by the next call to `render` for this component, instead
+         * of being requested again.
+         *
+         * @param {Array} components The components to render.
+         * @returns {*} A JQuery promise, which resolves once the components are rendered.
+         *     Components which can't be rendered together are rendered by `render`.
+         */
+        renderSections: function(components) {
+            var server = this;
+            var url = this.url('render_sections');
+            return $.Deferred(function(defer) {
+                $.ajax({
+                    url: url,
+                    type: "POST",
+                    data: JSON.stringify({sections: components}),
+                    contentType: jsonContentType,
+                    dataType: "json"
+                }).done(function(data) {
+                    server.renderedSections = data;
+                }).always(function() {
+                    defer.resolve();
+                });
+            }).promise();
+        },
+
         /**
          * Render Latex for all new DOM elements with class 'allow--latex'.
          *
@@ -515,6 +549,149 @@ if (typeof OpenAssessment.Server === "undefined" || !OpenAssessment.Server) {
             }).promise();
         },
 
+        /**
+         * Get the upload URLs of several files of the submission, with a single request.
+         *
+         * @param {Array} files The files to upload, as objects with the keys
+         * "contentType", "filename" and "filenum".
+         * @returns {promise} A promise which resolves with the list of the upload URLs,
+         * in the order of the files, on success, or with an error message upon failure.
+         */
+        getUploadUrls: function(files) {
+            var url = this.url('upload_urls');
+            return $.Deferred(function(defer) {
+                $.ajax({
+                    type: "POST",
+                    url: url,
+                    data: JSON.stringify({files: files}),
+                    contentType: jsonContentType
+                }).done(function(data) {
+                    if (data.success) { defer.resolve(data.urls); }
+                    else { defer.rejectWith(this, [data.msg]); }
+                }).fail(function() {
+                    defer.rejectWith(this, [gettext('Could not retrieve upload url.')]);
+                });
+            }).promise();
+        },
+
+        /**
+         * Start uploading a large file of the submission in parts.
+         *
+         * @param {string} contentType The Content Type for the file being uploaded.
+         * @param {string} filename The name of the file to be uploaded.
+         * @param {string} filenum The number of the file to be uploaded.
+         * @returns {promise} A promise which resolves with the ID of the upload on success,
+         * or with an error message upon failure (including when the file upload backend
+         * doesn't support multipart uploads).
+         */
+        initiateMultipartUpload: function(contentType, filename, filenum) {
+            var url = this.url('initiate_multipart_upload');
+            return $.Deferred(function(defer) {
+                $.ajax({
+                    type: "POST",
+                    url: url,
+                    data: JSON.stringify({contentType: contentType, filename: filename, filenum: filenum}),
+                    contentType: jsonContentType
+                }).done(function(data) {
+                    if (data.success) { defer.resolve(data.uploadId); }
+                    else { defer.rejectWith(this, [data.msg]); }
+                }).fail(function() {
+                    defer.rejectWith(this, [gettext('Could not retrieve upload url.')]);
+                });
+            }).promise();
+        },
+
+        /**
+         * Get the upload URLs of parts of a multipart upload.
+         *
+         * @param {string} filenum The number of the file being uploaded.
+         * @param {string} uploadId The ID of the upload.
+         * @param {Array} partNumbers The numbers (starting from 1) of the parts to upload.
+         * @returns {promise} A promise which resolves with an object mapping each part
+         * number to its upload URL on success, or with an error message upon failure.
+         */
+        getUploadPartUrls: function(filenum, uploadId, partNumbers) {
+            var url = this.url('upload_part_urls');
+            return $.Deferred(function(defer) {
+                $.ajax({
+                    type: "POST",
+                    url: url,
+                    data: JSON.stringify({filenum: filenum, uploadId: uploadId, partNumbers: partNumbers}),
+                    contentType: jsonContentType
+                }).done(function(data) {
+                    if (data.success) { defer.resolve(data.urls); }
+                    else { defer.rejectWith(this, [data.msg]); }
+                }).fail(function() {
+                    defer.rejectWith(this, [gettext('Could not retrieve upload url.')]);
+                });
+            }).promise();
+        },
+
+        /**
+         * List the parts of a multipart upload which were already uploaded.
+         *
+         * @param {string} filenum The number of the file being uploaded.
+         * @param {string} uploadId The ID of the upload.
+         * @returns {promise} A promise which resolves with an object mapping the number
+         * of each uploaded part to its size in bytes on success, or with an error message
+         * upon failure.
+         */
+        listUploadParts: function(filenum, uploadId) {
+            return this.multipartUploadRequest('list_upload_parts', filenum, uploadId).pipe(function(data) {
+                return data.parts;
+            });
+        },
+
+        /**
+         * Assemble the uploaded parts of a multipart upload into the file.
+         *
+         * @param {string} filenum The number of the file being uploaded.
+         * @param {string} uploadId The ID of the upload.
+         * @returns {promise} A promise which resolves on success, or with an error
+         * message upon failure.
+         */
+        completeMultipartUpload: function(filenum, uploadId) {
+            return this.multipartUploadRequest('complete_multipart_upload', filenum, uploadId);
+        },
+
+        /**
+         * Discard a multipart upload and the parts uploaded so far.
+         *
+         * @param {string} filenum The number of the file being uploaded.
+         * @param {string} uploadId The ID of the upload.
+         * @returns {promise} A promise which resolves on success, or with an error
+         * message upon failure.
+         */
+        abortMultipartUpload: function(filenum, uploadId) {
+            return this.multipartUploadRequest('abort_multipart_upload', filenum, uploadId);
+        },
+
+        /**
+         * Send a request about an ongoing multipart upload to a handler.
+         *
+         * @param {string} handler The name of the XBlock handler.
+         * @param {string} filenum The number of the file being uploaded.
+         * @param {string} uploadId The ID of the upload.
+         * @returns {promise} A promise which resolves with the response data on success,
+         * or with an error message upon failure.
+         */
+        multipartUploadRequest: function(handler, filenum, uploadId) {
+            var url = this.url(handler);
+            return $.Deferred(function(defer) {
+                $.ajax({
+                    type: "POST",
+                    url: url,
+                    data: JSON.stringify({filenum: filenum, uploadId: uploadId}),
+                    contentType: jsonContentType
+                }).done(function(data) {
+                    if (data.success) { defer.resolve(data); }
+                    else { defer.rejectWith(this, [data.msg]); }
+                }).fail(function() {
+                    defer.rejectWith(this, [gettext('There was an error uploading your file.')]);
+                });
+            }).promise();
+        },
+
         /**
          * Sends request to server to remove specific uploaded file.
          */
@@ -576,6 +753,27 @@ if (typeof OpenAssessment.Server === "undefined" || !OpenAssessment.Server) {
             }).promise();
         },
 
+        /**
+         * Exchange the placeholders rendered in place of file download URLs for the URLs.
+         *
+         * @param {Array} tokens - The placeholders, from the data-file-token attributes.
+         * @returns {promise} A JQuery promise, which resolves with an object mapping
+         *     each placeholder to its download URL (empty if it can't be resolved).
+         */
+        resolveFileUrls: function(tokens) {
+            var url = this.url('resolve_file_urls');
+            return $.Deferred(function(defer) {
+                $.ajax({
+                    type: "POST", url: url, data: JSON.stringify({tokens: tokens}), contentType: jsonContentType
+                }).done(function(data) {
+                    if (data.success) { defer.resolve(data.urls); }
+                    else { defer.rejectWith(this, [data.msg]); }
+                }).fail(function() {
+                    defer.rejectWith(this, [gettext('Could not retrieve download url.')]);
+                });
+            }).promise();
+        },
+
         /**
          * Cancel a submission from the peer grading pool.
          *
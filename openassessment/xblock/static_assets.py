@@ -0,0 +1,80 @@
+"""
+CSS and JavaScript assets of the fragments rendered by the OpenAssessment XBlock.
+
+By default, the minified assets are inlined in every fragment, which repeats
+them for every ORA block of a page, on every request.  With the
+ORA2_STATIC_ASSET_URLS setting enabled, the assets are referenced instead by
+URLs served by the runtime (see `local_resource_url`), which are versioned
+with a hash of their content: browsers can cache them for as long as the
+content doesn't change, and the fragments of the blocks of a page all refer
+to the same URLs.
+
+Either way, the content of the assets is read from the package once per
+process.
+"""
+from __future__ import absolute_import
+
+from functools import lru_cache
+import hashlib
+
+import pkg_resources
+
+from django.conf import settings
+
+
+def use_asset_urls():
+    """
+    Return True if the assets are referenced by URL rather than inlined in the fragments.
+    """
+    return getattr(settings, 'ORA2_STATIC_ASSET_URLS', False)
+
+
+@lru_cache(maxsize=None)
+def load_resource(path):
+    """
+    Return the content of a resource of the package, as text.
+
+    Args:
+        path (str): The path of the resource, relative to the package (e.g. "static/css/openassessment-ltr.css").
+    """
+    return pkg_resources.resource_string(__name__, path).decode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def get_asset_version(path):
+    """
+    Return a short hash of the content of an asset, which changes with the content.
+    """
+    return hashlib.sha1(load_resource(path).encode('utf-8')).hexdigest()[:12]
+
+
+def get_asset_url(block, path):
+    """
+    Return the versioned URL at which the runtime serves an asset of the block.
+    """
+    url = block.runtime.local_resource_url(block, path)
+    return u'{url}{separator}v={version}'.format(
+        url=url,
+        separator='&' if '?' in url else '?',
+        version=get_asset_version(path),
+    )
+
+
+def add_css(block, fragment, path):
+    """
+    Add a CSS asset to the fragment, by URL or inlined (see `use_asset_urls`).
+    """
+    if use_asset_urls():
+        fragment.add_css_url(get_asset_url(block, path))
+    else:
+        fragment.add_css(load_resource(path))
+
+
+def add_javascript(block, fragment, path):
+    """
+    Add a JavaScript asset to the fragment, by URL or inlined (see `use_asset_urls`).
+    """
+    if use_asset_urls():
+        fragment.add_javascript_url(get_asset_url(block, path))
+    else:
+        fragment.add_javascript(load_resource(path))
@@ -7,16 +7,17 @@ import logging
 
 import six
 
-from openassessment.assessment.api import student_training
 from openassessment.workflow.errors import AssessmentWorkflowError
 from openassessment.xblock.data_conversion import convert_training_examples_list_to_dict, create_submission_dict
 from webob import Response
 from xblock.core import XBlock
 
+from .lazy_module import LazyModule
 from .resolve_dates import DISTANT_FUTURE
 from .user_data import get_user_preferences
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+student_training = LazyModule('openassessment.assessment.api.student_training')  # pylint: disable=invalid-name
 
 
 class StudentTrainingMixin:
@@ -7,22 +7,24 @@ import copy
 import logging
 from uuid import uuid4
 
-import pkg_resources
 import six
 from six.moves import zip
 
 from django.conf import settings
-from django.template.loader import get_template
 from django.utils.translation import ugettext_lazy
 
+from openassessment.workflow.errors import AssessmentWorkflowInternalError
 from openassessment.xblock.data_conversion import (
     create_rubric_dict,
     make_django_template_key,
     update_assessments_format
 )
 from openassessment.xblock.defaults import DEFAULT_EDITOR_ASSESSMENTS_ORDER, DEFAULT_RUBRIC_FEEDBACK_TEXT
-from openassessment.xblock.resolve_dates import resolve_dates
+from openassessment.xblock.lazy_module import LazyModule
+from openassessment.xblock.resolve_dates import DateValidationError, InvalidDateFormat, resolve_dates
 from openassessment.xblock.schema import EDITOR_UPDATE_SCHEMA
+from openassessment.xblock import static_assets
+from openassessment.xblock.template_registry import get_template
 from openassessment.xblock.validation import validator
 from voluptuous import MultipleInvalid
 from xblock.core import XBlock
@@ -31,6 +33,8 @@ from web_fragments.fragment import Fragment
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
+deadlines_api = LazyModule('openassessment.workflow.deadlines_api')  # pylint: disable=invalid-name
+
 
 class StudioMixin:
     """
@@ -88,9 +92,7 @@ class StudioMixin:
             self.add_javascript_files(fragment, "static/js/src/oa_server.js")
             self.add_javascript_files(fragment, "static/js/src/studio")
         else:
-            # TODO: switch to add_javascript_url once XBlock resources are loaded from the CDN
-            js_bytes = pkg_resources.resource_string(__name__, "static/js/openassessment-studio.min.js")
-            fragment.add_javascript(js_bytes.decode('utf-8'))
+            static_assets.add_javascript(self, fragment, "static/js/openassessment-studio.min.js")
         js_context_dict = {
             "FILE_EXT_BLACK_LIST": self.FILE_EXT_BLACK_LIST,
         }
@@ -117,7 +119,7 @@ class StudioMixin:
                 (self.submission_start, self.submission_due)
             ] + [
                 (asmnt.get('start'), asmnt.get('due'))
-                for asmnt in self.valid_assessments
+                for asmnt in self.configuration.assessments
             ],
             self._
         )
@@ -264,9 +266,35 @@ class StudioMixin:
         self.leaderboard_show = data['leaderboard_show']
         self.teams_enabled = bool(data.get('teams_enabled', False))
         self.selected_teamset_id = data.get('selected_teamset_id', '')
+        if not deadlines_api.is_indexed_on_publish():
+            # Without a publish step, index the dates as they are saved
+            self.index_step_deadlines()
 
         return {'success': True, 'msg': self._(u'Successfully updated OpenAssessment XBlock')}
 
+    def index_step_deadlines(self):
+        """
+        Index the resolved dates of the steps of the block (see `openassessment.workflow.deadlines_api`),
+        if the ORA2_DEADLINE_INDEX setting is enabled.
+
+        Errors are logged rather than raised, so that the block can be saved
+        even if its dates can't be indexed.
+
+        Returns:
+            bool: True if the dates were indexed.
+        """
+        if not getattr(settings, 'ORA2_DEADLINE_INDEX', False) or not hasattr(self, 'location'):
+            return False
+
+        try:
+            deadlines_api.update_step_deadlines(
+                six.text_type(self.location.course_key), six.text_type(self.location), self.get_step_deadlines()
+            )
+        except (DateValidationError, InvalidDateFormat, AssessmentWorkflowInternalError):
+            logger.exception(u'Could not index the step dates of {}'.format(self.location))
+            return False
+        return True
+
     @XBlock.json_handler
     def check_released(self, data, suffix=''):  # pylint: disable=unused-argument
         """
@@ -370,7 +398,7 @@ class StudioMixin:
 
         # Account for inconsistencies between the user's order and the problems
         # that are currently enabled in the problem (These cannot be changed)
-        enabled_assessments = [asmnt['name'] for asmnt in self.valid_assessments]
+        enabled_assessments = [asmnt['name'] for asmnt in self.configuration.assessments]
         enabled_ordered_assessments = [
             assessment for assessment in enabled_assessments if assessment in user_order
         ]
@@ -1,6 +1,7 @@
 """ A Mixin for Response submissions. """
 from __future__ import absolute_import, unicode_literals
 
+from functools import partial
 import json
 import logging
 
@@ -8,18 +9,19 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.utils.functional import cached_property
 import six
 
-from openassessment.fileupload import api as file_upload_api
 from openassessment.fileupload.exceptions import FileUploadError
 from openassessment.workflow.errors import AssessmentWorkflowError
 from xblock.core import XBlock
 from xblock.exceptions import NoSuchServiceError
 
 from .data_conversion import create_submission_dict, prepare_submission_for_serialization
+from .lazy_module import LazyModule
 from .resolve_dates import DISTANT_FUTURE
 from .user_data import get_user_preferences
 from .validation import validate_submission
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+file_upload_api = LazyModule('openassessment.fileupload.api')  # pylint: disable=invalid-name
 
 
 class NoTeamToCreateSubmissionForError(Exception):
@@ -45,6 +47,10 @@ class SubmissionMixin:
 
     MAX_FILES_COUNT = 20  # pragma: no cover
 
+    # Maximum number of file URLs resolved at a time by the resolve_file_urls handler
+    # (the client sends larger sets of placeholders in several requests)
+    MAX_RESOLVED_FILE_URLS = 100
+
     # taken from http://www.howtogeek.com/137270/50-file-extensions-that-are-potentially-dangerous-on-windows/
     # and http://pcsupport.about.com/od/tipstricks/a/execfileext.htm
     # left out .js and office extensions
@@ -307,6 +313,7 @@ class SubmissionMixin:
         )
 
         self.create_team_workflow(submission["team_submission_uuid"])
+        self.workflow_snapshot.invalidate()
         # Emit analytics event...
         self.runtime.publish(
             self,
@@ -336,6 +343,7 @@ class SubmissionMixin:
         submission = api.create_submission(student_item_dict, student_sub_dict)
         self.create_workflow(submission["uuid"])
         self.submission_uuid = submission["uuid"]
+        self.workflow_snapshot.invalidate()
 
         # Emit analytics event...
         self.runtime.publish(
@@ -394,31 +402,203 @@ class SubmissionMixin:
         if 'contentType' not in data or 'filename' not in data:
             return {'success': False, 'msg': self._(u"There was an error uploading your file.")}
         content_type = data['contentType']
-        file_name = data['filename']
-        file_name_parts = file_name.split('.')
-
         file_num = int(data.get('filenum', 0))
 
+        error_msg = self._get_upload_error_msg(content_type, data['filename'])
+        if error_msg:
+            return {'success': False, 'msg': error_msg}
+        try:
+            key = self._get_student_item_key(file_num)
+            url = file_upload_api.get_upload_url(key, content_type)
+            return {'success': True, 'url': url}
+        except FileUploadError:
+            logger.exception(u"FileUploadError:Error retrieving upload URL for the data:{data}.".format(data=data))
+            return {'success': False, 'msg': self._(u"Error retrieving upload URL.")}
+
+    @XBlock.json_handler
+    def upload_urls(self, data, suffix=''):  # pylint: disable=unused-argument
+        """
+        Request the URLs to be used for uploading several files related to
+        this submission, in a single request.
+
+        Args:
+            data (dict): Data should have a single key 'files' that contains a list of
+                dictionaries with the keys 'contentType', 'filename' and 'filenum',
+                one for each file to upload.
+            suffix (str): Not used.
+
+        Returns:
+            A list of the URLs to be used to upload each file, in the order of the request.
+
+        """
+        files = data.get('files')
+        if not isinstance(files, list) or not files or len(files) > self.MAX_FILES_COUNT:
+            return {'success': False, 'msg': self._(u"There was an error uploading your file.")}
+
+        uploads = []
+        for file_data in files:
+            if not isinstance(file_data, dict) or 'contentType' not in file_data or 'filename' not in file_data:
+                return {'success': False, 'msg': self._(u"There was an error uploading your file.")}
+            error_msg = self._get_upload_error_msg(file_data['contentType'], file_data['filename'])
+            if error_msg:
+                return {'success': False, 'msg': error_msg}
+            key = self._get_student_item_key(int(file_data.get('filenum', 0)))
+            uploads.append((key, file_data['contentType']))
+
+        try:
+            urls = file_upload_api.get_upload_urls(uploads)
+            return {'success': True, 'urls': [urls[key] for key, _ in uploads]}
+        except FileUploadError:
+            logger.exception(u"FileUploadError:Error retrieving upload URLs for the data:{data}.".format(data=data))
+            return {'success': False, 'msg': self._(u"Error retrieving upload URL.")}
+
+    @XBlock.json_handler
+    def initiate_multipart_upload(self, data, suffix=''):  # pylint: disable=unused-argument
+        """
+        Start uploading a large file in several parts, which can each be
+        retried, and resumed after an interruption.
+
+        Args:
+            data (dict): Data should have the keys 'contentType', 'filename' and 'filenum'.
+            suffix (str): Not used.
+
+        Returns:
+            The 'uploadId' of the upload, to pass to the other multipart upload handlers.
+
+        """
+        if 'contentType' not in data or 'filename' not in data:
+            return {'success': False, 'msg': self._(u"There was an error uploading your file.")}
+        error_msg = self._get_upload_error_msg(data['contentType'], data['filename'])
+        if error_msg:
+            return {'success': False, 'msg': error_msg}
+        try:
+            key = self._get_student_item_key(int(data.get('filenum', 0)))
+            upload_id = file_upload_api.initiate_multipart_upload(key, data['contentType'])
+            return {'success': True, 'uploadId': upload_id}
+        except FileUploadError:
+            logger.exception(
+                u"FileUploadError:Error initiating multipart upload for the data:{data}.".format(data=data)
+            )
+            return {'success': False, 'msg': self._(u"Error retrieving upload URL.")}
+
+    @XBlock.json_handler
+    def upload_part_urls(self, data, suffix=''):  # pylint: disable=unused-argument
+        """
+        Request the URLs to be used for uploading parts of a multipart upload.
+
+        Args:
+            data (dict): Data should have the keys 'filenum', 'uploadId' and
+                'partNumbers', the list of the numbers (starting from 1) of the parts.
+            suffix (str): Not used.
+
+        Returns:
+            A dict mapping each part number to the URL its content should be PUT to.
+
+        """
+        part_numbers = data.get('partNumbers')
+        if 'uploadId' not in data or not isinstance(part_numbers, list):
+            return {'success': False, 'msg': self._(u"There was an error uploading your file.")}
+        try:
+            key = self._get_student_item_key(int(data.get('filenum', 0)))
+            urls = {
+                part_number: file_upload_api.get_upload_part_url(key, data['uploadId'], int(part_number))
+                for part_number in part_numbers
+            }
+            return {'success': True, 'urls': urls}
+        except (FileUploadError, ValueError):
+            logger.exception(
+                u"FileUploadError:Error retrieving upload part URLs for the data:{data}.".format(data=data)
+            )
+            return {'success': False, 'msg': self._(u"Error retrieving upload URL.")}
+
+    @XBlock.json_handler
+    def list_upload_parts(self, data, suffix=''):  # pylint: disable=unused-argument
+        """
+        List the parts of a multipart upload uploaded so far, so that an
+        interrupted upload can be resumed without sending them again.
+
+        Args:
+            data (dict): Data should have the keys 'filenum' and 'uploadId'.
+            suffix (str): Not used.
+
+        Returns:
+            A dict 'parts' mapping the number of each uploaded part to its size in bytes.
+
+        """
+        if 'uploadId' not in data:
+            return {'success': False, 'msg': self._(u"There was an error uploading your file.")}
+        try:
+            key = self._get_student_item_key(int(data.get('filenum', 0)))
+            return {'success': True, 'parts': file_upload_api.list_upload_parts(key, data['uploadId'])}
+        except FileUploadError:
+            logger.exception(u"FileUploadError:Error listing upload parts for the data:{data}.".format(data=data))
+            return {'success': False, 'msg': self._(u"There was an error uploading your file.")}
+
+    @XBlock.json_handler
+    def complete_multipart_upload(self, data, suffix=''):  # pylint: disable=unused-argument
+        """
+        Assemble the uploaded parts of a multipart upload into the file.
+
+        Args:
+            data (dict): Data should have the keys 'filenum' and 'uploadId'.
+            suffix (str): Not used.
+
+        """
+        if 'uploadId' not in data:
+            return {'success': False, 'msg': self._(u"There was an error uploading your file.")}
+        try:
+            key = self._get_student_item_key(int(data.get('filenum', 0)))
+            file_upload_api.complete_multipart_upload(key, data['uploadId'])
+            return {'success': True}
+        except FileUploadError:
+            logger.exception(
+                u"FileUploadError:Error completing multipart upload for the data:{data}.".format(data=data)
+            )
+            return {'success': False, 'msg': self._(u"There was an error uploading your file.")}
+
+    @XBlock.json_handler
+    def abort_multipart_upload(self, data, suffix=''):  # pylint: disable=unused-argument
+        """
+        Discard a multipart upload and the parts uploaded so far.
+
+        Args:
+            data (dict): Data should have the keys 'filenum' and 'uploadId'.
+            suffix (str): Not used.
+
+        """
+        if 'uploadId' not in data:
+            return {'success': False, 'msg': self._(u"There was an error uploading your file.")}
+        try:
+            key = self._get_student_item_key(int(data.get('filenum', 0)))
+            file_upload_api.abort_multipart_upload(key, data['uploadId'])
+            return {'success': True}
+        except FileUploadError:
+            logger.exception(u"FileUploadError:Error aborting multipart upload for the data:{data}.".format(data=data))
+            return {'success': False, 'msg': self._(u"There was an error uploading your file.")}
+
+    def _get_upload_error_msg(self, content_type, file_name):
+        """
+        Check that a file of the given type and name may be uploaded to this problem.
+
+        Returns:
+            The error message (unicode) to display, or None if the file is allowed.
+
+        """
+        file_name_parts = file_name.split('.')
         file_ext = file_name_parts[-1] if len(file_name_parts) > 1 else None
         if self.file_upload_type == 'image' and content_type not in self.ALLOWED_IMAGE_MIME_TYPES:
-            return {'success': False, 'msg': self._(u"Content type must be GIF, PNG or JPG.")}
+            return self._(u"Content type must be GIF, PNG or JPG.")
 
         if self.file_upload_type == 'pdf-and-image' and content_type not in self.ALLOWED_FILE_MIME_TYPES:
-            return {'success': False, 'msg': self._(u"Content type must be PDF, GIF, PNG or JPG.")}
+            return self._(u"Content type must be PDF, GIF, PNG or JPG.")
 
         if self.file_upload_type == 'custom' and file_ext.lower() not in self.white_listed_file_types:
-            return {'success': False, 'msg': self._(u"File type must be one of the following types: {}").format(
-                ', '.join(self.white_listed_file_types))}
+            return self._(u"File type must be one of the following types: {}").format(
+                ', '.join(self.white_listed_file_types))
 
         if file_ext in self.FILE_EXT_BLACK_LIST:
-            return {'success': False, 'msg': self._(u"File type is not allowed.")}
-        try:
-            key = self._get_student_item_key(file_num)
-            url = file_upload_api.get_upload_url(key, content_type)
-            return {'success': True, 'url': url}
-        except FileUploadError:
-            logger.exception(u"FileUploadError:Error retrieving upload URL for the data:{data}.".format(data=data))
-            return {'success': False, 'msg': self._(u"Error retrieving upload URL.")}
+            return self._(u"File type is not allowed.")
+        return None
 
     @XBlock.json_handler
     def download_url(self, data, suffix=''):  # pylint: disable=unused-argument
@@ -432,6 +612,35 @@ class SubmissionMixin:
         file_num = int(data.get('filenum', 0))
         return {'success': True, 'url': self._get_download_url(file_num)}
 
+    @XBlock.json_handler
+    def resolve_file_urls(self, data, suffix=''):  # pylint: disable=unused-argument
+        """
+        Resolve the placeholders rendered in place of file download URLs
+        (see `get_download_urls_from_submission`), in a single batch.
+
+        Args:
+            data (dict): Dictionary with a 'tokens' list of placeholders.
+
+        Returns:
+            A dictionary mapping each placeholder to its download URL, or to an
+            empty string if it can't be resolved.
+
+        """
+        tokens = data.get('tokens')
+        valid = isinstance(tokens, list) and len(tokens) <= self.MAX_RESOLVED_FILE_URLS
+        valid = valid and all(isinstance(token, six.string_types) for token in tokens)
+        if not valid:
+            return {'success': False, 'msg': self._(u"There was an error retrieving the files.")}
+        student_item = self.get_student_item_dict()
+        try:
+            urls = file_upload_api.resolve_deferred_download_urls(
+                tokens, student_item['course_id'], student_item['item_id']
+            )
+            return {'success': True, 'urls': urls}
+        except FileUploadError as exc:
+            logger.exception(u"FileUploadError: Resolving download urls failed with error {error}".format(error=exc))
+            return {'success': False, 'msg': self._(u"There was an error retrieving the files.")}
+
     @XBlock.json_handler
     def remove_uploaded_file(self, data, suffix=''):  # pylint: disable=unused-argument
         """
@@ -500,7 +709,7 @@ class SubmissionMixin:
 
         return url
 
-    def get_download_urls_from_submission(self, submission):
+    def get_download_urls_from_submission(self, submission, defer_urls=False):
         """
         Returns a download URLs for retrieving content within a submission.
 
@@ -508,6 +717,10 @@ class SubmissionMixin:
             submission (dict): Dictionary containing an answer and a file_keys.
                 The file_keys is used to try and retrieve a download urls
                 with related content
+            defer_urls (bool): If True, return placeholders which the client
+                resolves with the `resolve_file_urls` handler, instead of
+                signing the URLs now.  The files are then listed even if they
+                are missing from the storage.
 
         Returns:
             List with URLs to related content. If there is no content related to this
@@ -515,13 +728,18 @@ class SubmissionMixin:
             list.
 
         """
+        if defer_urls:
+            item_id = self.get_student_item_dict()['item_id']
+            get_url = partial(file_upload_api.get_deferred_download_url, item_id=item_id)
+        else:
+            get_url = self._get_url_by_file_key
         urls = []
         if 'file_keys' in submission['answer']:
             file_keys = submission['answer'].get('file_keys', [])
             descriptions = submission['answer'].get('files_descriptions', [])
             file_names = submission['answer'].get('files_name', submission['answer'].get('files_names', []))
             for idx, key in enumerate(file_keys):
-                file_download_url = self._get_url_by_file_key(key)
+                file_download_url = get_url(key)
                 if file_download_url:
                     file_description = descriptions[idx].strip() if idx < len(descriptions) else ''
                     try:
@@ -532,11 +750,54 @@ class SubmissionMixin:
                     urls.append((file_download_url, file_description, file_name, False))
         elif 'file_key' in submission['answer']:
             key = submission['answer'].get('file_key', '')
-            file_download_url = self._get_url_by_file_key(key)
+            file_download_url = get_url(key) if key else ''
             if file_download_url:
                 urls.append((file_download_url, '', '', False))
         return urls
 
+    def get_file_previews_from_submission(self, submission, defer_urls=False):
+        """
+        Returns the URLs of the previews of the files of a submission, which
+        are shown instead of the full size files.
+
+        Args:
+            submission (dict): Dictionary containing an answer and a file_keys.
+
+            defer_urls (bool): If True, map the placeholders of the download
+                URLs instead (see `get_download_urls_from_submission`).
+
+        Returns:
+            Dict mapping the download URL of each file to the URL of its
+            preview. Files without preview (for instance because previews are
+            disabled) are not included.
+
+        """
+        answer = submission['answer']
+        if 'file_keys' in answer:
+            file_keys = answer.get('file_keys') or []
+        elif answer.get('file_key'):
+            file_keys = [answer['file_key']]
+        else:
+            file_keys = []
+
+        try:
+            preview_urls = {key: url for key, url in file_upload_api.get_preview_urls(file_keys).items() if url}
+            if not preview_urls:
+                return {}
+            if defer_urls:
+                item_id = self.get_student_item_dict()['item_id']
+                download_urls = {key: file_upload_api.get_deferred_download_url(key, item_id) for key in preview_urls}
+            else:
+                # The download URLs were just signed for the submission, and are cached
+                download_urls = file_upload_api.get_download_urls(list(preview_urls))
+        except FileUploadError as exc:
+            logger.exception(u"FileUploadError: Preview urls for file keys {keys} failed with error {error}".format(
+                keys=file_keys,
+                error=exc
+            ))
+            return {}
+        return {download_urls[key]: url for key, url in preview_urls.items() if download_urls.get(key)}
+
     def get_files_info_from_user_state(self, username):
         """
         Returns the files information from the user state for a given username.
@@ -712,8 +973,9 @@ class SubmissionMixin:
         file_urls = None
 
         if self.file_upload_type:
-            context['file_urls'] = self.file_manager.file_descriptor_tuples(include_deleted=True)
-            context['team_file_urls'] = self.file_manager.team_file_descriptor_tuples()
+            defer_urls = file_upload_api.defer_download_urls()
+            context['file_urls'] = self.file_manager.file_descriptor_tuples(include_deleted=True, defer_urls=defer_urls)
+            context['team_file_urls'] = self.file_manager.team_file_descriptor_tuples(defer_urls=defer_urls)
         if self.file_upload_type == 'custom':
             context['white_listed_file_types'] = self.white_listed_file_types
 
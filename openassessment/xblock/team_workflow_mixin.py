@@ -7,11 +7,13 @@ from __future__ import absolute_import
 import logging
 
 from xblock.core import XBlock
-from submissions import team_api as team_sub_api
 from submissions.errors import TeamSubmissionNotFoundError, TeamSubmissionInternalError
-from openassessment.workflow import team_api as team_workflow_api
+
+from .lazy_module import LazyModule
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+team_sub_api = LazyModule('submissions.team_api')  # pylint: disable=invalid-name
+team_workflow_api = LazyModule('openassessment.workflow.team_api')  # pylint: disable=invalid-name
 
 
 class TeamWorkflowMixin:
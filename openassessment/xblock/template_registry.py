@@ -0,0 +1,160 @@
+"""
+Registry of the compiled templates of the OpenAssessment XBlock.
+
+Every section of the XBlock is rendered from an `openassessmentblock/*`
+template.  Unless DEBUG is enabled, the registry keeps the compiled templates
+for the lifetime of the process (they are compiled when the application starts
+with the ORA2_WARM_TEMPLATES setting enabled), so that handlers don't go
+through the template loaders on each request.  It also records how long each
+template takes to render.
+
+Render timings are aggregated in-process (see `get_render_timings`) and
+passed to the metrics hooks: functions called with the name of the template
+and the duration of the rendering in seconds, registered with
+`add_render_hook` or with the ORA2_TEMPLATE_RENDER_HOOK setting (the dotted
+path of a function).
+"""
+from __future__ import absolute_import
+
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.template import loader
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+TEMPLATE_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates')
+TEMPLATE_PREFIX = 'openassessmentblock/'
+
+_TEMPLATES = {}
+_RENDER_HOOKS = []
+_RENDER_TIMINGS = {}
+_TIMINGS_LOCK = threading.Lock()
+
+
+class RegisteredTemplate:
+    """
+    A compiled template, whose renderings are timed.
+    """
+
+    def __init__(self, name, template):
+        self.name = name
+        self.template = template
+
+    def render(self, context=None, request=None):
+        """
+        Render the template, like the template of a Django template backend.
+        """
+        started = time.time()
+        try:
+            return self.template.render(context, request)
+        finally:
+            _record_render_time(self.name, time.time() - started)
+
+
+def get_template(template_name):
+    """
+    Return the compiled template with the given name, loading it on first use.
+
+    Args:
+        template_name (str): The name of the template, e.g. "openassessmentblock/oa_base.html".
+
+    Returns:
+        RegisteredTemplate
+
+    Raises:
+        TemplateDoesNotExist
+    """
+    try:
+        return _TEMPLATES[template_name]
+    except KeyError:
+        template = RegisteredTemplate(template_name, loader.get_template(template_name))
+        # In development, templates are loaded again on each use so that changes are picked up
+        if not settings.DEBUG:
+            _TEMPLATES[template_name] = template
+        return template
+
+
+def warm():
+    """
+    Compile every `openassessmentblock/*` template, so that no request has to.
+
+    Returns:
+        The number of templates compiled.
+    """
+    template_root = os.path.join(TEMPLATE_DIRECTORY, TEMPLATE_PREFIX)
+    num_templates = 0
+    for directory, __, filenames in os.walk(template_root):
+        for filename in filenames:
+            if not filename.endswith('.html'):
+                continue
+            template_name = os.path.relpath(os.path.join(directory, filename), TEMPLATE_DIRECTORY)
+            get_template(template_name.replace(os.sep, '/'))
+            num_templates += 1
+    return num_templates
+
+
+def add_render_hook(hook):
+    """
+    Register a function called with (template_name, duration) after each rendering.
+    """
+    _RENDER_HOOKS.append(hook)
+
+
+def remove_render_hook(hook):
+    """
+    Unregister a function registered with `add_render_hook`.
+    """
+    _RENDER_HOOKS.remove(hook)
+
+
+def get_render_timings():
+    """
+    Return the render timings of the templates rendered by this process.
+
+    Returns:
+        dict mapping template names to dicts with the number of renderings
+        ("count"), and their total and maximum durations in seconds ("total"
+        and "max").
+    """
+    with _TIMINGS_LOCK:
+        return {name: dict(timings) for name, timings in _RENDER_TIMINGS.items()}
+
+
+def reset_render_timings():
+    """
+    Discard the render timings recorded so far.
+    """
+    with _TIMINGS_LOCK:
+        _RENDER_TIMINGS.clear()
+
+
+def _get_render_hooks():
+    """
+    Return the registered hooks, and the hook configured with the ORA2_TEMPLATE_RENDER_HOOK setting if any.
+    """
+    hook_path = getattr(settings, 'ORA2_TEMPLATE_RENDER_HOOK', None)
+    if not hook_path:
+        return _RENDER_HOOKS
+    return _RENDER_HOOKS + [import_string(hook_path)]
+
+
+def _record_render_time(template_name, duration):
+    """
+    Aggregate the duration of a rendering, and pass it to the metrics hooks.
+    """
+    with _TIMINGS_LOCK:
+        timings = _RENDER_TIMINGS.setdefault(template_name, {'count': 0, 'total': 0.0, 'max': 0.0})
+        timings['count'] += 1
+        timings['total'] += duration
+        timings['max'] = max(timings['max'], duration)
+
+    for hook in _get_render_hooks():
+        try:
+            hook(template_name, duration)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(u"The render hook {} failed for template {}".format(hook, template_name))
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for caching the configuration-only fragments of the templates.
+"""
+from __future__ import absolute_import
+
+import json
+
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.test.utils import override_settings
+from django.utils import translation
+
+import mock
+
+from openassessment.xblock import fragment_cache
+
+from .base import XBlockHandlerTestCase, scenario
+
+
+class FragmentCacheTest(XBlockHandlerTestCase):
+    """
+    Tests for the fragment cache.
+    """
+
+    SUBMISSION = (u'ՇﻉรՇ', u'รપ๒๓ٱรรٱѻก')
+
+    def setUp(self):
+        super(FragmentCacheTest, self).setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_fragment_rendered_once(self):
+        render = mock.Mock(return_value=u'<p>Rubric</p>')
+        self.assertEqual(u'<p>Rubric</p>', fragment_cache.get_fragment('prefix', 'rubric', ['self'], render))
+        self.assertEqual(u'<p>Rubric</p>', fragment_cache.get_fragment('prefix', 'rubric', ['self'], render))
+        self.assertEqual(1, render.call_count)
+
+        # Fragments are rendered again for other values of their variables
+        fragment_cache.get_fragment('prefix', 'rubric', ['peer'], render)
+        self.assertEqual(2, render.call_count)
+
+    @scenario('data/self_assessment_scenario.xml', user_id='Bob')
+    def test_cache_prefix(self, xblock):
+        prefix = fragment_cache.get_cache_prefix(xblock)
+        self.assertEqual(prefix, fragment_cache.get_cache_prefix(xblock))
+
+        # The fragments are cached by language
+        with translation.override('es-419'):
+            self.assertNotEqual(prefix, fragment_cache.get_cache_prefix(xblock))
+
+        # The fragments are cached by content version
+        xblock.rubric_criteria[0]['prompt'] = u'Another prompt'
+        self.assertNotEqual(prefix, fragment_cache.get_cache_prefix(xblock))
+
+    @scenario('data/self_only_scenario.xml', user_id='Bob')
+    def test_render_self_assessment(self, xblock):
+        xblock.create_submission(xblock.get_student_item_dict(), self.SUBMISSION)
+
+        with override_settings(ORA2_FRAGMENT_CACHE=False):
+            uncached_html = self.request(xblock, 'render_self_assessment', json.dumps({}))
+
+        with override_settings(ORA2_FRAGMENT_CACHE=True):
+            with mock.patch.object(fragment_cache.cache, 'set', wraps=fragment_cache.cache.set) as mock_set:
+                first_html = self.request(xblock, 'render_self_assessment', json.dumps({}))
+                self.assertTrue(mock_set.called)
+                mock_set.reset_mock()
+
+                second_html = self.request(xblock, 'render_self_assessment', json.dumps({}))
+                self.assertFalse(mock_set.called)
+
+        self.assertIn(u'assessment__rubric__question', uncached_html.decode('utf-8'))
+        self.assertEqual(uncached_html, first_html)
+        self.assertEqual(uncached_html, second_html)
+
+    @scenario('data/self_only_scenario.xml', user_id='Bob')
+    def test_rubric_submission_ids_not_cached(self, xblock):
+        template = get_template('openassessmentblock/oa_rubric.html')
+        context = {
+            'rubric_type': 'peer',
+            'xblock_id': xblock.get_xblock_id(),
+            'rubric_criteria': xblock.rubric_criteria_with_labels,
+            fragment_cache.FRAGMENT_CACHE_CONTEXT_KEY: fragment_cache.get_cache_prefix(xblock),
+        }
+
+        with mock.patch.object(fragment_cache.cache, 'set', wraps=fragment_cache.cache.set) as mock_set:
+            first_html = template.render(dict(context, submission={'uuid': 'first-submission'}))
+            self.assertEqual(mock_set.call_count, len(xblock.rubric_criteria))
+            second_html = template.render(dict(context, submission={'uuid': 'second-submission'}))
+            self.assertEqual(mock_set.call_count, len(xblock.rubric_criteria))
+
+        # The rubric of each submission has its own ids, only the options are shared
+        self.assertIn(u'oa_rubric__peer__first-submission__0', first_html)
+        self.assertIn(u'oa_rubric__peer__second-submission__0', second_html)
+        self.assertNotIn(u'first-submission', second_html)
+        self.assertEqual(first_html.replace(u'first-submission', u'second-submission'), second_html)
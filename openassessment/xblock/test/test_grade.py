@@ -8,6 +8,7 @@ import copy
 import json
 
 import ddt
+import mock
 import six
 from six.moves import zip
 
@@ -211,6 +212,23 @@ class TestGrade(XBlockHandlerTestCase, SubmitAssessmentsMixin):
         self.assertIsNone(criteria[0]['assessments'][1].get('points', None))
         self.assertIsNone(criteria[1]['assessments'][1].get('points', None))
 
+    @scenario('data/feedback_per_criterion.xml', user_id='Bernard')
+    def test_grade_details_computes_median_once(self, xblock):
+        self.create_submission_and_assessments(
+            xblock, self.SUBMISSION, self.PEERS, PEER_ASSESSMENTS, SELF_ASSESSMENT
+        )
+        submission_uuid = xblock.get_workflow_info()['submission_uuid']
+        peer_assessments = peer_api.get_assessments(submission_uuid)
+
+        with mock.patch.object(
+            peer_api, 'get_assessment_median_scores', wraps=peer_api.get_assessment_median_scores
+        ) as mock_median:
+            grade_details = xblock.grade_details(submission_uuid, peer_assessments, None, None)
+
+        # The rubric has two criteria, but the median is only computed once
+        self.assertEqual(len(grade_details['criteria']), 2)
+        mock_median.assert_called_once_with(submission_uuid)
+
     @ddt.data(
         (STAFF_GOOD_ASSESSMENT, [4, 3]),
         (STAFF_BAD_ASSESSMENT, [1, 1]),
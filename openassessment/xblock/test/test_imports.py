@@ -0,0 +1,77 @@
+"""
+Import-time budget of the OpenAssessment XBlock.
+
+The XBlock module is imported by every LMS and Studio worker on startup,
+before Django apps are ready: it must import without loading Django models,
+the APIs which use them, or the storage SDKs of the file upload backends.
+"""
+from __future__ import absolute_import
+
+import json
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+from django.test import TestCase
+
+XBLOCK_MODULE = 'openassessment.xblock.openassessmentblock'
+
+# Total time (in seconds) spent in the modules of this package when importing the XBlock
+IMPORT_TIME_BUDGET = 0.5
+
+# Modules which must only be imported when first used
+DEFERRED_MODULES = re.compile(
+    r'^(boto|swiftclient|submissions\.(api|team_api|models)|openassessment\.fileupload\.api'
+    r'|openassessment\.(assessment|workflow)\.(api|deadlines_api|models|serializers|team_api)\b)'
+)
+
+IMPORT_TIME_REGEX = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+class ImportTimeTest(TestCase):
+    """
+    Profile the import of the XBlock module in a new interpreter.
+    """
+
+    def import_xblock(self):
+        """
+        Import the XBlock module in a new interpreter, without setting up Django.
+
+        The import times are only reported on Python 3.7 and later: earlier
+        versions ignore the `-X importtime` option.
+
+        Returns:
+            tuple of (list of the names of the imported modules, dict mapping
+            module names to the time spent importing them, in seconds, excluding submodules)
+        """
+        script = 'import json, sys; import {}; print(json.dumps(sorted(sys.modules)))'.format(XBLOCK_MODULE)
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'settings.base')),
+            universal_newlines=True,
+        )
+        self.assertEqual(0, process.returncode, process.stderr[-2000:])
+
+        import_times = {}
+        for line in process.stderr.splitlines():
+            match = IMPORT_TIME_REGEX.match(line)
+            if match:
+                import_times[match.group(4)] = int(match.group(1)) / 1e6
+        return json.loads(process.stdout), import_times
+
+    def test_deferred_imports(self):
+        modules, __ = self.import_xblock()
+        self.assertEqual([], [module for module in modules if DEFERRED_MODULES.match(module)])
+
+    @unittest.skipIf(sys.version_info < (3, 7), "python -X importtime requires Python 3.7")
+    def test_import_time_budget(self):
+        __, import_times = self.import_xblock()
+        package_import_times = {
+            module: duration for module, duration in import_times.items() if module.startswith('openassessment')
+        }
+        self.assertIn(XBLOCK_MODULE, package_import_times)
+        self.assertLess(sum(package_import_times.values()), IMPORT_TIME_BUDGET, package_import_times)
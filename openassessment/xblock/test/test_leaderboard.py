@@ -4,11 +4,14 @@ Tests for leaderboard handlers in Open Assessment XBlock.
 """
 from __future__ import absolute_import
 
+import datetime as dt
 import json
 from random import randint
+import time
 
+from freezegun import freeze_time
 import mock
-from six.moves.urllib.parse import urlparse  # pylint: disable=import-error
+from six.moves.urllib.parse import parse_qs, urlparse  # pylint: disable=import-error
 
 from django.core.cache import cache
 from django.test.utils import override_settings
@@ -17,6 +20,7 @@ import boto
 from boto.s3.key import Key
 from moto import mock_s3_deprecated
 from openassessment.fileupload import api
+from openassessment.fileupload.backends.base import BaseBackend
 from openassessment.xblock.data_conversion import create_submission_dict, prepare_submission_for_serialization
 from submissions import api as sub_api
 
@@ -232,6 +236,116 @@ class TestLeaderboardRender(XBlockHandlerTransactionTestCase):
             )}
         ])
 
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME='mybucket',
+        ORA2_FILEUPLOAD_PREVIEWS=True,
+    )
+    @scenario('data/leaderboard_show_allowfiles.xml')
+    def test_file_previews(self, xblock):
+        """
+        Tests that the previews of the files are shown instead of the files
+        """
+        conn = boto.connect_s3()
+        bucket = conn.create_bucket('mybucket')
+        for key_name in ('foo', 'previews/foo', 'bar'):
+            Key(bucket, 'submissions_attachments/{}'.format(key_name)).set_contents_from_string("How d'ya do?")
+
+        submission = prepare_submission_for_serialization(('test answer 1 part 1', 'test answer 1 part 2'))
+        submission[u'file_keys'] = ['foo', 'bar']
+        self._create_submissions_and_scores(xblock, [
+            (submission, 1)
+        ])
+        xblock.get_workflow_info = mock.Mock(return_value={'status': 'done'})
+        _, context = xblock.render_leaderboard_complete(xblock.get_student_item_dict())
+
+        # Only the files with a preview are included
+        self.assertEqual(
+            context['topscores'][0]['file_previews'],
+            {api.get_download_url('foo'): api.get_download_url('previews/foo')}
+        )
+
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME='mybucket'
+    )
+    @scenario('data/leaderboard_show_allowfiles.xml')
+    def test_materialized_leaderboard_urls_outlive_it(self, xblock):
+        conn = boto.connect_s3()
+        bucket = conn.create_bucket('mybucket')
+        Key(bucket, 'submissions_attachments/foo').set_contents_from_string("How d'ya do?")
+        submission = prepare_submission_for_serialization(('test answer 1 part 1', 'test answer 1 part 2'))
+        submission[u'file_key'] = 'foo'
+        self._create_submissions_and_scores(xblock, [(submission, 1)])
+        xblock.get_workflow_info = mock.Mock(return_value={'status': 'done'})
+        student_item = xblock.get_student_item_dict()
+
+        def url_expiry(context):
+            """ Return the expiration time of the URL of the file on the leaderboard. """
+            file_url = context['topscores'][0]['files'][0][0]
+            return int(parse_qs(urlparse(file_url).query)['Expires'][0])
+
+        with freeze_time("2020-01-01 00:00:00") as frozen_time:
+            # The download URL of the file is signed, and cached, before the leaderboard is rendered
+            api.get_download_url('foo')
+            frozen_time.tick(dt.timedelta(seconds=BaseBackend.DOWNLOAD_URL_TIMEOUT - 100))
+            _, context = xblock.render_leaderboard_complete(student_item)
+
+            # Past the expiration of the cached URL, the materialized leaderboard
+            # is still served, with a URL that hasn't expired
+            frozen_time.tick(dt.timedelta(seconds=200))
+            with mock.patch.object(sub_api, 'get_top_submissions') as mock_top:
+                _, context = xblock.render_leaderboard_complete(student_item)
+            mock_top.assert_not_called()
+            self.assertGreater(url_expiry(context), time.time())
+
+    @scenario('data/leaderboard_show.xml')
+    def test_materialized_leaderboard_is_reused(self, xblock):
+        self._create_submissions_and_scores(xblock, [
+            (prepare_submission_for_serialization(('test answer 1 part 1', 'test answer 1 part 2')), 1),
+        ])
+        student_item = xblock.get_student_item_dict()
+
+        with mock.patch.object(sub_api, 'get_top_submissions', wraps=sub_api.get_top_submissions) as mock_top:
+            _, first_context = xblock.render_leaderboard_complete(student_item)
+            _, second_context = xblock.render_leaderboard_complete(student_item)
+
+        # The leaderboard is only built once, and both renders display the same scores
+        self.assertEqual(mock_top.call_count, 1)
+        self.assertEqual(first_context['topscores'], second_context['topscores'])
+
+    @scenario('data/leaderboard_show.xml')
+    def test_materialized_leaderboard_refreshed_on_score_change(self, xblock):
+        self._create_submissions_and_scores(xblock, [
+            (prepare_submission_for_serialization(('test answer 1 part 1', 'test answer 1 part 2')), 1),
+        ])
+        self._assert_scores(xblock, [
+            {'score': 1, 'files': [], 'submission': create_submission_dict(
+                {'answer': prepare_submission_for_serialization((u'test answer 1 part 1', u'test answer 1 part 2'))},
+                xblock.prompts
+            )},
+        ])
+
+        # Setting a new score invalidates the materialized leaderboard,
+        # so there's no need to clear the cache to see the new scores.
+        self._create_submissions_and_scores(xblock, [
+            (prepare_submission_for_serialization(('test answer 2 part 1', 'test answer 2 part 2')), 2),
+        ])
+        self._assert_scores(xblock, [
+            {'score': 2, 'files': [], 'submission': create_submission_dict(
+                {'answer': prepare_submission_for_serialization((u'test answer 2 part 1', u'test answer 2 part 2'))},
+                xblock.prompts
+            )},
+            {'score': 1, 'files': [], 'submission': create_submission_dict(
+                {'answer': prepare_submission_for_serialization((u'test answer 1 part 1', u'test answer 1 part 2'))},
+                xblock.prompts
+            )},
+        ])
+
     def _create_submissions_and_scores(
             self, xblock, submissions_and_scores,
             submission_key=None, points_possible=10
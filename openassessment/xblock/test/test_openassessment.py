@@ -15,9 +15,10 @@ from six import StringIO
 
 from freezegun import freeze_time
 from lxml import etree
+from openassessment.workflow import api as workflow_api
 from openassessment.workflow.errors import AssessmentWorkflowError
 from openassessment.xblock import openassessmentblock
-from openassessment.xblock.resolve_dates import DISTANT_FUTURE, DISTANT_PAST
+from openassessment.xblock.resolve_dates import DISTANT_FUTURE, DISTANT_PAST, resolve_dates
 
 from .base import XBlockHandlerTestCase, scenario
 
@@ -174,6 +175,63 @@ class TestOpenAssessment(XBlockHandlerTestCase):
             }
             mock_api.update_from_assessments.assert_called_once_with('test_submission', expected_reqs)
 
+    @scenario('data/basic_scenario.xml', user_id='Bob')
+    def test_render_sections(self, xblock):
+        student_item = xblock.get_student_item_dict()
+        xblock.create_submission(student_item, ('Answer part 1', 'Answer part 2'))
+
+        with patch.object(
+                workflow_api, 'get_workflow_for_submission', wraps=workflow_api.get_workflow_for_submission
+        ) as mock_get_workflow:
+            sections = self.request(
+                xblock,
+                'render_sections',
+                json.dumps({'sections': ['submission', 'peer_assessment', 'grade', 'message', 'unknown']}),
+                response_format='json'
+            )
+
+        self.assertEqual({'submission', 'peer_assessment', 'grade', 'message'}, set(sections))
+        self.assertIn('step--response', sections['submission'])
+        self.assertEqual(sections['grade'], self.request(xblock, 'render_grade', json.dumps({})).decode('utf-8'))
+        # The workflow is retrieved (and updated) once for all the sections
+        self.assertEqual(1, mock_get_workflow.call_count)
+
+    @scenario('data/basic_scenario.xml', user_id='Bob')
+    def test_workflow_snapshot(self, xblock):
+        student_item = xblock.get_student_item_dict()
+        with xblock.request_cache.scope():
+            self.assertEqual({}, xblock.get_workflow_info())
+
+            # Creating the submission (and its workflow) invalidates the snapshot
+            xblock.create_submission(student_item, ('Answer part 1', 'Answer part 2'))
+            with patch.object(
+                    workflow_api, 'get_workflow_for_submission', wraps=workflow_api.get_workflow_for_submission
+            ) as mock_get_workflow:
+                workflow = xblock.get_workflow_info()
+                self.assertEqual('peer', workflow['status'])
+                self.assertIs(workflow, xblock.get_workflow_info())
+                self.assertEqual(1, mock_get_workflow.call_count)
+
+                # So does updating the workflow
+                xblock.update_workflow_status()
+                xblock.get_workflow_info()
+                self.assertEqual(2, mock_get_workflow.call_count)
+
+        # Nothing is memoized outside of a handler
+        with patch.object(workflow_api, 'get_workflow_for_submission') as mock_get_workflow:
+            xblock.get_workflow_info()
+            xblock.get_workflow_info()
+            self.assertEqual(2, mock_get_workflow.call_count)
+
+    @scenario('data/basic_scenario.xml', user_id='Bob')
+    def test_render_sections_error(self, xblock):
+        with patch.object(openassessmentblock.OpenAssessmentBlock, 'render_grade', side_effect=Exception):
+            sections = self.request(
+                xblock, 'render_sections', json.dumps({'sections': ['submission', 'grade']}), response_format='json'
+            )
+        # Sections which can't be rendered are left out
+        self.assertEqual(['submission'], list(sections))
+
     @scenario('data/basic_scenario.xml')
     def test_student_view_workflow_error(self, xblock):
 
@@ -489,6 +547,39 @@ class TestOpenAssessment(XBlockHandlerTestCase):
 class TestDates(XBlockHandlerTestCase):
     """ Test Assessment Dates. """
 
+    @scenario('data/basic_scenario.xml')
+    def test_configuration_computed_once(self, xblock):
+        configuration = xblock.configuration
+        with patch('openassessment.xblock.block_configuration.resolve_dates', wraps=resolve_dates) as mock_resolve:
+            xblock.is_closed(step='peer-assessment')
+            xblock.is_closed(step='self-assessment')
+            xblock.is_released()
+        self.assertIs(configuration, xblock.configuration)
+        self.assertEqual(1, mock_resolve.call_count)
+
+        # Callers get their own copy of the assessments
+        xblock.valid_assessments[0]['must_grade'] = 100
+        xblock.get_assessment_module('peer-assessment')['must_grade'] = 100
+        self.assertEqual(5, xblock.get_assessment_module('peer-assessment')['must_grade'])
+
+        # Only assigning the fields it depends on recomputes the configuration
+        xblock.title = "Changed"
+        self.assertIs(configuration, xblock.configuration)
+
+    @scenario('data/basic_scenario.xml')
+    def test_configuration_follows_fields(self, xblock):
+        configuration = xblock.configuration
+        xblock.submission_due = "2014-03-05T00:00:00"
+        self.assertIsNot(configuration, xblock.configuration)
+        self.assertEqual(
+            dt.datetime(2014, 3, 5).replace(tzinfo=pytz.utc),
+            xblock.configuration.get_open_range('submission')[1]
+        )
+
+        xblock.rubric_assessments = [asmnt for asmnt in xblock.rubric_assessments if asmnt['name'] != 'peer-assessment']
+        self.assertEqual(['self-assessment'], xblock.assessment_steps)
+        self.assertIsNone(xblock.get_assessment_module('peer-assessment'))
+
     @scenario('data/basic_scenario.xml')
     def test_start_end_date_checks(self, xblock):
         xblock.start = dt.datetime(2014, 3, 1).replace(tzinfo=pytz.utc)
@@ -0,0 +1,77 @@
+"""
+Tests for the per-request API cache.
+"""
+from __future__ import absolute_import
+
+from unittest import TestCase
+
+import mock
+
+from openassessment.xblock.request_cache import RequestCache
+
+
+class RequestCacheTest(TestCase):
+    """
+    Tests for memoizing calls within a request scope.
+    """
+
+    def setUp(self):
+        super(RequestCacheTest, self).setUp()
+        self.cache = RequestCache()
+        self.func = mock.Mock(side_effect=lambda *args, **kwargs: object())
+
+    def test_no_caching_outside_scope(self):
+        first = self.cache.call(self.func, 'abc')
+        second = self.cache.call(self.func, 'abc')
+        self.assertIsNot(first, second)
+        self.assertEqual(self.func.call_count, 2)
+
+    def test_caching_within_scope(self):
+        with self.cache.scope():
+            first = self.cache.call(self.func, 'abc')
+            second = self.cache.call(self.func, 'abc')
+            other = self.cache.call(self.func, 'def')
+            with_kwarg = self.cache.call(self.func, 'abc', flag=True)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertIsNot(first, with_kwarg)
+        self.assertEqual(self.func.call_count, 3)
+
+    def test_nested_scopes_share_results(self):
+        with self.cache.scope():
+            first = self.cache.call(self.func, 'abc')
+            with self.cache.scope():
+                second = self.cache.call(self.func, 'abc')
+            third = self.cache.call(self.func, 'abc')
+
+        self.assertIs(first, second)
+        self.assertIs(first, third)
+        self.assertEqual(self.func.call_count, 1)
+
+    def test_results_discarded_after_scope(self):
+        with self.cache.scope():
+            first = self.cache.call(self.func, 'abc')
+        self.assertFalse(self.cache.active)
+
+        with self.cache.scope():
+            second = self.cache.call(self.func, 'abc')
+
+        self.assertIsNot(first, second)
+        self.assertEqual(self.func.call_count, 2)
+
+    def test_invalidate(self):
+        with self.cache.scope():
+            first = self.cache.call(self.func, 'abc')
+            self.cache.invalidate()
+            second = self.cache.call(self.func, 'abc')
+
+        self.assertIsNot(first, second)
+        self.assertEqual(self.func.call_count, 2)
+
+    def test_unhashable_arguments(self):
+        with self.cache.scope():
+            self.cache.call(self.func, {'peer': {}})
+            self.cache.call(self.func, {'peer': {}})
+
+        self.assertEqual(self.func.call_count, 2)
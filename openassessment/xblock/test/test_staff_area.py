@@ -5,7 +5,9 @@ Tests for the staff area.
 from __future__ import absolute_import
 
 from collections import namedtuple
+from io import BytesIO
 import json
+import zipfile
 
 import ddt
 from mock import MagicMock, Mock, PropertyMock, call, patch
@@ -143,6 +145,28 @@ class TestCourseStaff(XBlockHandlerTestCase):
         resp = self.request(xblock, 'render_student_info', json.dumps({}))
         self.assertIn("a response was not found for this learner.", resp.decode('utf-8').lower())
 
+    @scenario('data/file_upload_scenario.xml', user_id='Bob')
+    def test_download_submission_files(self, xblock):
+        # If we're not course staff, we shouldn't be able to download the responses
+        xblock.xmodule_runtime = self._create_mock_runtime(
+            xblock.scope_ids.usage_id, False, False, "Bob"
+        )
+        resp = self.request(xblock, 'download_submission_files', json.dumps({}), request_method="GET")
+        self.assertIn("you do not have permission", resp.decode('utf-8').lower())
+
+        # If we ARE course staff, we get an archive of every learner's responses
+        xblock.xmodule_runtime.user_is_staff = True
+        bob_item = STUDENT_ITEM.copy()
+        bob_item["item_id"] = xblock.scope_ids.usage_id
+        sub_api.create_submission(bob_item, {'text': u"Bob's answer", 'file_keys': ['bob-key']})
+
+        with patch('openassessment.data.file_upload_api.open_file', return_value=BytesIO(b'file content')):
+            resp = self.request(xblock, 'download_submission_files', json.dumps({}), request_method="GET")
+
+        archive = zipfile.ZipFile(BytesIO(resp))
+        self.assertEqual(archive.read('Bob/response.txt'), b"Bob's answer")
+        self.assertEqual(archive.read('Bob/0_bob-key'), b'file content')
+
     @scenario('data/basic_scenario.xml')
     def test_hide_course_staff_area_in_studio_preview(self, xblock):
         # If we are in Studio preview mode, don't show the staff area.
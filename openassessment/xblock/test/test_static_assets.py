@@ -0,0 +1,73 @@
+"""
+Tests for the CSS and JavaScript assets of the XBlock fragments.
+"""
+from __future__ import absolute_import
+
+from django.test.utils import override_settings
+
+import mock
+from web_fragments.fragment import Fragment
+
+from openassessment.xblock import static_assets
+
+from .base import XBlockHandlerTestCase, scenario
+
+CSS_PATH = "static/css/openassessment-ltr.css"
+JS_PATH = "static/js/openassessment-lms.min.js"
+
+
+class StaticAssetsTest(XBlockHandlerTestCase):
+    """
+    Tests for adding assets to fragments, inlined or by URL.
+    """
+
+    def setUp(self):
+        super(StaticAssetsTest, self).setUp()
+        self.block = mock.Mock()
+        self.block.runtime.local_resource_url.side_effect = lambda block, path: '/resource/' + path
+
+    @override_settings(ORA2_STATIC_ASSET_URLS=False)
+    def test_inline_assets(self):
+        fragment = Fragment()
+        static_assets.add_css(self.block, fragment, CSS_PATH)
+        static_assets.add_javascript(self.block, fragment, JS_PATH)
+
+        self.assertEqual(
+            [('text/css', 'text'), ('application/javascript', 'text')],
+            [(resource.mimetype, resource.kind) for resource in fragment.resources]
+        )
+        self.assertEqual(static_assets.load_resource(CSS_PATH), fragment.resources[0].data)
+
+    @override_settings(ORA2_STATIC_ASSET_URLS=True)
+    def test_asset_urls(self):
+        fragment = Fragment()
+        static_assets.add_css(self.block, fragment, CSS_PATH)
+        static_assets.add_javascript(self.block, fragment, JS_PATH)
+
+        self.assertEqual(['url', 'url'], [resource.kind for resource in fragment.resources])
+        css_url = fragment.resources[0].data
+        self.assertTrue(css_url.startswith('/resource/' + CSS_PATH + '?v='))
+        # The URL is versioned with the content of the asset
+        self.assertNotEqual(css_url.split('?v=')[1], fragment.resources[1].data.split('?v=')[1])
+
+    def test_asset_url_with_query_string(self):
+        self.block.runtime.local_resource_url.side_effect = lambda block, path: '/resource?path=' + path
+        url = static_assets.get_asset_url(self.block, CSS_PATH)
+        self.assertEqual('/resource?path={}&v={}'.format(CSS_PATH, static_assets.get_asset_version(CSS_PATH)), url)
+
+    def test_resources_read_once(self):
+        static_assets.load_resource.cache_clear()
+        self.addCleanup(static_assets.load_resource.cache_clear)
+        with mock.patch('openassessment.xblock.static_assets.pkg_resources.resource_string') as mock_resource_string:
+            mock_resource_string.return_value = b'body {}'
+            self.assertEqual('body {}', static_assets.load_resource(CSS_PATH))
+            self.assertEqual('body {}', static_assets.load_resource(CSS_PATH))
+        self.assertEqual(1, mock_resource_string.call_count)
+
+    @override_settings(DEBUG=False, ORA2_STATIC_ASSET_URLS=True)
+    @scenario('data/basic_scenario.xml')
+    def test_student_view_asset_urls(self, xblock):
+        with mock.patch.object(self.runtime, 'local_resource_url', side_effect=lambda block, path: '/' + path):
+            fragment = self.runtime.render(xblock, 'student_view')
+        self.assertTrue(fragment.resources)
+        self.assertTrue(all(resource.kind == 'url' for resource in fragment.resources))
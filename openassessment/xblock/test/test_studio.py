@@ -13,6 +13,10 @@ from mock import MagicMock, patch, Mock
 import pytz
 import six
 
+from django.test.utils import override_settings
+
+from openassessment.workflow import deadlines_api
+
 from .base import XBlockHandlerTestCase, scenario
 
 
@@ -394,3 +398,59 @@ class StudioViewTest(XBlockHandlerTestCase):
             Mock(name="teamset_name_a", teamset_id='teamset_id_a'),
             Mock(name="teamset_name_b", teamset_id='teamset_id_b'),
         ]
+
+    @scenario('data/basic_scenario.xml')
+    def test_update_editor_context_indexes_step_deadlines(self, xblock):
+        xblock.runtime.modulestore = MagicMock()
+        xblock.runtime.modulestore.has_published_version.return_value = False
+        with patch.object(xblock, 'index_step_deadlines') as mock_index:
+            resp = self.request(
+                xblock, 'update_editor_context', json.dumps(self.UPDATE_EDITOR_DATA), response_format='json'
+            )
+        self.assertTrue(resp['success'], msg=resp.get('msg'))
+        mock_index.assert_called_once_with()
+
+    @scenario('data/basic_scenario.xml')
+    def test_update_editor_context_leaves_step_deadlines_to_publish(self, xblock):
+        xblock.runtime.modulestore = MagicMock()
+        xblock.runtime.modulestore.has_published_version.return_value = False
+        with patch.object(deadlines_api, 'is_indexed_on_publish', return_value=True):
+            with patch.object(xblock, 'index_step_deadlines') as mock_index:
+                resp = self.request(
+                    xblock, 'update_editor_context', json.dumps(self.UPDATE_EDITOR_DATA), response_format='json'
+                )
+        self.assertTrue(resp['success'], msg=resp.get('msg'))
+        mock_index.assert_not_called()
+
+    @override_settings(ORA2_DEADLINE_INDEX=True)
+    @scenario('data/basic_scenario.xml')
+    def test_index_step_deadlines(self, xblock):
+        xblock.location = MagicMock(course_key='edX/Enchantment_101/April_1')
+        xblock.location.__str__.return_value = 'openassessment-item'
+        xblock.submission_start = '4014-02-10T09:46'
+        xblock.submission_due = '4014-02-27T09:46'
+        self.assertTrue(xblock.index_step_deadlines())
+
+        deadlines = {
+            deadline['step']: (deadline['start'], deadline['due'])
+            for deadline in deadlines_api.get_step_deadlines('edX/Enchantment_101/April_1', 'openassessment-item')
+        }
+        self.assertEqual(sorted(deadlines), ['peer-assessment', 'problem', 'self-assessment', 'submission'])
+        self.assertEqual(deadlines['problem'], (None, None))
+        self.assertEqual(deadlines['submission'], (
+            dt.datetime(4014, 2, 10, 9, 46, tzinfo=pytz.utc), dt.datetime(4014, 2, 27, 9, 46, tzinfo=pytz.utc)
+        ))
+
+        # Changing the dates replaces the indexed dates
+        xblock.submission_due = '4014-03-27T09:46'
+        self.assertTrue(xblock.index_step_deadlines())
+        closing = deadlines_api.get_steps_in_window(
+            dt.datetime(4014, 3, 27, tzinfo=pytz.utc), dt.datetime(4014, 3, 28, tzinfo=pytz.utc)
+        )
+        self.assertEqual([deadline['step'] for deadline in closing], ['submission'])
+
+    @scenario('data/basic_scenario.xml')
+    def test_index_step_deadlines_disabled(self, xblock):
+        xblock.location = MagicMock(course_key='edX/Enchantment_101/April_1')
+        self.assertFalse(xblock.index_step_deadlines())
+        self.assertEqual(deadlines_api.get_step_deadlines('edX/Enchantment_101/April_1'), [])
@@ -7,9 +7,11 @@ from __future__ import absolute_import, unicode_literals
 
 import datetime as dt
 import json
+import time
 
 from mock import ANY, Mock, call, patch
 import pytz
+import six
 
 from django.test.utils import override_settings
 
@@ -18,6 +20,7 @@ from boto.s3.key import Key
 from moto import mock_s3_deprecated
 from django.contrib.auth import get_user_model
 from openassessment.fileupload import api
+from openassessment.fileupload.exceptions import FileUploadInternalError
 from openassessment.workflow import api as workflow_api
 from openassessment.xblock.data_conversion import create_submission_dict, prepare_submission_for_serialization
 from openassessment.xblock.openassessmentblock import OpenAssessmentBlock
@@ -167,6 +170,84 @@ class SubmissionTest(XBlockHandlerTestCase):
             resp['url']
         )
 
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket"
+    )
+    @scenario('data/file_upload_scenario.xml')
+    def test_upload_urls(self, xblock):
+        """ Test generate upload URLs for several files in one request """
+        xblock.xmodule_runtime = Mock(
+            course_id='test_course',
+            anonymous_student_id='test_student',
+        )
+        files = [
+            {"contentType": "image/jpeg", "filename": "test.jpg", "filenum": 0},
+            {"contentType": "image/png", "filename": "test.png", "filenum": 1},
+        ]
+        resp = self.request(xblock, 'upload_urls', json.dumps({"files": files}), response_format='json')
+        self.assertTrue(resp['success'])
+        self.assertEqual(len(resp['urls']), 2)
+        self.assertIn(self._get_student_item_key(0, xblock.scope_ids.usage_id) + '?', resp['urls'][0])
+        self.assertIn(self._get_student_item_key(1, xblock.scope_ids.usage_id) + '?', resp['urls'][1])
+
+        # A single invalid file fails the whole request
+        files.append({"contentType": "application/x-msdownload", "filename": "test.exe", "filenum": 2})
+        resp = self.request(xblock, 'upload_urls', json.dumps({"files": files}), response_format='json')
+        self.assertFalse(resp['success'])
+        self.assertNotIn('urls', resp)
+
+        resp = self.request(xblock, 'upload_urls', json.dumps({"files": []}), response_format='json')
+        self.assertFalse(resp['success'])
+
+    @mock_s3_deprecated
+    @override_settings(
+        AWS_ACCESS_KEY_ID='foobar',
+        AWS_SECRET_ACCESS_KEY='bizbaz',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME="mybucket"
+    )
+    @scenario('data/file_upload_scenario.xml')
+    def test_multipart_upload(self, xblock):
+        """ Test the handlers of a multipart upload """
+        xblock.xmodule_runtime = Mock(
+            course_id='test_course',
+            anonymous_student_id='test_student',
+        )
+        conn = boto.connect_s3()
+        conn.create_bucket('mybucket')
+        file_data = {"contentType": "image/jpeg", "filename": "test.jpg", "filenum": 0}
+
+        resp = self.request(xblock, 'initiate_multipart_upload', json.dumps(file_data), response_format='json')
+        self.assertTrue(resp['success'])
+        upload_id = resp['uploadId']
+
+        data = {"filenum": 0, "uploadId": upload_id}
+        resp = self.request(
+            xblock, 'upload_part_urls', json.dumps(dict(data, partNumbers=[1, 2])), response_format='json'
+        )
+        self.assertTrue(resp['success'])
+        self.assertEqual(sorted(resp['urls']), ['1', '2'])
+        self.assertIn('partNumber=2', resp['urls']['2'])
+        self.assertIn(self._get_student_item_key(0, xblock.scope_ids.usage_id) + '?', resp['urls']['1'])
+
+        resp = self.request(xblock, 'list_upload_parts', json.dumps(data), response_format='json')
+        self.assertTrue(resp['success'])
+        self.assertEqual(resp['parts'], {})
+
+        # Nothing has been uploaded yet
+        resp = self.request(xblock, 'complete_multipart_upload', json.dumps(data), response_format='json')
+        self.assertFalse(resp['success'])
+
+        resp = self.request(xblock, 'abort_multipart_upload', json.dumps(data), response_format='json')
+        self.assertTrue(resp['success'])
+
+        file_data['contentType'] = "application/x-msdownload"
+        file_data['filename'] = "test.exe"
+        resp = self.request(xblock, 'initiate_multipart_upload', json.dumps(file_data), response_format='json')
+        self.assertFalse(resp['success'])
+
     @mock_s3_deprecated
     @override_settings(
         AWS_ACCESS_KEY_ID='foobar',
@@ -538,6 +619,91 @@ class SubmissionTest(XBlockHandlerTestCase):
 
             mock_download_url.assert_has_calls([call('key-1')])
 
+    @scenario('data/submission_open.xml', user_id="Bob")
+    def test_get_deferred_download_urls_from_submission(self, xblock):
+        mock_submission = {
+            'answer': {
+                'file_keys': ['key-1', 'key-2'],
+                'files_descriptions': ['desc-1', 'desc-2'],
+                'files_names': ['name-1', 'name-2'],
+            },
+        }
+        with patch('openassessment.fileupload.api.get_download_url') as mock_download_url:
+            actual_urls = xblock.get_download_urls_from_submission(mock_submission, defer_urls=True)
+            self.assertFalse(mock_download_url.called)
+
+        item_id = xblock.get_student_item_dict()['item_id']
+        expected_urls = [
+            (api.get_deferred_download_url('key-1', item_id), 'desc-1', 'name-1', False),
+            (api.get_deferred_download_url('key-2', item_id), 'desc-2', 'name-2', False),
+        ]
+        self.assertEqual(expected_urls, actual_urls)
+        self.assertTrue(all(url.deferred for url, _, _, _ in actual_urls))
+
+    @scenario('data/file_upload_scenario.xml')
+    def test_resolve_file_urls(self, xblock):
+        student_item = xblock.get_student_item_dict()
+        item_id = student_item['item_id']
+        keys = [api.get_student_file_key(student_item, index) for index in range(2)]
+        other_item = dict(student_item, item_id='other-item')
+        with patch('django.core.signing.time.time', return_value=time.time() - 2000):
+            expired_token = api.get_deferred_download_url(keys[0], item_id)
+        # Placeholders of the same file are equal: compare the tokens, like the client sends them
+        tokens = [six.text_type(token) for token in (
+            api.get_deferred_download_url(keys[0], item_id),
+            api.get_deferred_download_url(keys[1], item_id),
+            'invalid',
+            expired_token,
+            # Tokens are only valid for the files of the item they were rendered for
+            api.get_deferred_download_url(keys[0], 'other-item'),
+            api.get_deferred_download_url(api.get_student_file_key(other_item), item_id),
+        )]
+        with patch('openassessment.fileupload.api.get_download_urls') as mock_download_urls:
+            mock_download_urls.side_effect = lambda keys: {key: 'url-of-' + key for key in keys}
+            resp = self.request(xblock, 'resolve_file_urls', json.dumps({'tokens': tokens}), response_format='json')
+
+        self.assertTrue(resp['success'])
+        self.assertEqual(
+            dict([(tokens[0], 'url-of-' + keys[0]), (tokens[1], 'url-of-' + keys[1])] + [
+                (token, '') for token in tokens[2:]
+            ]),
+            resp['urls']
+        )
+        # The URLs are signed in a single batch
+        self.assertEqual(1, mock_download_urls.call_count)
+
+    @scenario('data/file_upload_scenario.xml')
+    def test_resolve_file_urls_batch_size(self, xblock):
+        # The client sends at most MAX_RESOLVED_FILE_URLS tokens per request
+        tokens = ['token-{}'.format(index) for index in range(xblock.MAX_RESOLVED_FILE_URLS)]
+        resp = self.request(xblock, 'resolve_file_urls', json.dumps({'tokens': tokens}), response_format='json')
+        self.assertTrue(resp['success'])
+        self.assertEqual(len(resp['urls']), xblock.MAX_RESOLVED_FILE_URLS)
+
+        tokens.append('token-{}'.format(xblock.MAX_RESOLVED_FILE_URLS))
+        resp = self.request(xblock, 'resolve_file_urls', json.dumps({'tokens': tokens}), response_format='json')
+        self.assertFalse(resp['success'])
+
+    @scenario('data/file_upload_scenario.xml')
+    def test_resolve_file_urls_invalid_request(self, xblock):
+        for payload in ({}, {'tokens': 'token'}, {'tokens': [1]}, {'tokens': ['token'] * 101}):
+            resp = self.request(xblock, 'resolve_file_urls', json.dumps(payload), response_format='json')
+            self.assertFalse(resp['success'])
+
+    @scenario('data/file_upload_scenario.xml')
+    def test_resolve_file_urls_error(self, xblock):
+        student_item = xblock.get_student_item_dict()
+        token = api.get_deferred_download_url(api.get_student_file_key(student_item), student_item['item_id'])
+        with patch('openassessment.fileupload.api.get_download_urls') as mock_download_urls:
+            mock_download_urls.side_effect = FileUploadInternalError("Storage unavailable")
+            resp = self.request(
+                xblock,
+                'resolve_file_urls',
+                json.dumps({'tokens': [token]}),
+                response_format='json'
+            )
+        self.assertFalse(resp['success'])
+
 
 class SubmissionRenderTest(XBlockHandlerTestCase):
     """
@@ -0,0 +1,86 @@
+"""
+Tests for the registry of compiled templates.
+"""
+from __future__ import absolute_import
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+import mock
+
+from openassessment.xblock import template_registry
+
+TEMPLATE_NAME = 'openassessmentblock/oa_error.html'
+RENDER_HOOK_CALLS = []
+
+
+def record_render(template_name, duration):
+    """
+    Render hook configured with the ORA2_TEMPLATE_RENDER_HOOK setting.
+    """
+    RENDER_HOOK_CALLS.append((template_name, duration))
+
+
+class TemplateRegistryTest(TestCase):
+    """
+    Tests for caching and timing the templates.
+    """
+
+    def setUp(self):
+        super(TemplateRegistryTest, self).setUp()
+        template_registry.reset_render_timings()
+        self.addCleanup(template_registry.reset_render_timings)
+        self.addCleanup(template_registry._TEMPLATES.clear)  # pylint: disable=protected-access
+        del RENDER_HOOK_CALLS[:]
+
+    @override_settings(DEBUG=False)
+    def test_template_compiled_once(self):
+        self.assertIs(template_registry.get_template(TEMPLATE_NAME), template_registry.get_template(TEMPLATE_NAME))
+
+    @override_settings(DEBUG=True)
+    def test_template_not_cached_in_debug(self):
+        self.assertIsNot(template_registry.get_template(TEMPLATE_NAME), template_registry.get_template(TEMPLATE_NAME))
+
+    @override_settings(DEBUG=False)
+    def test_warm(self):
+        num_templates = template_registry.warm()
+        self.assertGreater(num_templates, 0)
+        self.assertEqual(num_templates, len(template_registry._TEMPLATES))  # pylint: disable=protected-access
+        self.assertIn(TEMPLATE_NAME, template_registry._TEMPLATES)  # pylint: disable=protected-access
+
+    def test_render_timings(self):
+        template = template_registry.get_template(TEMPLATE_NAME)
+        template.render({'error_msg': 'Oops'})
+        template.render({'error_msg': 'Oops'})
+
+        timings = template_registry.get_render_timings()
+        self.assertEqual([TEMPLATE_NAME], list(timings))
+        self.assertEqual(2, timings[TEMPLATE_NAME]['count'])
+        self.assertGreaterEqual(timings[TEMPLATE_NAME]['total'], timings[TEMPLATE_NAME]['max'])
+
+    def test_render_hook(self):
+        hook = mock.Mock()
+        template_registry.add_render_hook(hook)
+        self.addCleanup(template_registry.remove_render_hook, hook)
+
+        html = template_registry.get_template(TEMPLATE_NAME).render({'error_msg': 'Oops'})
+
+        self.assertIn('Oops', html)
+        hook.assert_called_once_with(TEMPLATE_NAME, mock.ANY)
+
+    @mock.patch('openassessment.xblock.template_registry.logger')
+    def test_failing_render_hook(self, mock_logger):
+        hook = mock.Mock(side_effect=Exception('metrics are down'))
+        template_registry.add_render_hook(hook)
+        self.addCleanup(template_registry.remove_render_hook, hook)
+
+        # The rendering doesn't fail with the hook
+        html = template_registry.get_template(TEMPLATE_NAME).render({'error_msg': 'Oops'})
+
+        self.assertIn('Oops', html)
+        self.assertTrue(mock_logger.exception.called)
+
+    @override_settings(ORA2_TEMPLATE_RENDER_HOOK='openassessment.xblock.test.test_template_registry.record_render')
+    def test_render_hook_setting(self):
+        template_registry.get_template(TEMPLATE_NAME).render({'error_msg': 'Oops'})
+        self.assertEqual([TEMPLATE_NAME], [template_name for template_name, __ in RENDER_HOOK_CALLS])
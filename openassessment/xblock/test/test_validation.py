@@ -13,8 +13,11 @@ import mock
 import pytz
 from six.moves import range
 
+from django.core.cache import cache
 from django.test import TestCase
+from django.test.utils import override_settings
 
+from openassessment.assessment.api import student_training as student_training_api
 from openassessment.xblock.openassessmentblock import OpenAssessmentBlock
 from openassessment.xblock.validation import (validate_assessment_examples, validate_assessments, validate_dates,
                                               validate_rubric, validate_submission, validator)
@@ -335,6 +338,29 @@ class ValidationIntegrationTest(TestCase):
         self._assert_leaderboard_num_valid(101, False)
         self._assert_leaderboard_num_valid(102, False)
 
+    @override_settings(ORA2_INCREMENTAL_VALIDATION=True)
+    def test_incremental_validation(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.oa_block.rubric_assessments = []
+        self.oa_block.prompts = []
+        with mock.patch.object(
+            student_training_api, 'validate_training_examples', wraps=student_training_api.validate_training_examples
+        ) as mock_validate_examples:
+            # Sections which were validated successfully aren't validated again
+            self.assertEqual((True, u''), self.validator(self.RUBRIC, self.ASSESSMENTS))
+            self.assertEqual((True, u''), self.validator(self.RUBRIC, self.ASSESSMENTS, 10))
+            self.assertEqual(1, mock_validate_examples.call_count)
+
+            # Sections which changed are validated again
+            mutated_assessments = copy.deepcopy(self.ASSESSMENTS)
+            mutated_assessments[0]['examples'][0]['options_selected'][0]['option'] = 'Invalid option!'
+            for __ in range(2):
+                is_valid, msg = self.validator(self.RUBRIC, mutated_assessments)
+                self.assertFalse(is_valid)
+                self.assertEqual(msg, u'Example 1 has an invalid option for "vocabulary": "Invalid option!"')
+            self.assertEqual(3, mock_validate_examples.call_count)
+
     def _assert_leaderboard_num_valid(self, num, expected_is_valid):
         """
         Check that the leaderboard number is either valid or invalid.
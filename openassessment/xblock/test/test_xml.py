@@ -19,8 +19,9 @@ from django.test import TestCase
 import lxml.etree as etree
 from openassessment.xblock.data_conversion import create_prompts_list
 from openassessment.xblock.openassessmentblock import OpenAssessmentBlock
-from openassessment.xblock.xml import (UpdateFromXmlError, _parse_prompts_xml, parse_assessments_xml,
-                                       parse_examples_xml, parse_from_xml_str, parse_rubric_xml,
+from openassessment.xblock import xml as oa_xml
+from openassessment.xblock.xml import (UpdateFromXmlError, _parse_prompts_xml, parse_assessments_xml, parse_date,
+                                       parse_examples_xml, parse_from_xml, parse_from_xml_str, parse_rubric_xml,
                                        serialize_assessments_to_xml_str, serialize_content,
                                        serialize_examples_to_xml_str, serialize_rubric_to_xml_str)
 
@@ -549,3 +550,44 @@ class TestParseFromXml(TestCase):
     def test_parse_from_xml_error(self, data):
         with self.assertRaises(UpdateFromXmlError):
             parse_from_xml_str("".join(data['xml']))
+
+    def test_parse_from_xml_cached(self):
+        xml = (
+            u'<openassessment submission_due="2030-01-01T00:00:00"><title>Cached</title>'
+            u'<prompts><prompt><description>Prompt</description></prompt></prompts>'
+            u'<rubric><criterion><name>Form</name><prompt>Form?</prompt>'
+            u'<option points="1"><name>Fair</name><explanation>Fair</explanation></option></criterion></rubric>'
+            u'<assessments><assessment name="self-assessment" /></assessments></openassessment>'
+        )
+        with mock.patch.object(oa_xml, '_parse_from_xml', wraps=oa_xml._parse_from_xml) as mock_parse:
+            config = parse_from_xml(etree.fromstring(xml))
+            # Callers can modify the content without changing the cached content
+            config['rubric_criteria'][0]['name'] = u'Changed'
+
+            cached_config = parse_from_xml(etree.fromstring(xml))
+            self.assertEqual(cached_config, parse_from_xml_str(xml))
+
+        self.assertEqual(1, mock_parse.call_count)
+        self.assertEqual(u'Form', cached_config['rubric_criteria'][0]['name'])
+        self.assertEqual(u'2030-01-01T00:00:00', cached_config['submission_due'])
+
+    def test_parse_from_xml_entities(self):
+        with self.assertRaises(UpdateFromXmlError):
+            parse_from_xml_str(u'<!DOCTYPE openassessment [<!ENTITY title "Title">]><openassessment />')
+
+    @ddt.data(
+        u'2014-03-01T00:00:00',
+        u'2014-03-01T23:59:59',
+        u'2014-03-01',
+        u'2014-03-01T00:00:00.123',
+        u'2014-03-01T00:00:00+05:00',
+        u'March 1, 2014',
+    )
+    def test_parse_date(self, date_str):
+        expected = dateutil.parser.parse(date_str).replace(tzinfo=pytz.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        self.assertEqual(expected, parse_date(date_str))
+
+    @ddt.data(u'2014-02-30T00:00:00', u'2014-03-01T24:00:00', u'not a date')
+    def test_parse_invalid_date(self, date_str):
+        with self.assertRaises(UpdateFromXmlError):
+            parse_date(date_str)
@@ -1,18 +1,66 @@
 """
 Validate changes to an XBlock before it is updated.
+
+Each section of the definition (assessments, rubric, training examples and
+dates) is validated separately.  With the ORA2_INCREMENTAL_VALIDATION setting
+enabled, the sections which were successfully validated are remembered by a
+hash of their content, so that saving a definition only validates again the
+sections which changed since they were last validated: editing the title of
+a problem doesn't validate its training examples again.
 """
 from __future__ import absolute_import
 
 from collections import Counter
+import hashlib
+import json
 
 import six
 from six.moves import zip
 
-from openassessment.assessment.api.student_training import validate_training_examples
-from openassessment.assessment.serializers import InvalidRubric, rubric_from_dict
+from django.conf import settings
+from django.core.cache import cache
+
 from openassessment.xblock.data_conversion import convert_training_examples_list_to_dict
+from openassessment.xblock.lazy_module import LazyModule
 from openassessment.xblock.resolve_dates import DateValidationError, InvalidDateFormat, resolve_dates
 
+assessment_serializers = LazyModule('openassessment.assessment.serializers')  # pylint: disable=invalid-name
+student_training_api = LazyModule('openassessment.assessment.api.student_training')  # pylint: disable=invalid-name
+
+# Time (in seconds) successful validations of a section are remembered for
+VALIDATION_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Change the version when validation rules change, so that sections are validated again
+VALIDATION_CACHE_VERSION = 1
+
+
+def _validate_section(section, inputs, validate):
+    """
+    Validate a section of the definition, unless the same inputs were already validated successfully.
+
+    Only successes are cached: their (empty) message doesn't depend on the language.
+
+    Args:
+        section (str): The name of the section, e.g. "rubric".
+        inputs (tuple): Everything the validation of the section depends on.
+        validate (callable): Validates the section, returning a (is_valid, msg) tuple.
+
+    Returns:
+        tuple (is_valid, msg)
+    """
+    if not getattr(settings, 'ORA2_INCREMENTAL_VALIDATION', False):
+        return validate()
+
+    serialized = json.dumps([VALIDATION_CACHE_VERSION, inputs], sort_keys=True, default=six.text_type)
+    cache_key = u"openassessment.validation.{}.{}".format(section, hashlib.sha1(serialized.encode('utf-8')).hexdigest())
+    if cache.get(cache_key):
+        return True, u''
+
+    success, msg = validate()
+    if success:
+        cache.set(cache_key, True, VALIDATION_CACHE_TIMEOUT)
+    return success, msg
+
 
 def _match_by_order(items, others):
     """
@@ -188,8 +236,8 @@ def validate_rubric(rubric_dict, current_rubric, is_released, _):
             and msg describes any validation errors found.
     """
     try:
-        rubric_from_dict(rubric_dict)
-    except InvalidRubric:
+        assessment_serializers.rubric_from_dict(rubric_dict)
+    except assessment_serializers.InvalidRubric:
         return False, _(u'This rubric definition is not valid.')
 
     for criterion in rubric_dict['criteria']:
@@ -296,7 +344,7 @@ def validate_assessment_examples(rubric_dict, assessments, _):
 
             # Delegate to the student training API to validate the
             # examples against the rubric.
-            errors = validate_training_examples(rubric_dict, examples)
+            errors = student_training_api.validate_training_examples(rubric_dict, examples)
             if errors:
                 return False, "; ".join(errors)
 
@@ -329,7 +377,11 @@ def validator(oa_block, _, strict_post_release=True):
 
         # Assessments
         current_assessments = oa_block.rubric_assessments
-        success, msg = validate_assessments(assessments, current_assessments, is_released, _)
+        success, msg = _validate_section(
+            'assessments',
+            (assessments, current_assessments, is_released),
+            lambda: validate_assessments(assessments, current_assessments, is_released, _)
+        )
         if not success:
             return False, msg
 
@@ -338,19 +390,33 @@ def validator(oa_block, _, strict_post_release=True):
             'prompts': oa_block.prompts,
             'criteria': oa_block.rubric_criteria
         }
-        success, msg = validate_rubric(rubric_dict, current_rubric, is_released, _)
+        success, msg = _validate_section(
+            'rubric',
+            (rubric_dict, current_rubric, is_released),
+            lambda: validate_rubric(rubric_dict, current_rubric, is_released, _)
+        )
         if not success:
             return False, msg
 
         # Training examples
-        success, msg = validate_assessment_examples(rubric_dict, assessments, _)
+        training_examples = [asmnt.get('examples') for asmnt in assessments if asmnt.get('name') == 'student-training']
+        success, msg = _validate_section(
+            'examples',
+            (rubric_dict, training_examples),
+            lambda: validate_assessment_examples(rubric_dict, assessments, _)
+        )
         if not success:
             return False, msg
 
         # Dates
         submission_dates = [(submission_start, submission_due)]
         assessment_dates = [(asmnt.get('start'), asmnt.get('due')) for asmnt in assessments]
-        success, msg = validate_dates(oa_block.start, oa_block.due, submission_dates + assessment_dates, _)
+        date_ranges = submission_dates + assessment_dates
+        success, msg = _validate_section(
+            'dates',
+            (oa_block.start, oa_block.due, date_ranges),
+            lambda: validate_dates(oa_block.start, oa_block.due, date_ranges, _)
+        )
         if not success:
             return False, msg
 
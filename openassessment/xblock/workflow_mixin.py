@@ -4,11 +4,17 @@ Handle OpenAssessment XBlock requests to the Workflow API.
 
 from __future__ import absolute_import
 
-from openassessment.workflow import api as workflow_api
-from openassessment.workflow.models import AssessmentWorkflowCancellation
-from submissions.api import get_submissions, SubmissionInternalError, SubmissionNotFoundError
+from lazy import lazy
+from submissions.errors import SubmissionInternalError, SubmissionNotFoundError
 from xblock.core import XBlock
 
+from .lazy_module import LazyModule
+from .workflow_snapshot import WorkflowSnapshot
+
+submission_api = LazyModule('submissions.api')  # pylint: disable=invalid-name
+workflow_api = LazyModule('openassessment.workflow.api')  # pylint: disable=invalid-name
+workflow_models = LazyModule('openassessment.workflow.models')  # pylint: disable=invalid-name
+
 
 class WorkflowMixin:
     """
@@ -24,6 +30,16 @@ class WorkflowMixin:
         "staff-assessment": "staff"
     }
 
+    @lazy
+    def workflow_snapshot(self):
+        """
+        The state of the workflows read during the current handler invocation.
+
+        Returns:
+            WorkflowSnapshot
+        """
+        return WorkflowSnapshot(self.request_cache)
+
     @XBlock.json_handler
     def handle_workflow_info(self, data, suffix=''):    # pylint:disable=W0613
         """
@@ -64,6 +80,12 @@ class WorkflowMixin:
         Returns:
             dict
 
+        """
+        return self.workflow_snapshot.get(self._get_workflow_requirements)
+
+    def _get_workflow_requirements(self):
+        """
+        Retrieve the requirements of the assessment modules, see `workflow_requirements`.
         """
         requirements = {}
 
@@ -109,7 +131,10 @@ class WorkflowMixin:
 
         if submission_uuid is not None:
             requirements = self.workflow_requirements()
-            workflow_api.update_from_assessments(submission_uuid, requirements)
+            try:
+                workflow_api.update_from_assessments(submission_uuid, requirements)
+            finally:
+                self.workflow_snapshot.invalidate()
 
     def get_workflow_info(self, submission_uuid=None):
         """
@@ -126,6 +151,12 @@ class WorkflowMixin:
         Raises:
             AssessmentWorkflowError
         """
+        return self.workflow_snapshot.get(self._get_workflow_info, submission_uuid)
+
+    def _get_workflow_info(self, submission_uuid):
+        """
+        Retrieve (and possibly update) the workflow, see `get_workflow_info`.
+        """
         if self.is_team_assignment():
             return self.get_team_workflow_info()
 
@@ -153,14 +184,21 @@ class WorkflowMixin:
         if self.submission_uuid is not None:
             return self.submission_uuid
         elif self.is_team_assignment():
-            try:
-                # Query for submissions by the student item
-                student_item = self.get_student_item_dict()
-                submission_list = get_submissions(student_item)
-                if submission_list and submission_list[0]["uuid"] is not None:
-                    return submission_list[0]["uuid"]
-            except (SubmissionInternalError, SubmissionNotFoundError):
-                return None
+            return self.workflow_snapshot.get(self._get_team_member_submission_uuid)
+
+    def _get_team_member_submission_uuid(self):
+        """
+        Retrieve the UUID of the submission created for the student by a team submission, if any.
+        """
+        try:
+            # Query for submissions by the student item
+            student_item = self.get_student_item_dict()
+            submission_list = submission_api.get_submissions(student_item)
+            if submission_list and submission_list[0]["uuid"] is not None:
+                return submission_list[0]["uuid"]
+        except (SubmissionInternalError, SubmissionNotFoundError):
+            pass
+        return None
 
     def get_workflow_status_counts(self):
         """
@@ -204,9 +242,9 @@ class WorkflowMixin:
 
         """
         return [
-            self.ASSESSMENT_STEP_NAMES.get(ra['name'])
-            for ra in self.valid_assessments
-            if ra['name'] in self.ASSESSMENT_STEP_NAMES
+            self.ASSESSMENT_STEP_NAMES.get(step)
+            for step in self.assessment_steps
+            if step in self.ASSESSMENT_STEP_NAMES
         ]
 
     def get_workflow_cancellation_info(self, submission_uuid):
@@ -226,7 +264,9 @@ class WorkflowMixin:
 
         # Add the date that the workflow was cancelled (in preference to the serialized date string)
         del cancellation_info['created_at']
-        cancellation_model = AssessmentWorkflowCancellation.get_latest_workflow_cancellation(submission_uuid)
+        cancellation_model = workflow_models.AssessmentWorkflowCancellation.get_latest_workflow_cancellation(
+            submission_uuid
+        )
         if cancellation_model:
             cancellation_info['cancelled_at'] = cancellation_model.created_at
 
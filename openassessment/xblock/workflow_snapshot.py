@@ -0,0 +1,53 @@
+"""
+Request-scoped snapshot of the workflow state read by the OpenAssessment XBlock.
+
+Within a single handler, the submission UUID, the workflow requirements and
+the workflow itself are needed by several steps, and retrieving the workflow
+also updates it from the assessments.  The `WorkflowSnapshot` reads each of
+them once per handler invocation, so that every mixin sees the same state.
+"""
+from __future__ import absolute_import
+
+
+class WorkflowSnapshot:
+    """
+    The state of the workflows of a block, as read during a handler invocation.
+
+    Values are memoized in the block's `RequestCache`, so they are kept for
+    as long as its scope is open (the handler invocation), and read again on
+    every call outside of a scope.
+
+    Operations which change the workflows (creating a submission or an
+    assessment, updating or cancelling a workflow) must `invalidate` the
+    snapshot, so that the values are read again once they have changed.
+
+    Example:
+        >>> snapshot = WorkflowSnapshot(block.request_cache)
+        >>> snapshot.get(block.read_workflow_info, submission_uuid)
+        >>> snapshot.get(block.read_workflow_info, submission_uuid)  # cached
+        >>> snapshot.invalidate()
+    """
+
+    def __init__(self, request_cache):
+        self._request_cache = request_cache
+
+    def get(self, read, *args):
+        """
+        Return the value read by `read` with the given arguments, reading it
+        only if it isn't already in the snapshot.
+
+        Args:
+            read (callable): Reads the value from the APIs.
+            *args: Positional arguments passed to `read`.
+
+        Returns:
+            The (possibly memoized) value.
+        """
+        return self._request_cache.call(read, *args)
+
+    def invalidate(self):
+        """
+        Discard the values of the snapshot, and the other results memoized
+        for the request, which may depend on them.
+        """
+        self._request_cache.invalidate()
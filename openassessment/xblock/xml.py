@@ -3,12 +3,18 @@ Serialize and deserialize OpenAssessment XBlock content to/from XML.
 """
 from __future__ import absolute_import
 
+from collections import OrderedDict
+import datetime
+import hashlib
 import json
 import logging
+import pickle
+import re
+import threading
 from uuid import uuid4 as uuid
+import xml.etree.ElementTree as ElementTree
 
 import dateutil.parser
-import defusedxml.ElementTree as safe_etree
 import pytz
 import six
 
@@ -18,6 +24,22 @@ from openassessment.xblock.lms_mixin import GroupAccessDict
 
 log = logging.getLogger(__name__)
 
+# Dates in the format written by `serialize_content_to_xml`, which can be parsed without dateutil
+ISO_DATE_REGEX = re.compile(r'^([1-9]\d{3})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})$')
+
+# Parser of XML strings.  Like defusedxml, it doesn't resolve entities or
+# access the network; comments and processing instructions are dropped, as
+# with the ElementTree parser.
+XML_PARSER = etree.XMLParser(
+    resolve_entities=False, no_network=True, load_dtd=False, remove_comments=True, remove_pis=True
+)
+
+# Maximum number of XML definitions whose parsed content is kept by `parse_from_xml`
+PARSE_CACHE_SIZE = 1000
+
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_LOCK = threading.Lock()
+
 
 class UpdateFromXmlError(Exception):
     """
@@ -223,6 +245,14 @@ def parse_date(date_str, name=""):
     """
     if date_str == "":
         return None
+    match = ISO_DATE_REGEX.match(date_str) if isinstance(date_str, six.text_type) else None
+    if match:
+        try:
+            # Check that the date exists: the formatted date is the date string itself
+            datetime.datetime(*[int(part) for part in match.groups()])
+            return date_str
+        except ValueError:
+            pass
     try:
         # Get the date into ISO format
         parsed_date = dateutil.parser.parse(six.text_type(date_str)).replace(tzinfo=pytz.utc)
@@ -829,6 +859,11 @@ def parse_from_xml(root):
     We need to be strict about the XML we accept, to avoid setting
     the XBlock to an invalid state (which will then be persisted).
 
+    The content parsed from the last `PARSE_CACHE_SIZE` definitions is cached
+    by the hash of the definition, so that a definition loaded again (e.g. when
+    a course is imported again, or blocks are loaded from an XML modulestore)
+    isn't parsed again.  Invalid definitions aren't cached.
+
     Args:
         root (lxml.etree.Element): The XML definition of the XBlock's content.
 
@@ -838,6 +873,32 @@ def parse_from_xml(root):
     Raises:
         UpdateFromXmlError: The XML definition is invalid
     """
+    if etree.iselement(root):
+        definition = etree.tostring(root, with_tail=False)
+    else:
+        definition = ElementTree.tostring(root)
+    key = hashlib.sha1(definition).hexdigest()
+
+    with _PARSE_CACHE_LOCK:
+        content = _PARSE_CACHE.get(key)
+        if content is not None:
+            _PARSE_CACHE.move_to_end(key)
+
+    if content is None:
+        content = pickle.dumps(_parse_from_xml(root), pickle.HIGHEST_PROTOCOL)
+        with _PARSE_CACHE_LOCK:
+            _PARSE_CACHE[key] = content
+            while len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+                _PARSE_CACHE.popitem(last=False)
+
+    # Every caller gets its own copy of the content, which it may modify
+    return pickle.loads(content)
+
+
+def _parse_from_xml(root):
+    """
+    Parse the content of the OpenAssessment XBlock from an XML definition (see `parse_from_xml`).
+    """
 
     # Check that the root has the correct tag
     if root.tag != 'openassessment':
@@ -972,12 +1033,17 @@ def _unicode_to_xml(xml):
 
     """
     # Parse the XML content definition
-    # Use the defusedxml library implementation to avoid known security vulnerabilities in ElementTree:
+    # Like the defusedxml library, reject entity declarations to avoid known security vulnerabilities:
     # http://docs.python.org/2/library/xml.html#xml-vulnerabilities
     try:
-        return safe_etree.fromstring(xml.encode('utf-8'))
-    except (ValueError, safe_etree.ParseError):
+        root = etree.fromstring(xml.encode('utf-8'), XML_PARSER)
+    except (ValueError, etree.XMLSyntaxError):
+        raise UpdateFromXmlError("An error occurred while parsing the XML content.")
+
+    dtd = root.getroottree().docinfo.internalDTD
+    if dtd is not None and list(dtd.iterentities()):
         raise UpdateFromXmlError("An error occurred while parsing the XML content.")
+    return root
 
 
 def parse_examples_from_xml_str(xml):
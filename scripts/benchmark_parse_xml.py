@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Benchmark parsing the XML definition of OpenAssessment blocks, as done when
+courses are imported or blocks are loaded from an XML modulestore.
+
+The benchmark generates definitions with small and very large rubrics, and
+reports the per-block latency of parsing a definition for the first time,
+parsing it again (from the parse cache), and parsing it from a string.
+
+Usage:
+    python scripts/benchmark_parse_xml.py [NUM_BLOCKS]
+
+NUM_BLOCKS defaults to 200.
+"""
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+import timeit
+
+# Ensure that the root repo directory is in the front of the Python path,
+# so Django can find the settings module.
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings.base")
+
+import django
+
+import lxml.etree as etree
+
+django.setup()
+
+from openassessment.xblock import xml as oa_xml  # pylint: disable=wrong-import-position
+
+USAGE = u"{prog} [NUM_BLOCKS]"
+
+# (name, number of criteria, number of options per criterion)
+RUBRIC_SIZES = (
+    ("small", 3, 3),
+    ("large", 50, 10),
+)
+
+OPTION_XML = (
+    u'<option points="{points}"><name>option-{points}</name><label>Option {points}</label>'
+    u'<explanation>{explanation}</explanation></option>'
+)
+CRITERION_XML = (
+    u'<criterion feedback="optional"><name>criterion-{index}</name><label>Criterion {index}</label>'
+    u'<prompt>{prompt}</prompt>{options}</criterion>'
+)
+BLOCK_XML = (
+    u'<openassessment url_name="block-{index}" submission_start="2014-03-01T00:00:00" '
+    u'submission_due="2030-03-01T00:00:00"><title>Block {index}</title>'
+    u'<prompts><prompt><description>{prompt}</description></prompt></prompts>'
+    u'<rubric>{criteria}<feedbackprompt>Feedback</feedbackprompt></rubric>'
+    u'<assessments>'
+    u'<assessment name="peer-assessment" must_grade="5" must_be_graded_by="3" '
+    u'start="2014-03-01T00:00:00" due="2030-03-01T00:00:00" />'
+    u'<assessment name="self-assessment" start="2014-03-01T00:00:00" due="2030-03-01T00:00:00" />'
+    u'</assessments></openassessment>'
+)
+
+
+def _block_xml(index, num_criteria, num_options):
+    """
+    Return the XML definition of a block with a rubric of the given size.
+    """
+    criteria = u"".join(
+        CRITERION_XML.format(
+            index=criterion,
+            prompt=u"How well does the response answer the question? " * 5,
+            options=u"".join(
+                OPTION_XML.format(points=points, explanation=u"The response meets the expectations. " * 5)
+                for points in range(num_options)
+            )
+        )
+        for criterion in range(num_criteria)
+    )
+    return BLOCK_XML.format(index=index, prompt=u"Write an essay. " * 50, criteria=criteria)
+
+
+def _time_per_block(func, items):
+    """
+    Return the average time in milliseconds `func` takes for each item.
+    """
+    elapsed = timeit.timeit(lambda: [func(item) for item in items], number=1)
+    return elapsed * 1000 / len(items)
+
+
+def run_benchmark(num_blocks):
+    """
+    Print the per-block latency of parsing XML definitions, for each rubric size.
+    """
+    print(u"Per-block latency for {} blocks (ms):".format(num_blocks))
+    for name, num_criteria, num_options in RUBRIC_SIZES:
+        definitions = [_block_xml(index, num_criteria, num_options) for index in range(num_blocks)]
+        roots = [etree.fromstring(definition) for definition in definitions]
+
+        oa_xml._PARSE_CACHE.clear()  # pylint: disable=protected-access
+        first = _time_per_block(oa_xml.parse_from_xml, roots)
+        cached = _time_per_block(oa_xml.parse_from_xml, roots)
+        oa_xml._PARSE_CACHE.clear()  # pylint: disable=protected-access
+        from_string = _time_per_block(oa_xml.parse_from_xml_str, definitions)
+
+        print(u"  {name:<6} ({criteria} criteria x {options} options)  first: {first:8.3f}   "
+              u"cached: {cached:8.3f}   from string: {from_string:8.3f}".format(
+                  name=name, criteria=num_criteria, options=num_options,
+                  first=first, cached=cached, from_string=from_string
+              ))
+
+
+def main():
+    """
+    Main entry point for the script.
+    """
+    try:
+        num_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    except ValueError:
+        print(USAGE.format(prog=sys.argv[0]))
+        sys.exit(1)
+
+    run_benchmark(num_blocks)
+
+
+if __name__ == "__main__":
+    main()
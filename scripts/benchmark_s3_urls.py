@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Benchmark upload and download URL generation for the S3 file upload backend.
+
+The benchmark runs against moto's in-process S3 stand-in, and compares the
+per-URL latency of the pooled S3 connection with the latency of creating a
+new connection for every URL.
+
+Usage:
+    python scripts/benchmark_s3_urls.py [NUM_KEYS]
+
+NUM_KEYS defaults to 1000.
+"""
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+import timeit
+
+# Ensure that the root repo directory is in the front of the Python path,
+# so Django can find the settings module.
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings.base")
+
+import django
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+import boto
+from moto import mock_s3_deprecated
+
+django.setup()
+
+from openassessment.fileupload.backends import s3  # pylint: disable=wrong-import-position
+
+USAGE = u"{prog} [NUM_KEYS]"
+BUCKET_NAME = "benchmark-bucket"
+
+
+def _time_per_url(func, keys):
+    """
+    Return the average time in milliseconds `func` takes for each key.
+    """
+    elapsed = timeit.timeit(lambda: [func(key) for key in keys], number=1)
+    return elapsed * 1000 / len(keys)
+
+
+def _unpooled(func):
+    """
+    Wrap `func` so that every call starts from a new S3 connection.
+    """
+    def _wrapped(key):
+        s3._S3_CONNECTIONS.reset()  # pylint: disable=protected-access
+        return func(key)
+    return _wrapped
+
+
+def run_benchmark(num_keys):
+    """
+    Print the per-URL latency of URL generation, with and without connection pooling.
+    """
+    backend = s3.Backend()
+    keys = [u"benchmark/{}".format(index) for index in range(num_keys)]
+
+    conn = boto.connect_s3()
+    bucket = conn.create_bucket(BUCKET_NAME)
+    for key in keys:
+        bucket.new_key(backend._get_key_name(key)).set_contents_from_string("test")  # pylint: disable=protected-access
+
+    def upload_url(key):
+        return backend.get_upload_url(key, "image/png")
+
+    def download_url(key):
+        # Bypass the download URL cache, to measure the cost of signing
+        cache.clear()
+        return backend.get_download_url(key)
+
+    print(u"Per-URL latency for {} keys (ms):".format(num_keys))
+    for name, func in (("upload", upload_url), ("download", download_url)):
+        unpooled = _time_per_url(_unpooled(func), keys)
+        pooled = _time_per_url(func, keys)
+        print(u"  {name:<10} new connection: {unpooled:8.3f}   pooled: {pooled:8.3f}".format(
+            name=name, unpooled=unpooled, pooled=pooled
+        ))
+
+
+def main():
+    """
+    Main entry point for the script.
+    """
+    try:
+        num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    except ValueError:
+        print(USAGE.format(prog=sys.argv[0]))
+        sys.exit(1)
+
+    with mock_s3_deprecated(), override_settings(
+        AWS_ACCESS_KEY_ID='benchmark',
+        AWS_SECRET_ACCESS_KEY='benchmark',
+        FILE_UPLOAD_STORAGE_BUCKET_NAME=BUCKET_NAME,
+    ):
+        run_benchmark(num_keys)
+
+
+if __name__ == "__main__":
+    main()
@@ -156,3 +156,7 @@ FEATURES = {
     # See: https://openedx.atlassian.net/browse/EDUCATOR-4951
     'ENABLE_ORA_USER_STATE_UPLOAD_DATA': False,
 }
+
+# Remove the files deleted by learners right away, instead of in a background
+# thread, so that deletions are immediately visible in development and tests.
+ORA2_FILEUPLOAD_DEFER_REMOVAL = False